@@ -0,0 +1,41 @@
+"""Add webhook events inbox
+
+Revision ID: 3f8b2d6c9e14
+Revises: 7c3e9a41d2f0
+Create Date: 2026-10-17 11:40:02.551930
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '3f8b2d6c9e14'
+down_revision = '7c3e9a41d2f0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('webhook_events',
+    sa.Column('id', sa.String(length=255), nullable=False),
+    sa.Column('provider', sa.String(length=20), nullable=False),
+    sa.Column('event_type', sa.String(length=100), nullable=False),
+    sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('received_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('processed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_webhook_events_status_received_at', 'webhook_events', ['status', 'received_at'], unique=False)
+    # Settled deposits are looked up by payment intent id
+    op.create_index('ix_transactions_external_id', 'transactions', ['external_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_transactions_external_id', table_name='transactions')
+    op.drop_index('ix_webhook_events_status_received_at', table_name='webhook_events')
+    op.drop_table('webhook_events')
@@ -0,0 +1,36 @@
+"""Add keyset pagination indexes
+
+Revision ID: 7c3e9a41d2f0
+Revises: 240d033cdf1b
+Create Date: 2026-10-17 09:12:44.318204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7c3e9a41d2f0'
+down_revision = '240d033cdf1b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_matches_created_at_id', 'matches', ['created_at', 'id'], unique=False)
+    op.create_index('ix_matches_status_created_at_id', 'matches', ['status', 'created_at', 'id'], unique=False)
+    op.create_index('ix_matches_created_by_created_at_id', 'matches', ['created_by', 'created_at', 'id'], unique=False)
+    op.create_index('ix_matches_accepted_by_created_at_id', 'matches', ['accepted_by', 'created_at', 'id'], unique=False)
+    op.create_index('ix_transactions_user_id_created_at_id', 'transactions', ['user_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_disputes_created_at_id', 'disputes', ['created_at', 'id'], unique=False)
+    op.create_index('ix_disputes_status_created_at_id', 'disputes', ['status', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_disputes_status_created_at_id', table_name='disputes')
+    op.drop_index('ix_disputes_created_at_id', table_name='disputes')
+    op.drop_index('ix_transactions_user_id_created_at_id', table_name='transactions')
+    op.drop_index('ix_matches_accepted_by_created_at_id', table_name='matches')
+    op.drop_index('ix_matches_created_by_created_at_id', table_name='matches')
+    op.drop_index('ix_matches_status_created_at_id', table_name='matches')
+    op.drop_index('ix_matches_created_at_id', table_name='matches')
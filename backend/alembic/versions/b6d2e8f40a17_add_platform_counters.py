@@ -0,0 +1,52 @@
+"""Add platform counters table
+
+Revision ID: b6d2e8f40a17
+Revises: e4b7c19a5d30
+Create Date: 2026-10-17 18:42:09.217304
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b6d2e8f40a17'
+down_revision = 'e4b7c19a5d30'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('platform_counters',
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('value', sa.BigInteger(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+
+    # Seed with exact counts; from here on they are maintained incrementally
+    op.execute("""
+        INSERT INTO platform_counters (name, value, updated_at)
+        SELECT name, value, now() FROM (
+            SELECT 'users.total' AS name, count(*) AS value FROM users WHERE deleted_at IS NULL
+            UNION ALL
+            SELECT 'users.status.' || account_status, count(*) FROM users
+            WHERE deleted_at IS NULL GROUP BY account_status
+            UNION ALL
+            SELECT 'matches.status.' || status, count(*) FROM matches GROUP BY status
+            UNION ALL
+            SELECT 'disputes.status.' || status::text, count(*) FROM disputes GROUP BY status
+            UNION ALL
+            SELECT 'transactions.count.' || transaction_type::text, count(*) FROM transactions
+            WHERE status = 'COMPLETED' GROUP BY transaction_type
+            UNION ALL
+            SELECT 'transactions.volume_cents.' || transaction_type::text, sum(abs(amount_cents)) FROM transactions
+            WHERE status = 'COMPLETED' GROUP BY transaction_type
+            UNION ALL
+            SELECT 'reconciled_at', extract(epoch FROM now())::bigint
+        ) AS counts
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('platform_counters')
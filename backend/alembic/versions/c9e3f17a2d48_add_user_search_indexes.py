@@ -0,0 +1,32 @@
+"""Add trigram indexes for admin user search
+
+Revision ID: c9e3f17a2d48
+Revises: b6d2e8f40a17
+Create Date: 2026-10-17 20:03:27.905116
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c9e3f17a2d48'
+down_revision = 'b6d2e8f40a17'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    # Built concurrently so a large users table stays writable meanwhile
+    with op.get_context().autocommit_block():
+        op.create_index('ix_users_email_trgm', 'users', ['email'], unique=False, postgresql_using='gin', postgresql_ops={'email': 'gin_trgm_ops'}, postgresql_concurrently=True)
+        op.create_index('ix_player_profiles_username_trgm', 'player_profiles', ['username'], unique=False, postgresql_using='gin', postgresql_ops={'username': 'gin_trgm_ops'}, postgresql_concurrently=True)
+        op.create_index('ix_users_created_at_id', 'users', ['created_at', 'id'], unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_users_created_at_id', table_name='users', postgresql_concurrently=True)
+        op.drop_index('ix_player_profiles_username_trgm', table_name='player_profiles', postgresql_concurrently=True)
+        op.drop_index('ix_users_email_trgm', table_name='users', postgresql_concurrently=True)
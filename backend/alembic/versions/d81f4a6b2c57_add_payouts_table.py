@@ -0,0 +1,52 @@
+"""Add payouts table
+
+Revision ID: d81f4a6b2c57
+Revises: a52c7e1f0b93
+Create Date: 2026-10-17 14:21:48.672015
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd81f4a6b2c57'
+down_revision = 'a52c7e1f0b93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('payouts',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('destination', sa.String(length=255), nullable=False),
+    sa.Column('amount_cents', sa.BigInteger(), nullable=False),
+    sa.Column('currency', sa.String(length=3), nullable=False),
+    sa.Column('withdrawal_count', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('transfer_id', sa.String(length=255), nullable=True),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('lease_until', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.CheckConstraint('amount_cents > 0', name='payouts_amount_cents_check'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_payouts_destination'), 'payouts', ['destination'], unique=False)
+    op.create_index('ix_payouts_status_lease_until', 'payouts', ['status', 'lease_until'], unique=False)
+    # Unbatched withdrawals are claimed oldest first
+    op.create_index(
+        'ix_transactions_unbatched_withdrawals',
+        'transactions',
+        ['created_at'],
+        unique=False,
+        postgresql_where=sa.text("transaction_type = 'WITHDRAWAL' AND status = 'PROCESSING' AND reference_id IS NULL")
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_transactions_unbatched_withdrawals', table_name='transactions')
+    op.drop_index('ix_payouts_status_lease_until', table_name='payouts')
+    op.drop_index(op.f('ix_payouts_destination'), table_name='payouts')
+    op.drop_table('payouts')
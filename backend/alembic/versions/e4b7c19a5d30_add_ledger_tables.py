@@ -0,0 +1,75 @@
+"""Add double-entry ledger tables
+
+Revision ID: e4b7c19a5d30
+Revises: d81f4a6b2c57
+Create Date: 2026-10-17 16:05:12.384921
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4b7c19a5d30'
+down_revision = 'd81f4a6b2c57'
+branch_labels = None
+depends_on = None
+
+# Journal holding the balances that existed before the ledger
+OPENING_JOURNAL_ID = '00000000-0000-0000-0000-00000000ba1a'
+
+
+def upgrade() -> None:
+    op.create_table('ledger_entries',
+    sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+    sa.Column('journal_id', sa.UUID(), nullable=False),
+    sa.Column('journal_type', sa.String(length=30), nullable=False),
+    sa.Column('account', sa.String(length=64), nullable=False),
+    sa.Column('amount_cents', sa.BigInteger(), nullable=False),
+    sa.Column('transaction_id', sa.UUID(), nullable=True),
+    sa.Column('reference_id', sa.UUID(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.CheckConstraint('amount_cents <> 0', name='ledger_entries_amount_cents_check'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_ledger_entries_journal_id'), 'ledger_entries', ['journal_id'], unique=False)
+    op.create_index('ix_ledger_entries_account_id', 'ledger_entries', ['account', 'id'], unique=False)
+    op.create_table('ledger_snapshots',
+    sa.Column('account', sa.String(length=64), nullable=False),
+    sa.Column('entry_id', sa.BigInteger(), nullable=False),
+    sa.Column('balance_cents', sa.BigInteger(), nullable=False),
+    sa.Column('taken_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('account')
+    )
+    op.create_index(op.f('ix_ledger_snapshots_entry_id'), 'ledger_snapshots', ['entry_id'], unique=False)
+
+    # Open every account with the balance it holds today, against equity:opening
+    op.execute(f"""
+        INSERT INTO ledger_entries (journal_id, journal_type, account, amount_cents, created_at)
+        SELECT '{OPENING_JOURNAL_ID}'::uuid, 'OPENING_BALANCE', account, amount_cents, now()
+        FROM (
+            SELECT 'wallet:' || user_id AS account, balance_cents AS amount_cents FROM wallets
+            UNION ALL
+            SELECT 'pending:' || user_id, pending_cents FROM wallets
+            UNION ALL
+            SELECT 'escrow:' || match_id, player1_amount_cents + player2_amount_cents
+            FROM escrow_accounts WHERE status IN ('LOCKED', 'HELD')
+        ) AS opening
+        WHERE amount_cents <> 0
+        ORDER BY account
+    """)
+    op.execute(f"""
+        INSERT INTO ledger_entries (journal_id, journal_type, account, amount_cents, created_at)
+        SELECT '{OPENING_JOURNAL_ID}'::uuid, 'OPENING_BALANCE', 'equity:opening', -SUM(amount_cents), now()
+        FROM ledger_entries
+        WHERE journal_id = '{OPENING_JOURNAL_ID}'::uuid
+        HAVING SUM(amount_cents) <> 0
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_ledger_snapshots_entry_id'), table_name='ledger_snapshots')
+    op.drop_table('ledger_snapshots')
+    op.drop_index('ix_ledger_entries_account_id', table_name='ledger_entries')
+    op.drop_index(op.f('ix_ledger_entries_journal_id'), table_name='ledger_entries')
+    op.drop_table('ledger_entries')
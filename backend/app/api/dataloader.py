@@ -0,0 +1,100 @@
+"""
+Request-scoped batch loader.
+Coalesces per-key lookups made while handling one request into a single
+batched repository call, so listing endpoints run a constant number of
+queries regardless of page size.
+"""
+import asyncio
+from typing import Awaitable, Callable, Dict, Generic, Hashable, Iterable, List, Optional, Set, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class DataLoader(Generic[K, V]):
+    """
+    Batch and cache key lookups for the lifetime of a request.
+
+    Keys requested in the same event-loop tick are dispatched together to
+    batch_fn, which must return a mapping of key -> value. Missing keys
+    resolve to default_factory() (or None). Batches are serialized because
+    they share the request's database session.
+
+    Usage:
+        loader = DataLoader(match_repo.get_participants_for_matches, default_factory=list)
+        participants = await loader.load(match.id)
+        many = await loader.load_many([m.id for m in matches])
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[List[K]], Awaitable[Dict[K, V]]],
+        default_factory: Optional[Callable[[], V]] = None
+    ):
+        self._batch_fn = batch_fn
+        self._default_factory = default_factory
+        self._cache: Dict[K, "asyncio.Future[V]"] = {}
+        self._pending: List[K] = []
+        # The loop only keeps weak references to tasks; hold dispatches until they finish
+        self._tasks: Set[asyncio.Task] = set()
+        self._lock = asyncio.Lock()
+        self.batches = 0
+
+    async def load(self, key: K) -> V:
+        """Load a single key, batching with any other keys requested this tick."""
+        future = self._cache.get(key)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._cache[key] = future
+            self._pending.append(key)
+            if len(self._pending) == 1:
+                asyncio.get_running_loop().call_soon(self._schedule_dispatch)
+        return await future
+
+    async def load_many(self, keys: Iterable[K]) -> List[V]:
+        """Load several keys in one batch, preserving order."""
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def prime(self, key: K, value: V) -> None:
+        """Seed the cache with an already-known value."""
+        if key not in self._cache:
+            future = asyncio.get_running_loop().create_future()
+            future.set_result(value)
+            self._cache[key] = future
+
+    def clear(self, key: K) -> None:
+        """Drop a resolved key so the next load fetches it again."""
+        future = self._cache.get(key)
+        if future is not None and future.done():
+            del self._cache[key]
+
+    def _schedule_dispatch(self) -> None:
+        task = asyncio.get_running_loop().create_task(self._dispatch())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _dispatch(self) -> None:
+        """Resolve all pending keys with one call to the batch function."""
+        keys, self._pending = self._pending, []
+        if not keys:
+            return
+
+        async with self._lock:
+            try:
+                values = await self._batch_fn(keys)
+                self.batches += 1
+            except Exception as exc:
+                for key in keys:
+                    future = self._cache.pop(key, None)
+                    if future is not None and not future.done():
+                        future.set_exception(exc)
+                return
+
+        for key in keys:
+            future = self._cache[key]
+            if future.done():
+                continue
+            if key in values:
+                future.set_result(values[key])
+            else:
+                future.set_result(self._default_factory() if self._default_factory else None)
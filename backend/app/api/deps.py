@@ -10,7 +10,8 @@ from app.domain.repositories.user_repository import UserRepository
 from app.infrastructure.repositories.user_repository_impl import UserRepositoryImpl
 from app.core.security import verify_token
 from app.domain.entities.user import User
-from app.core.exceptions import UnauthorizedError
+from app.core.exceptions import UnauthorizedError, ForbiddenError
+from app.infrastructure.principal_cache import principal_cache
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
@@ -24,10 +25,14 @@ async def get_user_repository(
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: AsyncSession = Depends(get_db),
     user_repo: UserRepository = Depends(get_user_repository)
 ) -> User:
-    """Get current authenticated user."""
+    """
+    Get current authenticated user.
+    
+    Served from the principal cache when possible; the request's session
+    only opens a connection on a cache miss.
+    """
     try:
         payload = verify_token(token)
         user_id: str = payload.get("sub")
@@ -36,9 +41,12 @@ async def get_current_user(
     except Exception:
         raise UnauthorizedError("Invalid token")
     
-    user = await user_repo.get_user_by_id(user_id)
+    user = principal_cache.get(user_id)
     if user is None:
-        raise UnauthorizedError("User not found")
+        user = await user_repo.get_user_by_id(user_id)
+        if user is None:
+            raise UnauthorizedError("User not found")
+        principal_cache.put(user)
     
     if not user.is_active():
         raise UnauthorizedError("User account is inactive")
@@ -47,15 +55,15 @@ async def get_current_user(
 
 
 async def get_current_admin_user(
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    user_repo: UserRepository = Depends(get_user_repository)
 ) -> User:
-    """Get current user and verify admin role."""
-    # For MVP, we'll check admin status differently
-    # In production, this would check the roles relationship
-    # For now, we'll allow if user email contains admin or check a flag
-    # This is a placeholder - actual implementation would query roles
-    from app.core.exceptions import ForbiddenError
+    """
+    Get current user and verify admin role.
     
-    # TODO: Implement proper role checking
-    # For MVP, we'll skip the check and let the admin endpoints handle it
+    The grant is read from user_roles on every call rather than cached, so
+    revoking ADMIN takes effect on the next request.
+    """
+    if not await user_repo.has_role(current_user.id, "ADMIN"):
+        raise ForbiddenError("Admin access required")
     return current_user
@@ -0,0 +1,90 @@
+"""
+Streaming exports.
+Encodes batches of plain rows as CSV or NDJSON and sends each batch as one
+chunk of a chunked response, so an export of any size is written while it
+is being read and never held in memory.
+"""
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Dict, List, Sequence
+from uuid import UUID
+
+from fastapi.responses import StreamingResponse
+
+from app.core.exceptions import ValidationError
+
+MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def _plain(value: Any) -> Any:
+    """Convert a column value to its text-friendly form."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def _csv_encoder(columns: Sequence[str]) -> Callable[[List[Dict[str, Any]]], bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def encode(rows: List[Dict[str, Any]]) -> bytes:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([_plain(row[c]) for c in columns] for row in rows)
+        return buffer.getvalue().encode()
+
+    return encode
+
+
+def _ndjson_encoder(columns: Sequence[str]) -> Callable[[List[Dict[str, Any]]], bytes]:
+    def encode(rows: List[Dict[str, Any]]) -> bytes:
+        return "".join(
+            json.dumps({c: _plain(row[c]) for c in columns}, separators=(",", ":")) + "\n"
+            for row in rows
+        ).encode()
+
+    return encode
+
+
+def export_response(
+    batches: AsyncIterator[List[Dict[str, Any]]],
+    columns: Sequence[str],
+    export_format: str,
+    filename: str
+) -> StreamingResponse:
+    """
+    Stream row batches as a CSV (with header) or NDJSON download.
+
+    Raises ValidationError for an unknown format.
+    """
+    if export_format not in MEDIA_TYPES:
+        raise ValidationError(
+            f"Unsupported export format '{export_format}', expected one of: {', '.join(MEDIA_TYPES)}",
+            field="format"
+        )
+
+    if export_format == "csv":
+        encode = _csv_encoder(columns)
+        header = (",".join(columns) + "\r\n").encode()
+    else:
+        encode = _ndjson_encoder(columns)
+        header = b""
+
+    async def body() -> AsyncIterator[bytes]:
+        if header:
+            yield header
+        async for rows in batches:
+            yield encode(rows)
+
+    return StreamingResponse(
+        body(),
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{export_format}"'}
+    )
@@ -0,0 +1,96 @@
+"""
+Rate limiting middleware.
+Runs as plain ASGI middleware in front of the routers, so a rejected
+request costs one limiter check and never reaches dependency resolution,
+a database session or password hashing.
+
+Every request is limited per client IP and, when it carries a valid
+access token, per user, to RATE_LIMIT_PER_MINUTE. The credential routes
+(login and registration) get a much tighter per-IP budget of
+RATE_LIMIT_AUTH_PER_MINUTE to slow down credential stuffing.
+"""
+import math
+from typing import Iterable, List, Optional
+
+from fastapi.responses import JSONResponse
+from jose import JWTError
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.exceptions import RateLimitError
+from app.core.security import verify_token
+from app.infrastructure.rate_limiter import Limit, RateLimiter
+
+
+class RateLimitMiddleware:
+    """Reject requests over their per-IP, per-user or auth limits with 429."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        limiter: RateLimiter,
+        auth_paths: Iterable[str],
+        exempt_paths: Iterable[str] = ()
+    ):
+        self.app = app
+        self.limiter = limiter
+        self.auth_paths = frozenset(auth_paths)
+        self.exempt_paths = frozenset(exempt_paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.limiter.enabled or scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+
+        retry_after = await self.limiter.check(self._limits(scope))
+        if not retry_after:
+            await self.app(scope, receive, send)
+            return
+
+        seconds = max(math.ceil(retry_after), 1)
+        exc = RateLimitError(details={"retry_after_seconds": seconds})
+        response = JSONResponse(
+            status_code=exc.status_code,
+            content={"error": {"code": exc.code, "message": exc.message, "details": exc.details}},
+            headers={"Retry-After": str(seconds)}
+        )
+        await response(scope, receive, send)
+
+    def _limits(self, scope: Scope) -> List[Limit]:
+        ip = _client_ip(scope)
+        if scope["path"] in self.auth_paths:
+            return [(f"auth:ip:{ip}", settings.RATE_LIMIT_AUTH_PER_MINUTE)]
+
+        limits = [(f"ip:{ip}", settings.RATE_LIMIT_PER_MINUTE)]
+        user_id = _token_subject(scope)
+        if user_id:
+            limits.append((f"user:{user_id}", settings.RATE_LIMIT_PER_MINUTE))
+        return limits
+
+
+def _header(scope: Scope, name: bytes) -> Optional[str]:
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+def _client_ip(scope: Scope) -> str:
+    """The client address, or the one our proxy appended to X-Forwarded-For."""
+    if settings.RATE_LIMIT_TRUST_PROXY:
+        forwarded = _header(scope, b"x-forwarded-for")
+        if forwarded:
+            return forwarded.rsplit(",", 1)[-1].strip()
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+def _token_subject(scope: Scope) -> Optional[str]:
+    """User id from a valid bearer access token; invalid tokens are left to the auth dependency."""
+    authorization = _header(scope, b"authorization")
+    if not authorization or not authorization[:7].lower() == "bearer ":
+        return None
+    try:
+        return verify_token(authorization[7:].strip(), "access").get("sub")
+    except JWTError:
+        return None
@@ -0,0 +1,60 @@
+"""
+Unit-of-work commit middleware.
+FastAPI tears yield dependencies down only after the response has been
+sent, so committing in get_db's teardown would let a failed commit go out
+as a 2xx. This middleware commits the request's sessions when the
+response starts instead, and answers 500 if the commit fails.
+
+Errors raised by an endpoint never reach this point with an open session:
+they unwind through get_db first, which rolls the unit of work back.
+"""
+import logging
+
+from fastapi import status
+from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.infrastructure.database.session import commit_request_sessions
+
+logger = logging.getLogger(__name__)
+
+
+class UnitOfWorkMiddleware:
+    """Commit the request's database sessions before its response goes out."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        failed = False
+
+        async def send_after_commit(message: Message) -> None:
+            nonlocal failed
+            if failed:
+                # The endpoint's response was replaced; drop the rest of its body
+                return
+            if message["type"] == "http.response.start":
+                try:
+                    await commit_request_sessions(scope)
+                except Exception:
+                    logger.exception("Commit failed for %s %s", scope["method"], scope["path"])
+                    failed = True
+                    response = JSONResponse(
+                        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                        content={
+                            "error": {
+                                "code": "INTERNAL_ERROR",
+                                "message": "An internal error occurred",
+                                "details": {}
+                            }
+                        }
+                    )
+                    await response(scope, receive, send)
+                    return
+            await send(message)
+
+        await self.app(scope, receive, send_after_commit)
@@ -2,10 +2,13 @@
 Admin endpoints.
 """
 from uuid import UUID
+from datetime import datetime
 from fastapi import APIRouter, Depends, Query
-from typing import Optional
+from typing import List, Optional
 
-from app.api.deps import get_current_user
+from app.api.deps import get_current_admin_user
+from app.api.dataloader import DataLoader
+from app.api.v1.payments import transaction_export
 from app.domain.entities.user import User
 from app.domain.repositories.user_repository import UserRepository
 from app.domain.repositories.match_repository import MatchRepository
@@ -15,20 +18,31 @@ from app.infrastructure.repositories.user_repository_impl import UserRepositoryI
 from app.infrastructure.repositories.match_repository_impl import MatchRepositoryImpl
 from app.infrastructure.repositories.dispute_repository_impl import DisputeRepositoryImpl
 from app.infrastructure.repositories.wallet_repository_impl import WalletRepositoryImpl
-from app.infrastructure.database.session import get_db
-from app.core.exceptions import ForbiddenError
+from app.infrastructure.database.session import get_db, uow_metrics
+from app.infrastructure.cache import cache
+from app.infrastructure.principal_cache import principal_cache
+from app.infrastructure.platform_stats import platform_stats
+from app.infrastructure.rate_limiter import rate_limiter
+from app.infrastructure.login_attempts import login_attempts
+from app.infrastructure.refresh_tokens import refresh_tokens
+from app.core.security import password_hash_executor, verified_token_cache
+from app.infrastructure.repositories.webhook_repository_impl import WebhookRepositoryImpl
+from app.infrastructure.repositories.job_repository_impl import JobRepositoryImpl
+from app.infrastructure.repositories.payout_repository_impl import PayoutRepositoryImpl
+from app.infrastructure.repositories.ledger_repository_impl import LedgerRepositoryImpl
+from app.workers.webhook_inbox import webhook_inbox_worker
+from app.workers.jobs import job_queue
+from app.workers.payouts import payout_worker
+from app.workers.ledger_snapshots import ledger_snapshot_worker
+from app.workers.platform_stats import platform_stats_worker
+from app.workers.last_logins import last_login_worker
+from app.workers.leaderboard import leaderboard_worker
 from sqlalchemy.ext.asyncio import AsyncSession
 
 router = APIRouter()
 
 
-def require_admin(current_user: User = Depends(get_current_user)) -> User:
-    """Require admin role."""
-    # TODO: Implement proper role checking
-    # For MVP, we'll allow access - in production, check user_roles table
-    # For now, we'll just verify user is authenticated
-    # In production: check if user has ADMIN role in user_roles table
-    return current_user
+require_admin = get_current_admin_user
 
 
 async def get_user_repository_admin(
@@ -45,6 +59,13 @@ async def get_match_repository_admin(
     return MatchRepositoryImpl(db)
 
 
+async def get_participant_loader_admin(
+    match_repo: MatchRepository = Depends(get_match_repository_admin)
+) -> DataLoader:
+    """Dependency for the request-scoped match participant loader."""
+    return DataLoader(match_repo.get_participants_for_matches, default_factory=list)
+
+
 async def get_dispute_repository_admin(
     db: AsyncSession = Depends(get_db)
 ) -> DisputeRepository:
@@ -52,6 +73,13 @@ async def get_dispute_repository_admin(
     return DisputeRepositoryImpl(db)
 
 
+async def get_evidence_loader_admin(
+    dispute_repo: DisputeRepository = Depends(get_dispute_repository_admin)
+) -> DataLoader:
+    """Dependency for the request-scoped dispute evidence loader."""
+    return DataLoader(dispute_repo.get_evidence_for_disputes, default_factory=list)
+
+
 async def get_wallet_repository_admin(
     db: AsyncSession = Depends(get_db)
 ) -> WalletRepository:
@@ -59,21 +87,51 @@ async def get_wallet_repository_admin(
     return WalletRepositoryImpl(db)
 
 
-@router.get("/users", summary="List all users (admin)")
+# Soft-delete filter values for user search
+DELETED_FILTERS = {"exclude": False, "only": True, "include": None}
+
+
+@router.get("/users", summary="List and search users (admin)")
 async def list_users(
+    q: Optional[str] = Query(None, min_length=3, description="Partial email or username"),
+    status: Optional[str] = Query(None, pattern="^(ACTIVE|SUSPENDED|BANNED)$"),
+    deleted: str = Query("exclude", pattern="^(exclude|only|include)$", description="Soft-deleted accounts"),
     limit: int = Query(20, ge=1, le=100),
     cursor: Optional[str] = Query(None),
     admin_user: User = Depends(require_admin),
     user_repo: UserRepository = Depends(get_user_repository_admin)
 ):
-    """List all users (admin only)."""
-    # TODO: Implement pagination
-    from app.schemas.user import UserPublic
+    """List users newest first, optionally searching by partial email or username (admin only)."""
+    from app.schemas.user import AdminUserResponse
+    
+    users, next_cursor = await user_repo.search_users(
+        query=q,
+        account_status=status,
+        deleted=DELETED_FILTERS[deleted],
+        limit=limit,
+        cursor=cursor
+    )
     
-    # For MVP, return empty list - would need pagination method in repository
     return {
-        "data": [],
-        "meta": {"pagination": {"cursor": None, "has_more": False}}
+        "data": [
+            AdminUserResponse(
+                id=user.id,
+                email=user.email,
+                email_verified=user.email_verified,
+                account_status=user.account_status,
+                username=profile.username if profile else None,
+                display_name=profile.display_name if profile else None,
+                created_at=user.created_at.isoformat(),
+                last_login_at=user.last_login_at.isoformat() if user.last_login_at else None,
+                deleted_at=user.deleted_at.isoformat() if user.deleted_at else None
+            ) for user, profile in users
+        ],
+        "meta": {
+            "pagination": {
+                "cursor": next_cursor,
+                "has_more": next_cursor is not None
+            }
+        }
     }
 
 
@@ -125,7 +183,8 @@ async def list_matches_admin(
     limit: int = Query(20, ge=1, le=100),
     cursor: Optional[str] = Query(None),
     admin_user: User = Depends(require_admin),
-    match_repo: MatchRepository = Depends(get_match_repository_admin)
+    match_repo: MatchRepository = Depends(get_match_repository_admin),
+    participant_loader: DataLoader = Depends(get_participant_loader_admin)
 ):
     """List all matches (admin only)."""
     matches, next_cursor = await match_repo.list_matches(
@@ -136,10 +195,11 @@ async def list_matches_admin(
     
     from app.api.v1.matches import _match_to_response
     
-    match_responses = []
-    for match in matches:
-        participants = await match_repo.get_participants(match.id)
-        match_responses.append(_match_to_response(match, participants))
+    participants = await participant_loader.load_many([match.id for match in matches])
+    match_responses = [
+        _match_to_response(match, match_participants)
+        for match, match_participants in zip(matches, participants)
+    ]
     
     return {
         "data": match_responses,
@@ -158,7 +218,8 @@ async def list_disputes_admin(
     limit: int = Query(20, ge=1, le=100),
     cursor: Optional[str] = Query(None),
     admin_user: User = Depends(require_admin),
-    dispute_repo: DisputeRepository = Depends(get_dispute_repository_admin)
+    dispute_repo: DisputeRepository = Depends(get_dispute_repository_admin),
+    evidence_loader: DataLoader = Depends(get_evidence_loader_admin)
 ):
     """List all disputes (admin only)."""
     from app.domain.entities.dispute import DisputeStatus
@@ -177,10 +238,11 @@ async def list_disputes_admin(
         cursor=cursor
     )
     
-    dispute_responses = []
-    for dispute in disputes:
-        evidence = await dispute_repo.get_evidence(dispute.id)
-        dispute_responses.append(_dispute_to_response(dispute, evidence))
+    evidence = await evidence_loader.load_many([dispute.id for dispute in disputes])
+    dispute_responses = [
+        _dispute_to_response(dispute, dispute_evidence)
+        for dispute, dispute_evidence in zip(disputes, evidence)
+    ]
     
     return {
         "data": dispute_responses,
@@ -193,35 +255,162 @@ async def list_disputes_admin(
     }
 
 
+@router.get("/transactions/export", summary="Export transactions (admin)")
+async def export_transactions_admin(
+    user_id: Optional[UUID] = Query(None, description="Limit to one user; all users when omitted"),
+    export_format: str = Query("csv", alias="format", description="csv or ndjson"),
+    transaction_types: Optional[List[str]] = Query(None, alias="type", description="Repeat to export several types"),
+    created_from: Optional[datetime] = Query(None, alias="from", description="Inclusive lower bound on created_at"),
+    created_to: Optional[datetime] = Query(None, alias="to", description="Exclusive upper bound on created_at"),
+    admin_user: User = Depends(require_admin)
+):
+    """Stream transactions, oldest first, for finance reporting."""
+    return transaction_export(
+        user_id,
+        transaction_types,
+        created_from,
+        created_to,
+        export_format,
+        filename=f"transactions-{user_id}" if user_id else "transactions"
+    )
+
+
 @router.get("/stats", summary="Get platform statistics (admin)")
 async def get_stats(
     admin_user: User = Depends(require_admin)
 ):
-    """Get platform statistics (admin only)."""
-    # TODO: Implement actual statistics
-    # Would query database for:
-    # - Total users
-    # - Active matches
-    # - Total transactions
-    # - Revenue
-    # - Pending disputes
+    """
+    Get platform statistics (admin only).
     
+    Served from incrementally maintained counters without querying the
+    database; figures trail other processes by up to STATS_FLUSH_SECONDS.
+    """
+    return platform_stats.snapshot()
+
+
+@router.get("/metrics/db", summary="Get unit-of-work database metrics (admin)")
+async def get_db_metrics(
+    admin_user: User = Depends(require_admin)
+):
+    """Get commits and statements per request unit of work (admin only)."""
+    return {"data": uow_metrics.snapshot()}
+
+
+@router.get("/metrics/cache", summary="Get read-through cache metrics (admin)")
+async def get_cache_metrics(
+    admin_user: User = Depends(require_admin)
+):
+    """Get cache hit/miss counters for this worker (admin only)."""
+    return {"data": {**cache.stats(), "principals": principal_cache.stats()}}
+
+
+@router.get("/metrics/password-hash", summary="Get password hash executor metrics (admin)")
+async def get_password_hash_metrics(
+    admin_user: User = Depends(require_admin)
+):
+    """Get queue depth, rejections and latency of password hashing (admin only)."""
+    return {"data": password_hash_executor.stats()}
+
+
+@router.get("/metrics/webhooks", summary="Get webhook inbox metrics (admin)")
+async def get_webhook_metrics(
+    admin_user: User = Depends(require_admin),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get inbox backlog by status and this worker's drain counters (admin only)."""
     return {
-        "users": {
-            "total": 0,
-            "active": 0
-        },
-        "matches": {
-            "total": 0,
-            "active": 0,
-            "completed": 0
-        },
-        "transactions": {
-            "total_volume_cents": 0,
-            "total_count": 0
-        },
-        "disputes": {
-            "pending": 0,
-            "resolved": 0
+        "data": {
+            "inbox": await WebhookRepositoryImpl(db).count_by_status(),
+            "workers": webhook_inbox_worker.stats()
         }
     }
+
+
+@router.get("/metrics/jobs", summary="Get background job queue metrics (admin)")
+async def get_job_metrics(
+    admin_user: User = Depends(require_admin),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get job counts by status and this worker's run counters (admin only)."""
+    return {
+        "data": {
+            "jobs": await JobRepositoryImpl(db).count_by_status(),
+            "workers": job_queue.stats()
+        }
+    }
+
+
+@router.get("/metrics/payouts", summary="Get withdrawal payout metrics (admin)")
+async def get_payout_metrics(
+    admin_user: User = Depends(require_admin),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get the payout backlog and this worker's throughput and latency (admin only)."""
+    return {
+        "data": {
+            "backlog": await PayoutRepositoryImpl(db).get_backlog(),
+            "workers": payout_worker.stats()
+        }
+    }
+
+
+@router.get("/metrics/ledger", summary="Get ledger snapshot and platform account metrics (admin)")
+async def get_ledger_metrics(
+    admin_user: User = Depends(require_admin),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get snapshot progress, platform account balances and snapshot worker counters (admin only)."""
+    return {
+        "data": {
+            "ledger": await LedgerRepositoryImpl(db).get_summary(),
+            "workers": ledger_snapshot_worker.stats()
+        }
+    }
+
+
+@router.get("/metrics/stats", summary="Get platform statistics counter metrics (admin)")
+async def get_stats_metrics(
+    admin_user: User = Depends(require_admin)
+):
+    """Get event, flush and reconcile counters behind /admin/stats (admin only)."""
+    return {"data": platform_stats_worker.stats()}
+
+
+@router.get("/metrics/rate-limit", summary="Get rate limiter metrics (admin)")
+async def get_rate_limit_metrics(
+    admin_user: User = Depends(require_admin)
+):
+    """Get admitted and rate-limited request counts for this process (admin only)."""
+    return {"data": rate_limiter.stats()}
+
+
+@router.get("/metrics/logins", summary="Get login tracking metrics (admin)")
+async def get_login_metrics(
+    admin_user: User = Depends(require_admin)
+):
+    """Get failed-login, lockout and last-login flush counters for this process (admin only)."""
+    return {"data": {"attempts": login_attempts.stats(), "last_logins": last_login_worker.stats()}}
+
+
+@router.get("/metrics/refresh-tokens", summary="Get refresh token store metrics (admin)")
+async def get_refresh_token_metrics(
+    admin_user: User = Depends(require_admin)
+):
+    """Get rotation, reuse-detection and Bloom filter counters for this process (admin only)."""
+    return {"data": refresh_tokens.stats()}
+
+
+@router.get("/metrics/jwt-cache", summary="Get verified token cache metrics (admin)")
+async def get_jwt_cache_metrics(
+    admin_user: User = Depends(require_admin)
+):
+    """Get hit rate and token verification time saved in this process (admin only)."""
+    return {"data": verified_token_cache.stats()}
+
+
+@router.get("/metrics/leaderboard", summary="Get leaderboard index metrics (admin)")
+async def get_leaderboard_metrics(
+    admin_user: User = Depends(require_admin)
+):
+    """Get size, age and reload timings of this process's leaderboard index (admin only)."""
+    return {"data": leaderboard_worker.stats()}
@@ -134,13 +134,17 @@ async def refresh_token(
     status_code=status.HTTP_200_OK,
     summary="Logout and invalidate refresh token"
 )
-async def logout(request: LogoutRequest):
+async def logout(
+    request: LogoutRequest,
+    user_repo: UserRepository = Depends(get_user_repository)
+):
     """
     Logout user.
-    Note: In production, we'd invalidate the refresh token in Redis/database.
-    For MVP, we'll just return success. Token invalidation can be added later.
+    Revokes the refresh token and every token rotated from the same login,
+    so none of them can be refreshed again.
     """
-    # TODO: Implement token invalidation (store in Redis with TTL)
+    auth_service = AuthService(user_repo)
+    await auth_service.logout(request.refresh_token)
     return {"message": "Logged out successfully"}
 
 
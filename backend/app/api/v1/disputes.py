@@ -18,6 +18,7 @@ from app.infrastructure.repositories.escrow_repository_impl import EscrowReposit
 from app.infrastructure.repositories.wallet_repository_impl import WalletRepositoryImpl
 from app.infrastructure.database.session import get_db
 from app.api.deps import get_current_user
+from app.api.dataloader import DataLoader
 from app.domain.entities.user import User
 from app.domain.entities.dispute import DisputeResolution
 from app.schemas.dispute import (
@@ -40,6 +41,13 @@ async def get_dispute_repository(
     return DisputeRepositoryImpl(db)
 
 
+async def get_evidence_loader(
+    dispute_repo: DisputeRepository = Depends(get_dispute_repository)
+) -> DataLoader:
+    """Dependency for the request-scoped dispute evidence loader."""
+    return DataLoader(dispute_repo.get_evidence_for_disputes, default_factory=list)
+
+
 async def get_match_repository_for_disputes(
     db: AsyncSession = Depends(get_db)
 ) -> MatchRepository:
@@ -186,7 +194,8 @@ async def list_disputes(
     limit: int = Query(20, ge=1, le=100),
     cursor: Optional[str] = Query(None),
     current_user: User = Depends(get_current_user),
-    dispute_repo: DisputeRepository = Depends(get_dispute_repository)
+    dispute_repo: DisputeRepository = Depends(get_dispute_repository),
+    evidence_loader: DataLoader = Depends(get_evidence_loader)
 ):
     """List disputes (admin only)."""
     # TODO: Check admin role
@@ -206,11 +215,12 @@ async def list_disputes(
         cursor=cursor
     )
     
-    # Get evidence for each dispute
-    dispute_responses = []
-    for dispute in disputes:
-        evidence = await dispute_repo.get_evidence(dispute.id)
-        dispute_responses.append(_dispute_to_response(dispute, evidence))
+    # Get evidence for the whole page in one batch
+    evidence = await evidence_loader.load_many([dispute.id for dispute in disputes])
+    dispute_responses = [
+        _dispute_to_response(dispute, dispute_evidence)
+        for dispute, dispute_evidence in zip(disputes, evidence)
+    ]
     
     return DisputeListResponse(
         data=dispute_responses,
@@ -10,15 +10,19 @@ from app.domain.repositories.user_repository import UserRepository
 from app.domain.repositories.ranking_repository import RankingRepository
 from app.domain.repositories.escrow_repository import EscrowRepository
 from app.domain.repositories.wallet_repository import WalletRepository
+from app.domain.repositories.job_repository import JobRepository
 from app.domain.services.match_service import MatchService
 from app.domain.services.escrow_service import EscrowService
 from app.domain.services.wallet_service import WalletService
 from app.api.deps import get_user_repository, get_current_user
+from app.api.dataloader import DataLoader
 from app.infrastructure.repositories.match_repository_impl import MatchRepositoryImpl
 from app.infrastructure.repositories.ranking_repository_impl import RankingRepositoryImpl
 from app.infrastructure.repositories.escrow_repository_impl import EscrowRepositoryImpl
 from app.infrastructure.repositories.wallet_repository_impl import WalletRepositoryImpl
+from app.infrastructure.repositories.job_repository_impl import JobRepositoryImpl
 from app.infrastructure.database.session import get_db, AsyncSessionLocal
+from app.infrastructure.cache import cache, LOBBY_TTL_SECONDS
 from app.schemas.match import (
     CreateMatchRequest,
     AcceptMatchRequest,
@@ -64,6 +68,13 @@ async def get_wallet_repository_for_matches(
     return WalletRepositoryImpl(db)
 
 
+async def get_job_repository(
+    db: AsyncSession = Depends(get_db)
+) -> JobRepository:
+    """Dependency for job repository."""
+    return JobRepositoryImpl(db)
+
+
 async def get_escrow_service(
     escrow_repo: EscrowRepository = Depends(get_escrow_repository),
     wallet_repo: WalletRepository = Depends(get_wallet_repository_for_matches)
@@ -73,14 +84,22 @@ async def get_escrow_service(
     return EscrowService(escrow_repo, wallet_service)
 
 
+async def get_participant_loader(
+    match_repo: MatchRepository = Depends(get_match_repository)
+) -> DataLoader:
+    """Dependency for the request-scoped match participant loader."""
+    return DataLoader(match_repo.get_participants_for_matches, default_factory=list)
+
+
 def get_match_service(
     match_repo: MatchRepository = Depends(get_match_repository),
     user_repo: UserRepository = Depends(get_user_repository),
     ranking_repo: RankingRepository = Depends(get_ranking_repository),
-    escrow_service: EscrowService = Depends(get_escrow_service)
+    escrow_service: EscrowService = Depends(get_escrow_service),
+    job_repo: JobRepository = Depends(get_job_repository)
 ) -> MatchService:
     """Dependency for match service."""
-    return MatchService(match_repo, user_repo, ranking_repo, escrow_service)
+    return MatchService(match_repo, user_repo, ranking_repo, escrow_service, job_repo)
 
 
 def _match_to_response(match: Match, participants: list = None) -> MatchResponse:
@@ -151,31 +170,44 @@ async def list_matches(
     match_type: Optional[str] = Query(None, description="Filter by match type"),
     limit: int = Query(20, ge=1, le=100),
     cursor: Optional[str] = Query(None),
-    match_repo: MatchRepository = Depends(get_match_repository)
+    match_repo: MatchRepository = Depends(get_match_repository),
+    participant_loader: DataLoader = Depends(get_participant_loader)
 ):
     """List matches with filtering."""
-    matches, next_cursor = await match_repo.list_matches(
-        status=status_filter,
-        match_type=match_type,
-        limit=limit,
-        cursor=cursor
-    )
-    
-    # Get participants for each match
-    match_responses = []
-    for match in matches:
-        participants = await match_repo.get_participants(match.id)
-        match_responses.append(_match_to_response(match, participants))
-    
-    return MatchListResponse(
-        data=match_responses,
-        meta={
-            "pagination": {
-                "cursor": next_cursor,
-                "has_more": next_cursor is not None
+    async def load_page() -> dict:
+        matches, next_cursor = await match_repo.list_matches(
+            status=status_filter,
+            match_type=match_type,
+            limit=limit,
+            cursor=cursor
+        )
+        
+        # Get participants for the whole page in one batch
+        participants = await participant_loader.load_many([match.id for match in matches])
+        match_responses = [
+            _match_to_response(match, match_participants)
+            for match, match_participants in zip(matches, participants)
+        ]
+        
+        return MatchListResponse(
+            data=match_responses,
+            meta={
+                "pagination": {
+                    "cursor": next_cursor,
+                    "has_more": next_cursor is not None
+                }
             }
-        }
-    )
+        ).model_dump(mode="json")
+    
+    # Open lobbies are the hot listing; cache them briefly
+    if status_filter == "CREATED":
+        return await cache.get_or_load(
+            "lobbies",
+            f"{match_type}:{limit}:{cursor}",
+            LOBBY_TTL_SECONDS,
+            load_page
+        )
+    return await load_page()
 
 
 @router.get(
@@ -188,7 +220,8 @@ async def get_my_matches(
     limit: int = Query(20, ge=1, le=100),
     cursor: Optional[str] = Query(None),
     current_user: User = Depends(get_current_user),
-    match_repo: MatchRepository = Depends(get_match_repository)
+    match_repo: MatchRepository = Depends(get_match_repository),
+    participant_loader: DataLoader = Depends(get_participant_loader)
 ):
     """Get current user's matches."""
     matches, next_cursor = await match_repo.get_user_matches(
@@ -198,11 +231,12 @@ async def get_my_matches(
         cursor=cursor
     )
     
-    # Get participants for each match
-    match_responses = []
-    for match in matches:
-        participants = await match_repo.get_participants(match.id)
-        match_responses.append(_match_to_response(match, participants))
+    # Get participants for the whole page in one batch
+    participants = await participant_loader.load_many([match.id for match in matches])
+    match_responses = [
+        _match_to_response(match, match_participants)
+        for match, match_participants in zip(matches, participants)
+    ]
     
     return MatchListResponse(
         data=match_responses,
@@ -2,14 +2,24 @@
 Payment endpoints.
 """
 from uuid import UUID
-from fastapi import APIRouter, Depends, Query
-from typing import Optional
+from datetime import datetime
+import logging
+from fastapi import APIRouter, Depends, Header, Query, Request, status
+from fastapi.responses import JSONResponse, StreamingResponse
+from typing import List, Optional
 
+from app.core.config import settings
 from app.domain.repositories.wallet_repository import WalletRepository
+from app.domain.repositories.webhook_repository import WebhookRepository
 from app.domain.services.wallet_service import WalletService
-from app.infrastructure.repositories.wallet_repository_impl import WalletRepositoryImpl
-from app.infrastructure.database.session import get_db
+from app.infrastructure.repositories.wallet_repository_impl import WalletRepositoryImpl, EXPORT_COLUMNS
+from app.infrastructure.repositories.webhook_repository_impl import WebhookRepositoryImpl
+from app.infrastructure.database.session import get_db, on_commit, unit_of_work
+from app.infrastructure.external.stripe_webhook import verify_event
+from app.workers.webhook_inbox import webhook_inbox_worker
 from app.api.deps import get_current_user
+from app.api.export import export_response
+from app.core.exceptions import ValidationError
 from app.domain.entities.user import User
 from app.domain.entities.payment import TransactionType
 from app.schemas.payment import (
@@ -20,8 +30,11 @@ from app.schemas.payment import (
     TransactionResponse,
     TransactionListResponse
 )
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
 
@@ -39,6 +52,51 @@ async def get_wallet_service(
     return WalletService(wallet_repo)
 
 
+def transaction_export(
+    user_id: Optional[UUID],
+    transaction_types: Optional[List[str]],
+    created_from: Optional[datetime],
+    created_to: Optional[datetime],
+    export_format: str,
+    filename: str
+) -> StreamingResponse:
+    """
+    Build a streaming transaction export.
+    
+    The rows are read on a session of the export's own: the request's
+    session is committed and closed before the response body is streamed.
+    """
+    try:
+        types = [TransactionType(t) for t in transaction_types or []]
+    except ValueError:
+        raise ValidationError(
+            f"Unknown transaction type, expected any of: {', '.join(t.value for t in TransactionType)}",
+            field="type"
+        )
+    if created_from and created_to and created_from >= created_to:
+        raise ValidationError("'from' must be earlier than 'to'", field="from")
+    
+    async def batches():
+        async with unit_of_work() as session:
+            async for rows in WalletRepositoryImpl(session).stream_transactions(
+                user_id=user_id,
+                transaction_types=types,
+                created_from=created_from,
+                created_to=created_to,
+                batch_size=settings.EXPORT_BATCH_SIZE
+            ):
+                yield rows
+    
+    return export_response(batches(), EXPORT_COLUMNS, export_format, filename)
+
+
+async def get_webhook_repository(
+    db: AsyncSession = Depends(get_db)
+) -> WebhookRepository:
+    """Dependency for webhook inbox repository."""
+    return WebhookRepositoryImpl(db)
+
+
 @router.get("/wallet", response_model=WalletResponse, summary="Get wallet balance")
 async def get_wallet(
     current_user: User = Depends(get_current_user),
@@ -98,7 +156,8 @@ async def request_withdrawal(
     transaction = await wallet_service.request_withdrawal(
         user_id=current_user.id,
         amount_cents=request.amount_cents,
-        idempotency_key=request.idempotency_key
+        idempotency_key=request.idempotency_key,
+        destination_account=request.destination_account
     )
     
     return TransactionResponse(
@@ -166,3 +225,73 @@ async def get_transactions(
             }
         }
     )
+
+
+@router.get("/transactions/export", summary="Export transaction history (CSV or NDJSON)")
+async def export_transactions(
+    export_format: str = Query("csv", alias="format", description="csv or ndjson"),
+    transaction_types: Optional[List[str]] = Query(None, alias="type", description="Repeat to export several types"),
+    created_from: Optional[datetime] = Query(None, alias="from", description="Inclusive lower bound on created_at"),
+    created_to: Optional[datetime] = Query(None, alias="to", description="Exclusive upper bound on created_at"),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Export the full transaction history, oldest first.
+    
+    The file is streamed as it is read, with no page size limit.
+    """
+    return transaction_export(
+        current_user.id,
+        transaction_types,
+        created_from,
+        created_to,
+        export_format,
+        filename="transactions"
+    )
+
+
+@router.post("/webhook", summary="Receive Stripe webhook events")
+async def stripe_webhook(
+    request: Request,
+    stripe_signature: Optional[str] = Header(None, alias="Stripe-Signature"),
+    db: AsyncSession = Depends(get_db),
+    inbox: WebhookRepository = Depends(get_webhook_repository)
+):
+    """
+    Receive a Stripe event.
+    
+    Verifies the signature, commits the event to the inbox and acknowledges
+    as soon as it is stored; the inbox workers settle deposits in batches.
+    If the commit fails the response is a 503 so Stripe redelivers.
+    Redelivered event ids are acknowledged without being stored twice.
+    """
+    payload = await request.body()
+    event = verify_event(
+        payload,
+        stripe_signature,
+        settings.STRIPE_WEBHOOK_SECRET,
+        settings.STRIPE_WEBHOOK_TOLERANCE_SECONDS
+    )
+    
+    stored = await inbox.record_event(event["id"], event["type"], event)
+    if stored:
+        on_commit(db, webhook_inbox_worker.notify)
+    
+    # Acknowledge only once the event is durable; any non-2xx makes Stripe redeliver
+    try:
+        await db.commit()
+    except SQLAlchemyError:
+        logger.exception("Could not store Stripe event %s", event["id"])
+        await db.rollback()
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={
+                "error": {
+                    "code": "WEBHOOK_NOT_STORED",
+                    "message": "Event could not be stored, retry later",
+                    "details": {"event_id": event["id"]}
+                }
+            }
+        )
+    
+    return {"data": {"received": True, "duplicate": not stored}}
@@ -8,6 +8,7 @@ from typing import Optional
 from app.domain.repositories.ranking_repository import RankingRepository
 from app.infrastructure.repositories.ranking_repository_impl import RankingRepositoryImpl
 from app.infrastructure.database.session import get_db
+from app.infrastructure.cache import cache, LEADERBOARD_TTL_SECONDS
 from app.api.deps import get_current_user
 from app.domain.entities.user import User
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -29,20 +30,25 @@ async def get_leaderboard(
     ranking_repo: RankingRepository = Depends(get_ranking_repository)
 ):
     """Get leaderboard."""
-    leaderboard, next_cursor = await ranking_repo.get_leaderboard(
-        limit=limit,
-        cursor=cursor
-    )
-    
-    return {
-        "data": leaderboard,
-        "meta": {
-            "pagination": {
-                "cursor": next_cursor,
-                "has_more": next_cursor is not None
+    async def load_page() -> dict:
+        leaderboard, next_cursor = await ranking_repo.get_leaderboard(
+            limit=limit,
+            cursor=cursor
+        )
+        return {
+            "data": leaderboard,
+            "meta": {
+                "pagination": {
+                    "cursor": next_cursor,
+                    "has_more": next_cursor is not None
+                }
             }
         }
-    }
+    
+    # Top-N pages are shared by everyone; deeper pages go straight to the index
+    if cursor is None:
+        return await cache.get_or_load("leaderboard", f"top:{limit}", LEADERBOARD_TTL_SECONDS, load_page)
+    return await load_page()
 
 
 @router.get("/me", summary="Get current user's ranking")
@@ -57,4 +63,26 @@ async def get_my_ranking(
         from app.core.exceptions import NotFoundError
         raise NotFoundError("Ranking", str(current_user.id))
     
+    rank = await ranking_repo.get_user_rank(current_user.id)
+    if rank:
+        ranking["rank"] = rank["rank"]
+        ranking["percentile"] = rank["percentile"]
+        ranking["total_ranked"] = rank["total_ranked"]
+    
     return {"data": ranking}
+
+
+@router.get("/me/around", summary="Get players ranked around the current user")
+async def get_players_around_me(
+    radius: int = Query(5, ge=1, le=50),
+    current_user: User = Depends(get_current_user),
+    ranking_repo: RankingRepository = Depends(get_ranking_repository)
+):
+    """Get up to radius players on each side of the current user."""
+    players = await ranking_repo.get_players_around(current_user.id, radius)
+    
+    if players is None:
+        from app.core.exceptions import NotFoundError
+        raise NotFoundError("Ranking", str(current_user.id))
+    
+    return {"data": players}
@@ -11,6 +11,7 @@ from app.domain.entities.user import User, PlayerProfile
 from app.schemas.auth import ProfileResponse, UserResponse
 from app.schemas.user import UpdateProfileRequest
 from app.core.exceptions import NotFoundError
+from app.infrastructure.cache import cache, PROFILE_TTL_SECONDS
 
 router = APIRouter()
 
@@ -21,17 +22,23 @@ async def get_user(
     user_repo: UserRepository = Depends(get_user_repository)
 ):
     """Get user profile (public data only)."""
-    user = await user_repo.get_user_by_id(user_id)
+    async def load_user() -> Optional[dict]:
+        user = await user_repo.get_user_by_id(user_id)
+        if not user:
+            return None
+        return UserResponse(
+            id=user.id,
+            email=user.email,
+            email_verified=user.email_verified,
+            account_status=user.account_status
+        ).model_dump(mode="json")
+    
+    user = await cache.get_or_load("profile", str(user_id), PROFILE_TTL_SECONDS, load_user)
     
     if not user:
         raise NotFoundError("User", str(user_id))
     
-    return UserResponse(
-        id=user.id,
-        email=user.email,
-        email_verified=user.email_verified,
-        account_status=user.account_status
-    )
+    return user
 
 
 @router.put("/me", response_model=ProfileResponse, summary="Update current user's profile")
@@ -46,6 +46,86 @@ class Settings(BaseSettings):
         default=7,
         env="JWT_REFRESH_TOKEN_EXPIRE_DAYS"
     )
+    JWT_VERIFY_CACHE_SIZE: int = Field(
+        default=10000,
+        env="JWT_VERIFY_CACHE_SIZE",
+        ge=0,
+        description="Verified tokens remembered until their exp, so repeat requests skip the decode (0 disables)"
+    )
+    AUTH_PRINCIPAL_CACHE_TTL_SECONDS: int = Field(
+        default=30,
+        env="AUTH_PRINCIPAL_CACHE_TTL_SECONDS",
+        description="How long an authenticated user is reused without reloading (0 disables)"
+    )
+    PASSWORD_HASH_WORKERS: int = Field(
+        default=2,
+        env="PASSWORD_HASH_WORKERS",
+        ge=1,
+        description="Threads dedicated to Argon2 hashing and verification"
+    )
+    PASSWORD_HASH_MAX_PENDING: int = Field(
+        default=32,
+        env="PASSWORD_HASH_MAX_PENDING",
+        ge=1,
+        description="Hash operations allowed in flight or queued before new ones are rejected"
+    )
+    
+    # Login tracking
+    LOGIN_MAX_FAILED_ATTEMPTS: int = Field(
+        default=5,
+        env="LOGIN_MAX_FAILED_ATTEMPTS",
+        ge=1,
+        description="Wrong passwords within the failure window that lock an account"
+    )
+    LOGIN_FAILURE_WINDOW_SECONDS: float = Field(
+        default=900.0,
+        env="LOGIN_FAILURE_WINDOW_SECONDS",
+        gt=0,
+        description="Sliding window over which failed logins are counted"
+    )
+    LOGIN_LOCKOUT_SECONDS: float = Field(
+        default=1800.0,
+        env="LOGIN_LOCKOUT_SECONDS",
+        gt=0,
+        description="How long an account stays locked after too many failures"
+    )
+    LOGIN_ATTEMPTS_BACKEND: str = Field(
+        default="redis",
+        env="LOGIN_ATTEMPTS_BACKEND",
+        description="redis (shared by all nodes), memory (per-process) or fake-redis"
+    )
+    LAST_LOGIN_FLUSH_SECONDS: float = Field(
+        default=10.0,
+        env="LAST_LOGIN_FLUSH_SECONDS",
+        gt=0,
+        description="How often buffered last_login_at times are written to users"
+    )
+    LAST_LOGIN_BATCH_SIZE: int = Field(
+        default=1000,
+        env="LAST_LOGIN_BATCH_SIZE",
+        ge=1,
+        description="Users updated per statement when flushing last_login_at"
+    )
+    
+    # Refresh tokens
+    REFRESH_TOKEN_BACKEND: str = Field(
+        default="redis",
+        env="REFRESH_TOKEN_BACKEND",
+        description="redis (shared by all nodes), memory (per-process) or fake-redis"
+    )
+    REFRESH_TOKEN_BLOOM_CAPACITY: int = Field(
+        default=1_000_000,
+        env="REFRESH_TOKEN_BLOOM_CAPACITY",
+        ge=1,
+        description="Revoked ids per Bloom filter generation; two generations are kept"
+    )
+    REFRESH_TOKEN_BLOOM_ERROR_RATE: float = Field(
+        default=0.001,
+        env="REFRESH_TOKEN_BLOOM_ERROR_RATE",
+        gt=0,
+        lt=1,
+        description="Bloom filter false-positive rate at capacity"
+    )
     
     # Payment Gateway (Stripe)
     STRIPE_SECRET_KEY: str = Field(..., env="STRIPE_SECRET_KEY")
@@ -58,6 +138,123 @@ class Settings(BaseSettings):
         le=100,
         description="Platform fee percentage (0-100)"
     )
+    STRIPE_API_BASE: str = Field(
+        default="https://api.stripe.com",
+        env="STRIPE_API_BASE",
+        description="Stripe API base URL (point at scripts/fake_stripe.py for offline runs)"
+    )
+    STRIPE_API_VERSION: str = Field(default="2023-10-16", env="STRIPE_API_VERSION")
+    STRIPE_TIMEOUT_SECONDS: float = Field(default=10.0, env="STRIPE_TIMEOUT_SECONDS", gt=0)
+    STRIPE_MAX_CONCURRENCY: int = Field(
+        default=20,
+        env="STRIPE_MAX_CONCURRENCY",
+        ge=1,
+        description="Max in-flight Stripe calls (and pooled connections) per worker"
+    )
+    STRIPE_WEBHOOK_TOLERANCE_SECONDS: int = Field(
+        default=300,
+        env="STRIPE_WEBHOOK_TOLERANCE_SECONDS",
+        ge=0,
+        description="Max age of a webhook signature timestamp (0 disables the check)"
+    )
+    
+    # Webhook inbox workers
+    WEBHOOK_WORKERS_ENABLED: bool = Field(default=True, env="WEBHOOK_WORKERS_ENABLED")
+    WEBHOOK_WORKERS: int = Field(
+        default=2,
+        env="WEBHOOK_WORKERS",
+        ge=1,
+        description="Inbox drain tasks per API process"
+    )
+    WEBHOOK_BATCH_SIZE: int = Field(default=100, env="WEBHOOK_BATCH_SIZE", ge=1)
+    WEBHOOK_POLL_SECONDS: float = Field(default=1.0, env="WEBHOOK_POLL_SECONDS", gt=0)
+    WEBHOOK_MAX_ATTEMPTS: int = Field(default=5, env="WEBHOOK_MAX_ATTEMPTS", ge=1)
+    
+    # Withdrawal payouts
+    PAYOUT_WORKERS_ENABLED: bool = Field(default=True, env="PAYOUT_WORKERS_ENABLED")
+    PAYOUT_WORKERS: int = Field(default=1, env="PAYOUT_WORKERS", ge=1)
+    PAYOUT_BATCH_SIZE: int = Field(
+        default=200,
+        env="PAYOUT_BATCH_SIZE",
+        ge=1,
+        description="Withdrawals leased per pass"
+    )
+    PAYOUT_POLL_SECONDS: float = Field(default=5.0, env="PAYOUT_POLL_SECONDS", gt=0)
+    PAYOUT_CONCURRENCY: int = Field(
+        default=10,
+        env="PAYOUT_CONCURRENCY",
+        ge=1,
+        description="Transfers in flight per process"
+    )
+    PAYOUT_LEASE_SECONDS: float = Field(
+        default=120.0,
+        env="PAYOUT_LEASE_SECONDS",
+        gt=0,
+        description="How long a claimed payout is reserved for one worker; must exceed STRIPE_TIMEOUT_SECONDS"
+    )
+    PAYOUT_RETRY_BASE_SECONDS: float = Field(default=30.0, env="PAYOUT_RETRY_BASE_SECONDS", gt=0)
+    PAYOUT_MAX_ATTEMPTS: int = Field(
+        default=8,
+        env="PAYOUT_MAX_ATTEMPTS",
+        ge=1,
+        description="Transfer attempts before a payout is failed and its withdrawals refunded"
+    )
+    
+    # Background jobs
+    JOB_WORKERS_ENABLED: bool = Field(default=True, env="JOB_WORKERS_ENABLED")
+    JOB_WORKERS: int = Field(
+        default=2,
+        env="JOB_WORKERS",
+        ge=1,
+        description="Job runner tasks per API process"
+    )
+    JOB_BATCH_SIZE: int = Field(default=50, env="JOB_BATCH_SIZE", ge=1)
+    JOB_POLL_SECONDS: float = Field(default=1.0, env="JOB_POLL_SECONDS", gt=0)
+    JOB_MAX_ATTEMPTS: int = Field(default=5, env="JOB_MAX_ATTEMPTS", ge=1)
+    JOB_RETRY_BASE_SECONDS: float = Field(
+        default=2.0,
+        env="JOB_RETRY_BASE_SECONDS",
+        gt=0,
+        description="First retry delay; doubles on every further attempt"
+    )
+    
+    # Ledger snapshots
+    LEDGER_SNAPSHOTS_ENABLED: bool = Field(default=True, env="LEDGER_SNAPSHOTS_ENABLED")
+    LEDGER_SNAPSHOT_INTERVAL_SECONDS: float = Field(
+        default=60.0,
+        env="LEDGER_SNAPSHOT_INTERVAL_SECONDS",
+        gt=0,
+        description="How often account balances are folded into snapshots"
+    )
+    LEDGER_SNAPSHOT_SETTLE_SECONDS: float = Field(
+        default=30.0,
+        env="LEDGER_SNAPSHOT_SETTLE_SECONDS",
+        ge=0,
+        description="Entries younger than this stay in the tail; must exceed the longest commit"
+    )
+    
+    # Platform statistics
+    STATS_ENABLED: bool = Field(default=True, env="STATS_ENABLED")
+    STATS_FLUSH_SECONDS: float = Field(
+        default=5.0,
+        env="STATS_FLUSH_SECONDS",
+        gt=0,
+        description="How often buffered counter deltas are flushed and totals reloaded"
+    )
+    STATS_RECONCILE_SECONDS: float = Field(
+        default=900.0,
+        env="STATS_RECONCILE_SECONDS",
+        gt=0,
+        description="How often the counters are recounted from the source tables"
+    )
+    
+    # Exports
+    EXPORT_BATCH_SIZE: int = Field(
+        default=2000,
+        env="EXPORT_BATCH_SIZE",
+        ge=1,
+        description="Rows fetched per server-side cursor round trip and sent per response chunk"
+    )
     
     # CORS
     CORS_ORIGINS: Union[List[str], str] = Field(
@@ -75,6 +272,31 @@ class Settings(BaseSettings):
         default=5,
         env="RATE_LIMIT_AUTH_PER_MINUTE"
     )
+    RATE_LIMIT_BACKEND: str = Field(
+        default="redis",
+        env="RATE_LIMIT_BACKEND",
+        description="redis (shared by all nodes), memory (per-process) or fake-redis"
+    )
+    RATE_LIMIT_TRUST_PROXY: bool = Field(
+        default=False,
+        env="RATE_LIMIT_TRUST_PROXY",
+        description="Key clients by the address our proxy appends to X-Forwarded-For"
+    )
+    
+    # Cache
+    CACHE_ENABLED: bool = Field(default=True, env="CACHE_ENABLED")
+    CACHE_BACKEND: str = Field(
+        default="redis",
+        env="CACHE_BACKEND",
+        description="redis, memory (per-process) or fake-redis (in-memory Redis stand-in)"
+    )
+    
+    # Leaderboard
+    LEADERBOARD_REFRESH_SECONDS: int = Field(
+        default=300,
+        env="LEADERBOARD_REFRESH_SECONDS",
+        description="Interval at which the leaderboard worker rebuilds the in-memory index"
+    )
     
     # Security
     ALLOWED_HOSTS: Union[List[str], str] = Field(
@@ -152,6 +374,8 @@ class Settings(BaseSettings):
         env_file = ".env"
         env_file_encoding = "utf-8"
         case_sensitive = True
+        # The .env is shared with the frontend (VITE_* keys)
+        extra = "ignore"
 
 
 # Global settings instance
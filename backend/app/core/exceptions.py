@@ -144,3 +144,15 @@ class ForbiddenError(FGCMMatchException):
             status_code=403,
             details=details
         )
+
+
+class ServiceUnavailableError(FGCMMatchException):
+    """A dependency the operation cannot safely proceed without is down (503)."""
+    
+    def __init__(self, message: str, code: str = "SERVICE_UNAVAILABLE", details: Optional[Dict[str, Any]] = None):
+        super().__init__(
+            message=message,
+            code=code,
+            status_code=503,
+            details=details
+        )
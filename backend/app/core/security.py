@@ -2,14 +2,23 @@
 Security utilities: JWT token generation/validation, password hashing.
 All security operations are idempotent and safe for concurrent use.
 """
+import asyncio
+import hashlib
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable, List, Tuple, TypeVar
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from argon2 import PasswordHasher
 from argon2.exceptions import VerifyMismatchError
 
 from app.core.config import settings
+from app.core.exceptions import RateLimitError
+
+T = TypeVar("T")
 
 # Password hashing context - using Argon2 for security
 # Argon2 is memory-hard and resistant to GPU attacks
@@ -23,10 +32,10 @@ def hash_password(password: str) -> str:
     
     Args:
         password: Plain text password
-        
+    
     Returns:
         Hashed password string
-        
+    
     Raises:
         ValueError: If password is empty
     """
@@ -43,7 +52,7 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     Args:
         plain_password: Plain text password to verify
         hashed_password: Hashed password to compare against
-        
+    
     Returns:
         True if password matches, False otherwise
     """
@@ -57,6 +66,172 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         return False
 
 
+class PasswordHashExecutor:
+    """
+    Bounded thread pool for Argon2 work.
+    
+    Argon2 takes tens of milliseconds of CPU per call and releases the GIL,
+    so running it here keeps the event loop free. Operations beyond
+    max_pending (running plus queued) are rejected with RateLimitError
+    instead of piling up behind a login burst.
+    """
+    
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+        self.pending = 0
+        self.max_pending_seen = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_wait_seconds = 0.0
+        self.total_run_seconds = 0.0
+    
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run fn(*args) on the pool, or raise RateLimitError if the pool is saturated."""
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise RateLimitError("Too many authentication attempts in progress, please retry")
+        
+        self.pending += 1
+        self.max_pending_seen = max(self.max_pending_seen, self.pending)
+        submitted = time.perf_counter()
+        # Written by the pool thread, read here once the future completes;
+        # the counters themselves are only ever touched on the loop
+        timing: List[float] = []
+        
+        def timed() -> T:
+            timing.append(time.perf_counter())
+            try:
+                return fn(*args)
+            finally:
+                timing.append(time.perf_counter())
+        
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, timed)
+        finally:
+            self.pending -= 1
+            self.completed += 1
+            if len(timing) == 2:
+                started, finished = timing
+                self.total_wait_seconds += started - submitted
+                self.total_run_seconds += finished - started
+    
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth and latency counters."""
+        completed = self.completed or 1
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "pending": self.pending,
+            "queued": max(self.pending - self.workers, 0),
+            "max_pending_seen": self.max_pending_seen,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_wait_ms": round(self.total_wait_seconds / completed * 1000, 2),
+            "avg_run_ms": round(self.total_run_seconds / completed * 1000, 2)
+        }
+
+
+password_hash_executor = PasswordHashExecutor(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING
+)
+
+
+class VerifiedTokenCache:
+    """
+    Bounded LRU of tokens that already passed signature verification.
+    
+    A client sends the same access token on every request for its whole
+    lifetime, and each verification is a full decode plus HMAC. Entries map
+    a digest of the token (the token itself is not kept) to its claims and
+    are only served until the token's exp. The timing counters show how
+    much verification time the cache saves per call.
+    """
+    
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[bytes, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+        self.hit_seconds = 0.0
+        self.decode_seconds = 0.0
+    
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        return hashlib.blake2b(token.encode(), digest_size=16).digest()
+    
+    def decode(self, token: str) -> Dict[str, Any]:
+        """decode_token(token), served from the cache while the token is unexpired."""
+        started = time.perf_counter()
+        if self.max_entries <= 0:
+            return decode_token(token)
+        
+        key = self._digest(token)
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] > time.time():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                self.hit_seconds += time.perf_counter() - started
+                return dict(entry[1])
+            del self._entries[key]
+            self.expired += 1
+        
+        payload = decode_token(token)
+        self.misses += 1
+        self.decode_seconds += time.perf_counter() - started
+        exp = payload.get("exp")
+        if isinstance(exp, (int, float)):
+            self._entries[key] = (exp, dict(payload))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return payload
+    
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._entries.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and the verification time saved."""
+        lookups = self.hits + self.misses
+        avg_hit = self.hit_seconds / self.hits if self.hits else 0.0
+        avg_decode = self.decode_seconds / self.misses if self.misses else 0.0
+        saved = self.hits * max(avg_decode - avg_hit, 0.0)
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "expired": self.expired,
+            "evictions": self.evictions,
+            "avg_hit_us": round(avg_hit * 1e6, 2),
+            "avg_decode_us": round(avg_decode * 1e6, 2),
+            "saved_ms": round(saved * 1000, 2),
+            "saved_us_per_verify": round(saved / lookups * 1e6, 2) if lookups else 0.0
+        }
+
+
+verified_token_cache = VerifiedTokenCache(max_entries=settings.JWT_VERIFY_CACHE_SIZE)
+
+
+async def hash_password_async(password: str) -> str:
+    """Hash a password on the password hash executor."""
+    if not password:
+        raise ValueError("Password cannot be empty")
+    return await password_hash_executor.run(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the password hash executor."""
+    return await password_hash_executor.run(verify_password, plain_password, hashed_password)
+
+
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     """
     Create a JWT access token.
@@ -64,7 +239,7 @@ def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta]
     Args:
         data: Payload data to encode (typically user_id, email, roles)
         expires_delta: Optional expiration time delta
-        
+    
     Returns:
         Encoded JWT token string
     """
@@ -97,8 +272,9 @@ def create_refresh_token(data: Dict[str, Any]) -> str:
     Create a JWT refresh token.
     
     Args:
-        data: Payload data to encode (typically user_id)
-        
+        data: Payload data to encode (typically user_id, plus "fam" when
+            rotating, to keep the new token in its login's family)
+    
     Returns:
         Encoded JWT refresh token string
     """
@@ -106,11 +282,14 @@ def create_refresh_token(data: Dict[str, Any]) -> str:
     expire = datetime.utcnow() + timedelta(
         days=settings.JWT_REFRESH_TOKEN_EXPIRE_DAYS
     )
+    jti = uuid.uuid4().hex
     
     to_encode.update({
         "exp": expire,
         "iat": datetime.utcnow(),
-        "type": "refresh"
+        "type": "refresh",
+        "jti": jti,
+        "fam": data.get("fam", jti)  # A new login starts its own family
     })
     
     encoded_jwt = jwt.encode(
@@ -128,10 +307,10 @@ def decode_token(token: str) -> Dict[str, Any]:
     
     Args:
         token: JWT token string
-        
+    
     Returns:
         Decoded token payload
-        
+    
     Raises:
         JWTError: If token is invalid, expired, or malformed
     """
@@ -153,16 +332,17 @@ def verify_token(token: str, token_type: str = "access") -> Dict[str, Any]:
     Args:
         token: JWT token string
         token_type: Expected token type ("access" or "refresh")
-        
+    
     Returns:
         Decoded token payload
-        
+    
     Raises:
         JWTError: If token is invalid or wrong type
     """
-    payload = decode_token(token)
+    payload = verified_token_cache.decode(token)
     
     if payload.get("type") != token_type:
         raise JWTError(f"Invalid token type. Expected {token_type}")
     
     return payload
+
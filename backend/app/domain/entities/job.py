@@ -0,0 +1,39 @@
+"""
+Background job domain entities.
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+
+class JobType:
+    """Job types handled by the background job queue."""
+    UPDATE_RATINGS = "ranking.update_after_match"
+    AUDIT = "audit.record"
+    NOTIFY = "notification.send"
+
+
+@dataclass
+class JobRequest:
+    """A job to enqueue."""
+    job_type: str
+    payload: Dict[str, Any]
+    idempotency_key: Optional[str] = None  # Enqueueing the same key twice is a no-op
+    run_at: Optional[datetime] = None
+
+
+@dataclass
+class Job:
+    """Background job domain entity."""
+    id: UUID
+    job_type: str
+    payload: Dict[str, Any]
+    status: str  # PENDING, SUCCEEDED, FAILED
+    idempotency_key: Optional[str]
+    attempts: int
+    max_attempts: int
+    run_at: datetime
+    last_error: Optional[str]
+    created_at: datetime
+    finished_at: Optional[datetime] = None
@@ -0,0 +1,107 @@
+"""
+Double-entry ledger domain entities.
+
+Every movement of money is a journal whose lines sum to zero, so money is
+only ever moved between accounts, never created or lost. Positive amounts
+raise an account's balance and negative amounts lower it.
+"""
+from dataclasses import dataclass, field
+from typing import List, Optional
+from uuid import UUID, uuid4
+
+from app.domain.entities.payment import Transaction, TransactionType
+
+
+class LedgerAccount:
+    """Ledger account names. Per-owner accounts embed the owner's id."""
+    EXTERNAL = "external:gateway"  # Money that entered or left through the payment gateway
+    PLATFORM_FEES = "platform:fees"
+    ADJUSTMENTS = "platform:adjustments"
+    OPENING_BALANCES = "equity:opening"  # Counterpart of balances that predate the ledger
+    
+    @staticmethod
+    def wallet(user_id: UUID) -> str:
+        """A user's spendable balance."""
+        return f"wallet:{user_id}"
+    
+    @staticmethod
+    def pending(user_id: UUID) -> str:
+        """A user's withdrawals awaiting payout."""
+        return f"pending:{user_id}"
+    
+    @staticmethod
+    def escrow(match_id: UUID) -> str:
+        """Stakes held for a match."""
+        return f"escrow:{match_id}"
+
+
+class JournalType:
+    """Journal types that are not wallet transaction types."""
+    PLATFORM_FEE = "PLATFORM_FEE"
+    WITHDRAWAL_PAID = "WITHDRAWAL_PAID"
+    WITHDRAWAL_RETURNED = "WITHDRAWAL_RETURNED"
+    OPENING_BALANCE = "OPENING_BALANCE"
+
+
+@dataclass
+class JournalLine:
+    """One account's side of a journal."""
+    account: str
+    amount_cents: int
+
+
+@dataclass
+class Journal:
+    """A balanced set of ledger lines."""
+    journal_type: str
+    lines: List[JournalLine]
+    reference_id: Optional[UUID] = None
+    transaction_id: Optional[UUID] = None
+    id: UUID = field(default_factory=uuid4)
+    
+    @classmethod
+    def transfer(
+        cls,
+        journal_type: str,
+        source: str,
+        destination: str,
+        amount_cents: int,
+        reference_id: Optional[UUID] = None,
+        transaction_id: Optional[UUID] = None
+    ) -> "Journal":
+        """Move amount_cents from source to destination."""
+        return cls(
+            journal_type,
+            [JournalLine(source, -amount_cents), JournalLine(destination, amount_cents)],
+            reference_id=reference_id,
+            transaction_id=transaction_id
+        )
+    
+    def is_balanced(self) -> bool:
+        """True if the journal has lines and they sum to zero."""
+        return bool(self.lines) and sum(line.amount_cents for line in self.lines) == 0
+
+
+def counter_account(transaction: Transaction) -> str:
+    """The account on the other side of a wallet transaction."""
+    if transaction.transaction_type == TransactionType.WITHDRAWAL:
+        return LedgerAccount.pending(transaction.user_id)
+    if transaction.reference_type == "match" and transaction.reference_id:
+        return LedgerAccount.escrow(transaction.reference_id)
+    if transaction.transaction_type == TransactionType.DEPOSIT:
+        return LedgerAccount.EXTERNAL
+    if transaction.transaction_type == TransactionType.PLATFORM_FEE:
+        return LedgerAccount.PLATFORM_FEES
+    return LedgerAccount.ADJUSTMENTS
+
+
+def wallet_journal(transaction: Transaction) -> Journal:
+    """Journal for a completed change to a wallet's balance."""
+    return Journal.transfer(
+        transaction.transaction_type.value,
+        counter_account(transaction),
+        LedgerAccount.wallet(transaction.user_id),
+        transaction.amount_cents,
+        reference_id=transaction.reference_id,
+        transaction_id=transaction.id
+    )
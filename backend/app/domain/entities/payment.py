@@ -3,7 +3,7 @@ Payment domain entities.
 """
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, Optional
 from uuid import UUID
 from enum import Enum
 
@@ -72,6 +72,46 @@ class Transaction:
     created_at: datetime
 
 
+@dataclass
+class DepositSettlement:
+    """A succeeded payment intent to be credited to a wallet."""
+    payment_intent_id: str
+    user_id: UUID
+    amount_cents: int
+    idempotency_key: Optional[str] = None  # Key of the PENDING deposit created by initiate_deposit
+
+
+@dataclass
+class Payout:
+    """One gateway transfer covering a batch of withdrawals to the same destination."""
+    id: UUID
+    destination: str
+    amount_cents: int
+    currency: str
+    withdrawal_count: int
+    status: str  # PENDING, PAID, FAILED, REVIEW
+    attempts: int
+    transfer_id: Optional[str]
+    last_error: Optional[str]
+    lease_until: datetime
+    created_at: datetime
+    completed_at: Optional[datetime] = None
+
+
+@dataclass
+class WebhookEvent:
+    """Verified provider event held in the webhook inbox."""
+    id: str
+    provider: str
+    event_type: str
+    payload: Dict[str, Any]
+    status: str
+    attempts: int
+    received_at: datetime
+    processed_at: Optional[datetime] = None
+    last_error: Optional[str] = None
+
+
 @dataclass
 class EscrowAccount:
     """Escrow account domain entity."""
@@ -0,0 +1,23 @@
+"""
+Audit log repository interface.
+"""
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+
+class AuditRepository(ABC):
+    """Interface for the append-only audit log."""
+    
+    @abstractmethod
+    async def record(
+        self,
+        event_type: str,
+        action: str,
+        user_id: Optional[UUID] = None,
+        entity_type: Optional[str] = None,
+        entity_id: Optional[UUID] = None,
+        details: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """Append an audit log entry."""
+        pass
@@ -2,7 +2,7 @@
 Dispute repository interface.
 """
 from abc import ABC, abstractmethod
-from typing import Optional, List, Tuple
+from typing import Optional, List, Tuple, Dict
 from uuid import UUID
 
 from app.domain.entities.dispute import Dispute, DisputeEvidence, DisputeStatus
@@ -63,3 +63,11 @@ class DisputeRepository(ABC):
     async def get_evidence(self, dispute_id: UUID) -> List[DisputeEvidence]:
         """Get all evidence for a dispute."""
         pass
+    
+    @abstractmethod
+    async def get_evidence_for_disputes(
+        self,
+        dispute_ids: List[UUID]
+    ) -> Dict[UUID, List[DisputeEvidence]]:
+        """Get evidence for several disputes in one query, keyed by dispute ID."""
+        pass
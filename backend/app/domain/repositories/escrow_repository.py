@@ -31,3 +31,11 @@ class EscrowRepository(ABC):
     async def update_escrow(self, escrow: EscrowAccount) -> EscrowAccount:
         """Update escrow account."""
         pass
+    
+    @abstractmethod
+    async def release_escrow(self, match_id: UUID, winner_id: UUID) -> Optional[EscrowAccount]:
+        """
+        Mark a LOCKED escrow account as released to winner_id.
+        Returns None without changing anything if no LOCKED escrow exists for the match.
+        """
+        pass
@@ -0,0 +1,62 @@
+"""
+Job repository interface.
+"""
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from app.domain.entities.job import Job, JobRequest
+
+
+class JobRepository(ABC):
+    """Interface for the durable background job queue."""
+    
+    @abstractmethod
+    async def enqueue(
+        self,
+        job_type: str,
+        payload: Dict[str, Any],
+        idempotency_key: Optional[str] = None,
+        run_at: Optional[datetime] = None,
+        max_attempts: Optional[int] = None
+    ) -> bool:
+        """
+        Add a job in the current transaction, so it exists only if the
+        change that caused it commits.
+        
+        Returns False without changing anything if a job with the same
+        idempotency key was already enqueued.
+        """
+        pass
+    
+    @abstractmethod
+    async def enqueue_many(self, requests: List[JobRequest]) -> int:
+        """Add several jobs with one statement; returns how many were new."""
+        pass
+    
+    @abstractmethod
+    async def claim_jobs(self, limit: int) -> List[Job]:
+        """
+        Lock up to limit due pending jobs, oldest run_at first.
+        
+        Jobs locked by another worker are skipped. The lock lasts until the
+        claiming transaction ends, so a crashed worker's jobs become
+        available again automatically.
+        """
+        pass
+    
+    @abstractmethod
+    async def mark_succeeded(self, job_ids: List[UUID]) -> None:
+        """Mark claimed jobs as done."""
+        pass
+    
+    @abstractmethod
+    async def record_failure(self, job_id: UUID, error: str, retry_at: Optional[datetime]) -> None:
+        """Count a failed attempt; reschedule at retry_at, or mark FAILED when retry_at is None."""
+        pass
+    
+    @abstractmethod
+    async def count_by_status(self) -> Dict[str, int]:
+        """Number of jobs per status."""
+        pass
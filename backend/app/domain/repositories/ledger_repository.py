@@ -0,0 +1,39 @@
+"""
+Ledger repository interface.
+"""
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List
+
+from app.domain.entities.ledger import Journal
+
+
+class LedgerRepository(ABC):
+    """Interface for the append-only double-entry ledger."""
+    
+    @abstractmethod
+    async def post(self, journals: List[Journal]) -> None:
+        """
+        Record balanced journals as part of the current transaction.
+        
+        Lines are buffered and written with a single INSERT when the
+        transaction commits. Raises BusinessLogicError for an unbalanced journal.
+        """
+        pass
+    
+    @abstractmethod
+    async def get_balances(self, accounts: List[str]) -> Dict[str, int]:
+        """Get balances as latest snapshot plus the entries posted since."""
+        pass
+    
+    @abstractmethod
+    async def take_snapshots(self, settle_seconds: float) -> int:
+        """
+        Fold entries older than settle_seconds into the account snapshots.
+        Returns how many account snapshots were advanced.
+        """
+        pass
+    
+    @abstractmethod
+    async def get_summary(self) -> Dict[str, Any]:
+        """Snapshot progress and the balances of the platform's own accounts."""
+        pass
@@ -2,7 +2,7 @@
 Match repository interface.
 """
 from abc import ABC, abstractmethod
-from typing import Optional, List
+from typing import Optional, List, Dict, Tuple
 from uuid import UUID
 
 from app.domain.entities.match import Match, MatchParticipant, MatchResult
@@ -28,11 +28,31 @@ class MatchRepository(ABC):
         """Get match by ID."""
         pass
     
+    @abstractmethod
+    async def get_match_for_update(self, match_id: UUID) -> Optional[Match]:
+        """Get match by ID and lock its row until the transaction ends."""
+        pass
+    
     @abstractmethod
     async def update_match(self, match: Match) -> Match:
         """Update match."""
         pass
     
+    @abstractmethod
+    async def complete_match(
+        self,
+        match: Match,
+        game_winner_ids: List[UUID],
+        reported_by: UUID
+    ) -> Tuple[Match, List[MatchResult]]:
+        """
+        Persist a completed match and all of its game results in one flush.
+        
+        match carries the new status, winner and completed_at; game results
+        are numbered from 1 in the order given.
+        """
+        pass
+    
     @abstractmethod
     async def list_matches(
         self,
@@ -70,6 +90,14 @@ class MatchRepository(ABC):
         """Get all participants for a match."""
         pass
     
+    @abstractmethod
+    async def get_participants_for_matches(
+        self,
+        match_ids: List[UUID]
+    ) -> Dict[UUID, List[MatchParticipant]]:
+        """Get participants for several matches in one query, keyed by match ID."""
+        pass
+    
     @abstractmethod
     async def create_match_result(
         self,
@@ -0,0 +1,67 @@
+"""
+Payout repository interface.
+"""
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, Dict, List
+from uuid import UUID
+
+from app.domain.entities.payment import Payout
+
+
+class PayoutRepository(ABC):
+    """Interface for batching withdrawals into gateway payouts."""
+    
+    @abstractmethod
+    async def claim_payouts(self, limit: int, lease_seconds: float) -> List[Payout]:
+        """
+        Lease payouts for this worker to submit.
+        
+        Returns pending payouts whose lease ran out (retries, or a crashed
+        worker's batch) plus new payouts built from up to limit withdrawals
+        that are still unassigned, grouped per destination. Rows held by
+        other workers are skipped. Withdrawals without a destination are
+        failed and refunded.
+        """
+        pass
+    
+    @abstractmethod
+    async def mark_paid(self, transfers: Dict[UUID, str]) -> int:
+        """
+        Settle payouts the gateway accepted (payout id -> transfer id).
+        
+        Completes their withdrawals and moves the amounts from pending_cents
+        to total_withdrawn_cents. Returns the number of withdrawals settled.
+        """
+        pass
+    
+    @abstractmethod
+    async def mark_failed(self, errors: Dict[UUID, str]) -> int:
+        """
+        Fail payouts the gateway rejected (payout id -> reason).
+        
+        Fails their withdrawals and returns the amounts from pending_cents
+        to the balance. Returns the number of withdrawals refunded.
+        """
+        pass
+    
+    @abstractmethod
+    async def mark_for_review(self, errors: Dict[UUID, str]) -> int:
+        """
+        Park payouts whose transfer outcome is unknown (payout id -> last error).
+        
+        The gateway may have paid them, so nothing is refunded: withdrawals
+        stay PROCESSING with their amounts in pending_cents until someone
+        checks the transfer. Returns the number of payouts parked.
+        """
+        pass
+    
+    @abstractmethod
+    async def record_retry(self, payout_id: UUID, error: str, retry_at: datetime) -> None:
+        """Count a transient failure and hold the payout until retry_at."""
+        pass
+    
+    @abstractmethod
+    async def get_backlog(self) -> Dict[str, Any]:
+        """Unassigned withdrawals and payouts per status."""
+        pass
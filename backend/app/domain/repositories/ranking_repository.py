@@ -2,7 +2,7 @@
 Ranking repository interface.
 """
 from abc import ABC, abstractmethod
-from typing import Optional, List, Tuple
+from typing import Dict, Optional, List, Tuple
 from uuid import UUID
 
 
@@ -25,6 +25,25 @@ class RankingRepository(ABC):
         """Update user ranking after match."""
         pass
     
+    @abstractmethod
+    async def lock_rankings(self, user_ids: List[UUID]) -> Dict[UUID, dict]:
+        """
+        Get rankings for several users in one query, locking their rows until
+        the transaction ends. Keyed by user ID; users without a ranking are absent.
+        """
+        pass
+    
+    @abstractmethod
+    async def update_rankings_after_match(
+        self,
+        outcomes: List[Tuple[UUID, bool, int, int]]
+    ) -> Dict[UUID, dict]:
+        """
+        Apply (user_id, won, rating_change, new_rating) outcomes in one statement.
+        Keyed by user ID, with the same fields as update_ranking_after_match.
+        """
+        pass
+    
     @abstractmethod
     async def get_leaderboard(
         self,
@@ -33,3 +52,13 @@ class RankingRepository(ABC):
     ) -> Tuple[List[dict], Optional[str]]:
         """Get leaderboard."""
         pass
+    
+    @abstractmethod
+    async def get_user_rank(self, user_id: UUID) -> Optional[dict]:
+        """Get a user's global rank and percentile."""
+        pass
+    
+    @abstractmethod
+    async def get_players_around(self, user_id: UUID, radius: int) -> Optional[List[dict]]:
+        """Get the players ranked immediately above and below a user."""
+        pass
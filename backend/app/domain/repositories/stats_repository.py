@@ -0,0 +1,36 @@
+"""
+Platform statistics repository interface.
+"""
+from abc import ABC, abstractmethod
+from typing import Dict, Optional
+
+
+class StatsRepository(ABC):
+    """Interface for the shared dashboard counters."""
+    
+    @abstractmethod
+    async def add_to_counters(self, buckets: Dict[int, Dict[str, int]]) -> int:
+        """
+        Add deltas to the named counters, creating any that do not exist yet.
+        
+        Deltas come bucketed by the epoch second they were buffered in;
+        buckets older than the last reconcile are already in its recount and
+        are dropped. Returns how many buckets were dropped.
+        """
+        pass
+    
+    @abstractmethod
+    async def get_counters(self) -> Dict[str, int]:
+        """Get every counter by name."""
+        pass
+    
+    @abstractmethod
+    async def reconcile_counters(self, min_interval_seconds: float) -> Optional[Dict[str, int]]:
+        """
+        Recount every counter from the source tables and overwrite it.
+        
+        Does nothing and returns None if another process is reconciling or
+        the last reconcile is younger than min_interval_seconds; otherwise
+        returns the drift found (exact minus stored) for counters that were off.
+        """
+        pass
@@ -3,7 +3,8 @@ User repository interface.
 Defines the contract for user data access, independent of implementation.
 """
 from abc import ABC, abstractmethod
-from typing import Optional, List
+from datetime import datetime
+from typing import Dict, Optional, List, Tuple
 from uuid import UUID
 
 from app.domain.entities.user import User, PlayerProfile
@@ -33,16 +34,56 @@ class UserRepository(ABC):
         """Get user by email."""
         pass
     
+    @abstractmethod
+    async def get_login_account(
+        self,
+        email: str
+    ) -> Optional[Tuple[User, Optional[PlayerProfile], str]]:
+        """
+        Get everything a login needs in one query.
+        
+        Returns:
+            Tuple of (user, profile, password_hash), or None if no such user
+        """
+        pass
+    
     @abstractmethod
     async def get_user_by_username(self, username: str) -> Optional[User]:
         """Get user by username."""
         pass
     
+    @abstractmethod
+    async def has_role(self, user_id: UUID, role_name: str) -> bool:
+        """Check whether the user currently holds a role (revoked grants do not count)."""
+        pass
+    
     @abstractmethod
     async def update_user(self, user: User) -> User:
         """Update user."""
         pass
     
+    @abstractmethod
+    async def record_last_logins(self, logins: Dict[UUID, datetime]) -> int:
+        """Set last_login_at for many users, never moving it backwards; returns rows updated."""
+        pass
+    
+    @abstractmethod
+    async def search_users(
+        self,
+        query: Optional[str] = None,
+        account_status: Optional[str] = None,
+        deleted: Optional[bool] = False,
+        limit: int = 20,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Tuple[User, Optional[PlayerProfile]]], Optional[str]]:
+        """
+        Search users by partial email or username, newest first.
+        
+        deleted=False keeps live accounts, True only soft-deleted ones and
+        None both. Returns (user, profile) pairs and the next page cursor.
+        """
+        pass
+    
     @abstractmethod
     async def get_profile_by_user_id(self, user_id: UUID) -> Optional[PlayerProfile]:
         """Get player profile by user ID."""
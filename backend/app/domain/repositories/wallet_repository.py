@@ -2,10 +2,17 @@
 Wallet repository interface.
 """
 from abc import ABC, abstractmethod
-from typing import Optional, List, Tuple
+from typing import Any, AsyncIterator, Dict, Optional, List, Tuple
 from uuid import UUID
+from datetime import datetime
 
-from app.domain.entities.payment import Wallet, Transaction, TransactionType, TransactionStatus
+from app.domain.entities.payment import (
+    Wallet,
+    Transaction,
+    TransactionType,
+    TransactionStatus,
+    DepositSettlement
+)
 
 
 class WalletRepository(ABC):
@@ -38,11 +45,62 @@ class WalletRepository(ABC):
         idempotency_key: Optional[str] = None,
         reference_id: Optional[UUID] = None,
         reference_type: Optional[str] = None,
-        description: Optional[str] = None
+        description: Optional[str] = None,
+        extra_data: Optional[Dict[str, Any]] = None
     ) -> Transaction:
         """Create a transaction."""
         pass
     
+    @abstractmethod
+    async def apply_balance_change(
+        self,
+        user_id: UUID,
+        amount_cents: int,
+        transaction_type: TransactionType,
+        idempotency_key: Optional[str] = None,
+        reference_id: Optional[UUID] = None,
+        reference_type: Optional[str] = None,
+        description: Optional[str] = None
+    ) -> Optional[Transaction]:
+        """
+        Atomically add amount_cents (negative for debits) to the wallet balance
+        and record a completed transaction.
+        
+        Returns None without changing anything if the wallet does not exist,
+        the balance would go negative, or the idempotency key is already used.
+        """
+        pass
+    
+    @abstractmethod
+    async def reserve_withdrawal(
+        self,
+        user_id: UUID,
+        amount_cents: int,
+        idempotency_key: str,
+        description: Optional[str] = None,
+        extra_data: Optional[Dict[str, Any]] = None
+    ) -> Optional[Transaction]:
+        """
+        Atomically move amount_cents from the wallet balance to pending and
+        record a PROCESSING withdrawal.
+        
+        Returns None without changing anything under the same conditions as
+        apply_balance_change.
+        """
+        pass
+    
+    @abstractmethod
+    async def settle_deposits(self, settlements: List[DepositSettlement]) -> List[Transaction]:
+        """
+        Credit a batch of succeeded payment intents to their wallets.
+        
+        Completes the matching PENDING deposits (or records new completed
+        ones) and raises wallet balances. Intents that were already settled
+        are returned unchanged and never credited twice. Returns one
+        transaction per distinct intent whose user has a wallet.
+        """
+        pass
+    
     @abstractmethod
     async def get_transaction_by_id(self, transaction_id: UUID) -> Optional[Transaction]:
         """Get transaction by ID."""
@@ -64,6 +122,23 @@ class WalletRepository(ABC):
         """Get user's transaction history."""
         pass
     
+    @abstractmethod
+    async def stream_transactions(
+        self,
+        user_id: Optional[UUID] = None,
+        transaction_types: Optional[List[TransactionType]] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+        batch_size: int = 1000
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Stream transactions oldest first, in batches of plain rows.
+        
+        Filters by owner (all users when None), type and the half-open
+        created_at range [created_from, created_to).
+        """
+        pass
+    
     @abstractmethod
     async def update_transaction_status(
         self,
@@ -0,0 +1,52 @@
+"""
+Webhook inbox repository interface.
+"""
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+
+from app.domain.entities.payment import WebhookEvent
+
+
+class WebhookRepository(ABC):
+    """Interface for the durable webhook inbox."""
+    
+    @abstractmethod
+    async def record_event(
+        self,
+        event_id: str,
+        event_type: str,
+        payload: Dict[str, Any],
+        provider: str = "stripe"
+    ) -> bool:
+        """
+        Store a verified event.
+        
+        Returns False without changing anything if the event id was already
+        received (provider redelivery).
+        """
+        pass
+    
+    @abstractmethod
+    async def claim_events(self, limit: int, event_ids: Optional[List[str]] = None) -> List[WebhookEvent]:
+        """
+        Lock up to limit unprocessed events, oldest first (optionally only event_ids).
+        
+        Rows locked by another worker are skipped, so concurrent drainers
+        never receive the same event.
+        """
+        pass
+    
+    @abstractmethod
+    async def mark_events(self, event_ids: List[str], status: str, error: Optional[str] = None) -> None:
+        """Set the final status of claimed events."""
+        pass
+    
+    @abstractmethod
+    async def record_failure(self, event_id: str, error: str, max_attempts: int) -> None:
+        """Count a failed attempt; the event is marked FAILED once max_attempts is reached."""
+        pass
+    
+    @abstractmethod
+    async def count_by_status(self) -> Dict[str, int]:
+        """Number of inbox events per status."""
+        pass
@@ -3,14 +3,24 @@ Authentication service.
 Handles user registration, login, and token management.
 """
 from typing import Optional, Tuple
-from datetime import datetime, timedelta
+from datetime import datetime
 from uuid import UUID
+from jose import JWTError
 
 from app.domain.entities.user import User, PlayerProfile
 from app.domain.repositories.user_repository import UserRepository
+from app.infrastructure.login_attempts import LoginAttemptTracker, login_attempts as default_login_attempts
+from app.infrastructure.last_logins import LastLoginBuffer, last_logins as default_last_logins
+from app.infrastructure.refresh_tokens import (
+    CONSUMED,
+    RefreshTokenStore,
+    RefreshTokenStoreUnavailable,
+    refresh_token_ids,
+    refresh_tokens as default_refresh_tokens
+)
 from app.core.security import (
-    hash_password,
-    verify_password,
+    hash_password_async,
+    verify_password_async,
     create_access_token,
     create_refresh_token,
     verify_token
@@ -20,15 +30,25 @@ from app.core.exceptions import (
     AuthenticationError,
     ValidationError,
     ConflictError,
-    BusinessLogicError
+    BusinessLogicError,
+    ServiceUnavailableError
 )
 
 
 class AuthService:
     """Authentication service."""
     
-    def __init__(self, user_repository: UserRepository):
+    def __init__(
+        self,
+        user_repository: UserRepository,
+        login_attempts: Optional[LoginAttemptTracker] = None,
+        last_login_buffer: Optional[LastLoginBuffer] = None,
+        refresh_token_store: Optional[RefreshTokenStore] = None
+    ):
         self.user_repository = user_repository
+        self.login_attempts = login_attempts or default_login_attempts
+        self.last_logins = last_login_buffer or default_last_logins
+        self.refresh_tokens = refresh_token_store or default_refresh_tokens
     
     async def register(
         self,
@@ -68,7 +88,7 @@ class AuthService:
             raise ConflictError("Username already taken", code="DUPLICATE_USERNAME")
         
         # Hash password
-        password_hash = hash_password(password)
+        password_hash = await hash_password_async(password)
         
         # Create user and profile
         user, profile = await self.user_repository.create_user(
@@ -98,14 +118,16 @@ class AuthService:
         Returns:
             Tuple of (user, profile, access_token, refresh_token)
         """
-        # Get user by email
-        user = await self.user_repository.get_user_by_email(email)
+        # Get user, profile and password hash in one round trip
+        account = await self.user_repository.get_login_account(email)
         
-        if not user:
+        if not account:
             raise AuthenticationError("Invalid email or password")
+        user, profile, password_hash = account
         
-        # Check if account is locked
-        if user.is_locked():
+        # Check if account is locked, by an admin or after too many failures
+        failures, locked_for = await self.login_attempts.check(user.id)
+        if user.is_locked() or locked_for:
             raise BusinessLogicError(
                 "Account is locked. Please try again later.",
                 code="ACCOUNT_LOCKED"
@@ -115,39 +137,26 @@ class AuthService:
         if not user.is_active():
             raise AuthenticationError("Account is not active")
         
-        # Get user model to access password_hash
-        # Note: In production, we'd need to get the model or store hash in domain
-        # For now, we'll need to modify repository to return password_hash
-        # This is a design decision - we can either:
-        # 1. Include password_hash in domain entity (less secure)
-        # 2. Add a method to verify password in repository (better)
-        # Let's go with option 2
-        
         # Verify password
-        password_valid = await self.user_repository.verify_password(user.id, password)
+        password_valid = await verify_password_async(password, password_hash)
         
         if not password_valid:
-            # Increment failed login attempts
-            user.failed_login_attempts += 1
-            
-            # Lock account after 5 failed attempts
-            if user.failed_login_attempts >= 5:
-                user.locked_until = datetime.utcnow() + timedelta(minutes=30)
-            
-            await self.user_repository.update_user(user)
+            # Counted outside the database: nothing here touches the users row,
+            # and the count survives the request's rollback
+            await self.login_attempts.record_failure(user.id)
             raise AuthenticationError("Invalid email or password")
         
         # Reset failed attempts on successful login
-        user.failed_login_attempts = 0
-        user.locked_until = None
-        user.last_login_at = datetime.utcnow()
-        await self.user_repository.update_user(user)
+        if failures:
+            await self.login_attempts.reset(user.id)
         
-        # Get profile
-        profile = await self.user_repository.get_profile_by_user_id(user.id)
         if not profile:
             raise BusinessLogicError("User profile not found", code="PROFILE_NOT_FOUND")
         
+        # last_login_at is written by the last-login worker, coalesced per user
+        user.last_login_at = datetime.utcnow()
+        self.last_logins.record(user.id, user.last_login_at)
+        
         # Generate tokens
         access_token = create_access_token({
             "sub": str(user.id),
@@ -165,11 +174,19 @@ class AuthService:
         """
         Refresh access token using refresh token.
         Returns new access_token and new refresh_token (rotated).
+        The presented refresh token is consumed; presenting it again
+        revokes every token of its login.
         """
         try:
             payload = verify_token(refresh_token, token_type="refresh")
             user_id = UUID(payload["sub"])
             
+            # Consume the token before anything else so a replay cannot race it
+            jti, family = refresh_token_ids(refresh_token, payload)
+            status = await self.refresh_tokens.rotate(jti, family, payload["exp"])
+            if status != CONSUMED:
+                raise AuthenticationError(f"Invalid refresh token: token {status}")
+            
             # Get user to verify it still exists and is active
             user = await self.user_repository.get_user_by_id(user_id)
             if not user or not user.is_active():
@@ -183,10 +200,37 @@ class AuthService:
             })
             
             new_refresh_token = create_refresh_token({
-                "sub": str(user.id)
+                "sub": str(user.id),
+                "fam": family
             })
             
             return access_token, new_refresh_token
-            
+        
+        except AuthenticationError:
+            raise
+        except RefreshTokenStoreUnavailable:
+            # Fail closed: the token may already be used or revoked on another worker
+            raise AuthenticationError("Refresh is temporarily unavailable")
         except Exception as e:
             raise AuthenticationError(f"Invalid refresh token: {str(e)}")
+    
+    async def logout(self, refresh_token: str) -> None:
+        """
+        Revoke the refresh token and every other token from the same login.
+        Invalid or expired tokens are ignored: they cannot be used anyway.
+        ServiceUnavailableError is raised if the revocation was not stored,
+        so the client knows the session is still live and can retry.
+        """
+        try:
+            payload = verify_token(refresh_token, token_type="refresh")
+        except JWTError:
+            return
+        
+        _, family = refresh_token_ids(refresh_token, payload)
+        try:
+            await self.refresh_tokens.revoke_family(family)
+        except RefreshTokenStoreUnavailable:
+            raise ServiceUnavailableError(
+                "Logout is temporarily unavailable; please retry",
+                code="LOGOUT_UNAVAILABLE"
+            )
@@ -86,20 +86,17 @@ class EscrowService:
         Returns:
             Tuple of (updated_escrow, transactions)
         """
-        escrow = await self.escrow_repository.get_escrow_by_match_id(match_id)
+        # Flip the escrow first; the conditional update doubles as the state check
+        escrow = await self.escrow_repository.release_escrow(match_id, winner_id)
         if not escrow:
-            raise NotFoundError("Escrow", str(match_id))
-        
-        if not escrow.can_be_released():
+            current = await self.escrow_repository.get_escrow_by_match_id(match_id)
+            if not current:
+                raise NotFoundError("Escrow", str(match_id))
             raise BusinessLogicError(
-                f"Escrow cannot be released. Current status: {escrow.status}",
+                f"Escrow cannot be released. Current status: {current.status}",
                 code="INVALID_ESCROW_STATE"
             )
         
-        # Get participants to determine who is player1/player2
-        # For now, we'll use the escrow amounts to determine
-        # In production, we'd query match participants
-        
         # Release total pot to winner
         idempotency_key = f"escrow_release_{match_id}_{winner_id}"
         transaction = await self.wallet_service.credit_wallet(
@@ -112,14 +109,7 @@ class EscrowService:
             description=f"Match win payout: ${escrow.total_amount_cents / 100:.2f}"
         )
         
-        # Update escrow
-        escrow.status = "RELEASED"
-        escrow.released_at = datetime.utcnow()
-        escrow.released_to = winner_id
-        
-        updated_escrow = await self.escrow_repository.update_escrow(escrow)
-        
-        return updated_escrow, [transaction]
+        return escrow, [transaction]
     
     async def refund_match(
         self,
@@ -6,7 +6,9 @@ from typing import Optional, List, Tuple
 from datetime import datetime
 from uuid import UUID
 
+from app.domain.entities.job import JobRequest, JobType
 from app.domain.entities.match import Match, MatchResult
+from app.domain.repositories.job_repository import JobRepository
 from app.domain.repositories.match_repository import MatchRepository
 from app.domain.repositories.user_repository import UserRepository
 from app.domain.repositories.ranking_repository import RankingRepository
@@ -29,12 +31,14 @@ class MatchService:
         match_repository: MatchRepository,
         user_repository: UserRepository,
         ranking_repository: Optional[RankingRepository] = None,
-        escrow_service: Optional[EscrowService] = None
+        escrow_service: Optional[EscrowService] = None,
+        job_repository: Optional[JobRepository] = None
     ):
         self.match_repository = match_repository
         self.user_repository = user_repository
         self.ranking_repository = ranking_repository
         self.escrow_service = escrow_service
+        self.job_repository = job_repository
     
     async def create_match(
         self,
@@ -186,8 +190,13 @@ class MatchService:
         - Winner is a participant
         - Game results match best_of count
         - Winner won majority of games
+        
+        The match row is locked first, so concurrent reports serialize and
+        only one can complete it. Results, ratings and the escrow release are
+        written in the caller's transaction with a fixed number of statements
+        whatever best_of is; audit and notifications go to the job queue.
         """
-        match = await self.match_repository.get_match_by_id(match_id)
+        match = await self.match_repository.get_match_for_update(match_id)
         if not match:
             raise NotFoundError("Match", str(match_id))
         
@@ -210,8 +219,7 @@ class MatchService:
                 field="game_results"
             )
         
-        # Create match results
-        results = []
+        game_winner_ids = []
         winner_wins = 0
         
         for i, game_result in enumerate(game_results, start=1):
@@ -223,13 +231,7 @@ class MatchService:
                     field="game_results"
                 )
             
-            result = await self.match_repository.create_match_result(
-                match_id=match_id,
-                game_number=i,
-                winner_id=game_winner_id,
-                reported_by=reported_by
-            )
-            results.append(result)
+            game_winner_ids.append(game_winner_id)
             
             if game_winner_id == winner_id:
                 winner_wins += 1
@@ -242,24 +244,25 @@ class MatchService:
                 field="game_results"
             )
         
-        # Update match
+        # Update match and insert all game results together
         match.winner_id = winner_id
         match.status = "COMPLETED"
         match.completed_at = datetime.utcnow()
         
-        updated_match = await self.match_repository.update_match(match)
+        updated_match, results = await self.match_repository.complete_match(
+            match,
+            game_winner_ids,
+            reported_by
+        )
         
-        # Get participants for ranking and escrow
-        participants = await self.match_repository.get_participants(match_id)
+        # An in-progress match always has both players set
+        player_ids = [match.created_by, match.accepted_by]
         
-        # Update rankings if ranking repository is available
-        if self.ranking_repository and len(participants) == 2:
+        if self.ranking_repository:
             ranking_service = RankingService(self.ranking_repository, self.user_repository)
-            player1_id = participants[0].user_id
-            player2_id = participants[1].user_id
             await ranking_service.update_rankings_after_match(
-                player1_id,
-                player2_id,
+                player_ids[0],
+                player_ids[1],
                 winner_id
             )
         
@@ -267,8 +270,52 @@ class MatchService:
         if self.escrow_service:
             await self.escrow_service.release_to_winner(match_id, winner_id)
         
+        if self.job_repository:
+            # Audit and notifications run on the job queue once the match commits
+            await self._enqueue_completion_jobs(updated_match, player_ids, reported_by)
+        
         return updated_match, results
     
+    async def _enqueue_completion_jobs(
+        self,
+        match: Match,
+        player_ids: List[UUID],
+        reported_by: UUID
+    ) -> None:
+        """Enqueue the follow-ups of a completed match in one insert, keyed by match so they run once."""
+        key = f"match:{match.id}"
+        winner_id = str(match.winner_id)
+        requests = [
+            JobRequest(
+                JobType.AUDIT,
+                {
+                    "event_type": "MATCH_COMPLETE",
+                    "action": "match.complete",
+                    "user_id": str(reported_by),
+                    "entity_type": "match",
+                    "entity_id": str(match.id),
+                    "details": {"winner_id": winner_id, "best_of": match.best_of}
+                },
+                idempotency_key=f"{key}:audit"
+            )
+        ]
+        
+        for user_id in player_ids:
+            requests.append(JobRequest(
+                JobType.NOTIFY,
+                {
+                    "user_id": str(user_id),
+                    "kind": "match_completed",
+                    "data": {
+                        "match_id": str(match.id),
+                        "won": str(user_id) == winner_id
+                    }
+                },
+                idempotency_key=f"{key}:notify:{user_id}"
+            ))
+        
+        await self.job_repository.enqueue_many(requests)
+    
     async def cancel_match(
         self,
         match_id: UUID,
@@ -9,6 +9,9 @@ from app.domain.repositories.user_repository import UserRepository
 from app.domain.repositories.ranking_repository import RankingRepository
 from app.core.exceptions import NotFoundError, BusinessLogicError
 
+# Lowest rating a player can drop to (rankings_rating_check enforces it too)
+MIN_RATING = 0
+
 
 class RankingService:
     """Ranking service for ELO calculations."""
@@ -38,7 +41,7 @@ class RankingService:
             k_factor: K-factor for rating adjustment (default 32)
         
         Returns:
-            Tuple of (new_player1_rating, new_player2_rating)
+            Tuple of (new_player1_rating, new_player2_rating), never below MIN_RATING
         """
         # Expected scores using ELO formula
         expected1 = 1 / (1 + 10 ** ((player2_rating - player1_rating) / 400))
@@ -53,7 +56,10 @@ class RankingService:
         new_rating2 = player2_rating + k_factor * (actual2 - expected2)
         
         # Round to integers
-        return (int(round(new_rating1)), int(round(new_rating2)))
+        return (
+            max(int(round(new_rating1)), MIN_RATING),
+            max(int(round(new_rating2)), MIN_RATING)
+        )
     
     async def update_rankings_after_match(
         self,
@@ -64,12 +70,16 @@ class RankingService:
         """
         Update player rankings after match completion.
         
+        Both ranking rows are locked by one query and updated by one
+        statement, so concurrent results for the same player apply in turn.
+        
         Returns:
             Tuple of (player1_updates, player2_updates) with rating changes
         """
-        # Get current rankings
-        ranking1 = await self.ranking_repository.get_ranking_by_user_id(player1_id)
-        ranking2 = await self.ranking_repository.get_ranking_by_user_id(player2_id)
+        # Get and lock both rankings in one query
+        rankings = await self.ranking_repository.lock_rankings([player1_id, player2_id])
+        ranking1 = rankings.get(player1_id)
+        ranking2 = rankings.get(player2_id)
         
         if not ranking1 or not ranking2:
             raise NotFoundError("Ranking", f"User {player1_id} or {player2_id}")
@@ -88,32 +98,23 @@ class RankingService:
         rating_change1 = new_rating1 - player1_rating
         rating_change2 = new_rating2 - player2_rating
         
-        # Update rankings in database
-        update1 = await self.ranking_repository.update_ranking_after_match(
-            player1_id,
-            player1_won,
-            rating_change1,
-            new_rating1
-        )
-        
-        update2 = await self.ranking_repository.update_ranking_after_match(
-            player2_id,
-            not player1_won,
-            rating_change2,
-            new_rating2
-        )
+        # Update both rankings in one statement
+        updates = await self.ranking_repository.update_rankings_after_match([
+            (player1_id, player1_won, rating_change1, new_rating1),
+            (player2_id, not player1_won, rating_change2, new_rating2)
+        ])
         
         return (
             {
                 "rating_before": player1_rating,
                 "rating_after": new_rating1,
                 "rating_change": rating_change1,
-                **update1
+                **updates[player1_id]
             },
             {
                 "rating_before": player2_rating,
                 "rating_after": new_rating2,
                 "rating_change": rating_change2,
-                **update2
+                **updates[player2_id]
             }
         )
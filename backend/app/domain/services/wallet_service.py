@@ -2,11 +2,16 @@
 Wallet service.
 Handles wallet operations, deposits, withdrawals, and balance management.
 """
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 from uuid import UUID, uuid4
 from datetime import datetime
 
-from app.domain.entities.payment import Wallet, Transaction, TransactionType, TransactionStatus
+from app.domain.entities.payment import (
+    Wallet,
+    Transaction,
+    TransactionType,
+    DepositSettlement
+)
 from app.domain.repositories.wallet_repository import WalletRepository
 from app.infrastructure.external.payment_gateway import PaymentGateway, get_payment_gateway
 from app.core.exceptions import (
@@ -76,7 +81,8 @@ class WalletService:
             metadata={
                 "user_id": str(user_id),
                 "idempotency_key": idempotency_key
-            }
+            },
+            idempotency_key=idempotency_key
         )
         
         # Create pending transaction
@@ -99,8 +105,8 @@ class WalletService:
         user_id: UUID
     ) -> Transaction:
         """
-        Confirm a deposit after payment intent succeeds.
-        Called from webhook handler.
+        Confirm a single deposit after its payment intent succeeds.
+        Webhook events take the batched path through confirm_deposits.
         """
         # Get payment intent status
         payment_intent = await self.payment_gateway.confirm_payment_intent(payment_intent_id)
@@ -108,43 +114,25 @@ class WalletService:
         if payment_intent["status"] != "succeeded":
             raise PaymentError(f"Payment intent not succeeded: {payment_intent['status']}")
         
-        amount_cents = payment_intent["amount_cents"]
-        
-        # Find transaction by external_id
-        # For now, we'll need to add a method to find by external_id
-        # Or store payment_intent_id in transaction metadata
-        
-        # Get wallet
-        wallet = await self.get_wallet(user_id)
-        
-        # Update wallet balance
-        wallet.balance_cents += amount_cents
-        wallet.total_deposited_cents += amount_cents
-        
-        updated_wallet = await self.wallet_repository.update_wallet(wallet)
-        
-        # Create completed transaction
-        transaction = await self.wallet_repository.create_transaction(
-            user_id=user_id,
-            wallet_id=wallet.id,
-            transaction_type=TransactionType.DEPOSIT,
-            amount_cents=amount_cents,
-            balance_before_cents=wallet.balance_cents - amount_cents,
-            balance_after_cents=updated_wallet.balance_cents,
-            reference_id=None,
-            reference_type="payment",
-            external_id=payment_intent_id,
-            description=f"Deposit confirmed: ${amount_cents / 100:.2f}"
-        )
-        
-        # Update transaction status
-        await self.wallet_repository.update_transaction_status(
-            transaction.id,
-            TransactionStatus.COMPLETED,
-            external_id=payment_intent_id
-        )
+        settled = await self.confirm_deposits([
+            DepositSettlement(
+                payment_intent_id=payment_intent_id,
+                user_id=user_id,
+                amount_cents=payment_intent["amount_cents"],
+                idempotency_key=payment_intent.get("metadata", {}).get("idempotency_key")
+            )
+        ])
+        if not settled:
+            raise NotFoundError("Wallet", str(user_id))
         
-        return transaction
+        return settled[0]
+    
+    async def confirm_deposits(self, settlements: List[DepositSettlement]) -> List[Transaction]:
+        """
+        Credit a batch of succeeded payment intents.
+        Safe to replay: intents that were already settled are not credited again.
+        """
+        return await self.wallet_repository.settle_deposits(settlements)
     
     async def debit_wallet(
         self,
@@ -158,49 +146,22 @@ class WalletService:
     ) -> Transaction:
         """
         Debit wallet (for match entry, etc.).
-        Transaction-safe operation.
+        Transaction-safe operation: the balance check, debit and ledger insert
+        happen in a single statement.
         """
-        wallet = await self.get_wallet(user_id)
-        
-        if not wallet.has_sufficient_balance(amount_cents):
-            raise PaymentError(
-                f"Insufficient balance. Required: ${amount_cents / 100:.2f}, Available: ${wallet.balance_cents / 100:.2f}",
-                code="INSUFFICIENT_BALANCE"
-            )
-        
-        # Check idempotency if provided
-        if idempotency_key:
-            existing = await self.wallet_repository.get_transaction_by_idempotency_key(idempotency_key)
-            if existing:
-                return existing
-        
-        # Update wallet
-        balance_before = wallet.balance_cents
-        wallet.balance_cents -= amount_cents
-        
-        updated_wallet = await self.wallet_repository.update_wallet(wallet)
-        
-        # Create transaction
-        transaction = await self.wallet_repository.create_transaction(
+        transaction = await self.wallet_repository.apply_balance_change(
             user_id=user_id,
-            wallet_id=wallet.id,
-            transaction_type=transaction_type,
             amount_cents=-amount_cents,  # Negative for debit
-            balance_before_cents=balance_before,
-            balance_after_cents=updated_wallet.balance_cents,
+            transaction_type=transaction_type,
             idempotency_key=idempotency_key,
             reference_id=reference_id,
             reference_type=reference_type,
             description=description
         )
+        if transaction:
+            return transaction
         
-        # Mark as completed immediately (internal transaction)
-        await self.wallet_repository.update_transaction_status(
-            transaction.id,
-            TransactionStatus.COMPLETED
-        )
-        
-        return transaction
+        return await self._resolve_rejected_change(user_id, amount_cents, idempotency_key)
     
     async def credit_wallet(
         self,
@@ -214,100 +175,78 @@ class WalletService:
     ) -> Transaction:
         """
         Credit wallet (for match win, refund, etc.).
-        Transaction-safe operation.
+        Transaction-safe operation: the credit and ledger insert happen in a
+        single statement.
         """
-        wallet = await self.get_wallet(user_id)
-        
-        # Check idempotency if provided
-        if idempotency_key:
-            existing = await self.wallet_repository.get_transaction_by_idempotency_key(idempotency_key)
-            if existing:
-                return existing
-        
-        # Update wallet
-        balance_before = wallet.balance_cents
-        wallet.balance_cents += amount_cents
-        
-        if transaction_type == TransactionType.MATCH_WIN:
-            # Track earnings (for ranking)
-            pass  # Will be handled in ranking update
-        
-        updated_wallet = await self.wallet_repository.update_wallet(wallet)
-        
-        # Create transaction
-        transaction = await self.wallet_repository.create_transaction(
+        transaction = await self.wallet_repository.apply_balance_change(
             user_id=user_id,
-            wallet_id=wallet.id,
-            transaction_type=transaction_type,
             amount_cents=amount_cents,  # Positive for credit
-            balance_before_cents=balance_before,
-            balance_after_cents=updated_wallet.balance_cents,
+            transaction_type=transaction_type,
             idempotency_key=idempotency_key,
             reference_id=reference_id,
             reference_type=reference_type,
             description=description
         )
+        if transaction:
+            return transaction
         
-        # Mark as completed immediately
-        await self.wallet_repository.update_transaction_status(
-            transaction.id,
-            TransactionStatus.COMPLETED
-        )
-        
-        return transaction
+        return await self._resolve_rejected_change(user_id, 0, idempotency_key)
     
-    async def request_withdrawal(
+    async def _resolve_rejected_change(
         self,
         user_id: UUID,
-        amount_cents: int,
-        idempotency_key: str
+        required_cents: int,
+        idempotency_key: Optional[str]
     ) -> Transaction:
         """
-        Request a withdrawal.
-        Funds are moved to pending, actual transfer happens asynchronously.
+        Work out why an atomic balance change was rejected.
+        Only runs on the slow path, so the common case stays one round trip.
         """
-        # Validate amount
-        if amount_cents < 100:
-            raise ValidationError("Minimum withdrawal is $1.00", field="amount_cents")
-        
-        # Check idempotency
-        existing = await self.wallet_repository.get_transaction_by_idempotency_key(idempotency_key)
-        if existing:
-            raise ConflictError("Duplicate idempotency key", code="IDEMPOTENCY_CONFLICT")
+        # Replayed request: return the original transaction
+        if idempotency_key:
+            existing = await self.wallet_repository.get_transaction_by_idempotency_key(idempotency_key)
+            if existing:
+                return existing
         
         wallet = await self.get_wallet(user_id)
         
-        if not wallet.has_sufficient_balance(amount_cents):
+        if required_cents and not wallet.has_sufficient_balance(required_cents):
             raise PaymentError(
-                f"Insufficient balance. Required: ${amount_cents / 100:.2f}, Available: ${wallet.balance_cents / 100:.2f}",
+                f"Insufficient balance. Required: ${required_cents / 100:.2f}, Available: ${wallet.balance_cents / 100:.2f}",
                 code="INSUFFICIENT_BALANCE"
             )
         
-        # Move to pending
-        balance_before = wallet.balance_cents
-        wallet.balance_cents -= amount_cents
-        wallet.pending_cents += amount_cents
-        
-        updated_wallet = await self.wallet_repository.update_wallet(wallet)
+        raise ConflictError("Wallet changed concurrently, please retry", code="WALLET_CONFLICT")
+    
+    async def request_withdrawal(
+        self,
+        user_id: UUID,
+        amount_cents: int,
+        idempotency_key: str,
+        destination_account: str
+    ) -> Transaction:
+        """
+        Request a withdrawal.
+        Funds are moved to pending; the payout worker transfers them to
+        destination_account and settles the wallet.
+        """
+        # Validate amount
+        if amount_cents < 100:
+            raise ValidationError("Minimum withdrawal is $1.00", field="amount_cents")
         
-        # Create transaction
-        transaction = await self.wallet_repository.create_transaction(
+        # Move to pending in one statement; PROCESSING withdrawals are
+        # picked up by the payout worker
+        transaction = await self.wallet_repository.reserve_withdrawal(
             user_id=user_id,
-            wallet_id=wallet.id,
-            transaction_type=TransactionType.WITHDRAWAL,
-            amount_cents=-amount_cents,
-            balance_before_cents=balance_before,
-            balance_after_cents=updated_wallet.balance_cents,
+            amount_cents=amount_cents,
             idempotency_key=idempotency_key,
-            description=f"Withdrawal request: ${amount_cents / 100:.2f}"
+            description=f"Withdrawal request: ${amount_cents / 100:.2f}",
+            extra_data={"destination": destination_account}
         )
+        if transaction:
+            return transaction
         
-        # TODO: Process withdrawal asynchronously (background job)
-        # For MVP, we'll mark as processing
-        
-        await self.wallet_repository.update_transaction_status(
-            transaction.id,
-            TransactionStatus.PROCESSING
-        )
-        
-        return transaction
+        # Rejected: the balance is short, or the idempotency key is taken
+        await self._resolve_rejected_change(user_id, amount_cents, idempotency_key)
+        raise ConflictError("Duplicate idempotency key", code="IDEMPOTENCY_CONFLICT")
+    
@@ -0,0 +1,388 @@
+"""
+Read-through cache with TTL and event-driven invalidation.
+Values are JSON documents stored under "<prefix>:<namespace>:<key>".
+Every key written to a namespace is tracked in a per-namespace set so a
+whole namespace (e.g. all cached leaderboard pages) can be dropped at
+once when the underlying data changes.
+
+Backends:
+    RedisBackend   shared across workers; degrades to an in-process
+                   MemoryBackend while Redis is unreachable
+    MemoryBackend  per-process fallback (CACHE_BACKEND=memory)
+    FakeRedis      in-memory stand-in for the redis.asyncio client, for
+                   exercising RedisBackend without a server
+"""
+import asyncio
+import fnmatch
+import json
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+import redis.asyncio as redis_asyncio
+from redis.exceptions import RedisError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.infrastructure.database.session import on_commit
+
+logger = logging.getLogger(__name__)
+
+# TTLs for the cached read paths
+LEADERBOARD_TTL_SECONDS = 15
+LOBBY_TTL_SECONDS = 5
+PROFILE_TTL_SECONDS = 60
+
+
+class CacheBackend(ABC):
+    """Interface for cache storage."""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[str]:
+        """Get a value, or None if missing or expired."""
+        pass
+
+    @abstractmethod
+    async def set(self, key: str, value: str, ttl: int, tag: str) -> None:
+        """Store a value with a TTL and track it under tag."""
+        pass
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Delete a single key."""
+        pass
+
+    @abstractmethod
+    async def delete_tag(self, tag: str) -> None:
+        """Delete every key tracked under tag."""
+        pass
+
+
+class MemoryBackend(CacheBackend):
+    """Bounded in-process cache."""
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._tags: Dict[str, Set[str]] = {}
+
+    async def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        return value
+
+    async def set(self, key: str, value: str, ttl: int, tag: str) -> None:
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        self._tags.setdefault(tag, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    async def delete_tag(self, tag: str) -> None:
+        for key in self._tags.pop(tag, set()):
+            self._entries.pop(key, None)
+
+
+class RedisBackend(CacheBackend):
+    """Redis-backed cache that falls back to process memory while Redis is down."""
+
+    def __init__(self, client: Any, retry_after_seconds: float = 5.0):
+        self.client = client
+        self.fallback = MemoryBackend()
+        self.retry_after_seconds = retry_after_seconds
+        self._down_until = 0.0
+
+    def _available(self) -> bool:
+        return time.monotonic() >= self._down_until
+
+    def _mark_down(self, exc: Exception) -> None:
+        if self._available():
+            logger.warning("Redis unavailable, using in-process cache: %s", exc)
+        self._down_until = time.monotonic() + self.retry_after_seconds
+
+    async def get(self, key: str) -> Optional[str]:
+        if self._available():
+            try:
+                value = await self.client.get(key)
+                return value.decode() if isinstance(value, bytes) else value
+            except (RedisError, OSError) as exc:
+                self._mark_down(exc)
+        return await self.fallback.get(key)
+
+    async def set(self, key: str, value: str, ttl: int, tag: str) -> None:
+        if self._available():
+            try:
+                async with self.client.pipeline(transaction=False) as pipe:
+                    pipe.set(key, value, ex=ttl)
+                    pipe.sadd(tag, key)
+                    pipe.expire(tag, max(ttl * 4, 60))
+                    await pipe.execute()
+                return
+            except (RedisError, OSError) as exc:
+                self._mark_down(exc)
+        await self.fallback.set(key, value, ttl, tag)
+
+    async def delete(self, key: str) -> None:
+        # Always clear the fallback too, so values cached during an outage die with the event
+        await self.fallback.delete(key)
+        if self._available():
+            try:
+                await self.client.delete(key)
+            except (RedisError, OSError) as exc:
+                self._mark_down(exc)
+
+    async def delete_tag(self, tag: str) -> None:
+        await self.fallback.delete_tag(tag)
+        if self._available():
+            try:
+                keys = await self.client.smembers(tag)
+                await self.client.delete(tag, *keys)
+            except (RedisError, OSError) as exc:
+                self._mark_down(exc)
+
+
+class FakeRedis:
+    """In-memory stand-in for the subset of redis.asyncio.Redis used by the cache, rate limiter, token stores and principal invalidations."""
+
+    def __init__(self):
+        self._values: Dict[str, Tuple[Optional[float], Any]] = {}
+        self._channels: Dict[str, Set["_FakePubSub"]] = {}
+
+    def _live(self, key: str) -> Optional[Any]:
+        entry = self._values.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._values[key]
+            return None
+        return value
+
+    async def get(self, key: str) -> Optional[bytes]:
+        value = self._live(key)
+        return value.encode() if isinstance(value, str) else value
+
+    async def set(self, key: str, value: Any, ex: Optional[int] = None, nx: bool = False) -> Optional[bool]:
+        if nx and self._live(key) is not None:
+            return None
+        self._values[key] = (time.monotonic() + ex if ex else None, value)
+        return True
+
+    async def exists(self, *keys: str) -> int:
+        return sum(self._live(key) is not None for key in keys)
+
+    async def delete(self, *keys: Any) -> int:
+        removed = 0
+        for key in keys:
+            key = key.decode() if isinstance(key, bytes) else key
+            removed += self._values.pop(key, None) is not None
+        return removed
+
+    async def sadd(self, key: str, *members: str) -> int:
+        current = self._live(key) or set()
+        added = len(set(members) - current)
+        expires_at = self._values[key][0] if key in self._values else None
+        self._values[key] = (expires_at, current | set(members))
+        return added
+
+    async def smembers(self, key: str) -> Set[bytes]:
+        return {member.encode() for member in self._live(key) or set()}
+
+    async def expire(self, key: str, seconds: int) -> bool:
+        value = self._live(key)
+        if value is None:
+            return False
+        self._values[key] = (time.monotonic() + seconds, value)
+        return True
+
+    async def incr(self, key: str, amount: int = 1) -> int:
+        value = int(self._live(key) or 0) + amount
+        expires_at = self._values[key][0] if key in self._values else None
+        self._values[key] = (expires_at, value)
+        return value
+
+    async def decr(self, key: str, amount: int = 1) -> int:
+        return await self.incr(key, -amount)
+
+    async def keys(self, pattern: str = "*") -> List[bytes]:
+        return [key.encode() for key in list(self._values) if self._live(key) is not None and fnmatch.fnmatch(key, pattern)]
+
+    async def flushall(self) -> bool:
+        self._values.clear()
+        return True
+
+    def pipeline(self, transaction: bool = True) -> "_FakePipeline":
+        return _FakePipeline(self)
+
+    async def publish(self, channel: str, message: str) -> int:
+        subscribers = self._channels.get(channel, set())
+        for pubsub in subscribers:
+            pubsub._deliver({"type": "message", "channel": channel.encode(), "data": message.encode()})
+        return len(subscribers)
+
+    def pubsub(self) -> "_FakePubSub":
+        return _FakePubSub(self)
+
+
+class _FakePipeline:
+    """Queued commands for FakeRedis, applied on execute()."""
+
+    def __init__(self, client: FakeRedis):
+        self._client = client
+        self._commands: List[Tuple[str, tuple, dict]] = []
+
+    def __getattr__(self, name: str) -> Callable[..., "_FakePipeline"]:
+        def queue(*args: Any, **kwargs: Any) -> "_FakePipeline":
+            self._commands.append((name, args, kwargs))
+            return self
+        return queue
+
+    async def execute(self) -> List[Any]:
+        commands, self._commands = self._commands, []
+        return [await getattr(self._client, name)(*args, **kwargs) for name, args, kwargs in commands]
+
+    async def __aenter__(self) -> "_FakePipeline":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        self._commands = []
+
+
+class _FakePubSub:
+    """Channel subscription on a FakeRedis; messages queue until get_message()."""
+
+    def __init__(self, client: FakeRedis):
+        self._client = client
+        self._channels: Set[str] = set()
+        self._messages: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue()
+
+    def _deliver(self, message: Dict[str, Any]) -> None:
+        self._messages.put_nowait(message)
+
+    async def subscribe(self, *channels: str) -> None:
+        for channel in channels:
+            self._client._channels.setdefault(channel, set()).add(self)
+            self._channels.add(channel)
+            self._deliver({"type": "subscribe", "channel": channel.encode(), "data": len(self._channels)})
+
+    async def get_message(self, ignore_subscribe_messages: bool = False, timeout: Optional[float] = 0.0) -> Optional[Dict[str, Any]]:
+        try:
+            message = await asyncio.wait_for(self._messages.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        if ignore_subscribe_messages and message["type"] == "subscribe":
+            return None
+        return message
+
+    async def aclose(self) -> None:
+        for channel in self._channels:
+            self._client._channels.get(channel, set()).discard(self)
+        self._channels.clear()
+
+
+class Cache:
+    """
+    JSON read-through cache over a CacheBackend.
+
+    Usage:
+        page = await cache.get_or_load("leaderboard", "top:100", 15, load_page)
+        cache.invalidate_on_commit(session, "leaderboard")
+    """
+
+    def __init__(self, backend: CacheBackend, prefix: str = "cache", enabled: bool = True):
+        self.backend = backend
+        self.prefix = prefix
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._pending: Set[asyncio.Task] = set()
+
+    def _key(self, namespace: str, key: str) -> str:
+        return f"{self.prefix}:{namespace}:{key}"
+
+    def _tag(self, namespace: str) -> str:
+        return f"{self.prefix}:{namespace}:__keys__"
+
+    async def get_or_load(
+        self,
+        namespace: str,
+        key: str,
+        ttl: int,
+        loader: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Return the cached value for key, calling loader and caching its result on a miss."""
+        if not self.enabled:
+            return await loader()
+
+        cached = await self.backend.get(self._key(namespace, key))
+        if cached is not None:
+            self.hits += 1
+            return json.loads(cached)
+
+        self.misses += 1
+        value = await loader()
+        # Misses (None) are not cached so newly created rows show up immediately
+        if value is not None:
+            await self.backend.set(self._key(namespace, key), json.dumps(value), ttl, self._tag(namespace))
+        return value
+
+    async def invalidate(self, namespace: str, key: Optional[str] = None) -> None:
+        """Drop one key, or the whole namespace when key is None."""
+        self.invalidations += 1
+        if key is None:
+            await self.backend.delete_tag(self._tag(namespace))
+        else:
+            await self.backend.delete(self._key(namespace, key))
+
+    def invalidate_on_commit(self, session: AsyncSession, namespace: str, key: Optional[str] = None) -> None:
+        """Invalidate once the session's transaction commits (never on rollback)."""
+        if not self.enabled:
+            return
+
+        def schedule() -> None:
+            task = asyncio.get_running_loop().create_task(self.invalidate(namespace, key))
+            self._pending.add(task)
+            task.add_done_callback(self._pending.discard)
+
+        on_commit(session, schedule)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters."""
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__,
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "invalidations": self.invalidations
+        }
+
+
+def create_cache() -> Cache:
+    """Build the process-wide cache from settings."""
+    if settings.CACHE_BACKEND == "redis":
+        backend: CacheBackend = RedisBackend(redis_asyncio.from_url(
+            settings.REDIS_URL,
+            socket_connect_timeout=0.5,
+            socket_timeout=0.5
+        ))
+    elif settings.CACHE_BACKEND == "fake-redis":
+        backend = RedisBackend(FakeRedis())
+    else:
+        backend = MemoryBackend()
+    return Cache(backend, enabled=settings.CACHE_ENABLED)
+
+
+cache = create_cache()
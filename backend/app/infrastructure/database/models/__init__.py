@@ -6,9 +6,13 @@ from app.infrastructure.database.models.user import User, Role, UserRole
 from app.infrastructure.database.models.player_profile import PlayerProfile
 from app.infrastructure.database.models.match import Match, MatchParticipant, MatchResult
 from app.infrastructure.database.models.ranking import Ranking
-from app.infrastructure.database.models.wallet import Wallet, Transaction, EscrowAccount
+from app.infrastructure.database.models.wallet import Wallet, Transaction, EscrowAccount, Payout
 from app.infrastructure.database.models.dispute import Dispute, DisputeEvidence
 from app.infrastructure.database.models.admin import AdminAction, AuditLog
+from app.infrastructure.database.models.webhook import WebhookEvent
+from app.infrastructure.database.models.job import Job
+from app.infrastructure.database.models.ledger import LedgerEntry, LedgerSnapshot
+from app.infrastructure.database.models.stats import PlatformCounter
 
 __all__ = [
     "User",
@@ -22,8 +26,14 @@ __all__ = [
     "Wallet",
     "Transaction",
     "EscrowAccount",
+    "Payout",
     "Dispute",
     "DisputeEvidence",
     "AdminAction",
     "AuditLog",
+    "WebhookEvent",
+    "Job",
+    "LedgerEntry",
+    "LedgerSnapshot",
+    "PlatformCounter",
 ]
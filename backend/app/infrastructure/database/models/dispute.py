@@ -3,7 +3,7 @@ Dispute system models.
 """
 from datetime import datetime
 from typing import Optional
-from sqlalchemy import Column, String, Text, DateTime, ForeignKey, CheckConstraint, Integer
+from sqlalchemy import Column, String, Text, DateTime, ForeignKey, CheckConstraint, Integer, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
@@ -66,6 +66,9 @@ class Dispute(Base):
             "reason IN ('CHEATING', 'DISCONNECTION', 'HARASSMENT', 'RULE_VIOLATION', 'PAYMENT_ISSUE', 'OTHER')",
             name="disputes_reason_check"
         ),
+        # Keyset pagination on (created_at, id), overall and per status
+        Index("ix_disputes_created_at_id", "created_at", "id"),
+        Index("ix_disputes_status_created_at_id", "status", "created_at", "id"),
     )
 
 
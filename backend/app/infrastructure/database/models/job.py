@@ -0,0 +1,38 @@
+"""
+Background job models.
+"""
+from datetime import datetime
+from sqlalchemy import Column, String, Integer, DateTime, Text, Index
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+import uuid
+
+from app.infrastructure.database.base import Base
+
+
+class JobStatus:
+    """Job status values."""
+    PENDING = "PENDING"
+    SUCCEEDED = "SUCCEEDED"
+    FAILED = "FAILED"
+
+
+class Job(Base):
+    """Durable background job, enqueued in the same transaction as the change that caused it."""
+    __tablename__ = "jobs"
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    job_type = Column(String(100), nullable=False, index=True)
+    payload = Column(JSONB, nullable=False)
+    status = Column(String(20), nullable=False, default=JobStatus.PENDING)
+    idempotency_key = Column(String(255), unique=True, nullable=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=5)
+    run_at = Column(DateTime(timezone=True), nullable=False, default=datetime.utcnow)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), nullable=False, default=datetime.utcnow)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    
+    __table_args__ = (
+        # Workers claim due pending jobs in run_at order
+        Index("ix_jobs_status_run_at", "status", "run_at"),
+    )
@@ -0,0 +1,39 @@
+"""
+Double-entry ledger models.
+"""
+from datetime import datetime
+from sqlalchemy import Column, String, BigInteger, DateTime, CheckConstraint, Index
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.infrastructure.database.base import Base
+
+
+class LedgerEntry(Base):
+    """One line of a balanced journal. Rows are only ever inserted, never updated."""
+    __tablename__ = "ledger_entries"
+    
+    # Monotonic position; snapshots record the last id they folded in
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    journal_id = Column(UUID(as_uuid=True), nullable=False, index=True)
+    journal_type = Column(String(30), nullable=False)
+    account = Column(String(64), nullable=False)
+    amount_cents = Column(BigInteger, nullable=False)  # Positive raises the account's balance
+    transaction_id = Column(UUID(as_uuid=True), nullable=True)  # Wallet transaction that caused it
+    reference_id = Column(UUID(as_uuid=True), nullable=True)
+    created_at = Column(DateTime(timezone=True), nullable=False, default=datetime.utcnow)
+    
+    __table_args__ = (
+        CheckConstraint("amount_cents <> 0", name="ledger_entries_amount_cents_check"),
+        # Balance reads sum an account's entries after its snapshot
+        Index("ix_ledger_entries_account_id", "account", "id"),
+    )
+
+
+class LedgerSnapshot(Base):
+    """Materialized balance of one account up to and including entry_id."""
+    __tablename__ = "ledger_snapshots"
+    
+    account = Column(String(64), primary_key=True)
+    entry_id = Column(BigInteger, nullable=False, index=True)
+    balance_cents = Column(BigInteger, nullable=False)
+    taken_at = Column(DateTime(timezone=True), nullable=False, default=datetime.utcnow)
@@ -5,7 +5,7 @@ from datetime import datetime
 from typing import Optional
 from sqlalchemy import (
     Column, String, Integer, BigInteger, DateTime, ForeignKey,
-    Text, CheckConstraint, JSON, Boolean
+    Text, CheckConstraint, JSON, Boolean, Index
 )
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
@@ -56,6 +56,11 @@ class Match(Base):
         CheckConstraint("region = 'US'", name="matches_region_check"),
         CheckConstraint("stake_cents > 0", name="matches_stake_cents_check"),
         CheckConstraint("total_pot_cents > 0", name="matches_total_pot_cents_check"),
+        # Keyset pagination on (created_at, id), overall and per filter
+        Index("ix_matches_created_at_id", "created_at", "id"),
+        Index("ix_matches_status_created_at_id", "status", "created_at", "id"),
+        Index("ix_matches_created_by_created_at_id", "created_by", "created_at", "id"),
+        Index("ix_matches_accepted_by_created_at_id", "accepted_by", "created_at", "id"),
     )
 
 
@@ -2,7 +2,7 @@
 Player profile model.
 """
 from datetime import datetime
-from sqlalchemy import Column, String, Text, DateTime, ForeignKey, CheckConstraint
+from sqlalchemy import Column, String, Text, DateTime, ForeignKey, CheckConstraint, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
@@ -36,4 +36,11 @@ class PlayerProfile(Base):
     
     __table_args__ = (
         CheckConstraint("region = 'US'", name="player_profiles_region_check"),
+        # Admin search: substring matches on username
+        Index(
+            "ix_player_profiles_username_trgm",
+            "username",
+            postgresql_using="gin",
+            postgresql_ops={"username": "gin_trgm_ops"}
+        ),
     )
@@ -0,0 +1,16 @@
+"""
+Platform statistics models.
+"""
+from datetime import datetime
+from sqlalchemy import Column, String, BigInteger, DateTime
+
+from app.infrastructure.database.base import Base
+
+
+class PlatformCounter(Base):
+    """One named dashboard counter, kept up to date by batched deltas."""
+    __tablename__ = "platform_counters"
+    
+    name = Column(String(100), primary_key=True)  # e.g. "matches.status.COMPLETED"
+    value = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -3,7 +3,7 @@ User authentication and authorization models.
 """
 from datetime import datetime
 from typing import Optional
-from sqlalchemy import Column, String, Boolean, Integer, DateTime, ForeignKey, CheckConstraint
+from sqlalchemy import Column, String, Boolean, Integer, DateTime, ForeignKey, CheckConstraint, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
@@ -48,6 +48,14 @@ class User(Base):
             "account_status IN ('ACTIVE', 'SUSPENDED', 'BANNED')",
             name="users_account_status_check"
         ),
+        # Admin search: substring matches on email, keyset pages on (created_at, id)
+        Index(
+            "ix_users_email_trgm",
+            "email",
+            postgresql_using="gin",
+            postgresql_ops={"email": "gin_trgm_ops"}
+        ),
+        Index("ix_users_created_at_id", "created_at", "id"),
     )
 
 
@@ -5,7 +5,7 @@ from datetime import datetime
 from typing import Optional
 from sqlalchemy import (
     Column, String, Integer, BigInteger, DateTime, ForeignKey,
-    Text, CheckConstraint, Enum as SQLEnum
+    Text, CheckConstraint, Index, Enum as SQLEnum, text
 )
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
@@ -101,6 +101,18 @@ class Transaction(Base):
     
     __table_args__ = (
         CheckConstraint("amount_cents != 0", name="transactions_amount_cents_check"),
+        # Keyset pagination of a user's history on (created_at, id)
+        Index("ix_transactions_user_id_created_at_id", "user_id", "created_at", "id"),
+        # Deposit settlement looks transactions up by payment intent id
+        Index("ix_transactions_external_id", "external_id"),
+        # Payout worker claims withdrawals not yet assigned to a payout
+        Index(
+            "ix_transactions_unbatched_withdrawals",
+            "created_at",
+            postgresql_where=text(
+                "transaction_type = 'WITHDRAWAL' AND status = 'PROCESSING' AND reference_id IS NULL"
+            )
+        ),
     )
 
 
@@ -147,3 +159,35 @@ class EscrowAccount(Base):
             name="escrow_accounts_amounts_check"
         ),
     )
+
+
+class PayoutStatus:
+    """Payout status values."""
+    PENDING = "PENDING"
+    PAID = "PAID"
+    FAILED = "FAILED"
+    REVIEW = "REVIEW"  # Outcome unknown after the last attempt; funds stay reserved
+
+
+class Payout(Base):
+    """Gateway transfer paying out a batch of withdrawals to one destination account."""
+    __tablename__ = "payouts"
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    destination = Column(String(255), nullable=False, index=True)
+    amount_cents = Column(BigInteger, nullable=False)
+    currency = Column(String(3), nullable=False, default="USD")
+    withdrawal_count = Column(Integer, nullable=False)
+    status = Column(String(20), nullable=False, default=PayoutStatus.PENDING)
+    attempts = Column(Integer, nullable=False, default=0)
+    transfer_id = Column(String(255), nullable=True)
+    last_error = Column(Text, nullable=True)
+    lease_until = Column(DateTime(timezone=True), nullable=False)  # Claimed by a worker until then
+    created_at = Column(DateTime(timezone=True), nullable=False, default=datetime.utcnow)
+    completed_at = Column(DateTime(timezone=True), nullable=True)
+    
+    __table_args__ = (
+        CheckConstraint("amount_cents > 0", name="payouts_amount_cents_check"),
+        # Workers reclaim pending payouts whose lease has run out
+        Index("ix_payouts_status_lease_until", "status", "lease_until"),
+    )
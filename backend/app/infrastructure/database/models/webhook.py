@@ -0,0 +1,35 @@
+"""
+Inbound webhook models.
+"""
+from datetime import datetime
+from sqlalchemy import Column, String, Integer, DateTime, Text, Index
+from sqlalchemy.dialects.postgresql import JSONB
+
+from app.infrastructure.database.base import Base
+
+
+class WebhookEventStatus:
+    """Webhook inbox status values."""
+    RECEIVED = "RECEIVED"
+    PROCESSED = "PROCESSED"
+    IGNORED = "IGNORED"
+    FAILED = "FAILED"
+
+
+class WebhookEvent(Base):
+    """Durable inbox of verified provider events, keyed by the provider's event id."""
+    __tablename__ = "webhook_events"
+    
+    id = Column(String(255), primary_key=True)  # Provider event id (evt_...), deduplicates redeliveries
+    provider = Column(String(20), nullable=False, default="stripe")
+    event_type = Column(String(100), nullable=False)
+    payload = Column(JSONB, nullable=False)
+    status = Column(String(20), nullable=False, default=WebhookEventStatus.RECEIVED)
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+    received_at = Column(DateTime(timezone=True), nullable=False, default=datetime.utcnow)
+    processed_at = Column(DateTime(timezone=True), nullable=True)
+    
+    __table_args__ = (
+        Index("ix_webhook_events_status_received_at", "status", "received_at"),
+    )
@@ -1,12 +1,28 @@
 """
 Database session management for async SQLAlchemy.
 Provides session factory and dependency injection for FastAPI.
+
+Each session is a unit of work: repositories only flush, and the unit
+commits exactly once when it ends (or rolls back if anything failed).
+Request sessions are committed by UnitOfWorkMiddleware before the response
+starts, so a client never sees success for a write that did not persist.
 """
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, MutableMapping
+
+from fastapi import Request
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
+# ASGI scope key holding the sessions get_db opened for the request
+REQUEST_SESSIONS_KEY = "uow_sessions"
+
 # Create async engine
 engine = create_async_engine(
     settings.DATABASE_URL,
@@ -27,22 +43,174 @@ AsyncSessionLocal = async_sessionmaker(
 )
 
 
-async def get_db() -> AsyncSession:
+class UnitOfWorkMetrics:
+    """Process-wide counters describing how many commits and statements each unit of work costs."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        """Reset all counters."""
+        self.units = 0
+        self.commits = 0
+        self.rollbacks = 0
+        self.statements = 0
+        self.max_commits_per_unit = 0
+        self.max_statements_per_unit = 0
+
+    def record(self, info: Dict[str, Any], rolled_back: bool = False) -> None:
+        """Record a finished unit of work from its session info."""
+        commits = info.get("uow_commits", 0)
+        statements = info.get("uow_statements", 0)
+
+        self.units += 1
+        self.commits += commits
+        self.statements += statements
+        if rolled_back:
+            self.rollbacks += 1
+        self.max_commits_per_unit = max(self.max_commits_per_unit, commits)
+        self.max_statements_per_unit = max(self.max_statements_per_unit, statements)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return current counters and per-unit averages."""
+        units = self.units or 1
+        return {
+            "units": self.units,
+            "commits": self.commits,
+            "rollbacks": self.rollbacks,
+            "statements": self.statements,
+            "commits_per_unit": round(self.commits / units, 3),
+            "statements_per_unit": round(self.statements / units, 3),
+            "max_commits_per_unit": self.max_commits_per_unit,
+            "max_statements_per_unit": self.max_statements_per_unit,
+        }
+
+
+uow_metrics = UnitOfWorkMetrics()
+
+
+@event.listens_for(Session, "after_begin")
+def _bind_connection_to_unit(session, transaction, connection):
+    """Point the connection at the session so statements are attributed to its unit of work."""
+    connection.info["uow_info"] = session.info
+
+
+@event.listens_for(Session, "after_commit")
+def _count_commit(session):
+    """Count commits issued by a session and run its on-commit callbacks."""
+    session.info["uow_commits"] = session.info.get("uow_commits", 0) + 1
+    for callback in session.info.pop("on_commit", []):
+        try:
+            callback()
+        except Exception:
+            logger.exception("on-commit callback failed")
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_commit(session):
+    """Drop on-commit callbacks when the transaction is rolled back."""
+    session.info.pop("on_commit", None)
+
+
+def on_commit(session: AsyncSession, callback: Callable[[], None]) -> None:
     """
-    Dependency for getting database session.
-    Use in FastAPI route dependencies.
-    
+    Run callback once the session's current transaction commits.
+
+    Use for in-process side effects (in-memory indexes, cache invalidation)
+    that must not happen if the unit of work is rolled back.
+    """
+    session.info.setdefault("on_commit", []).append(callback)
+
+
+@event.listens_for(engine.sync_engine, "before_cursor_execute")
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    """Count round trips made on behalf of a unit of work."""
+    info = conn.info.get("uow_info")
+    if info is not None:
+        info["uow_statements"] = info.get("uow_statements", 0) + 1
+
+
+def _has_work(session: AsyncSession) -> bool:
+    """Whether the session holds a transaction or unflushed changes that a commit would persist."""
+    return session.in_transaction() or bool(session.new or session.dirty or session.deleted)
+
+
+@asynccontextmanager
+async def unit_of_work() -> AsyncIterator[AsyncSession]:
+    """
+    Open a session that commits once on success and rolls back on error.
+
+    Everything written before an exception is rolled back with it, so a
+    write that must outlive a failed request (failed-login counts, for
+    instance) has to be made outside the unit of work.
+
     Usage:
-        @router.get("/")
-        async def endpoint(db: AsyncSession = Depends(get_db)):
+        async with unit_of_work() as session:
+            repo = MatchRepositoryImpl(session)
             ...
     """
     async with AsyncSessionLocal() as session:
+        rolled_back = False
         try:
             yield session
-            await session.commit()
+            # Request sessions are normally committed already by the middleware
+            if _has_work(session):
+                await session.commit()
         except Exception:
+            rolled_back = True
             await session.rollback()
             raise
         finally:
+            rolled_back = rolled_back or session.info.pop("uow_commit_failed", False)
+            uow_metrics.record(session.info, rolled_back=rolled_back)
+            logger.debug(
+                "unit of work finished: commits=%d statements=%d rolled_back=%s",
+                session.info.get("uow_commits", 0),
+                session.info.get("uow_statements", 0),
+                rolled_back
+            )
             await session.close()
+
+
+async def commit_request_sessions(scope: MutableMapping[str, Any]) -> None:
+    """
+    Commit the sessions get_db opened for a request.
+
+    Called by UnitOfWorkMiddleware as the response starts. On failure every
+    session is rolled back and the error is raised, so the caller can send
+    an error response instead of the one the endpoint produced.
+    """
+    sessions = scope.get(REQUEST_SESSIONS_KEY, ())
+    try:
+        for session in sessions:
+            if _has_work(session):
+                await session.commit()
+    except Exception:
+        for session in sessions:
+            session.info["uow_commit_failed"] = True
+            await session.rollback()
+        raise
+
+
+async def get_db(request: Request) -> AsyncIterator[AsyncSession]:
+    """
+    Dependency for getting database session.
+    Use in FastAPI route dependencies.
+
+    The session is shared by every repository resolved for the request and
+    committed once, by UnitOfWorkMiddleware, before the response is sent.
+    Anything written after that (e.g. while streaming a body) is committed
+    when the dependency is torn down.
+
+    Usage:
+        @router.get("/")
+        async def endpoint(db: AsyncSession = Depends(get_db)):
+            ...
+    """
+    sessions = request.scope.setdefault(REQUEST_SESSIONS_KEY, [])
+    async with unit_of_work() as session:
+        sessions.append(session)
+        try:
+            yield session
+        finally:
+            sessions.remove(session)
@@ -0,0 +1,39 @@
+"""
+User notification abstraction.
+No delivery channel (email, push) is wired up yet, so the default notifier
+writes notifications to the application log. Swap in a real provider by
+implementing Notifier.
+"""
+import logging
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class Notifier(ABC):
+    """Notification channel interface."""
+    
+    @abstractmethod
+    async def notify(self, user_id: str, kind: str, data: Dict[str, Any]) -> None:
+        """Deliver a notification to a user."""
+        pass
+
+
+class LogNotifier(Notifier):
+    """Notifier that records notifications in the log."""
+    
+    async def notify(self, user_id: str, kind: str, data: Dict[str, Any]) -> None:
+        logger.info("notification %s for user %s: %s", kind, user_id, data)
+
+
+_notifier: Optional[Notifier] = None
+
+
+# Factory function
+def get_notifier() -> Notifier:
+    """Get the shared notifier instance."""
+    global _notifier
+    if _notifier is None:
+        _notifier = LogNotifier()
+    return _notifier
@@ -1,16 +1,19 @@
 """
 Payment gateway abstraction.
 Supports Stripe now, can be extended for other providers.
+
+The Stripe implementation talks to the REST API through one pooled,
+keep-alive async HTTP client, so calls never block the event loop.
+STRIPE_API_BASE can point it at scripts/fake_stripe.py for offline runs.
 """
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Optional, Dict, Any
-from uuid import UUID
+from typing import Optional, Dict, Any, List, Tuple
+from urllib.parse import urlencode
 
-import stripe
+import httpx
 from app.core.config import settings
-
-# Initialize Stripe
-stripe.api_key = settings.STRIPE_SECRET_KEY
+from app.core.exceptions import PaymentError
 
 
 class PaymentGateway(ABC):
@@ -21,7 +24,8 @@ class PaymentGateway(ABC):
         self,
         amount_cents: int,
         currency: str,
-        metadata: Optional[Dict[str, Any]] = None
+        metadata: Optional[Dict[str, Any]] = None,
+        idempotency_key: Optional[str] = None
     ) -> Dict[str, Any]:
         """Create a payment intent for deposit."""
         pass
@@ -36,81 +40,195 @@ class PaymentGateway(ABC):
         self,
         amount_cents: int,
         destination_account: str,
-        metadata: Optional[Dict[str, Any]] = None
+        metadata: Optional[Dict[str, Any]] = None,
+        idempotency_key: Optional[str] = None
     ) -> Dict[str, Any]:
         """Create a transfer (for withdrawals)."""
         pass
 
 
+def _form_encode(params: Dict[str, Any], prefix: str = "") -> List[Tuple[str, str]]:
+    """Flatten nested params into Stripe's bracketed form encoding."""
+    pairs: List[Tuple[str, str]] = []
+    for key, value in params.items():
+        name = f"{prefix}[{key}]" if prefix else key
+        if isinstance(value, dict):
+            pairs.extend(_form_encode(value, name))
+        elif isinstance(value, bool):
+            pairs.append((name, "true" if value else "false"))
+        elif value is not None:
+            pairs.append((name, str(value)))
+    return pairs
+
+
 class StripePaymentGateway(PaymentGateway):
-    """Stripe implementation of payment gateway."""
+    """Stripe implementation of payment gateway over a pooled async HTTP client."""
+    
+    def __init__(
+        self,
+        api_key: str = settings.STRIPE_SECRET_KEY,
+        api_base: str = settings.STRIPE_API_BASE,
+        timeout_seconds: float = settings.STRIPE_TIMEOUT_SECONDS,
+        max_concurrency: int = settings.STRIPE_MAX_CONCURRENCY
+    ):
+        self.api_key = api_key
+        self.api_base = api_base.rstrip("/")
+        self.timeout_seconds = timeout_seconds
+        self.max_concurrency = max_concurrency
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        """Create the shared client on first use (inside the running loop)."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.api_base,
+                auth=(self.api_key, ""),
+                timeout=httpx.Timeout(self.timeout_seconds, connect=min(self.timeout_seconds, 3.0)),
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrency,
+                    max_keepalive_connections=self.max_concurrency,
+                    keepalive_expiry=60.0
+                ),
+                headers={"Stripe-Version": settings.STRIPE_API_VERSION}
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._client
+    
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        idempotency_key: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Call the Stripe API and return the decoded object."""
+        client = self._get_client()
+        headers = {"Idempotency-Key": idempotency_key} if idempotency_key else {}
+        content = None
+        if params and method == "POST":
+            content = urlencode(_form_encode(params))
+            headers["Content-Type"] = "application/x-www-form-urlencoded"
+        
+        async with self._semaphore:
+            try:
+                response = await client.request(
+                    method,
+                    path,
+                    content=content,
+                    headers=headers
+                )
+            except httpx.TimeoutException:
+                raise PaymentError("Stripe request timed out", code="GATEWAY_TIMEOUT")
+            except httpx.HTTPError as e:
+                raise PaymentError(f"Stripe connection error: {str(e)}", code="GATEWAY_UNAVAILABLE")
+        
+        try:
+            body = response.json()
+        except ValueError:
+            # An HTML error page from a proxy or load balancer, not Stripe itself
+            raise PaymentError(
+                f"Stripe returned a non-JSON response ({response.status_code})",
+                code="GATEWAY_UNAVAILABLE",
+                details={"http_status": response.status_code}
+            )
+        if response.status_code >= 400:
+            error = body.get("error", {})
+            raise PaymentError(
+                f"Stripe error: {error.get('message', response.status_code)}",
+                code="STRIPE_ERROR",
+                details={
+                    "type": error.get("type"),
+                    "stripe_code": error.get("code"),
+                    "http_status": response.status_code
+                }
+            )
+        return body
     
     async def create_payment_intent(
         self,
         amount_cents: int,
         currency: str = "usd",
-        metadata: Optional[Dict[str, Any]] = None
+        metadata: Optional[Dict[str, Any]] = None,
+        idempotency_key: Optional[str] = None
     ) -> Dict[str, Any]:
         """Create a Stripe payment intent."""
-        try:
-            intent = stripe.PaymentIntent.create(
-                amount=amount_cents,
-                currency=currency,
-                metadata=metadata or {},
-                automatic_payment_methods={
-                    "enabled": True,
-                },
-            )
-            return {
-                "payment_intent_id": intent.id,
-                "client_secret": intent.client_secret,
-                "status": intent.status,
-                "amount_cents": amount_cents,
+        intent = await self._request(
+            "POST",
+            "/v1/payment_intents",
+            {
+                "amount": amount_cents,
                 "currency": currency,
-            }
-        except stripe.error.StripeError as e:
-            raise Exception(f"Stripe error: {str(e)}")
+                "metadata": metadata or {},
+                "automatic_payment_methods": {"enabled": True},
+            },
+            idempotency_key=idempotency_key
+        )
+        return {
+            "payment_intent_id": intent["id"],
+            "client_secret": intent["client_secret"],
+            "status": intent["status"],
+            "amount_cents": amount_cents,
+            "currency": currency,
+        }
     
     async def confirm_payment_intent(self, payment_intent_id: str) -> Dict[str, Any]:
         """Confirm a Stripe payment intent."""
-        try:
-            intent = stripe.PaymentIntent.retrieve(payment_intent_id)
-            return {
-                "id": intent.id,
-                "status": intent.status,
-                "amount_cents": intent.amount,
-                "currency": intent.currency,
-            }
-        except stripe.error.StripeError as e:
-            raise Exception(f"Stripe error: {str(e)}")
+        intent = await self._request("GET", f"/v1/payment_intents/{payment_intent_id}")
+        return {
+            "id": intent["id"],
+            "status": intent["status"],
+            "amount_cents": intent["amount"],
+            "currency": intent["currency"],
+            "metadata": intent.get("metadata", {}),
+        }
     
     async def create_transfer(
         self,
         amount_cents: int,
         destination_account: str,
-        metadata: Optional[Dict[str, Any]] = None
+        metadata: Optional[Dict[str, Any]] = None,
+        idempotency_key: Optional[str] = None
     ) -> Dict[str, Any]:
         """Create a Stripe transfer (for withdrawals)."""
         # Note: In production, you'd use Stripe Connect for transfers
-        # For MVP, we'll use a simplified approach
-        try:
-            # This is a placeholder - actual implementation depends on Stripe Connect setup
-            transfer = stripe.Transfer.create(
-                amount=amount_cents,
-                currency="usd",
-                destination=destination_account,
-                metadata=metadata or {},
-            )
-            return {
-                "transfer_id": transfer.id,
-                "status": transfer.status,
-                "amount_cents": amount_cents,
-            }
-        except stripe.error.StripeError as e:
-            raise Exception(f"Stripe error: {str(e)}")
+        transfer = await self._request(
+            "POST",
+            "/v1/transfers",
+            {
+                "amount": amount_cents,
+                "currency": "usd",
+                "destination": destination_account,
+                "metadata": metadata or {},
+            },
+            idempotency_key=idempotency_key
+        )
+        return {
+            "transfer_id": transfer["id"],
+            "status": transfer.get("status", "pending"),
+            "amount_cents": amount_cents,
+        }
+    
+    async def aclose(self) -> None:
+        """Close pooled connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+_gateway: Optional[StripePaymentGateway] = None
 
 
 # Factory function
 def get_payment_gateway() -> PaymentGateway:
-    """Get payment gateway instance."""
-    return StripePaymentGateway()
+    """Get the shared payment gateway instance (one connection pool per process)."""
+    global _gateway
+    if _gateway is None:
+        _gateway = StripePaymentGateway()
+    return _gateway
+
+
+async def close_payment_gateway() -> None:
+    """Release the shared gateway's connections."""
+    if _gateway is not None:
+        await _gateway.aclose()
@@ -0,0 +1,52 @@
+"""
+Coalesced last_login_at writes.
+A successful login only records its time here; the last-login worker
+writes the newest time per user to the users table in one statement every
+LAST_LOGIN_FLUSH_SECONDS. A user who logs in many times between flushes
+costs one row update, and a login wave costs one statement per batch
+instead of one write per login.
+"""
+from datetime import datetime
+from typing import Any, Dict
+from uuid import UUID
+
+
+class LastLoginBuffer:
+    """Per-process map of user id to the newest login time not yet written."""
+
+    def __init__(self):
+        self._pending: Dict[UUID, datetime] = {}
+        self.recorded = 0
+        self.written = 0
+        self.flushes = 0
+
+    def record(self, user_id: UUID, at: datetime) -> None:
+        """Remember a login; its size is bounded by the users logging in per flush interval."""
+        previous = self._pending.get(user_id)
+        if previous is None or previous < at:
+            self._pending[user_id] = at
+        self.recorded += 1
+
+    def take_pending(self) -> Dict[UUID, datetime]:
+        """Hand the buffered logins to the flusher."""
+        pending, self._pending = self._pending, {}
+        return pending
+
+    def restore_pending(self, logins: Dict[UUID, datetime]) -> None:
+        """Put back logins whose flush failed, keeping any newer ones recorded since."""
+        for user_id, at in logins.items():
+            previous = self._pending.get(user_id)
+            if previous is None or previous < at:
+                self._pending[user_id] = at
+
+    def stats(self) -> Dict[str, Any]:
+        """Recorded/written counters for this process."""
+        return {
+            "pending": len(self._pending),
+            "recorded": self.recorded,
+            "written": self.written,
+            "flushes": self.flushes
+        }
+
+
+last_logins = LastLoginBuffer()
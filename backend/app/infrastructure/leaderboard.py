@@ -0,0 +1,369 @@
+"""
+In-memory leaderboard engine.
+Keeps an order-statistic index over rating buckets (a Fenwick tree of
+player counts per rating) so top-N pages, global rank and percentile are
+answered in O(log R) instead of scanning the rankings table.
+
+Ordering is rating descending, then user ID ascending. Players with the
+same rating share a rank (competition ranking: 1, 2, 2, 4).
+
+The index is rebuilt from the rankings table by the leaderboard worker at
+startup and every LEADERBOARD_REFRESH_SECONDS (so processes converge on
+changes made by other processes), and updated in place after each
+committed ranking change. Requests only ever read the current index.
+"""
+import asyncio
+import time
+from bisect import bisect_left, bisect_right, insort
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infrastructure.database.models.ranking import Ranking as RankingModel
+from app.infrastructure.database.models.player_profile import PlayerProfile as PlayerProfileModel
+
+# Ratings are Fenwick keys, so the index keeps them within [MIN_RATING,
+# MAX_RATING]; anything outside is clamped on the way in. The ceiling bounds
+# the tree's memory far above any reachable Elo rating.
+MIN_RATING = 0
+MAX_RATING = 100_000
+
+# Fields kept per player; everything a leaderboard row needs except rank
+ENTRY_FIELDS = (
+    "rating", "wins", "losses", "draws", "win_streak", "total_matches",
+    "username", "display_name"
+)
+
+
+class FenwickTree:
+    """Binary indexed tree of counts over integer keys 0..size-1."""
+
+    def __init__(self, size: int):
+        self.size = size
+        self._tree = [0] * (size + 1)
+
+    @classmethod
+    def from_counts(cls, counts: List[int]) -> "FenwickTree":
+        """Build a tree from per-key counts in O(n)."""
+        tree = cls(len(counts))
+        data = tree._tree
+        for i, count in enumerate(counts, start=1):
+            data[i] += count
+            parent = i + (i & -i)
+            if parent <= tree.size:
+                data[parent] += data[i]
+        return tree
+
+    def add(self, key: int, delta: int) -> None:
+        """Add delta to the count at key."""
+        if not 0 <= key < self.size:
+            # A key outside the tree would never reach the root (and 0 & -0 never advances)
+            raise IndexError(f"key {key} outside 0..{self.size - 1}")
+        i = key + 1
+        while i <= self.size:
+            self._tree[i] += delta
+            i += i & -i
+
+    def prefix(self, key: int) -> int:
+        """Sum of counts for keys < key."""
+        total = 0
+        i = min(key, self.size)
+        while i > 0:
+            total += self._tree[i]
+            i -= i & -i
+        return total
+
+    def find_kth(self, k: int) -> int:
+        """Smallest key whose prefix count including itself reaches k (1-based)."""
+        position = 0
+        step = 1 << self.size.bit_length()
+        while step:
+            nxt = position + step
+            if nxt <= self.size and self._tree[nxt] < k:
+                position = nxt
+                k -= self._tree[nxt]
+            step >>= 1
+        return position
+
+
+class LeaderboardIndex:
+    """Order-statistic index of players by (rating desc, user_id asc)."""
+
+    def __init__(self, capacity: int = 4096):
+        self._counts = FenwickTree(capacity)
+        self._buckets: Dict[int, List[str]] = {}
+        self._entries: Dict[str, Dict[str, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def clamp_rating(rating: int) -> int:
+        """Rating as stored in the index."""
+        return min(max(rating, MIN_RATING), MAX_RATING)
+
+    @classmethod
+    def build(cls, rows: List[Tuple[str, Dict[str, Any]]]) -> "LeaderboardIndex":
+        """Bulk-build an index from (user_id, entry) pairs."""
+        for _, entry in rows:
+            entry["rating"] = cls.clamp_rating(entry["rating"])
+        max_rating = max((entry["rating"] for _, entry in rows), default=0)
+        index = cls(capacity=max(4096, 1 << (max_rating + 1).bit_length()))
+        counts = [0] * index._counts.size
+        for user_id, entry in rows:
+            index._entries[user_id] = entry
+            index._buckets.setdefault(entry["rating"], []).append(user_id)
+            counts[entry["rating"]] += 1
+        for bucket in index._buckets.values():
+            bucket.sort()
+        index._counts = FenwickTree.from_counts(counts)
+        return index
+
+    def _grow(self, rating: int) -> None:
+        """Resize the tree so rating fits."""
+        size = self._counts.size
+        while size <= rating:
+            size *= 2
+        counts = [0] * size
+        for bucket_rating, bucket in self._buckets.items():
+            counts[bucket_rating] = len(bucket)
+        self._counts = FenwickTree.from_counts(counts)
+
+    def upsert(self, user_id: str, **fields: Any) -> None:
+        """Insert a player or update their stored fields and rating."""
+        if "rating" in fields:
+            fields["rating"] = self.clamp_rating(fields["rating"])
+        entry = self._entries.get(user_id)
+        if entry is None:
+            if "rating" not in fields:
+                # Partial update for a player this index has not seen yet
+                return
+            entry = {field: None for field in ENTRY_FIELDS}
+            entry.update(rating=0, wins=0, losses=0, draws=0, win_streak=0, total_matches=0)
+            entry.update({k: v for k, v in fields.items() if k in ENTRY_FIELDS})
+            self._insert(user_id, entry)
+            return
+
+        new_rating = fields.get("rating", entry["rating"])
+        if new_rating != entry["rating"]:
+            self._detach(user_id, entry["rating"])
+            entry.update({k: v for k, v in fields.items() if k in ENTRY_FIELDS})
+            self._insert(user_id, entry)
+        else:
+            entry.update({k: v for k, v in fields.items() if k in ENTRY_FIELDS})
+
+    def remove(self, user_id: str) -> None:
+        """Remove a player from the index."""
+        entry = self._entries.get(user_id)
+        if entry is not None:
+            self._detach(user_id, entry["rating"])
+
+    def _insert(self, user_id: str, entry: Dict[str, Any]) -> None:
+        rating = entry["rating"]
+        if rating >= self._counts.size:
+            self._grow(rating)
+        self._entries[user_id] = entry
+        insort(self._buckets.setdefault(rating, []), user_id)
+        self._counts.add(rating, 1)
+
+    def _detach(self, user_id: str, rating: int) -> None:
+        bucket = self._buckets[rating]
+        del bucket[bisect_left(bucket, user_id)]
+        if not bucket:
+            del self._buckets[rating]
+        self._counts.add(rating, -1)
+        del self._entries[user_id]
+
+    def count_above(self, rating: int) -> int:
+        """Number of players with a strictly higher rating."""
+        return len(self._entries) - self._counts.prefix(rating + 1)
+
+    def position_after(self, rating: int, user_id: str) -> int:
+        """Zero-based position of the first player ordered after (rating, user_id)."""
+        if rating >= self._counts.size:
+            return 0
+        return self.count_above(rating) + bisect_right(self._buckets.get(rating, []), user_id)
+
+    def position_of(self, user_id: str) -> Optional[int]:
+        """Zero-based position of a player in leaderboard order."""
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+        rating = entry["rating"]
+        return self.count_above(rating) + bisect_left(self._buckets[rating], user_id)
+
+    def _row(self, user_id: str, rank: int) -> Dict[str, Any]:
+        entry = self._entries[user_id]
+        total = entry["wins"] + entry["losses"] + entry["draws"]
+        win_rate = (entry["wins"] / total * 100) if total > 0 else 0.0
+        return {
+            "rank": rank,
+            "user_id": user_id,
+            "username": entry["username"],
+            "display_name": entry["display_name"],
+            "rating": entry["rating"],
+            "wins": entry["wins"],
+            "losses": entry["losses"],
+            "draws": entry["draws"],
+            "win_streak": entry["win_streak"],
+            "total_matches": entry["total_matches"],
+            "win_rate": round(win_rate, 2)
+        }
+
+    def slice(self, start: int, limit: int) -> List[Dict[str, Any]]:
+        """Return up to limit rows starting at zero-based position start."""
+        total = len(self._entries)
+        rows: List[Dict[str, Any]] = []
+        position = max(start, 0)
+        while len(rows) < limit and position < total:
+            # The player at position p from the top is the (total - p)-th from the bottom
+            rating = self._counts.find_kth(total - position)
+            above = self.count_above(rating)
+            bucket = self._buckets[rating]
+            for user_id in bucket[position - above:position - above + limit - len(rows)]:
+                rows.append(self._row(user_id, above + 1))
+            position = above + len(bucket)
+        return rows
+
+    def rank_of(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """Global rank and percentile for a player."""
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+        total = len(self._entries)
+        above = self.count_above(entry["rating"])
+        below = self._counts.prefix(entry["rating"])
+        return {
+            "rank": above + 1,
+            "position": self.position_of(user_id),
+            "total_ranked": total,
+            "percentile": round(below / total * 100, 2) if total else 0.0
+        }
+
+
+class LeaderboardEngine:
+    """Process-wide leaderboard backed by a LeaderboardIndex."""
+
+    def __init__(self):
+        self._index = LeaderboardIndex()
+        self._loaded_at: Optional[float] = None
+        self._replay: Optional[List[Tuple[str, Dict[str, Any]]]] = None
+        self.reloads = 0
+        self.last_query_ms = 0.0
+        self.last_build_ms = 0.0
+
+    @property
+    def index(self) -> LeaderboardIndex:
+        """Current index (read-only use)."""
+        return self._index
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the index has been loaded from the database yet."""
+        return self._loaded_at is not None
+
+    async def reload(self, session: AsyncSession) -> None:
+        """
+        Rebuild the index from the rankings table and swap it in.
+
+        Called by the leaderboard worker only. The rows are fetched in
+        partitions and the index is built in the default executor, so the
+        event loop keeps serving reads from the current index meanwhile.
+        """
+        self._replay = []
+        try:
+            started = time.perf_counter()
+            result = await session.stream(
+                select(
+                    RankingModel.user_id,
+                    RankingModel.rating,
+                    RankingModel.wins,
+                    RankingModel.losses,
+                    RankingModel.draws,
+                    RankingModel.win_streak,
+                    RankingModel.total_matches,
+                    PlayerProfileModel.username,
+                    PlayerProfileModel.display_name
+                )
+                .join(PlayerProfileModel, RankingModel.user_id == PlayerProfileModel.user_id)
+                .execution_options(yield_per=10000)
+            )
+            rows = []
+            async for partition in result.partitions():
+                rows.extend(partition)
+            self.last_query_ms = (time.perf_counter() - started) * 1000
+
+            started = time.perf_counter()
+            index = await asyncio.get_running_loop().run_in_executor(None, _build_index, rows)
+            self.last_build_ms = (time.perf_counter() - started) * 1000
+
+            # Apply changes committed while the load was running, then swap;
+            # no await in between, so readers see either index whole
+            for user_id, fields in self._replay:
+                index.upsert(user_id, **fields)
+            self._index = index
+            self._loaded_at = time.monotonic()
+            self.reloads += 1
+        finally:
+            self._replay = None
+
+    def apply(self, user_id: str, **fields: Any) -> None:
+        """Apply a committed change for a player."""
+        self._index.upsert(user_id, **fields)
+        if self._replay is not None:
+            self._replay.append((user_id, fields))
+
+    def page(self, limit: int, after: Optional[Tuple[int, str]] = None) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Return a page of rows in leaderboard order.
+
+        Args:
+            limit: Maximum rows to return
+            after: (rating, user_id) of the last row of the previous page
+
+        Returns:
+            Tuple of (rows, has_more)
+        """
+        start = self._index.position_after(*after) if after else 0
+        rows = self._index.slice(start, limit + 1)
+        return rows[:limit], len(rows) > limit
+
+    def rank_of(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """Global rank and percentile for a player."""
+        return self._index.rank_of(user_id)
+
+    def around(self, user_id: str, radius: int) -> Optional[List[Dict[str, Any]]]:
+        """
+        Return the player plus up to radius players on each side.
+
+        Returns:
+            Rows in leaderboard order, or None if the player is not ranked
+        """
+        position = self._index.position_of(user_id)
+        if position is None:
+            return None
+        start = max(position - radius, 0)
+        return self._index.slice(start, position - start + radius + 1)
+
+    def stats(self) -> Dict[str, Any]:
+        """Size and reload timings for this process."""
+        return {
+            "loaded": self.loaded,
+            "players": len(self._index),
+            "age_seconds": round(time.monotonic() - self._loaded_at, 1) if self.loaded else None,
+            "reloads": self.reloads,
+            "last_query_ms": round(self.last_query_ms, 2),
+            "last_build_ms": round(self.last_build_ms, 2)
+        }
+
+
+def _build_index(rows: List[Any]) -> LeaderboardIndex:
+    """Build an index from ranking rows; runs off the event loop."""
+    return LeaderboardIndex.build([
+        (str(row.user_id), {field: getattr(row, field) for field in ENTRY_FIELDS})
+        for row in rows
+    ])
+
+
+leaderboard = LeaderboardEngine()
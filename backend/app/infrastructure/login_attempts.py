@@ -0,0 +1,280 @@
+"""
+Failed-login tracking for account lockout.
+Failures are counted per account in a sliding window (the previous fixed
+window weighted by its unelapsed share, plus the current one) outside the
+database, so a password-guessing run against one account, or a wave of
+mistyped passwords, never writes the users row. Reaching
+LOGIN_MAX_FAILED_ATTEMPTS within LOGIN_FAILURE_WINDOW_SECONDS locks the
+account for LOGIN_LOCKOUT_SECONDS and clears its count.
+
+Backends:
+    RedisLoginAttemptBackend   shared across workers, one round trip per
+                               operation; degrades to an in-process
+                               MemoryLoginAttemptBackend while Redis is down
+    MemoryLoginAttemptBackend  per-process, for single-node deployments
+"""
+import logging
+import math
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, List, Tuple
+
+import redis.asyncio as redis_asyncio
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.infrastructure.cache import FakeRedis
+
+logger = logging.getLogger(__name__)
+
+
+def _window(now: float, window_seconds: float) -> Tuple[int, float]:
+    """Current window number and the share of it still to elapse."""
+    number = int(now // window_seconds)
+    return number, 1.0 - (now - number * window_seconds) / window_seconds
+
+
+class LoginAttemptBackend(ABC):
+    """Interface for failed-login counter storage."""
+
+    @abstractmethod
+    async def get(self, key: str, window_seconds: float) -> Tuple[float, float]:
+        """
+        Read a key's state.
+
+        Returns:
+            Tuple of (failures in the sliding window, seconds left locked)
+        """
+        pass
+
+    @abstractmethod
+    async def add_failure(self, key: str, window_seconds: float) -> float:
+        """Count one failure and return the failures now in the sliding window."""
+        pass
+
+    @abstractmethod
+    async def lock(self, key: str, window_seconds: float, seconds: float) -> None:
+        """Lock a key for seconds and clear its failures."""
+        pass
+
+    @abstractmethod
+    async def reset(self, key: str, window_seconds: float) -> None:
+        """Clear a key's failures."""
+        pass
+
+
+class MemoryLoginAttemptBackend(LoginAttemptBackend):
+    """Bounded in-process counters; least recently used keys are evicted first."""
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        # key -> [window number, previous count, current count, locked until (epoch)]
+        self._entries: "OrderedDict[str, List[float]]" = OrderedDict()
+
+    def _entry(self, key: str, number: int) -> List[float]:
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._entries[key] = [number, 0, 0, 0.0]
+            while len(self._entries) > self.max_keys:
+                self._entries.popitem(last=False)
+        elif entry[0] != number:
+            entry[1] = entry[2] if entry[0] == number - 1 else 0
+            entry[0], entry[2] = number, 0
+        self._entries.move_to_end(key)
+        return entry
+
+    async def get(self, key: str, window_seconds: float) -> Tuple[float, float]:
+        now = time.time()
+        if key not in self._entries:
+            return 0.0, 0.0
+        number, remaining = _window(now, window_seconds)
+        _, previous, current, locked_until = self._entry(key, number)
+        return previous * remaining + current, max(locked_until - now, 0.0)
+
+    async def add_failure(self, key: str, window_seconds: float) -> float:
+        number, remaining = _window(time.time(), window_seconds)
+        entry = self._entry(key, number)
+        entry[2] += 1
+        return entry[1] * remaining + entry[2]
+
+    async def lock(self, key: str, window_seconds: float, seconds: float) -> None:
+        entry = self._entry(key, _window(time.time(), window_seconds)[0])
+        entry[1] = entry[2] = 0
+        entry[3] = time.time() + seconds
+
+    async def reset(self, key: str, window_seconds: float) -> None:
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry[1] = entry[2] = 0
+
+
+class RedisLoginAttemptBackend(LoginAttemptBackend):
+    """Redis counters shared by every worker, falling back to process memory while Redis is down."""
+
+    def __init__(self, client: Any, prefix: str = "login", retry_after_seconds: float = 5.0):
+        self.client = client
+        self.prefix = prefix
+        self.fallback = MemoryLoginAttemptBackend()
+        self.retry_after_seconds = retry_after_seconds
+        self._down_until = 0.0
+
+    def _available(self) -> bool:
+        return time.monotonic() >= self._down_until
+
+    def _mark_down(self, exc: Exception) -> None:
+        if self._available():
+            logger.warning("Redis unavailable, tracking failed logins per process: %s", exc)
+        self._down_until = time.monotonic() + self.retry_after_seconds
+
+    def _counter(self, key: str, number: int) -> str:
+        return f"{self.prefix}:{key}:{number}"
+
+    def _lock(self, key: str) -> str:
+        return f"{self.prefix}:{key}:lock"
+
+    async def get(self, key: str, window_seconds: float) -> Tuple[float, float]:
+        if not self._available():
+            return await self.fallback.get(key, window_seconds)
+        now = time.time()
+        number, remaining = _window(now, window_seconds)
+        try:
+            async with self.client.pipeline(transaction=False) as pipe:
+                pipe.get(self._counter(key, number))
+                pipe.get(self._counter(key, number - 1))
+                pipe.get(self._lock(key))
+                current, previous, locked_until = await pipe.execute()
+        except (RedisError, OSError) as exc:
+            self._mark_down(exc)
+            return await self.fallback.get(key, window_seconds)
+        failures = int(previous or 0) * remaining + int(current or 0)
+        # The lock holds its expiry time, so one GET tells how long is left
+        return failures, max(float(locked_until or 0) - now, 0.0)
+
+    async def add_failure(self, key: str, window_seconds: float) -> float:
+        if not self._available():
+            return await self.fallback.add_failure(key, window_seconds)
+        number, remaining = _window(time.time(), window_seconds)
+        current_key = self._counter(key, number)
+        try:
+            async with self.client.pipeline(transaction=False) as pipe:
+                pipe.incr(current_key)
+                pipe.expire(current_key, math.ceil(window_seconds * 2))
+                pipe.get(self._counter(key, number - 1))
+                current, _, previous = await pipe.execute()
+        except (RedisError, OSError) as exc:
+            self._mark_down(exc)
+            return await self.fallback.add_failure(key, window_seconds)
+        return int(previous or 0) * remaining + int(current)
+
+    async def lock(self, key: str, window_seconds: float, seconds: float) -> None:
+        if not self._available():
+            return await self.fallback.lock(key, window_seconds, seconds)
+        locked_until = time.time() + seconds
+        try:
+            async with self.client.pipeline(transaction=False) as pipe:
+                pipe.set(self._lock(key), str(locked_until), ex=math.ceil(seconds))
+                pipe.delete(*self._counter_keys(key, window_seconds))
+                await pipe.execute()
+        except (RedisError, OSError) as exc:
+            self._mark_down(exc)
+            await self.fallback.lock(key, window_seconds, seconds)
+
+    async def reset(self, key: str, window_seconds: float) -> None:
+        if not self._available():
+            return await self.fallback.reset(key, window_seconds)
+        try:
+            await self.client.delete(*self._counter_keys(key, window_seconds))
+        except (RedisError, OSError) as exc:
+            self._mark_down(exc)
+            await self.fallback.reset(key, window_seconds)
+
+    def _counter_keys(self, key: str, window_seconds: float) -> List[str]:
+        number, _ = _window(time.time(), window_seconds)
+        return [self._counter(key, number), self._counter(key, number - 1)]
+
+
+class LoginAttemptTracker:
+    """
+    Lockout policy over a LoginAttemptBackend.
+
+    Usage:
+        failures, locked_for = await login_attempts.check(user_id)
+        if locked_for:
+            ...  # reject without checking the password
+        if not password_valid:
+            await login_attempts.record_failure(user_id)
+        elif failures:
+            await login_attempts.reset(user_id)
+    """
+
+    def __init__(
+        self,
+        backend: LoginAttemptBackend,
+        max_failures: int,
+        window_seconds: float,
+        lockout_seconds: float
+    ):
+        self.backend = backend
+        self.max_failures = max_failures
+        self.window_seconds = window_seconds
+        self.lockout_seconds = lockout_seconds
+        self.failures = 0
+        self.lockouts = 0
+        self.rejected = 0
+
+    async def check(self, key: Any) -> Tuple[float, float]:
+        """Failures in the window and seconds the account stays locked."""
+        failures, locked_for = await self.backend.get(str(key), self.window_seconds)
+        if locked_for:
+            self.rejected += 1
+        return failures, locked_for
+
+    async def record_failure(self, key: Any) -> float:
+        """Count a wrong password; returns the lockout in seconds if this one locked the account."""
+        self.failures += 1
+        failures = await self.backend.add_failure(str(key), self.window_seconds)
+        if failures < self.max_failures:
+            return 0.0
+        await self.backend.lock(str(key), self.window_seconds, self.lockout_seconds)
+        self.lockouts += 1
+        return self.lockout_seconds
+
+    async def reset(self, key: Any) -> None:
+        """Forget an account's failures after a successful login."""
+        await self.backend.reset(str(key), self.window_seconds)
+
+    def stats(self) -> Dict[str, Any]:
+        """Failure and lockout counters for this process."""
+        return {
+            "backend": type(self.backend).__name__,
+            "max_failures": self.max_failures,
+            "window_seconds": self.window_seconds,
+            "lockout_seconds": self.lockout_seconds,
+            "failures": self.failures,
+            "lockouts": self.lockouts,
+            "rejected_while_locked": self.rejected
+        }
+
+
+def create_login_attempt_tracker() -> LoginAttemptTracker:
+    """Build the process-wide failed-login tracker from settings."""
+    if settings.LOGIN_ATTEMPTS_BACKEND == "redis":
+        backend: LoginAttemptBackend = RedisLoginAttemptBackend(redis_asyncio.from_url(
+            settings.REDIS_URL,
+            socket_connect_timeout=0.5,
+            socket_timeout=0.5
+        ))
+    elif settings.LOGIN_ATTEMPTS_BACKEND == "fake-redis":
+        backend = RedisLoginAttemptBackend(FakeRedis())
+    else:
+        backend = MemoryLoginAttemptBackend()
+    return LoginAttemptTracker(
+        backend,
+        max_failures=settings.LOGIN_MAX_FAILED_ATTEMPTS,
+        window_seconds=settings.LOGIN_FAILURE_WINDOW_SECONDS,
+        lockout_seconds=settings.LOGIN_LOCKOUT_SECONDS
+    )
+
+
+login_attempts = create_login_attempt_tracker()
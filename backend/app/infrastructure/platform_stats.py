@@ -0,0 +1,177 @@
+"""
+Incrementally maintained platform statistics.
+Repositories report domain events (user created, match or dispute status
+changed, transactions completed) as counter deltas once their unit of work
+commits. The deltas are buffered in memory, bucketed by the second they
+were buffered in, and a background worker adds them to the shared
+platform_counters table in one upsert every STATS_FLUSH_SECONDS, reads the
+totals back, and every STATS_RECONCILE_SECONDS recounts the source tables
+to repair any drift. A recount already includes every event committed
+before it, so buckets older than the last reconcile are dropped rather
+than flushed on top of it.
+
+The admin dashboard is served from the last totals read plus this
+process's unflushed deltas, without touching the database.
+"""
+import time
+from collections import Counter
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infrastructure.database.session import on_commit
+from app.infrastructure.repositories.stats_repository_impl import RECONCILED_AT
+
+ACTIVE_MATCH_STATUSES = ("ACCEPTED", "IN_PROGRESS")
+OPEN_DISPUTE_STATUSES = ("PENDING", "UNDER_REVIEW")
+CLOSED_DISPUTE_STATUSES = ("RESOLVED", "DISMISSED")
+
+
+class PlatformStats:
+    """Per-process view of the shared counters plus deltas not flushed yet."""
+
+    def __init__(self):
+        self._totals: Dict[str, int] = {}
+        # Unflushed deltas by the epoch second they were buffered in
+        self._pending: Dict[int, Counter] = {}
+        self.loaded_at: Optional[float] = None
+        self.events = 0
+        self.flushes = 0
+        self.stale_buckets = 0
+        self.reconciles = 0
+        self.last_drift: Dict[str, int] = {}
+
+    def add_on_commit(self, session: AsyncSession, deltas: Dict[str, int]) -> None:
+        """Buffer deltas once the session's transaction commits."""
+        deltas = {name: delta for name, delta in deltas.items() if delta}
+        if deltas:
+            on_commit(session, lambda: self._add(deltas))
+
+    def _add(self, deltas: Dict[str, int]) -> None:
+        self._pending.setdefault(int(time.time()), Counter()).update(deltas)
+        self.events += 1
+
+    def user_created(self, session: AsyncSession, account_status: str) -> None:
+        """Count a new account."""
+        self.add_on_commit(session, {"users.total": 1, f"users.status.{account_status}": 1})
+
+    def user_status_changed(self, session: AsyncSession, old: str, new: str) -> None:
+        """Move an account between status counters."""
+        if old != new:
+            self.add_on_commit(session, {f"users.status.{old}": -1, f"users.status.{new}": 1})
+
+    def match_status_changed(self, session: AsyncSession, old: Optional[str], new: str) -> None:
+        """Move a match between status counters; old is None for a new match."""
+        self._status_changed(session, "matches", old, new)
+
+    def dispute_status_changed(self, session: AsyncSession, old: Optional[str], new: str) -> None:
+        """Move a dispute between status counters; old is None for a new dispute."""
+        self._status_changed(session, "disputes", old, new)
+
+    def _status_changed(self, session: AsyncSession, entity: str, old: Optional[str], new: str) -> None:
+        if old == new:
+            return
+        deltas = {f"{entity}.status.{new}": 1}
+        if old is not None:
+            deltas[f"{entity}.status.{old}"] = -1
+        self.add_on_commit(session, deltas)
+
+    def transactions_completed(self, session: AsyncSession, transactions: Iterable[Tuple[str, int]]) -> None:
+        """Count completed transactions given as (type, amount_cents) pairs."""
+        deltas: Counter = Counter()
+        for transaction_type, amount_cents in transactions:
+            deltas[f"transactions.count.{transaction_type}"] += 1
+            deltas[f"transactions.volume_cents.{transaction_type}"] += abs(amount_cents)
+        self.add_on_commit(session, deltas)
+
+    def take_pending(self) -> Dict[int, Dict[str, int]]:
+        """Hand the buffered deltas, keyed by the second they were buffered in, to the flusher."""
+        pending, self._pending = self._pending, {}
+        buckets = {
+            second: {name: delta for name, delta in deltas.items() if delta}
+            for second, deltas in pending.items()
+        }
+        return {second: deltas for second, deltas in buckets.items() if deltas}
+
+    def restore_pending(self, buckets: Dict[int, Dict[str, int]]) -> None:
+        """Put back deltas whose flush failed so the next pass retries them."""
+        for second, deltas in buckets.items():
+            self._pending.setdefault(second, Counter()).update(deltas)
+
+    def load(self, totals: Dict[str, int]) -> None:
+        """Replace the shared totals with a fresh read, dropping deltas the last reconcile already counted."""
+        self._totals = totals
+        self.loaded_at = time.time()
+        if self.reconciled_at is not None:
+            self._pending = {
+                second: deltas for second, deltas in self._pending.items()
+                if second >= self.reconciled_at
+            }
+
+    @property
+    def reconciled_at(self) -> Optional[int]:
+        """Epoch second of the last reconcile, as of the last load."""
+        return self._totals.get(RECONCILED_AT)
+
+    def _unflushed(self) -> Counter:
+        unflushed: Counter = Counter()
+        for deltas in self._pending.values():
+            unflushed.update(deltas)
+        return unflushed
+
+    def _by_suffix(self, prefix: str, unflushed: Counter) -> Dict[str, int]:
+        names = {n for n in self._totals if n.startswith(prefix)} | {n for n in unflushed if n.startswith(prefix)}
+        return {name[len(prefix):]: self._totals.get(name, 0) + unflushed[name] for name in sorted(names)}
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Dashboard figures; never touches the database."""
+        unflushed = self._unflushed()
+        users = self._by_suffix("users.status.", unflushed)
+        matches = self._by_suffix("matches.status.", unflushed)
+        disputes = self._by_suffix("disputes.status.", unflushed)
+        counts = self._by_suffix("transactions.count.", unflushed)
+        volumes = self._by_suffix("transactions.volume_cents.", unflushed)
+
+        return {
+            "users": {
+                "total": self._totals.get("users.total", 0) + unflushed["users.total"],
+                "active": users.get("ACTIVE", 0),
+                "by_status": users
+            },
+            "matches": {
+                "total": sum(matches.values()),
+                "active": sum(matches.get(s, 0) for s in ACTIVE_MATCH_STATUSES),
+                "completed": matches.get("COMPLETED", 0),
+                "by_status": matches
+            },
+            "transactions": {
+                "total_volume_cents": sum(volumes.values()),
+                "total_count": sum(counts.values()),
+                "by_type": {
+                    t: {"count": counts.get(t, 0), "volume_cents": volumes.get(t, 0)}
+                    for t in sorted(set(counts) | set(volumes))
+                }
+            },
+            "disputes": {
+                "pending": sum(disputes.get(s, 0) for s in OPEN_DISPUTE_STATUSES),
+                "resolved": sum(disputes.get(s, 0) for s in CLOSED_DISPUTE_STATUSES),
+                "by_status": disputes
+            },
+            "as_of": self.loaded_at,
+            "reconciled_at": self.reconciled_at
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """Event, flush and reconcile counters for this process."""
+        return {
+            "events": self.events,
+            "pending_counters": len(self._unflushed()),
+            "flushes": self.flushes,
+            "stale_buckets": self.stale_buckets,
+            "reconciles": self.reconciles,
+            "last_drift": self.last_drift,
+            "loaded_at": self.loaded_at
+        }
+
+
+platform_stats = PlatformStats()
@@ -0,0 +1,203 @@
+"""
+Short-TTL cache of authenticated principals.
+get_current_user would otherwise load the user row on every authenticated
+request. Entries live for AUTH_PRINCIPAL_CACHE_TTL_SECONDS and are dropped
+as soon as a committed change touches account_status, locked_until or
+deleted_at.
+
+With CACHE_BACKEND=redis the invalidation is also published on a Redis
+channel that every worker subscribes to, so a ban or lock takes effect on
+the next request whichever worker serves it. A worker that is not
+subscribed (Redis down, or still connecting) cannot hear invalidations, so
+it bypasses its cache entirely and clears it when it subscribes again.
+"""
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import replace
+from typing import Any, Dict, Optional, Set, Tuple
+from uuid import UUID
+
+import redis.asyncio as redis_asyncio
+from redis.exceptions import RedisError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.domain.entities.user import User
+from app.infrastructure.cache import FakeRedis
+from app.infrastructure.database.session import on_commit
+
+logger = logging.getLogger(__name__)
+
+# Fields whose change must take effect on the next request
+SECURITY_FIELDS = ("account_status", "locked_until", "deleted_at")
+
+# Redis channel carrying the ids of users to drop from every worker's cache
+INVALIDATION_CHANNEL = "principal-invalidations"
+
+# Wait before resubscribing after the channel connection fails
+RESUBSCRIBE_SECONDS = 1.0
+
+
+class PrincipalCache:
+    """
+    Bounded per-process TTL cache of User entities keyed by user id.
+
+    client is the Redis connection invalidations are published and heard
+    on; without one the cache is local to the process.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: int,
+        max_entries: int = 50000,
+        client: Optional[Any] = None,
+        channel: str = INVALIDATION_CHANNEL
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.client = client
+        self.channel = channel
+        self._entries: "OrderedDict[str, Tuple[float, User]]" = OrderedDict()
+        # Entries are only trusted while invalidations from other workers can be heard
+        self.subscribed = client is None
+        self._listener: Optional[asyncio.Task] = None
+        self._publishing: Set[asyncio.Task] = set()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.published = 0
+        self.publish_failures = 0
+        self.received = 0
+
+    def get(self, user_id: Any) -> Optional[User]:
+        """Return a copy of the cached user, or None if missing, expired or not trusted."""
+        if not self.subscribed:
+            self.misses += 1
+            return None
+        key = str(user_id)
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self.hits += 1
+        # Callers get their own copy so request code cannot mutate the cached entity
+        return replace(entry[1])
+
+    def put(self, user: User) -> None:
+        """Cache a user loaded from the database."""
+        if self.ttl_seconds <= 0 or not self.subscribed:
+            return
+        key = str(user.id)
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, replace(user))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: Any) -> None:
+        """Drop a user from this process so its next request reloads it."""
+        if self._entries.pop(str(user_id), None) is not None:
+            self.invalidations += 1
+
+    def invalidate_on_commit(self, session: AsyncSession, user_id: UUID) -> None:
+        """Drop a user from every worker once the session's transaction commits (never on rollback)."""
+        def invalidate_everywhere() -> None:
+            self.invalidate(user_id)
+            if self.client is not None:
+                task = asyncio.get_running_loop().create_task(self._publish(str(user_id)))
+                self._publishing.add(task)
+                task.add_done_callback(self._publishing.discard)
+
+        on_commit(session, invalidate_everywhere)
+
+    async def _publish(self, user_id: str) -> None:
+        try:
+            await self.client.publish(self.channel, user_id)
+            self.published += 1
+        except (RedisError, OSError) as exc:
+            # Workers that cannot hear us share our Redis and have stopped trusting their entries
+            self.publish_failures += 1
+            logger.error("could not publish principal invalidation for %s: %s", user_id, exc)
+
+    async def _listen(self) -> None:
+        while True:
+            pubsub = self.client.pubsub()
+            try:
+                await pubsub.subscribe(self.channel)
+                # Wait for the confirmation: only then is every later invalidation delivered
+                while await pubsub.get_message(timeout=RESUBSCRIBE_SECONDS) is None:
+                    pass
+                # Anything published while we were not listening was missed
+                self.clear()
+                self.subscribed = True
+                while True:
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=RESUBSCRIBE_SECONDS)
+                    if message is not None:
+                        data = message["data"]
+                        self.invalidate(data.decode() if isinstance(data, bytes) else data)
+                        self.received += 1
+            except (RedisError, OSError) as exc:
+                if self.subscribed:
+                    logger.error("principal invalidation channel lost, bypassing the cache: %s", exc)
+            finally:
+                self.subscribed = False
+                try:
+                    await pubsub.aclose()
+                except (RedisError, OSError):
+                    pass
+            await asyncio.sleep(RESUBSCRIBE_SECONDS)
+
+    def start(self) -> None:
+        """Subscribe to invalidations from other workers on the running loop."""
+        if self.client is not None and self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        """Stop listening; the cache is bypassed until start() is called again."""
+        listener, self._listener = self._listener, None
+        if listener is not None:
+            listener.cancel()
+            await asyncio.gather(listener, return_exceptions=True)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "ttl_seconds": self.ttl_seconds,
+            "shared": self.client is not None,
+            "subscribed": self.subscribed,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "published": self.published,
+            "publish_failures": self.publish_failures,
+            "received": self.received
+        }
+
+
+def create_principal_cache() -> PrincipalCache:
+    """Build the process-wide principal cache, sharing invalidations through Redis like the cache layer."""
+    if settings.CACHE_BACKEND == "redis":
+        client = redis_asyncio.from_url(
+            settings.REDIS_URL,
+            socket_connect_timeout=0.5,
+            socket_timeout=0.5,
+            health_check_interval=10
+        )
+    elif settings.CACHE_BACKEND == "fake-redis":
+        client = FakeRedis()
+    else:
+        client = None
+    return PrincipalCache(ttl_seconds=settings.AUTH_PRINCIPAL_CACHE_TTL_SECONDS, client=client)
+
+
+principal_cache = create_principal_cache()
@@ -0,0 +1,214 @@
+"""
+Sliding-window rate limiter.
+Each key keeps two counters, the current and the previous fixed window;
+the rate is estimated as previous * (unelapsed share of the window) +
+current. That approximates a true sliding window in O(1) time and memory
+per key, with no burst at window boundaries.
+
+A request names several limits (per IP, per user, ...) and is admitted
+only if all of them have room; a rejected request is not counted against
+any of them.
+
+Backends:
+    RedisRateLimitBackend   shared across workers, one pipelined round trip
+                            per request; degrades to an in-process
+                            MemoryRateLimitBackend while Redis is unreachable
+    MemoryRateLimitBackend  per-process, for single-node deployments
+"""
+import logging
+import math
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, List, Tuple
+
+import redis.asyncio as redis_asyncio
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.infrastructure.cache import FakeRedis
+
+logger = logging.getLogger(__name__)
+
+# (key, max requests per window)
+Limit = Tuple[str, int]
+
+
+def _window(now: float, window_seconds: float) -> Tuple[int, float]:
+    """Current window number and the share of it still to elapse."""
+    number = int(now // window_seconds)
+    return number, 1.0 - (now - number * window_seconds) / window_seconds
+
+
+def _retry_after(previous: int, current: int, limit: int, remaining: float, window_seconds: float) -> float:
+    """Seconds until one more request would fit under limit."""
+    if current + 1 > limit or previous == 0:
+        return remaining * window_seconds  # Wait for the next window
+    # The previous window's weight decays linearly; find when it leaves room
+    needed = (limit - current - 1) / previous
+    return max(remaining - needed, 0.0) * window_seconds
+
+
+class RateLimitBackend(ABC):
+    """Interface for rate limit counter storage."""
+
+    @abstractmethod
+    async def acquire(self, limits: List[Limit], window_seconds: float) -> float:
+        """
+        Count one request against every limit if all of them have room.
+
+        Returns:
+            0.0 if the request was admitted, otherwise seconds until it
+            would be (and nothing was counted)
+        """
+        pass
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """Bounded in-process counters; least recently used keys are evicted first."""
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        # key -> [window number, previous count, current count]
+        self._counters: "OrderedDict[str, List[int]]" = OrderedDict()
+
+    def _counts(self, key: str, number: int) -> List[int]:
+        entry = self._counters.get(key)
+        if entry is None:
+            entry = self._counters[key] = [number, 0, 0]
+        elif entry[0] != number:
+            # Roll forward: the old current window is the new previous one,
+            # unless more than a whole window has passed
+            entry[1] = entry[2] if entry[0] == number - 1 else 0
+            entry[0], entry[2] = number, 0
+        self._counters.move_to_end(key)
+        return entry
+
+    async def acquire(self, limits: List[Limit], window_seconds: float) -> float:
+        number, remaining = _window(time.time(), window_seconds)
+        entries = [(self._counts(key, number), limit) for key, limit in limits]
+
+        retry_after = 0.0
+        for (_, previous, current), limit in entries:
+            if previous * remaining + current + 1 > limit:
+                retry_after = max(retry_after, _retry_after(previous, current, limit, remaining, window_seconds))
+        if not retry_after:
+            for entry, _ in entries:
+                entry[2] += 1
+
+        while len(self._counters) > self.max_keys:
+            self._counters.popitem(last=False)
+        return retry_after
+
+
+class RedisRateLimitBackend(RateLimitBackend):
+    """Redis counters shared by every worker, falling back to process memory while Redis is down."""
+
+    def __init__(self, client: Any, prefix: str = "ratelimit", retry_after_seconds: float = 5.0):
+        self.client = client
+        self.prefix = prefix
+        self.fallback = MemoryRateLimitBackend()
+        self.retry_after_seconds = retry_after_seconds
+        self._down_until = 0.0
+
+    def _available(self) -> bool:
+        return time.monotonic() >= self._down_until
+
+    def _mark_down(self, exc: Exception) -> None:
+        if self._available():
+            logger.warning("Redis unavailable, rate limiting per process: %s", exc)
+        self._down_until = time.monotonic() + self.retry_after_seconds
+
+    async def acquire(self, limits: List[Limit], window_seconds: float) -> float:
+        if not self._available():
+            return await self.fallback.acquire(limits, window_seconds)
+
+        number, remaining = _window(time.time(), window_seconds)
+        ttl = math.ceil(window_seconds * 2)
+        current_keys = [f"{self.prefix}:{key}:{number}" for key, _ in limits]
+        try:
+            # Count optimistically and read the previous windows in one round trip
+            async with self.client.pipeline(transaction=False) as pipe:
+                for (key, _), current_key in zip(limits, current_keys):
+                    pipe.incr(current_key)
+                    pipe.expire(current_key, ttl)
+                    pipe.get(f"{self.prefix}:{key}:{number - 1}")
+                replies = await pipe.execute()
+
+            retry_after = 0.0
+            for i, (_, limit) in enumerate(limits):
+                current, previous = int(replies[i * 3]), int(replies[i * 3 + 2] or 0)
+                if previous * remaining + current > limit:
+                    retry_after = max(
+                        retry_after,
+                        _retry_after(previous, current - 1, limit, remaining, window_seconds)
+                    )
+            if retry_after:
+                # Rejected requests do not count; undo every increment
+                async with self.client.pipeline(transaction=False) as pipe:
+                    for current_key in current_keys:
+                        pipe.decr(current_key)
+                    await pipe.execute()
+            return retry_after
+        except (RedisError, OSError) as exc:
+            self._mark_down(exc)
+            return await self.fallback.acquire(limits, window_seconds)
+
+
+class RateLimiter:
+    """
+    Per-minute request limits over a RateLimitBackend.
+
+    Usage:
+        retry_after = await rate_limiter.check([("ip:1.2.3.4", 100), ("user:42", 100)])
+        if retry_after:
+            ...  # respond 429
+    """
+
+    window_seconds = 60.0
+
+    def __init__(self, backend: RateLimitBackend, enabled: bool = True):
+        self.backend = backend
+        self.enabled = enabled
+        self.admitted = 0
+        self.limited = 0
+
+    async def check(self, limits: List[Limit]) -> float:
+        """Admit and count a request, or return seconds until it would be admitted."""
+        if not self.enabled or not limits:
+            return 0.0
+        retry_after = await self.backend.acquire(limits, self.window_seconds)
+        if retry_after:
+            self.limited += 1
+        else:
+            self.admitted += 1
+        return retry_after
+
+    def stats(self) -> Dict[str, Any]:
+        """Admitted/limited counters for this process."""
+        return {
+            "backend": type(self.backend).__name__,
+            "enabled": self.enabled,
+            "per_minute": settings.RATE_LIMIT_PER_MINUTE,
+            "auth_per_minute": settings.RATE_LIMIT_AUTH_PER_MINUTE,
+            "admitted": self.admitted,
+            "limited": self.limited
+        }
+
+
+def create_rate_limiter() -> RateLimiter:
+    """Build the process-wide rate limiter from settings."""
+    if settings.RATE_LIMIT_BACKEND == "redis":
+        backend: RateLimitBackend = RedisRateLimitBackend(redis_asyncio.from_url(
+            settings.REDIS_URL,
+            socket_connect_timeout=0.5,
+            socket_timeout=0.5
+        ))
+    elif settings.RATE_LIMIT_BACKEND == "fake-redis":
+        backend = RedisRateLimitBackend(FakeRedis())
+    else:
+        backend = MemoryRateLimitBackend()
+    return RateLimiter(backend, enabled=settings.RATE_LIMIT_ENABLED)
+
+
+rate_limiter = create_rate_limiter()
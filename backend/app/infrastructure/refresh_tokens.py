@@ -0,0 +1,336 @@
+"""
+Refresh-token revocation and rotation families.
+Every refresh token carries a jti (its own id) and a fam claim (the id of
+the login it descends from). Refreshing consumes the presented jti and
+issues a new token in the same family; presenting a consumed jti again
+means the token was copied, so the whole family is revoked. Logout revokes
+the family. Only consumed and revoked ids are stored, each until the token
+it belongs to would have expired anyway, so the store grows with refresh
+and logout traffic, not with the number of sessions.
+
+The backend is authoritative: consuming a jti is one atomic operation that
+also reports a revoked family. In front of it, each process keeps a Bloom
+filter of the ids it has seen revoked, so replays and logged-out sessions
+hitting the same process are recognised from memory; a filter miss goes
+straight to the consuming write.
+
+Backends:
+    RedisRefreshTokenBackend   shared across workers, one pipelined round
+                               trip per refresh; fails closed while Redis is
+                               down, raising RefreshTokenStoreUnavailable
+    MemoryRefreshTokenBackend  per-process, for single-node deployments
+
+A per-process fallback would let a token consumed or revoked in Redis be
+refreshed again on another worker, so the Redis backend never degrades to
+memory: refreshes are rejected and logouts fail until Redis is back.
+"""
+import hashlib
+import logging
+import math
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterable, List, Tuple
+
+import redis.asyncio as redis_asyncio
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.infrastructure.cache import FakeRedis
+
+logger = logging.getLogger(__name__)
+
+# Outcomes of RefreshTokenBackend.consume
+CONSUMED = "consumed"
+REUSED = "reused"
+REVOKED = "revoked"
+
+
+class RefreshTokenStoreUnavailable(Exception):
+    """The shared store could not be reached; the token's state is unknown."""
+
+    def __init__(self):
+        super().__init__("refresh token store unavailable")
+
+
+def refresh_token_ids(token: str, payload: Dict[str, Any]) -> Tuple[str, str]:
+    """(jti, family) of a decoded refresh token; tokens issued without a jti are keyed by their hash."""
+    jti = payload.get("jti") or hashlib.sha256(token.encode()).hexdigest()
+    return jti, payload.get("fam") or jti
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings; no false negatives."""
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.bits = max(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2), 8)
+        self.hashes = max(round(self.bits / capacity * math.log(2)), 1)
+        self.count = 0
+        self._array = bytearray((self.bits + 7) // 8)
+
+    def _positions(self, item: str) -> Iterable[int]:
+        # Double hashing: k positions from one 128-bit digest
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.bits for i in range(self.hashes))
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self._array[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._array[p >> 3] & (1 << (p & 7)) for p in self._positions(item))
+
+
+class RefreshTokenBackend(ABC):
+    """Interface for consumed and revoked token id storage."""
+
+    @abstractmethod
+    async def consume(self, jti: str, family: str, expires_at: float) -> str:
+        """
+        Mark jti used unless it already was.
+
+        Returns:
+            CONSUMED, REUSED if jti was already used or revoked, or REVOKED
+            if its family was revoked
+        """
+        pass
+
+    @abstractmethod
+    async def revoke(self, ids: List[str], expires_at: float) -> None:
+        """Revoke token or family ids until expires_at (epoch seconds)."""
+        pass
+
+    @abstractmethod
+    async def is_revoked(self, ids: List[str]) -> bool:
+        """Whether any of the ids is consumed or revoked."""
+        pass
+
+
+class MemoryRefreshTokenBackend(RefreshTokenBackend):
+    """In-process id -> expiry map, swept as it grows."""
+
+    def __init__(self):
+        self._expires: Dict[str, float] = {}
+        self._sweep_at = 1024
+
+    def _live(self, item: str, now: float) -> bool:
+        expires_at = self._expires.get(item)
+        return expires_at is not None and expires_at > now
+
+    def _put(self, item: str, expires_at: float) -> None:
+        self._expires[item] = max(expires_at, self._expires.get(item, 0.0))
+        if len(self._expires) >= self._sweep_at:
+            # Amortised O(1): sweep only once the map has doubled since the last sweep
+            now = time.time()
+            self._expires = {k: e for k, e in self._expires.items() if e > now}
+            self._sweep_at = max(len(self._expires) * 2, 1024)
+
+    async def consume(self, jti: str, family: str, expires_at: float) -> str:
+        now = time.time()
+        if self._live(jti, now):
+            return REUSED
+        self._put(jti, expires_at)
+        return REVOKED if self._live(family, now) else CONSUMED
+
+    async def revoke(self, ids: List[str], expires_at: float) -> None:
+        for item in ids:
+            self._put(item, expires_at)
+
+    async def is_revoked(self, ids: List[str]) -> bool:
+        now = time.time()
+        return any(self._live(item, now) for item in ids)
+
+
+class RedisRefreshTokenBackend(RefreshTokenBackend):
+    """Redis keys shared by every worker; raises RefreshTokenStoreUnavailable while Redis is down."""
+
+    def __init__(self, client: Any, prefix: str = "refresh", retry_after_seconds: float = 5.0):
+        self.client = client
+        self.prefix = prefix
+        self.retry_after_seconds = retry_after_seconds
+        self._down_until = 0.0
+
+    def _check_available(self) -> None:
+        # After a failure, fail fast for a while instead of waiting on timeouts
+        if time.monotonic() < self._down_until:
+            raise RefreshTokenStoreUnavailable()
+
+    def _mark_down(self, exc: Exception) -> RefreshTokenStoreUnavailable:
+        if time.monotonic() >= self._down_until:
+            logger.error("Redis unavailable, rejecting refreshes and logouts: %s", exc)
+        self._down_until = time.monotonic() + self.retry_after_seconds
+        return RefreshTokenStoreUnavailable()
+
+    def _key(self, item: str) -> str:
+        return f"{self.prefix}:{item}"
+
+    @staticmethod
+    def _ttl(expires_at: float) -> int:
+        return max(math.ceil(expires_at - time.time()), 1)
+
+    async def consume(self, jti: str, family: str, expires_at: float) -> str:
+        self._check_available()
+        try:
+            async with self.client.pipeline(transaction=False) as pipe:
+                pipe.set(self._key(jti), 1, ex=self._ttl(expires_at), nx=True)
+                pipe.exists(self._key(family))
+                first_use, family_revoked = await pipe.execute()
+        except (RedisError, OSError) as exc:
+            raise self._mark_down(exc) from exc
+        if not first_use:
+            return REUSED
+        return REVOKED if family_revoked else CONSUMED
+
+    async def revoke(self, ids: List[str], expires_at: float) -> None:
+        self._check_available()
+        try:
+            async with self.client.pipeline(transaction=False) as pipe:
+                for item in ids:
+                    pipe.set(self._key(item), 1, ex=self._ttl(expires_at))
+                await pipe.execute()
+        except (RedisError, OSError) as exc:
+            raise self._mark_down(exc) from exc
+
+    async def is_revoked(self, ids: List[str]) -> bool:
+        self._check_available()
+        try:
+            return bool(await self.client.exists(*[self._key(item) for item in ids]))
+        except (RedisError, OSError) as exc:
+            raise self._mark_down(exc) from exc
+
+
+class RefreshTokenStore:
+    """
+    Rotation and revocation over a RefreshTokenBackend, fronted by a Bloom filter.
+
+    Usage:
+        status = await refresh_tokens.rotate(jti, family, payload["exp"])
+        if status != CONSUMED:
+            ...  # reject the refresh
+        await refresh_tokens.revoke_family(family)  # logout
+    """
+
+    def __init__(
+        self,
+        backend: RefreshTokenBackend,
+        token_lifetime_seconds: float,
+        bloom_capacity: int,
+        bloom_error_rate: float
+    ):
+        self.backend = backend
+        self.token_lifetime_seconds = token_lifetime_seconds
+        self.bloom_capacity = bloom_capacity
+        self.bloom_error_rate = bloom_error_rate
+        # Two generations: once the current filter is full it becomes the
+        # previous one, so ids are remembered for at least bloom_capacity additions
+        self._filters = [BloomFilter(bloom_capacity, bloom_error_rate)]
+        self.rotations = 0
+        self.reuses = 0
+        self.revocations = 0
+        self.bloom_hits = 0
+        self.bloom_false_positives = 0
+
+    def _remember(self, *ids: str) -> None:
+        current = self._filters[0]
+        if current.count >= self.bloom_capacity:
+            current = BloomFilter(self.bloom_capacity, self.bloom_error_rate)
+            self._filters = [current, self._filters[0]]
+        for item in ids:
+            current.add(item)
+
+    def might_be_revoked(self, *ids: str) -> bool:
+        """Local membership check; False means this process has not seen any of the ids revoked."""
+        return any(item in bloom for bloom in self._filters for item in ids)
+
+    async def rotate(self, jti: str, family: str, expires_at: float) -> str:
+        """
+        Consume a refresh token so it cannot be used again.
+
+        Returns:
+            CONSUMED if the caller may issue the next token in the family,
+            REUSED if the token was used before (the family is now revoked),
+            or REVOKED if the family was logged out
+
+        Raises:
+            RefreshTokenStoreUnavailable: the backend could not be reached;
+                the refresh must be rejected
+        """
+        # A family id is its first token's jti; keep the two kinds apart
+        jti, family = f"t:{jti}", f"f:{family}"
+        if self.might_be_revoked(jti, family):
+            self.bloom_hits += 1
+            if await self.backend.is_revoked([family]):
+                return await self._reject(REVOKED, family)
+            if await self.backend.is_revoked([jti]):
+                return await self._reject(REUSED, family)
+            self.bloom_false_positives += 1
+
+        status = await self.backend.consume(jti, family, expires_at)
+        self._remember(jti)
+        if status != CONSUMED:
+            return await self._reject(status, family)
+        self.rotations += 1
+        return status
+
+    async def _reject(self, status: str, family: str) -> str:
+        if status == REUSED:
+            # A used token came back: someone holds a copy, so end the whole session
+            self.reuses += 1
+            await self._revoke_family(family)
+        else:
+            self._remember(family)
+        return status
+
+    async def revoke_family(self, family: str) -> None:
+        """
+        Revoke every token descended from one login.
+
+        Raises:
+            RefreshTokenStoreUnavailable: the revocation was not stored
+        """
+        await self._revoke_family(f"f:{family}")
+
+    async def _revoke_family(self, family: str) -> None:
+        # Kept as long as a token issued in the family right now could live
+        await self.backend.revoke([family], time.time() + self.token_lifetime_seconds)
+        self._remember(family)
+        self.revocations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Rotation, reuse and Bloom filter counters for this process."""
+        return {
+            "backend": type(self.backend).__name__,
+            "rotations": self.rotations,
+            "reuses_detected": self.reuses,
+            "families_revoked": self.revocations,
+            "bloom_bits": sum(bloom.bits for bloom in self._filters),
+            "bloom_entries": sum(bloom.count for bloom in self._filters),
+            "bloom_hits": self.bloom_hits,
+            "bloom_false_positives": self.bloom_false_positives
+        }
+
+
+def create_refresh_token_store() -> RefreshTokenStore:
+    """Build the process-wide refresh token store from settings."""
+    if settings.REFRESH_TOKEN_BACKEND == "redis":
+        backend: RefreshTokenBackend = RedisRefreshTokenBackend(redis_asyncio.from_url(
+            settings.REDIS_URL,
+            socket_connect_timeout=0.5,
+            socket_timeout=0.5
+        ))
+    elif settings.REFRESH_TOKEN_BACKEND == "fake-redis":
+        backend = RedisRefreshTokenBackend(FakeRedis())
+    else:
+        backend = MemoryRefreshTokenBackend()
+    return RefreshTokenStore(
+        backend,
+        token_lifetime_seconds=settings.JWT_REFRESH_TOKEN_EXPIRE_DAYS * 86400,
+        bloom_capacity=settings.REFRESH_TOKEN_BLOOM_CAPACITY,
+        bloom_error_rate=settings.REFRESH_TOKEN_BLOOM_ERROR_RATE
+    )
+
+
+refresh_tokens = create_refresh_token_store()
@@ -0,0 +1,36 @@
+"""
+Audit log repository implementation using SQLAlchemy.
+"""
+from typing import Any, Dict, Optional
+from uuid import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.repositories.audit_repository import AuditRepository
+from app.infrastructure.database.models.admin import AuditLog as AuditLogModel
+
+
+class AuditRepositoryImpl(AuditRepository):
+    """SQLAlchemy implementation of AuditRepository."""
+    
+    def __init__(self, session: AsyncSession):
+        self.session = session
+    
+    async def record(
+        self,
+        event_type: str,
+        action: str,
+        user_id: Optional[UUID] = None,
+        entity_type: Optional[str] = None,
+        entity_id: Optional[UUID] = None,
+        details: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """Append an audit log entry."""
+        self.session.add(AuditLogModel(
+            event_type=event_type,
+            action=action,
+            user_id=user_id,
+            entity_type=entity_type,
+            entity_id=entity_id,
+            details=details
+        ))
+        await self.session.flush()
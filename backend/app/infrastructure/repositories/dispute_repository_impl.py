@@ -1,11 +1,12 @@
 """
 Dispute repository implementation using SQLAlchemy.
 """
-from typing import Optional, List, Tuple
+from typing import Optional, List, Tuple, Dict
 from uuid import UUID
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, desc
+from sqlalchemy.orm import noload
 
 from app.domain.entities.dispute import Dispute, DisputeEvidence, DisputeStatus
 from app.domain.repositories.dispute_repository import DisputeRepository
@@ -14,6 +15,8 @@ from app.infrastructure.database.models.dispute import (
     DisputeEvidence as DisputeEvidenceModel,
     DisputeStatus as DisputeStatusEnum
 )
+from app.infrastructure.repositories.pagination import keyset_page, page_cursor
+from app.infrastructure.platform_stats import platform_stats
 
 
 class DisputeRepositoryImpl(DisputeRepository):
@@ -83,8 +86,9 @@ class DisputeRepositoryImpl(DisputeRepository):
         )
         
         self.session.add(dispute_model)
-        await self.session.commit()
-        await self.session.refresh(dispute_model)
+        await self.session.flush()
+        
+        platform_stats.dispute_status_changed(self.session, None, DisputeStatusEnum.PENDING.value)
         
         return self._to_domain_dispute(dispute_model)
     
@@ -111,6 +115,11 @@ class DisputeRepositoryImpl(DisputeRepository):
         )
         model = result.scalar_one()
         
+        platform_stats.dispute_status_changed(
+            self.session,
+            DisputeStatusEnum(model.status).value,
+            dispute.status.value
+        )
         model.status = DisputeStatusEnum(dispute.status.value)
         model.resolution = dispute.resolution.value if dispute.resolution else None
         model.resolved_by = dispute.resolved_by
@@ -118,8 +127,7 @@ class DisputeRepositoryImpl(DisputeRepository):
         # Note: For MVP, we store resolution notes in the resolution text field
         # In production, we'd have a separate resolution_notes field
         
-        await self.session.commit()
-        await self.session.refresh(model)
+        await self.session.flush()
         
         return self._to_domain_dispute(model)
     
@@ -130,28 +138,18 @@ class DisputeRepositoryImpl(DisputeRepository):
         cursor: Optional[str] = None
     ) -> Tuple[List[Dispute], Optional[str]]:
         """List disputes with filtering."""
-        query = select(DisputeModel)
+        # Evidence is loaded separately in batches; skip the model's selectin load
+        query = select(DisputeModel).options(noload(DisputeModel.evidence))
         
         if status:
             query = query.where(DisputeModel.status == DisputeStatusEnum(status.value))
         
-        if cursor:
-            try:
-                cursor_time = datetime.fromisoformat(cursor)
-                query = query.where(DisputeModel.created_at < cursor_time)
-            except ValueError:
-                pass
-        
-        query = query.order_by(desc(DisputeModel.created_at)).limit(limit + 1)
+        query = keyset_page(query, DisputeModel.created_at, DisputeModel.id, cursor, limit)
         
         result = await self.session.execute(query)
-        models = result.scalars().all()
-        
-        disputes = [self._to_domain_dispute(m) for m in models[:limit]]
-        next_cursor = None
+        models, next_cursor = page_cursor(result.scalars().all(), limit, "created_at")
         
-        if len(models) > limit:
-            next_cursor = models[limit].created_at.isoformat()
+        disputes = [self._to_domain_dispute(m) for m in models]
         
         return disputes, next_cursor
     
@@ -173,8 +171,7 @@ class DisputeRepositoryImpl(DisputeRepository):
         )
         
         self.session.add(evidence_model)
-        await self.session.commit()
-        await self.session.refresh(evidence_model)
+        await self.session.flush()
         
         return self._to_domain_evidence(evidence_model)
     
@@ -183,7 +180,26 @@ class DisputeRepositoryImpl(DisputeRepository):
         result = await self.session.execute(
             select(DisputeEvidenceModel)
             .where(DisputeEvidenceModel.dispute_id == dispute_id)
-            .order_by(DisputeEvidenceModel.uploaded_at)
+            .order_by(DisputeEvidenceModel.submitted_at)
         )
         models = result.scalars().all()
         return [self._to_domain_evidence(m) for m in models]
+    
+    async def get_evidence_for_disputes(
+        self,
+        dispute_ids: List[UUID]
+    ) -> Dict[UUID, List[DisputeEvidence]]:
+        """Get evidence for several disputes in one query, keyed by dispute ID."""
+        evidence: Dict[UUID, List[DisputeEvidence]] = {dispute_id: [] for dispute_id in dispute_ids}
+        if not evidence:
+            return evidence
+        
+        result = await self.session.execute(
+            select(DisputeEvidenceModel)
+            .where(DisputeEvidenceModel.dispute_id.in_(list(evidence)))
+            .order_by(DisputeEvidenceModel.submitted_at)
+        )
+        for model in result.scalars().all():
+            evidence[model.dispute_id].append(self._to_domain_evidence(model))
+        
+        return evidence
@@ -5,11 +5,13 @@ from typing import Optional
 from uuid import UUID
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update
 
+from app.domain.entities.ledger import Journal, JournalType, LedgerAccount
 from app.domain.entities.payment import EscrowAccount
 from app.domain.repositories.escrow_repository import EscrowRepository
 from app.infrastructure.database.models.wallet import EscrowAccount as EscrowAccountModel
+from app.infrastructure.repositories.ledger_repository_impl import LedgerRepositoryImpl
 
 
 class EscrowRepositoryImpl(EscrowRepository):
@@ -17,6 +19,7 @@ class EscrowRepositoryImpl(EscrowRepository):
     
     def __init__(self, session: AsyncSession):
         self.session = session
+        self.ledger = LedgerRepositoryImpl(session)
     
     def _to_domain_escrow(self, model: EscrowAccountModel) -> EscrowAccount:
         """Convert SQLAlchemy model to domain entity."""
@@ -57,8 +60,7 @@ class EscrowRepositoryImpl(EscrowRepository):
         )
         
         self.session.add(escrow_model)
-        await self.session.commit()
-        await self.session.refresh(escrow_model)
+        await self.session.flush()
         
         return self._to_domain_escrow(escrow_model)
     
@@ -68,7 +70,17 @@ class EscrowRepositoryImpl(EscrowRepository):
             select(EscrowAccountModel).where(EscrowAccountModel.match_id == match_id)
         )
         model = result.scalar_one_or_none()
-        return self._to_domain_escrow(model) if model else None
+        if not model:
+            return None
+        
+        await self.ledger.post([Journal.transfer(
+            JournalType.PLATFORM_FEE,
+            LedgerAccount.escrow(match_id),
+            LedgerAccount.PLATFORM_FEES,
+            model.platform_fee_cents,
+            reference_id=match_id
+        )])
+        return self._to_domain_escrow(model)
     
     async def update_escrow(self, escrow: EscrowAccount) -> EscrowAccount:
         """Update escrow account."""
@@ -83,7 +95,35 @@ class EscrowRepositoryImpl(EscrowRepository):
         model.held_at = escrow.held_at
         model.refunded_at = escrow.refunded_at
         
-        await self.session.commit()
-        await self.session.refresh(model)
+        await self.session.flush()
+        
+        return self._to_domain_escrow(model)
+    
+    async def release_escrow(self, match_id: UUID, winner_id: UUID) -> Optional[EscrowAccount]:
+        """
+        Release a LOCKED escrow account with one conditional UPDATE ... RETURNING.
+        The platform fee leaves the escrow account here; the pot leaves it
+        when the winner's wallet is credited.
+        """
+        now = datetime.utcnow()
+        result = await self.session.execute(
+            update(EscrowAccountModel)
+            .where(
+                EscrowAccountModel.match_id == match_id,
+                EscrowAccountModel.status == "LOCKED"
+            )
+            .values(status="RELEASED", released_at=now, released_to=winner_id, updated_at=now)
+            .returning(EscrowAccountModel)
+        )
+        model = result.scalar_one_or_none()
+        if not model:
+            return None
         
+        await self.ledger.post([Journal.transfer(
+            JournalType.PLATFORM_FEE,
+            LedgerAccount.escrow(match_id),
+            LedgerAccount.PLATFORM_FEES,
+            model.platform_fee_cents,
+            reference_id=match_id
+        )])
         return self._to_domain_escrow(model)
@@ -0,0 +1,152 @@
+"""
+Job repository implementation using SQLAlchemy.
+"""
+from typing import Any, Callable, Dict, List, Optional
+from uuid import UUID, uuid4
+from datetime import datetime
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, func
+from sqlalchemy.dialects.postgresql import insert
+
+from app.core.config import settings
+from app.domain.entities.job import Job, JobRequest
+from app.domain.repositories.job_repository import JobRepository
+from app.infrastructure.database.models.job import Job as JobModel, JobStatus
+from app.infrastructure.database.session import on_commit
+
+# Called after a transaction that enqueued jobs commits (the job queue registers its wake-up here)
+enqueue_listeners: List[Callable[[], None]] = []
+
+
+def _notify_enqueued() -> None:
+    for listener in enqueue_listeners:
+        listener()
+
+
+class JobRepositoryImpl(JobRepository):
+    """SQLAlchemy implementation of JobRepository."""
+    
+    def __init__(self, session: AsyncSession):
+        self.session = session
+    
+    def _to_domain_job(self, model: JobModel) -> Job:
+        """Convert SQLAlchemy model to domain entity."""
+        return Job(
+            id=model.id,
+            job_type=model.job_type,
+            payload=model.payload,
+            status=model.status,
+            idempotency_key=model.idempotency_key,
+            attempts=model.attempts,
+            max_attempts=model.max_attempts,
+            run_at=model.run_at,
+            last_error=model.last_error,
+            created_at=model.created_at,
+            finished_at=model.finished_at
+        )
+    
+    async def enqueue(
+        self,
+        job_type: str,
+        payload: Dict[str, Any],
+        idempotency_key: Optional[str] = None,
+        run_at: Optional[datetime] = None,
+        max_attempts: Optional[int] = None
+    ) -> bool:
+        """Insert a pending job, ignoring a repeated idempotency key."""
+        return await self._insert(
+            [JobRequest(job_type, payload, idempotency_key, run_at)],
+            max_attempts
+        ) == 1
+    
+    async def enqueue_many(self, requests: List[JobRequest]) -> int:
+        """Insert pending jobs as one multi-row INSERT."""
+        return await self._insert(requests)
+    
+    async def _insert(self, requests: List[JobRequest], max_attempts: Optional[int] = None) -> int:
+        """INSERT ... ON CONFLICT (idempotency_key) DO NOTHING, returning the number inserted."""
+        if not requests:
+            return 0
+        
+        now = datetime.utcnow()
+        stmt = (
+            insert(JobModel)
+            .values([
+                {
+                    "id": uuid4(),
+                    "job_type": request.job_type,
+                    "payload": request.payload,
+                    "status": JobStatus.PENDING,
+                    "idempotency_key": request.idempotency_key,
+                    "attempts": 0,
+                    "max_attempts": max_attempts or settings.JOB_MAX_ATTEMPTS,
+                    "run_at": request.run_at or now,
+                    "created_at": now
+                }
+                for request in requests
+            ])
+            .on_conflict_do_nothing(index_elements=[JobModel.idempotency_key])
+            .returning(JobModel.id)
+        )
+        result = await self.session.execute(stmt)
+        inserted = len(result.all())
+        
+        # Wake the workers once the jobs are committed
+        if inserted:
+            on_commit(self.session, _notify_enqueued)
+        return inserted
+    
+    async def claim_jobs(self, limit: int) -> List[Job]:
+        """Lock due pending jobs with FOR UPDATE SKIP LOCKED."""
+        result = await self.session.execute(
+            select(JobModel)
+            .where(
+                JobModel.status == JobStatus.PENDING,
+                JobModel.run_at <= datetime.utcnow()
+            )
+            .order_by(JobModel.run_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        return [self._to_domain_job(m) for m in result.scalars().all()]
+    
+    async def mark_succeeded(self, job_ids: List[UUID]) -> None:
+        """Mark claimed jobs as done in one statement."""
+        if not job_ids:
+            return
+        await self.session.execute(
+            update(JobModel)
+            .where(JobModel.id.in_(job_ids))
+            .values(
+                status=JobStatus.SUCCEEDED,
+                attempts=JobModel.attempts + 1,
+                finished_at=datetime.utcnow()
+            )
+            .execution_options(synchronize_session=False)
+        )
+    
+    async def record_failure(self, job_id: UUID, error: str, retry_at: Optional[datetime]) -> None:
+        """Count a failed attempt and reschedule or give up."""
+        values: Dict[str, Any] = {
+            "attempts": JobModel.attempts + 1,
+            "last_error": error
+        }
+        if retry_at is None:
+            values.update(status=JobStatus.FAILED, finished_at=datetime.utcnow())
+        else:
+            values["run_at"] = retry_at
+        
+        await self.session.execute(
+            update(JobModel)
+            .where(JobModel.id == job_id)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+    
+    async def count_by_status(self) -> Dict[str, int]:
+        """Number of jobs per status."""
+        result = await self.session.execute(
+            select(JobModel.status, func.count())
+            .group_by(JobModel.status)
+        )
+        return {status: count for status, count in result.all()}
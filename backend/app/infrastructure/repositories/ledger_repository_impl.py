@@ -0,0 +1,202 @@
+"""
+Ledger repository implementation using SQLAlchemy.
+
+Journal lines are buffered on the session and written with one INSERT
+just before it commits, so a unit of work that moves money several times
+still costs a single ledger write. Balances are read as the account's
+latest snapshot plus the sum of its entries after it; a background worker
+advances the snapshots so that tail stays short.
+"""
+from typing import Any, Dict, List
+from datetime import timedelta
+from sqlalchemy import event, select, insert, func, values, column, literal, String
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.exceptions import BusinessLogicError
+from app.domain.entities.ledger import Journal, LedgerAccount
+from app.domain.repositories.ledger_repository import LedgerRepository
+from app.infrastructure.database.models.ledger import (
+    LedgerEntry as LedgerEntryModel,
+    LedgerSnapshot as LedgerSnapshotModel
+)
+
+# session.info key holding the lines posted in the current transaction
+LEDGER_LINES = "ledger_lines"
+
+# Advisory lock that keeps snapshot passes on different nodes from overlapping
+SNAPSHOT_LOCK_KEY = 0x6C6564676572
+
+SYSTEM_ACCOUNTS = [
+    LedgerAccount.EXTERNAL,
+    LedgerAccount.PLATFORM_FEES,
+    LedgerAccount.ADJUSTMENTS,
+    LedgerAccount.OPENING_BALANCES,
+]
+
+
+@event.listens_for(Session, "before_commit")
+def _write_ledger_lines(session):
+    """
+    Write every line posted in the transaction with one INSERT.
+    
+    created_at is the database clock at the moment the id is drawn, not
+    when the line was posted, so take_snapshots' settle window only has to
+    cover the gap between this INSERT and the COMMIT right after it.
+    """
+    lines = session.info.pop(LEDGER_LINES, None)
+    if lines:
+        session.execute(
+            insert(LedgerEntryModel.__table__).values(created_at=func.clock_timestamp()),
+            lines
+        )
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_ledger_lines(session):
+    """Drop lines posted by a transaction that rolled back."""
+    session.info.pop(LEDGER_LINES, None)
+
+
+class LedgerRepositoryImpl(LedgerRepository):
+    """SQLAlchemy implementation of LedgerRepository."""
+    
+    def __init__(self, session: AsyncSession):
+        self.session = session
+    
+    async def post(self, journals: List[Journal]) -> None:
+        """Buffer balanced journals until the transaction commits."""
+        lines = self.session.info.setdefault(LEDGER_LINES, [])
+        
+        for journal in journals:
+            if not journal.is_balanced():
+                raise BusinessLogicError(
+                    f"Journal {journal.id} ({journal.journal_type}) does not balance",
+                    code="UNBALANCED_JOURNAL"
+                )
+            for line in journal.lines:
+                if not line.amount_cents:
+                    continue
+                lines.append({
+                    "journal_id": journal.id,
+                    "journal_type": journal.journal_type,
+                    "account": line.account,
+                    "amount_cents": line.amount_cents,
+                    "transaction_id": journal.transaction_id,
+                    "reference_id": journal.reference_id
+                })
+    
+    async def get_balances(self, accounts: List[str]) -> Dict[str, int]:
+        """
+        Get balances as snapshot plus tail sum, in one query.
+        
+        Lines this session posted but has not written yet are included, so a
+        caller sees its own movements.
+        """
+        if not accounts:
+            return {}
+        
+        entries = LedgerEntryModel.__table__
+        snapshots = LedgerSnapshotModel.__table__
+        requested = values(column("account", String), name="requested").data(
+            [(account,) for account in dict.fromkeys(accounts)]
+        )
+        tail = (
+            select(func.coalesce(func.sum(entries.c.amount_cents), 0))
+            .where(
+                entries.c.account == requested.c.account,
+                entries.c.id > func.coalesce(snapshots.c.entry_id, 0)
+            )
+            .scalar_subquery()
+        )
+        result = await self.session.execute(
+            select(requested.c.account, func.coalesce(snapshots.c.balance_cents, 0) + tail)
+            .select_from(requested.outerjoin(snapshots, snapshots.c.account == requested.c.account))
+        )
+        balances = {account: int(balance) for account, balance in result.all()}
+        
+        for line in self.session.info.get(LEDGER_LINES, []):
+            if line["account"] in balances:
+                balances[line["account"]] += line["amount_cents"]
+        
+        return balances
+    
+    async def take_snapshots(self, settle_seconds: float) -> int:
+        """
+        Advance account snapshots over the entries posted since the last pass.
+        
+        Each pass folds the id range (watermark, cutoff] into the snapshots
+        of the accounts it touches with one INSERT ... ON CONFLICT; accounts
+        with no new entries keep their older snapshot, which is still exact.
+        Only entries older than settle_seconds are folded, so a transaction
+        that took an id but has not committed yet cannot be skipped; both
+        sides of that comparison use the database clock. Returns
+        how many account snapshots were advanced.
+        """
+        entries = LedgerEntryModel.__table__
+        snapshots = LedgerSnapshotModel.__table__
+        
+        locked = await self.session.scalar(select(func.pg_try_advisory_xact_lock(SNAPSHOT_LOCK_KEY)))
+        if not locked:
+            return 0  # Another node is taking snapshots
+        
+        watermark = await self.session.scalar(select(func.coalesce(func.max(snapshots.c.entry_id), 0)))
+        cutoff = await self.session.scalar(
+            select(func.max(entries.c.id))
+            .where(
+                entries.c.id > watermark,
+                entries.c.created_at < func.clock_timestamp() - timedelta(seconds=settle_seconds)
+            )
+        )
+        if cutoff is None:
+            return 0
+        
+        folded = (
+            select(entries.c.account, func.sum(entries.c.amount_cents).label("amount_cents"))
+            .where(entries.c.id > watermark, entries.c.id <= cutoff)
+            .group_by(entries.c.account)
+            .subquery("folded")
+        )
+        stmt = pg_insert(snapshots).from_select(
+            ["account", "entry_id", "balance_cents", "taken_at"],
+            select(
+                folded.c.account,
+                literal(cutoff, snapshots.c.entry_id.type),
+                func.coalesce(snapshots.c.balance_cents, 0) + folded.c.amount_cents,
+                func.now()
+            ).select_from(folded.outerjoin(snapshots, snapshots.c.account == folded.c.account))
+        )
+        result = await self.session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[snapshots.c.account],
+                set_={
+                    "entry_id": stmt.excluded.entry_id,
+                    "balance_cents": stmt.excluded.balance_cents,
+                    "taken_at": stmt.excluded.taken_at
+                }
+            )
+        )
+        return result.rowcount
+    
+    async def get_summary(self) -> Dict[str, Any]:
+        """Snapshot progress and the balances of the platform's own accounts."""
+        entries = LedgerEntryModel.__table__
+        snapshots = LedgerSnapshotModel.__table__
+        
+        result = await self.session.execute(
+            select(
+                select(func.max(entries.c.id)).scalar_subquery(),
+                select(func.max(snapshots.c.entry_id)).scalar_subquery(),
+                select(func.max(snapshots.c.taken_at)).scalar_subquery()
+            )
+        )
+        latest, watermark, taken_at = result.one()
+        
+        return {
+            "latest_entry_id": latest or 0,
+            "snapshot_entry_id": watermark or 0,
+            "entries_behind_snapshot": (latest or 0) - (watermark or 0),
+            "last_snapshot_at": taken_at.isoformat() if taken_at else None,
+            "system_balances": await self.get_balances(SYSTEM_ACCOUNTS)
+        }
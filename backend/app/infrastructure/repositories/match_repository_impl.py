@@ -1,12 +1,12 @@
 """
 Match repository implementation using SQLAlchemy.
 """
-from typing import Optional, List, Tuple
+from typing import Optional, List, Tuple, Dict
 from uuid import UUID
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_, desc
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, and_, or_, desc, union
+from sqlalchemy.orm import selectinload, noload
 
 from app.domain.entities.match import Match, MatchParticipant, MatchResult
 from app.domain.repositories.match_repository import MatchRepository
@@ -15,8 +15,19 @@ from app.infrastructure.database.models.match import (
     MatchParticipant as MatchParticipantModel,
     MatchResult as MatchResultModel
 )
+from app.infrastructure.repositories.pagination import keyset_page, page_cursor
+from app.infrastructure.cache import cache
+from app.infrastructure.platform_stats import platform_stats
 from app.core.config import settings
 
+# Listings and the completion path only map scalar columns; skip the
+# selectin loads configured on the model
+_LIST_LOAD_OPTIONS = (
+    noload(MatchModel.participants),
+    noload(MatchModel.results),
+    noload(MatchModel.escrow),
+)
+
 
 class MatchRepositoryImpl(MatchRepository):
     """SQLAlchemy implementation of MatchRepository."""
@@ -110,8 +121,11 @@ class MatchRepositoryImpl(MatchRepository):
         )
         self.session.add(participant)
         
-        await self.session.commit()
-        await self.session.refresh(match_model)
+        await self.session.flush()
+        
+        # A new lobby is open
+        cache.invalidate_on_commit(self.session, "lobbies")
+        platform_stats.match_status_changed(self.session, None, match_model.status)
         
         return self._to_domain_match(match_model)
     
@@ -123,6 +137,17 @@ class MatchRepositoryImpl(MatchRepository):
         model = result.scalar_one_or_none()
         return self._to_domain_match(model) if model else None
     
+    async def get_match_for_update(self, match_id: UUID) -> Optional[Match]:
+        """Get match by ID and lock its row until the transaction ends."""
+        result = await self.session.execute(
+            select(MatchModel)
+            .options(*_LIST_LOAD_OPTIONS)
+            .where(MatchModel.id == match_id)
+            .with_for_update(of=MatchModel)
+        )
+        model = result.scalar_one_or_none()
+        return self._to_domain_match(model) if model else None
+    
     async def update_match(self, match: Match) -> Match:
         """Update match."""
         result = await self.session.execute(
@@ -130,6 +155,7 @@ class MatchRepositoryImpl(MatchRepository):
         )
         model = result.scalar_one()
         
+        platform_stats.match_status_changed(self.session, model.status, match.status)
         model.status = match.status
         model.accepted_by = match.accepted_by
         model.winner_id = match.winner_id
@@ -139,11 +165,52 @@ class MatchRepositoryImpl(MatchRepository):
         model.cancelled_by = match.cancelled_by
         model.cancellation_reason = match.cancellation_reason
         
-        await self.session.commit()
-        await self.session.refresh(model)
+        await self.session.flush()
+        
+        # Status or opponent changed, so cached lobby listings are stale
+        cache.invalidate_on_commit(self.session, "lobbies")
         
         return self._to_domain_match(model)
     
+    async def complete_match(
+        self,
+        match: Match,
+        game_winner_ids: List[UUID],
+        reported_by: UUID
+    ) -> Tuple[Match, List[MatchResult]]:
+        """
+        Persist a completed match and all of its game results in one flush.
+        
+        The match row is normally already in the identity map from
+        get_match_for_update, so this costs one UPDATE plus one multi-row
+        INSERT regardless of best_of.
+        """
+        model = await self.session.get(MatchModel, match.id, options=_LIST_LOAD_OPTIONS)
+        
+        platform_stats.match_status_changed(self.session, model.status, match.status)
+        model.status = match.status
+        model.winner_id = match.winner_id
+        model.completed_at = match.completed_at
+        
+        result_models = [
+            MatchResultModel(
+                match_id=match.id,
+                game_number=game_number,
+                winner_id=winner_id,
+                reported_by=reported_by
+            )
+            for game_number, winner_id in enumerate(game_winner_ids, start=1)
+        ]
+        self.session.add_all(result_models)
+        await self.session.flush()
+        
+        cache.invalidate_on_commit(self.session, "lobbies")
+        
+        return (
+            self._to_domain_match(model),
+            [self._to_domain_result(m) for m in result_models]
+        )
+    
     async def list_matches(
         self,
         status: Optional[str] = None,
@@ -152,7 +219,7 @@ class MatchRepositoryImpl(MatchRepository):
         cursor: Optional[str] = None
     ) -> Tuple[List[Match], Optional[str]]:
         """List matches with filtering and pagination."""
-        query = select(MatchModel)
+        query = select(MatchModel).options(*_LIST_LOAD_OPTIONS)
         
         # Apply filters
         if status:
@@ -160,24 +227,13 @@ class MatchRepositoryImpl(MatchRepository):
         if match_type:
             query = query.where(MatchModel.match_type == match_type)
         
-        # Cursor-based pagination
-        if cursor:
-            try:
-                cursor_time = datetime.fromisoformat(cursor)
-                query = query.where(MatchModel.created_at < cursor_time)
-            except ValueError:
-                pass
-        
-        query = query.order_by(desc(MatchModel.created_at)).limit(limit + 1)
+        # Keyset pagination on (created_at, id)
+        query = keyset_page(query, MatchModel.created_at, MatchModel.id, cursor, limit)
         
         result = await self.session.execute(query)
-        models = result.scalars().all()
-        
-        matches = [self._to_domain_match(m) for m in models[:limit]]
-        next_cursor = None
+        models, next_cursor = page_cursor(result.scalars().all(), limit, "created_at")
         
-        if len(models) > limit:
-            next_cursor = models[limit].created_at.isoformat()
+        matches = [self._to_domain_match(m) for m in models]
         
         return matches, next_cursor
     
@@ -189,33 +245,30 @@ class MatchRepositoryImpl(MatchRepository):
         cursor: Optional[str] = None
     ) -> Tuple[List[Match], Optional[str]]:
         """Get matches for a specific user."""
-        query = select(MatchModel).where(
-            or_(
-                MatchModel.created_by == user_id,
-                MatchModel.accepted_by == user_id
+        # One keyset scan per side of the OR so each can walk its own
+        # (user, created_at, id) index, then merge the two short lists
+        sides = []
+        for column in (MatchModel.created_by, MatchModel.accepted_by):
+            side = select(MatchModel.id, MatchModel.created_at).where(column == user_id)
+            if status:
+                side = side.where(MatchModel.status == status)
+            sides.append(
+                keyset_page(side, MatchModel.created_at, MatchModel.id, cursor, limit).subquery()
             )
-        )
-        
-        if status:
-            query = query.where(MatchModel.status == status)
-        
-        if cursor:
-            try:
-                cursor_time = datetime.fromisoformat(cursor)
-                query = query.where(MatchModel.created_at < cursor_time)
-            except ValueError:
-                pass
+        page_ids = union(*(select(side.c.id, side.c.created_at) for side in sides)).subquery()
         
-        query = query.order_by(desc(MatchModel.created_at)).limit(limit + 1)
+        query = (
+            select(MatchModel)
+            .options(*_LIST_LOAD_OPTIONS)
+            .join(page_ids, MatchModel.id == page_ids.c.id)
+            .order_by(desc(MatchModel.created_at), desc(MatchModel.id))
+            .limit(limit + 1)
+        )
         
         result = await self.session.execute(query)
-        models = result.scalars().all()
-        
-        matches = [self._to_domain_match(m) for m in models[:limit]]
-        next_cursor = None
+        models, next_cursor = page_cursor(result.scalars().all(), limit, "created_at")
         
-        if len(models) > limit:
-            next_cursor = models[limit].created_at.isoformat()
+        matches = [self._to_domain_match(m) for m in models]
         
         return matches, next_cursor
     
@@ -233,8 +286,7 @@ class MatchRepositoryImpl(MatchRepository):
         )
         
         self.session.add(participant)
-        await self.session.commit()
-        await self.session.refresh(participant)
+        await self.session.flush()
         
         return self._to_domain_participant(participant)
     
@@ -246,6 +298,25 @@ class MatchRepositoryImpl(MatchRepository):
         models = result.scalars().all()
         return [self._to_domain_participant(m) for m in models]
     
+    async def get_participants_for_matches(
+        self,
+        match_ids: List[UUID]
+    ) -> Dict[UUID, List[MatchParticipant]]:
+        """Get participants for several matches in one query, keyed by match ID."""
+        participants: Dict[UUID, List[MatchParticipant]] = {match_id: [] for match_id in match_ids}
+        if not participants:
+            return participants
+        
+        result = await self.session.execute(
+            select(MatchParticipantModel)
+            .where(MatchParticipantModel.match_id.in_(list(participants)))
+            .order_by(MatchParticipantModel.team_number, MatchParticipantModel.joined_at)
+        )
+        for model in result.scalars().all():
+            participants[model.match_id].append(self._to_domain_participant(model))
+        
+        return participants
+    
     async def create_match_result(
         self,
         match_id: UUID,
@@ -262,8 +333,7 @@ class MatchRepositoryImpl(MatchRepository):
         )
         
         self.session.add(result_model)
-        await self.session.commit()
-        await self.session.refresh(result_model)
+        await self.session.flush()
         
         return self._to_domain_result(result_model)
     
@@ -0,0 +1,100 @@
+"""
+Keyset pagination shared by repositories.
+Cursors are opaque tokens holding the (sort_key, id) of the last row on a
+page. The next page starts strictly after that pair, so rows that share a
+sort key are never skipped, and every page is a bounded range scan over a
+(sort_key, id) index no matter how deep it is.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, Optional, Sequence, Tuple, Type, TypeVar
+from uuid import UUID
+
+from sqlalchemy import Select, tuple_
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.core.exceptions import ValidationError
+
+T = TypeVar("T")
+
+
+def encode_cursor(sort_key: Any, row_id: Any) -> str:
+    """Encode a (sort_key, id) position as an opaque cursor."""
+    if isinstance(sort_key, datetime):
+        payload = ["dt", sort_key.isoformat(), str(row_id)]
+    else:
+        payload = ["v", sort_key, str(row_id)]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: Optional[str], sort_type: Type) -> Optional[Tuple[Any, UUID]]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Cursors come back from clients, so the sort key is checked against the
+    type of the column being paged before it reaches a query.
+
+    Args:
+        cursor: Cursor from the previous page, if any
+        sort_type: Expected sort key type (datetime, int, ...)
+
+    Returns:
+        (sort_key, id), or None if there is no cursor
+
+    Raises:
+        ValidationError: If the cursor is malformed or holds the wrong types
+    """
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        kind, sort_key, row_id = json.loads(raw)
+        if kind == "dt":
+            sort_key = datetime.fromisoformat(sort_key)
+        elif kind != "v":
+            raise ValueError(kind)
+        row_id = UUID(row_id)
+    except (ValueError, TypeError, AttributeError):
+        raise ValidationError("Invalid pagination cursor", field="cursor")
+    # bool is an int subclass but never a valid sort key
+    if isinstance(sort_key, bool) or not isinstance(sort_key, sort_type):
+        raise ValidationError("Invalid pagination cursor", field="cursor")
+    return sort_key, row_id
+
+
+def keyset_page(
+    query: Select,
+    sort_column: ColumnElement,
+    id_column: ColumnElement,
+    cursor: Optional[str],
+    limit: int
+) -> Select:
+    """
+    Order a query by (sort_column, id_column) descending and start after cursor.
+
+    Fetches limit + 1 rows so callers can tell whether another page exists.
+    """
+    position = decode_cursor(cursor, sort_column.type.python_type)
+    if position is not None:
+        query = query.where(tuple_(sort_column, id_column) < tuple_(*position))
+    return query.order_by(sort_column.desc(), id_column.desc()).limit(limit + 1)
+
+
+def page_cursor(
+    rows: Sequence[T],
+    limit: int,
+    sort_attr: str,
+    id_attr: str = "id"
+) -> Tuple[Sequence[T], Optional[str]]:
+    """
+    Trim a limit + 1 result to one page and build the cursor for the next.
+
+    Returns:
+        Tuple of (page rows, next cursor or None)
+    """
+    if len(rows) <= limit:
+        return rows, None
+    last = rows[limit - 1]
+    return rows[:limit], encode_cursor(getattr(last, sort_attr), getattr(last, id_attr))
@@ -0,0 +1,318 @@
+"""
+Payout repository implementation using SQLAlchemy.
+"""
+from typing import Any, Dict, List
+from uuid import UUID, uuid4
+from datetime import datetime, timedelta
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, func, values, column, String, BigInteger
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+
+from app.domain.entities.ledger import Journal, JournalType, LedgerAccount
+from app.domain.entities.payment import Payout
+from app.domain.repositories.payout_repository import PayoutRepository
+from app.infrastructure.database.models.wallet import (
+    Wallet as WalletModel,
+    Transaction as TransactionModel,
+    TransactionType as TransactionTypeEnum,
+    TransactionStatus as TransactionStatusEnum,
+    Payout as PayoutModel,
+    PayoutStatus
+)
+from app.infrastructure.repositories.ledger_repository_impl import LedgerRepositoryImpl
+from app.infrastructure.platform_stats import platform_stats
+
+
+class PayoutRepositoryImpl(PayoutRepository):
+    """SQLAlchemy implementation of PayoutRepository."""
+    
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.ledger = LedgerRepositoryImpl(session)
+    
+    def _to_domain_payout(self, model: PayoutModel) -> Payout:
+        """Convert SQLAlchemy model to domain entity."""
+        return Payout(
+            id=model.id,
+            destination=model.destination,
+            amount_cents=model.amount_cents,
+            currency=model.currency,
+            withdrawal_count=model.withdrawal_count,
+            status=model.status,
+            attempts=model.attempts,
+            transfer_id=model.transfer_id,
+            last_error=model.last_error,
+            lease_until=model.lease_until,
+            created_at=model.created_at,
+            completed_at=model.completed_at
+        )
+    
+    async def claim_payouts(self, limit: int, lease_seconds: float) -> List[Payout]:
+        """Lease expired payouts and batch new withdrawals, skipping rows other workers hold."""
+        now = datetime.utcnow()
+        lease_until = now + timedelta(seconds=lease_seconds)
+        
+        result = await self.session.execute(
+            select(PayoutModel)
+            .where(PayoutModel.status == PayoutStatus.PENDING, PayoutModel.lease_until <= now)
+            .order_by(PayoutModel.lease_until)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        payouts = list(result.scalars().all())
+        for payout in payouts:
+            payout.lease_until = lease_until
+        
+        result = await self.session.execute(
+            select(TransactionModel)
+            .where(
+                TransactionModel.transaction_type == TransactionTypeEnum.WITHDRAWAL,
+                TransactionModel.status == TransactionStatusEnum.PROCESSING,
+                TransactionModel.reference_id.is_(None)
+            )
+            .order_by(TransactionModel.created_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        by_destination: Dict[str, List[TransactionModel]] = {}
+        undeliverable: List[UUID] = []
+        for withdrawal in result.scalars().all():
+            destination = (withdrawal.extra_data or {}).get("destination")
+            if destination:
+                by_destination.setdefault(destination, []).append(withdrawal)
+            else:
+                undeliverable.append(withdrawal.id)
+        
+        for destination, withdrawals in by_destination.items():
+            payout = PayoutModel(
+                id=uuid4(),
+                destination=destination,
+                amount_cents=sum(-w.amount_cents for w in withdrawals),  # Withdrawals are stored negative
+                currency="USD",
+                withdrawal_count=len(withdrawals),
+                status=PayoutStatus.PENDING,
+                attempts=0,
+                lease_until=lease_until,
+                created_at=now
+            )
+            self.session.add(payout)
+            payouts.append(payout)
+            for withdrawal in withdrawals:
+                withdrawal.reference_id = payout.id
+                withdrawal.reference_type = "payout"
+        
+        await self.session.flush()
+        
+        if undeliverable:
+            await self._finish_withdrawals(
+                [TransactionModel.id.in_(undeliverable)],
+                {
+                    "status": TransactionStatusEnum.FAILED,
+                    "failed_at": now,
+                    "failure_reason": "No payout destination"
+                },
+                paid=False
+            )
+        
+        return [self._to_domain_payout(p) for p in payouts]
+    
+    async def mark_paid(self, transfers: Dict[UUID, str]) -> int:
+        """Complete paid payouts and their withdrawals with one statement per table."""
+        if not transfers:
+            return 0
+        
+        now = datetime.utcnow()
+        payouts = PayoutModel.__table__
+        paid = values(
+            column("payout_id", PG_UUID(as_uuid=True)),
+            column("transfer_id", String),
+            name="paid"
+        ).data(list(transfers.items()))
+        
+        await self.session.execute(
+            update(payouts)
+            .where(payouts.c.id == paid.c.payout_id, payouts.c.status == PayoutStatus.PENDING)
+            .values(
+                status=PayoutStatus.PAID,
+                transfer_id=paid.c.transfer_id,
+                attempts=payouts.c.attempts + 1,
+                completed_at=now
+            )
+        )
+        return await self._finish_withdrawals(
+            [TransactionModel.reference_id == paid.c.payout_id],
+            {
+                "status": TransactionStatusEnum.COMPLETED,
+                "external_id": paid.c.transfer_id,
+                "processed_at": now
+            },
+            paid=True
+        )
+    
+    async def mark_failed(self, errors: Dict[UUID, str]) -> int:
+        """Fail rejected payouts and refund their withdrawals with one statement per table."""
+        if not errors:
+            return 0
+        
+        now = datetime.utcnow()
+        payouts = PayoutModel.__table__
+        failed = values(
+            column("payout_id", PG_UUID(as_uuid=True)),
+            column("error", String),
+            name="failed"
+        ).data(list(errors.items()))
+        
+        await self.session.execute(
+            update(payouts)
+            .where(payouts.c.id == failed.c.payout_id, payouts.c.status == PayoutStatus.PENDING)
+            .values(
+                status=PayoutStatus.FAILED,
+                last_error=failed.c.error,
+                attempts=payouts.c.attempts + 1,
+                completed_at=now
+            )
+        )
+        return await self._finish_withdrawals(
+            [TransactionModel.reference_id == failed.c.payout_id],
+            {
+                "status": TransactionStatusEnum.FAILED,
+                "failed_at": now,
+                "failure_reason": failed.c.error
+            },
+            paid=False
+        )
+    
+    async def _finish_withdrawals(self, conditions: list, changes: Dict[str, Any], paid: bool) -> int:
+        """
+        Move PROCESSING withdrawals to a final status and settle their wallets.
+        
+        Paid amounts leave pending_cents for total_withdrawn_cents; failed
+        ones go back to the balance. Only rows still PROCESSING change, so a
+        payout settled twice (e.g. after its lease was taken over) cannot
+        move money twice.
+        """
+        transactions = TransactionModel.__table__
+        wallets = WalletModel.__table__
+        now = datetime.utcnow()
+        
+        result = await self.session.execute(
+            update(transactions)
+            .where(transactions.c.status == TransactionStatusEnum.PROCESSING, *conditions)
+            .values(updated_at=now, **changes)
+            .returning(
+                transactions.c.id,
+                transactions.c.user_id,
+                transactions.c.amount_cents,
+                transactions.c.reference_id
+            )
+        )
+        amounts: Dict[UUID, int] = {}
+        journals: List[Journal] = []
+        withdrawn: List[int] = []
+        for row in result.all():
+            amounts[row.user_id] = amounts.get(row.user_id, 0) - row.amount_cents
+            withdrawn.append(row.amount_cents)
+            journals.append(Journal.transfer(
+                JournalType.WITHDRAWAL_PAID if paid else JournalType.WITHDRAWAL_RETURNED,
+                LedgerAccount.pending(row.user_id),
+                LedgerAccount.EXTERNAL if paid else LedgerAccount.wallet(row.user_id),
+                -row.amount_cents,  # Withdrawals are stored negative
+                reference_id=row.reference_id,
+                transaction_id=row.id
+            ))
+        if not amounts:
+            return 0
+        
+        # Lock wallets in user id order so concurrent settlements cannot deadlock
+        await self.session.execute(
+            select(wallets.c.id)
+            .where(wallets.c.user_id.in_(list(amounts)))
+            .order_by(wallets.c.user_id)
+            .with_for_update()
+        )
+        settled_rows = values(
+            column("user_id", PG_UUID(as_uuid=True)),
+            column("amount_cents", BigInteger),
+            name="settled"
+        ).data(list(amounts.items()))
+        
+        wallet_changes = {"pending_cents": wallets.c.pending_cents - settled_rows.c.amount_cents}
+        if paid:
+            wallet_changes["total_withdrawn_cents"] = wallets.c.total_withdrawn_cents + settled_rows.c.amount_cents
+        else:
+            wallet_changes["balance_cents"] = wallets.c.balance_cents + settled_rows.c.amount_cents
+        
+        await self.session.execute(
+            update(wallets)
+            .where(wallets.c.user_id == settled_rows.c.user_id)
+            .values(updated_at=now, **wallet_changes)
+        )
+        await self.ledger.post(journals)
+        if paid:
+            platform_stats.transactions_completed(
+                self.session,
+                [(TransactionTypeEnum.WITHDRAWAL.value, amount) for amount in withdrawn]
+            )
+        return len(journals)
+    
+    async def mark_for_review(self, errors: Dict[UUID, str]) -> int:
+        """Park payouts with an unknown transfer outcome, leaving their withdrawals reserved."""
+        if not errors:
+            return 0
+        
+        payouts = PayoutModel.__table__
+        review = values(
+            column("payout_id", PG_UUID(as_uuid=True)),
+            column("error", String),
+            name="review"
+        ).data(list(errors.items()))
+        
+        result = await self.session.execute(
+            update(payouts)
+            .where(payouts.c.id == review.c.payout_id, payouts.c.status == PayoutStatus.PENDING)
+            .values(
+                status=PayoutStatus.REVIEW,
+                last_error=review.c.error,
+                attempts=payouts.c.attempts + 1
+            )
+        )
+        return result.rowcount
+    
+    async def record_retry(self, payout_id: UUID, error: str, retry_at: datetime) -> None:
+        """Count a transient failure and hold the payout until retry_at."""
+        await self.session.execute(
+            update(PayoutModel)
+            .where(PayoutModel.id == payout_id, PayoutModel.status == PayoutStatus.PENDING)
+            .values(
+                attempts=PayoutModel.attempts + 1,
+                last_error=error,
+                lease_until=retry_at
+            )
+            .execution_options(synchronize_session=False)
+        )
+    
+    async def get_backlog(self) -> Dict[str, Any]:
+        """Unassigned withdrawals and payouts per status."""
+        result = await self.session.execute(
+            select(func.count(), func.min(TransactionModel.created_at))
+            .where(
+                TransactionModel.transaction_type == TransactionTypeEnum.WITHDRAWAL,
+                TransactionModel.status == TransactionStatusEnum.PROCESSING,
+                TransactionModel.reference_id.is_(None)
+            )
+        )
+        waiting, oldest = result.one()
+        
+        result = await self.session.execute(
+            select(PayoutModel.status, func.count(), func.coalesce(func.sum(PayoutModel.amount_cents), 0))
+            .group_by(PayoutModel.status)
+        )
+        
+        return {
+            "unbatched_withdrawals": waiting,
+            "oldest_unbatched_at": oldest.isoformat() if oldest else None,
+            "payouts": {
+                status: {"count": count, "amount_cents": int(amount)}
+                for status, count, amount in result.all()
+            }
+        }
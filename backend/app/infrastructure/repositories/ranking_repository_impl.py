@@ -1,16 +1,21 @@
 """
 Ranking repository implementation using SQLAlchemy.
 """
-from typing import Optional, List, Tuple
+from typing import Dict, Optional, List, Tuple
 from uuid import UUID
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, desc, func
+from sqlalchemy import select, update, desc, func, case, values, column, Boolean, Integer
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import selectinload
 
 from app.domain.repositories.ranking_repository import RankingRepository
 from app.infrastructure.database.models.ranking import Ranking as RankingModel
 from app.infrastructure.database.models.player_profile import PlayerProfile as PlayerProfileModel
+from app.infrastructure.database.session import on_commit
+from app.infrastructure.leaderboard import leaderboard
+from app.infrastructure.cache import cache
+from app.infrastructure.repositories.pagination import decode_cursor, encode_cursor
 
 
 class RankingRepositoryImpl(RankingRepository):
@@ -19,16 +24,8 @@ class RankingRepositoryImpl(RankingRepository):
     def __init__(self, session: AsyncSession):
         self.session = session
     
-    async def get_ranking_by_user_id(self, user_id: UUID) -> Optional[dict]:
-        """Get ranking for a user."""
-        result = await self.session.execute(
-            select(RankingModel).where(RankingModel.user_id == user_id)
-        )
-        model = result.scalar_one_or_none()
-        
-        if not model:
-            return None
-        
+    def _to_ranking(self, model) -> dict:
+        """Convert a ranking model or row to the ranking dict."""
         # Calculate win rate
         total = model.wins + model.losses + model.draws
         win_rate = (model.wins / total * 100) if total > 0 else 0.0
@@ -48,6 +45,18 @@ class RankingRepositoryImpl(RankingRepository):
             "last_match_at": model.last_match_at.isoformat() if model.last_match_at else None
         }
     
+    async def get_ranking_by_user_id(self, user_id: UUID) -> Optional[dict]:
+        """Get ranking for a user."""
+        result = await self.session.execute(
+            select(RankingModel).where(RankingModel.user_id == user_id)
+        )
+        model = result.scalar_one_or_none()
+        
+        if not model:
+            return None
+        
+        return self._to_ranking(model)
+    
     async def update_ranking_after_match(
         self,
         user_id: UUID,
@@ -82,8 +91,20 @@ class RankingRepositoryImpl(RankingRepository):
         model.total_matches += 1
         model.last_match_at = datetime.utcnow()
         
-        await self.session.commit()
-        await self.session.refresh(model)
+        await self.session.flush()
+        
+        # Reflect the change in the in-memory leaderboard once it is durable
+        user_key = str(model.user_id)
+        fields = {
+            "rating": model.rating,
+            "wins": model.wins,
+            "losses": model.losses,
+            "draws": model.draws,
+            "win_streak": model.win_streak,
+            "total_matches": model.total_matches
+        }
+        on_commit(self.session, lambda: leaderboard.apply(user_key, **fields))
+        cache.invalidate_on_commit(self.session, "leaderboard")
         
         # Calculate win rate
         total = model.wins + model.losses + model.draws
@@ -100,56 +121,110 @@ class RankingRepositoryImpl(RankingRepository):
             "win_rate": round(win_rate, 2)
         }
     
+    async def lock_rankings(self, user_ids: List[UUID]) -> Dict[UUID, dict]:
+        """
+        Get rankings for several users in one SELECT ... FOR UPDATE.
+        
+        Rows are locked in user_id order so two matches sharing a player
+        cannot deadlock. Reads the table directly so no ORM objects are left
+        in the session to go stale after update_rankings_after_match.
+        """
+        rankings = RankingModel.__table__
+        result = await self.session.execute(
+            select(rankings)
+            .where(rankings.c.user_id.in_(user_ids))
+            .order_by(rankings.c.user_id)
+            .with_for_update()
+        )
+        return {row.user_id: self._to_ranking(row) for row in result}
+    
+    async def update_rankings_after_match(
+        self,
+        outcomes: List[Tuple[UUID, bool, int, int]]
+    ) -> Dict[UUID, dict]:
+        """Apply several players' match outcomes with one UPDATE ... FROM (VALUES ...)."""
+        if not outcomes:
+            return {}
+        
+        now = datetime.utcnow()
+        rankings = RankingModel.__table__
+        played = values(
+            column("user_id", PG_UUID(as_uuid=True)),
+            column("won", Boolean),
+            column("rating", Integer),
+            name="played"
+        ).data([(user_id, won, new_rating) for user_id, won, _, new_rating in outcomes])
+        
+        # SET expressions all see the pre-update row, same as update_ranking_after_match
+        win_streak = case((played.c.won, rankings.c.win_streak + 1), else_=0)
+        result = await self.session.execute(
+            update(rankings)
+            .where(rankings.c.user_id == played.c.user_id)
+            .values(
+                rating=played.c.rating,
+                peak_rating=func.greatest(rankings.c.peak_rating, played.c.rating),
+                wins=rankings.c.wins + case((played.c.won, 1), else_=0),
+                losses=rankings.c.losses + case((played.c.won, 0), else_=1),
+                win_streak=win_streak,
+                best_win_streak=func.greatest(rankings.c.best_win_streak, win_streak),
+                total_matches=rankings.c.total_matches + 1,
+                last_match_at=now,
+                updated_at=now
+            )
+            .returning(*rankings.c)
+        )
+        
+        rating_changes = {user_id: change for user_id, _, change, _ in outcomes}
+        updates = {}
+        for row in result:
+            ranking = self._to_ranking(row)
+            user_key = ranking["user_id"]
+            fields = {
+                "rating": row.rating,
+                "wins": row.wins,
+                "losses": row.losses,
+                "draws": row.draws,
+                "win_streak": row.win_streak,
+                "total_matches": row.total_matches
+            }
+            on_commit(self.session, lambda key=user_key, fields=fields: leaderboard.apply(key, **fields))
+            updates[row.user_id] = {
+                "user_id": user_key,
+                "rating": row.rating,
+                "rating_change": rating_changes[row.user_id],
+                "wins": row.wins,
+                "losses": row.losses,
+                "win_streak": row.win_streak,
+                "total_matches": row.total_matches,
+                "win_rate": ranking["win_rate"]
+            }
+        cache.invalidate_on_commit(self.session, "leaderboard")
+        
+        return updates
+    
     async def get_leaderboard(
         self,
         limit: int = 100,
         cursor: Optional[str] = None
     ) -> Tuple[List[dict], Optional[str]]:
-        """Get leaderboard."""
-        # Query rankings with user profile info
-        query = (
-            select(
-                RankingModel,
-                PlayerProfileModel.username,
-                PlayerProfileModel.display_name
-            )
-            .join(PlayerProfileModel, RankingModel.user_id == PlayerProfileModel.user_id)
-            .order_by(desc(RankingModel.rating))
-            .limit(limit + 1)
-        )
+        """Get leaderboard page with global ranks from the in-memory index."""
+        
+        # Cursor holds (rating, user_id) of the last row on the previous page
+        position = decode_cursor(cursor, int)
+        after = (position[0], str(position[1])) if position else None
         
-        # Cursor-based pagination (using rating as cursor)
-        if cursor:
-            try:
-                cursor_rating = int(cursor)
-                query = query.where(RankingModel.rating < cursor_rating)
-            except ValueError:
-                pass
-        
-        result = await self.session.execute(query)
-        rows = result.all()
-        
-        leaderboard = []
-        for i, (ranking, username, display_name) in enumerate(rows[:limit]):
-            total = ranking.wins + ranking.losses + ranking.draws
-            win_rate = (ranking.wins / total * 100) if total > 0 else 0.0
-            
-            leaderboard.append({
-                "rank": i + 1,
-                "user_id": str(ranking.user_id),
-                "username": username,
-                "display_name": display_name,
-                "rating": ranking.rating,
-                "wins": ranking.wins,
-                "losses": ranking.losses,
-                "draws": ranking.draws,
-                "win_streak": ranking.win_streak,
-                "total_matches": ranking.total_matches,
-                "win_rate": round(win_rate, 2)
-            })
+        rows, has_more = leaderboard.page(limit, after=after)
         
         next_cursor = None
-        if len(rows) > limit:
-            next_cursor = str(rows[limit][0].rating)
+        if has_more and rows:
+            next_cursor = encode_cursor(rows[-1]["rating"], rows[-1]["user_id"])
         
-        return leaderboard, next_cursor
+        return rows, next_cursor
+    
+    async def get_user_rank(self, user_id: UUID) -> Optional[dict]:
+        """Get a user's global rank and percentile."""
+        return leaderboard.rank_of(str(user_id))
+    
+    async def get_players_around(self, user_id: UUID, radius: int) -> Optional[List[dict]]:
+        """Get the players ranked immediately above and below a user."""
+        return leaderboard.around(str(user_id), radius)
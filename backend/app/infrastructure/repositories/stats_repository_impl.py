@@ -0,0 +1,152 @@
+"""
+Platform statistics repository implementation using SQLAlchemy.
+
+Counters live in one small table. Processes add their buffered deltas
+with a single upsert, and a periodic reconcile recounts the source tables
+so any drift (e.g. deltas lost when a process died) cannot accumulate.
+"""
+from collections import Counter
+from typing import Dict, Optional
+from datetime import datetime
+from sqlalchemy import select, func, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.repositories.stats_repository import StatsRepository
+from app.infrastructure.database.models.stats import PlatformCounter as PlatformCounterModel
+
+# Counter holding the database epoch second the last recount was taken at
+RECONCILED_AT = "reconciled_at"
+
+# Advisory lock reconciles take exclusively and flushes take shared, so a
+# reconcile never overlaps another reconcile or any flush
+RECONCILE_LOCK_KEY = 0x7374617473
+
+# Exact value of every counter, in one statement; the status and type
+# columns are all indexed, so each branch is an index scan
+EXACT_COUNTS = text("""
+    SELECT 'users.total' AS name, count(*) AS value FROM users WHERE deleted_at IS NULL
+    UNION ALL
+    SELECT 'users.status.' || account_status, count(*) FROM users
+    WHERE deleted_at IS NULL GROUP BY account_status
+    UNION ALL
+    SELECT 'matches.status.' || status, count(*) FROM matches GROUP BY status
+    UNION ALL
+    SELECT 'disputes.status.' || status::text, count(*) FROM disputes GROUP BY status
+    UNION ALL
+    SELECT 'transactions.count.' || transaction_type::text, count(*) FROM transactions
+    WHERE status = 'COMPLETED' GROUP BY transaction_type
+    UNION ALL
+    SELECT 'transactions.volume_cents.' || transaction_type::text, sum(abs(amount_cents)) FROM transactions
+    WHERE status = 'COMPLETED' GROUP BY transaction_type
+    UNION ALL
+    SELECT 'reconciled_at', floor(extract(epoch FROM statement_timestamp()))
+""")
+
+
+class StatsRepositoryImpl(StatsRepository):
+    """SQLAlchemy implementation of StatsRepository."""
+    
+    def __init__(self, session: AsyncSession):
+        self.session = session
+    
+    async def _upsert(self, values: Dict[str, int], increment: bool) -> None:
+        counters = PlatformCounterModel.__table__
+        now = datetime.utcnow()
+        
+        # Rows are locked in name order, as reconcile locks them, so the two cannot deadlock
+        stmt = pg_insert(counters).values([
+            {"name": name, "value": value, "updated_at": now}
+            for name, value in sorted(values.items())
+        ])
+        await self.session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[counters.c.name],
+                set_={
+                    "value": counters.c.value + stmt.excluded.value if increment else stmt.excluded.value,
+                    "updated_at": stmt.excluded.updated_at
+                }
+            )
+        )
+    
+    async def add_to_counters(self, buckets: Dict[int, Dict[str, int]]) -> int:
+        """
+        Add buffered deltas with one upsert, dropping buckets the last recount already counted.
+        
+        The reconcile lock is taken shared first, so a flush waits out a
+        running reconcile and then reads the epoch it wrote. Returns how
+        many buckets were dropped as stale.
+        """
+        if not buckets:
+            return 0
+        counters = PlatformCounterModel.__table__
+        
+        await self.session.execute(select(func.pg_advisory_xact_lock_shared(RECONCILE_LOCK_KEY)))
+        reconciled_at = await self.session.scalar(
+            select(counters.c.value).where(counters.c.name == RECONCILED_AT)
+        ) or 0
+        
+        deltas: Counter = Counter()
+        stale = 0
+        for second, bucket in buckets.items():
+            if second < reconciled_at:
+                stale += 1
+            else:
+                deltas.update(bucket)
+        deltas = {name: delta for name, delta in deltas.items() if delta}
+        if deltas:
+            await self._upsert(deltas, increment=True)
+        return stale
+    
+    async def get_counters(self) -> Dict[str, int]:
+        """Get every counter by name."""
+        counters = PlatformCounterModel.__table__
+        result = await self.session.execute(select(counters.c.name, counters.c.value))
+        return {name: int(value) for name, value in result.all()}
+    
+    async def reconcile_counters(self, min_interval_seconds: float) -> Optional[Dict[str, int]]:
+        """
+        Recount and overwrite every counter.
+        
+        The recount includes every event committed before it, including
+        ones other processes have buffered but not flushed yet. It stores
+        its own start second as RECONCILED_AT, and flushes drop buckets
+        buffered before that instead of adding them a second time. Events
+        buffered within the same second as the recount, or shifted across
+        it by clock skew between the app and the database, can still be
+        off by a few; the next reconcile repairs them.
+        """
+        counters = PlatformCounterModel.__table__
+        
+        result = await self.session.execute(
+            select(
+                func.pg_try_advisory_xact_lock(RECONCILE_LOCK_KEY),
+                func.extract("epoch", func.clock_timestamp())
+            )
+        )
+        locked, now = result.one()
+        if not locked:
+            return None  # Another node is reconciling, or a flush is in progress
+        
+        result = await self.session.execute(
+            select(counters.c.name, counters.c.value)
+            .order_by(counters.c.name)
+            .with_for_update()
+        )
+        stored = {name: int(value) for name, value in result.all()}
+        if float(now) - stored.get(RECONCILED_AT, 0) < min_interval_seconds:
+            return None
+        
+        result = await self.session.execute(EXACT_COUNTS)
+        exact = {name: int(value) for name, value in result.all()}
+        # Counters whose rows have all gone (e.g. a status no longer in use) drop to zero
+        for name in stored:
+            exact.setdefault(name, 0)
+        
+        await self._upsert(exact, increment=False)
+        
+        return {
+            name: value - stored.get(name, 0)
+            for name, value in exact.items()
+            if name != RECONCILED_AT and value != stored.get(name, 0)
+        }
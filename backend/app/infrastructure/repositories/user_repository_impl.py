@@ -1,11 +1,13 @@
 """
 User repository implementation using SQLAlchemy.
 """
-from typing import Optional
+from datetime import datetime
+from typing import Dict, Optional, List, Tuple
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, update, union, desc, or_, values, column, DateTime
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.orm import selectinload, noload
 
 from app.domain.entities.user import User, PlayerProfile
 from app.domain.repositories.user_repository import UserRepository
@@ -13,7 +15,19 @@ from app.infrastructure.database.models.user import User as UserModel, Role, Use
 from app.infrastructure.database.models.player_profile import PlayerProfile as PlayerProfileModel
 from app.infrastructure.database.models.wallet import Wallet as WalletModel
 from app.infrastructure.database.models.ranking import Ranking as RankingModel
-from app.core.security import verify_password
+from app.infrastructure.database.session import on_commit
+from app.infrastructure.leaderboard import leaderboard
+from app.infrastructure.cache import cache
+from app.infrastructure.principal_cache import principal_cache, SECURITY_FIELDS
+from app.infrastructure.platform_stats import platform_stats
+from app.infrastructure.repositories.pagination import keyset_page, page_cursor
+from app.core.security import verify_password_async
+
+
+def _like_pattern(text: str) -> str:
+    """Substring pattern for ILIKE with the user's wildcards taken literally."""
+    escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
 
 
 class UserRepositoryImpl(UserRepository):
@@ -111,9 +125,15 @@ class UserRepositoryImpl(UserRepository):
             )
             self.session.add(user_role)
         
-        await self.session.commit()
-        await self.session.refresh(user_model)
-        await self.session.refresh(profile_model)
+        await self.session.flush()
+        
+        on_commit(self.session, lambda: leaderboard.apply(
+            str(user_model.id),
+            rating=ranking_model.rating,
+            username=profile_model.username,
+            display_name=profile_model.display_name
+        ))
+        platform_stats.user_created(self.session, user_model.account_status)
         
         return (
             self._to_domain_user(user_model),
@@ -131,6 +151,22 @@ class UserRepositoryImpl(UserRepository):
         model = result.scalar_one_or_none()
         return self._to_domain_user(model) if model else None
     
+    async def has_role(self, user_id: UUID, role_name: str) -> bool:
+        """Check whether the user currently holds a role (revoked grants do not count)."""
+        result = await self.session.execute(
+            select(
+                select(UserRole.id)
+                .join(Role, Role.id == UserRole.role_id)
+                .where(
+                    UserRole.user_id == user_id,
+                    UserRole.revoked_at.is_(None),
+                    Role.name == role_name
+                )
+                .exists()
+            )
+        )
+        return bool(result.scalar())
+    
     async def get_user_by_email(self, email: str) -> Optional[User]:
         """Get user by email."""
         result = await self.session.execute(
@@ -142,6 +178,31 @@ class UserRepositoryImpl(UserRepository):
         model = result.scalar_one_or_none()
         return self._to_domain_user(model) if model else None
     
+    async def get_login_account(
+        self,
+        email: str
+    ) -> Optional[Tuple[User, Optional[PlayerProfile], str]]:
+        """Get user, profile and password hash by email in one query."""
+        result = await self.session.execute(
+            select(UserModel, PlayerProfileModel)
+            .outerjoin(PlayerProfileModel, PlayerProfileModel.user_id == UserModel.id)
+            .where(
+                UserModel.email == email,
+                UserModel.deleted_at.is_(None)
+            )
+            # The joined row already carries the profile; skip the selectin loaders
+            .options(noload(UserModel.roles), noload(UserModel.profile), noload(UserModel.wallet))
+        )
+        row = result.one_or_none()
+        if row is None:
+            return None
+        user_model, profile_model = row
+        return (
+            self._to_domain_user(user_model),
+            self._to_domain_profile(profile_model) if profile_model else None,
+            user_model.password_hash
+        )
+    
     async def get_user_by_username(self, username: str) -> Optional[User]:
         """Get user by username."""
         result = await self.session.execute(
@@ -162,17 +223,112 @@ class UserRepositoryImpl(UserRepository):
         )
         model = result.scalar_one()
         
+        public_changed = (
+            (model.email_verified, model.account_status) != (user.email_verified, user.account_status)
+        )
+        security_changed = any(
+            getattr(model, field) != getattr(user, field) for field in SECURITY_FIELDS
+        )
+        platform_stats.user_status_changed(self.session, model.account_status, user.account_status)
+        
         model.email_verified = user.email_verified
         model.account_status = user.account_status
         model.failed_login_attempts = user.failed_login_attempts
         model.locked_until = user.locked_until
         model.last_login_at = user.last_login_at
         
-        await self.session.commit()
-        await self.session.refresh(model)
+        await self.session.flush()
+        
+        if public_changed:
+            cache.invalidate_on_commit(self.session, "profile", str(model.id))
+        if security_changed:
+            principal_cache.invalidate_on_commit(self.session, model.id)
         
         return self._to_domain_user(model)
     
+    async def record_last_logins(self, logins: Dict[UUID, datetime]) -> int:
+        """Set last_login_at for many users, never moving it backwards; returns rows updated."""
+        if not logins:
+            return 0
+        
+        users = UserModel.__table__
+        # Sorted so concurrent flushes from different nodes lock rows in the same order
+        latest = values(
+            column("user_id", PG_UUID(as_uuid=True)),
+            column("at", DateTime(timezone=True)),
+            name="latest"
+        ).data(sorted(logins.items()))
+        
+        result = await self.session.execute(
+            update(users)
+            .where(
+                users.c.id == latest.c.user_id,
+                or_(users.c.last_login_at.is_(None), users.c.last_login_at < latest.c.at)
+            )
+            .values(last_login_at=latest.c.at)
+        )
+        return result.rowcount
+    
+    async def search_users(
+        self,
+        query: Optional[str] = None,
+        account_status: Optional[str] = None,
+        deleted: Optional[bool] = False,
+        limit: int = 20,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Tuple[User, Optional[PlayerProfile]]], Optional[str]]:
+        """
+        Search users by partial email or username, newest first.
+        
+        Substring matches are served by the trigram indexes on users.email
+        and player_profiles.username. The two columns live in different
+        tables, so each gets its own keyset scan and the two short lists are
+        merged; Postgres picks per side between the trigram index (rare
+        terms) and walking (created_at, id) until the page fills (common
+        ones). Without a query this is a plain keyset listing.
+        """
+        conditions = []
+        if account_status:
+            conditions.append(UserModel.account_status == account_status)
+        if deleted is not None:
+            conditions.append(UserModel.deleted_at.isnot(None) if deleted else UserModel.deleted_at.is_(None))
+        
+        if query:
+            pattern = _like_pattern(query)
+            sides = [
+                select(UserModel.id, UserModel.created_at)
+                .where(UserModel.email.ilike(pattern), *conditions),
+                select(UserModel.id, UserModel.created_at)
+                .join(PlayerProfileModel, PlayerProfileModel.user_id == UserModel.id)
+                .where(PlayerProfileModel.username.ilike(pattern), *conditions)
+            ]
+        else:
+            sides = [select(UserModel.id, UserModel.created_at).where(*conditions)]
+        
+        pages = [
+            keyset_page(side, UserModel.created_at, UserModel.id, cursor, limit).subquery()
+            for side in sides
+        ]
+        page_ids = union(*(select(page.c.id, page.c.created_at) for page in pages)).subquery()
+        
+        result = await self.session.execute(
+            select(UserModel, PlayerProfileModel)
+            .options(noload(UserModel.roles), noload(UserModel.profile), noload(UserModel.wallet))
+            .join(page_ids, UserModel.id == page_ids.c.id)
+            .outerjoin(PlayerProfileModel, PlayerProfileModel.user_id == UserModel.id)
+            .order_by(desc(UserModel.created_at), desc(UserModel.id))
+            .limit(limit + 1)
+        )
+        rows = result.all()
+        models, next_cursor = page_cursor([user for user, _ in rows], limit, "created_at")
+        
+        users = [
+            (self._to_domain_user(user), self._to_domain_profile(profile) if profile else None)
+            for (user, profile), _ in zip(rows, models)
+        ]
+        
+        return users, next_cursor
+    
     async def get_profile_by_user_id(self, user_id: UUID) -> Optional[PlayerProfile]:
         """Get player profile by user ID."""
         result = await self.session.execute(
@@ -193,8 +349,10 @@ class UserRepositoryImpl(UserRepository):
         model.bio = profile.bio
         model.timezone = profile.timezone
         
-        await self.session.commit()
-        await self.session.refresh(model)
+        await self.session.flush()
+        
+        user_id, display_name = str(model.user_id), model.display_name
+        on_commit(self.session, lambda: leaderboard.apply(user_id, display_name=display_name))
         
         return self._to_domain_profile(model)
     
@@ -223,4 +381,4 @@ class UserRepositoryImpl(UserRepository):
         user_model = result.scalar_one_or_none()
         if not user_model:
             return False
-        return verify_password(password, user_model.password_hash)
+        return await verify_password_async(password, user_model.password_hash)
@@ -1,13 +1,24 @@
 """
 Wallet repository implementation using SQLAlchemy.
 """
-from typing import Optional, List, Tuple
-from uuid import UUID
+from typing import Any, AsyncIterator, Dict, Optional, List, Tuple
+from uuid import UUID, uuid4
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, desc
+from sqlalchemy import select, desc, update, insert, exists, literal, or_, values, column, BigInteger
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm.util import identity_key
+from sqlalchemy.orm.attributes import set_committed_value
 
-from app.domain.entities.payment import Wallet, Transaction, TransactionType, TransactionStatus
+from app.domain.entities.payment import (
+    Wallet,
+    Transaction,
+    TransactionType,
+    TransactionStatus,
+    DepositSettlement
+)
+from app.domain.entities.ledger import wallet_journal
 from app.domain.repositories.wallet_repository import WalletRepository
 from app.infrastructure.database.models.wallet import (
     Wallet as WalletModel,
@@ -15,6 +26,25 @@ from app.infrastructure.database.models.wallet import (
     TransactionType as TransactionTypeEnum,
     TransactionStatus as TransactionStatusEnum
 )
+from app.infrastructure.repositories.ledger_repository_impl import LedgerRepositoryImpl
+from app.infrastructure.repositories.pagination import keyset_page, page_cursor
+from app.infrastructure.platform_stats import platform_stats
+
+
+# Columns written by transaction exports, in output order
+EXPORT_COLUMNS = (
+    "id",
+    "created_at",
+    "transaction_type",
+    "status",
+    "amount_cents",
+    "balance_before_cents",
+    "balance_after_cents",
+    "description",
+    "reference_id",
+    "reference_type",
+    "processed_at",
+)
 
 
 class WalletRepositoryImpl(WalletRepository):
@@ -22,6 +52,7 @@ class WalletRepositoryImpl(WalletRepository):
     
     def __init__(self, session: AsyncSession):
         self.session = session
+        self.ledger = LedgerRepositoryImpl(session)
     
     def _to_domain_wallet(self, model: WalletModel) -> Wallet:
         """Convert SQLAlchemy model to domain entity."""
@@ -74,8 +105,7 @@ class WalletRepositoryImpl(WalletRepository):
             currency="USD"
         )
         self.session.add(wallet_model)
-        await self.session.commit()
-        await self.session.refresh(wallet_model)
+        await self.session.flush()
         return self._to_domain_wallet(wallet_model)
     
     async def update_wallet(self, wallet: Wallet) -> Wallet:
@@ -90,8 +120,7 @@ class WalletRepositoryImpl(WalletRepository):
         model.total_deposited_cents = wallet.total_deposited_cents
         model.total_withdrawn_cents = wallet.total_withdrawn_cents
         
-        await self.session.commit()
-        await self.session.refresh(model)
+        await self.session.flush()
         return self._to_domain_wallet(model)
     
     async def create_transaction(
@@ -105,7 +134,8 @@ class WalletRepositoryImpl(WalletRepository):
         idempotency_key: Optional[str] = None,
         reference_id: Optional[UUID] = None,
         reference_type: Optional[str] = None,
-        description: Optional[str] = None
+        description: Optional[str] = None,
+        extra_data: Optional[Dict[str, Any]] = None
     ) -> Transaction:
         """Create a transaction."""
         transaction_model = TransactionModel(
@@ -119,15 +149,293 @@ class WalletRepositoryImpl(WalletRepository):
             idempotency_key=idempotency_key,
             reference_id=reference_id,
             reference_type=reference_type,
-            description=description
+            description=description,
+            extra_data=extra_data
         )
         
         self.session.add(transaction_model)
-        await self.session.commit()
-        await self.session.refresh(transaction_model)
+        await self.session.flush()
         
         return self._to_domain_transaction(transaction_model)
     
+    async def apply_balance_change(
+        self,
+        user_id: UUID,
+        amount_cents: int,
+        transaction_type: TransactionType,
+        idempotency_key: Optional[str] = None,
+        reference_id: Optional[UUID] = None,
+        reference_type: Optional[str] = None,
+        description: Optional[str] = None
+    ) -> Optional[Transaction]:
+        """
+        Atomically change balance and append a completed transaction.
+        
+        Runs as a single statement: a conditional UPDATE ... RETURNING on
+        wallets feeds an INSERT ... SELECT into transactions. The row lock taken
+        by the UPDATE serializes concurrent changes, so balance_before/after
+        always form a consistent chain and no update is lost. With an
+        idempotency key the statement runs in a savepoint, so a duplicate key
+        racing in from a concurrent request rolls back cleanly and returns None.
+        """
+        return await self._apply_change(
+            user_id=user_id,
+            amount_cents=amount_cents,
+            transaction_type=transaction_type,
+            status=TransactionStatusEnum.COMPLETED,
+            idempotency_key=idempotency_key,
+            reference_id=reference_id,
+            reference_type=reference_type,
+            description=description
+        )
+    
+    async def reserve_withdrawal(
+        self,
+        user_id: UUID,
+        amount_cents: int,
+        idempotency_key: str,
+        description: Optional[str] = None,
+        extra_data: Optional[Dict[str, Any]] = None
+    ) -> Optional[Transaction]:
+        """Atomically move funds from balance to pending and record a PROCESSING withdrawal."""
+        return await self._apply_change(
+            user_id=user_id,
+            amount_cents=-amount_cents,
+            transaction_type=TransactionType.WITHDRAWAL,
+            status=TransactionStatusEnum.PROCESSING,
+            idempotency_key=idempotency_key,
+            description=description,
+            extra_data=extra_data,
+            pending_change=amount_cents
+        )
+    
+    async def _apply_change(
+        self,
+        user_id: UUID,
+        amount_cents: int,
+        transaction_type: TransactionType,
+        status: TransactionStatusEnum,
+        idempotency_key: Optional[str] = None,
+        reference_id: Optional[UUID] = None,
+        reference_type: Optional[str] = None,
+        description: Optional[str] = None,
+        extra_data: Optional[Dict[str, Any]] = None,
+        pending_change: int = 0
+    ) -> Optional[Transaction]:
+        """Change balance (and pending) and insert the transaction in one statement, then post it to the ledger."""
+        wallets = WalletModel.__table__
+        transactions = TransactionModel.__table__
+        now = datetime.utcnow()
+        
+        conditions = [
+            wallets.c.user_id == user_id,
+            wallets.c.balance_cents + amount_cents >= 0
+        ]
+        if idempotency_key:
+            conditions.append(
+                ~exists().where(transactions.c.idempotency_key == idempotency_key)
+            )
+        
+        wallet_changes = {"balance_cents": wallets.c.balance_cents + amount_cents}
+        if pending_change:
+            wallet_changes["pending_cents"] = wallets.c.pending_cents + pending_change
+        
+        updated_wallet = (
+            update(wallets)
+            .where(*conditions)
+            .values(updated_at=now, **wallet_changes)
+            .returning(wallets.c.id, wallets.c.balance_cents, wallets.c.pending_cents)
+            .cte("updated_wallet")
+        )
+        
+        columns = transactions.c
+        stmt = (
+            insert(transactions)
+            .from_select(
+                [
+                    columns.id, columns.user_id, columns.wallet_id,
+                    columns.transaction_type, columns.status, columns.amount_cents,
+                    columns.balance_before_cents, columns.balance_after_cents,
+                    columns.reference_id, columns.reference_type,
+                    columns.idempotency_key, columns.description, columns.extra_data,
+                    columns.processed_at, columns.created_at, columns.updated_at
+                ],
+                select(
+                    literal(uuid4(), columns.id.type),
+                    literal(user_id, columns.user_id.type),
+                    updated_wallet.c.id,
+                    literal(TransactionTypeEnum(transaction_type.value), columns.transaction_type.type),
+                    literal(status, columns.status.type),
+                    literal(amount_cents, columns.amount_cents.type),
+                    updated_wallet.c.balance_cents - amount_cents,
+                    updated_wallet.c.balance_cents,
+                    literal(reference_id, columns.reference_id.type),
+                    literal(reference_type, columns.reference_type.type),
+                    literal(idempotency_key, columns.idempotency_key.type),
+                    literal(description, columns.description.type),
+                    literal(extra_data, columns.extra_data.type),
+                    literal(now if status == TransactionStatusEnum.COMPLETED else None, columns.processed_at.type),
+                    literal(now, columns.created_at.type),
+                    literal(now, columns.updated_at.type)
+                )
+            )
+            .returning(*transactions.c)
+        )
+        
+        if idempotency_key:
+            # Two requests with the same key can both pass the NOT EXISTS guard;
+            # the later insert then hits the unique index. The savepoint takes
+            # this statement's wallet update back with it, and the caller finds
+            # the winner's transaction as an idempotent replay.
+            try:
+                async with self.session.begin_nested():
+                    row = (await self.session.execute(stmt)).one_or_none()
+            except IntegrityError:
+                return None
+        else:
+            row = (await self.session.execute(stmt)).one_or_none()
+        if row is None:
+            return None
+        
+        # Keep any wallet already loaded in this session in step with the database
+        wallet_model = self.session.sync_session.identity_map.get(
+            identity_key(WalletModel, row.wallet_id)
+        )
+        if wallet_model is not None:
+            set_committed_value(wallet_model, "balance_cents", row.balance_after_cents)
+            if pending_change:
+                set_committed_value(wallet_model, "pending_cents", wallet_model.pending_cents + pending_change)
+        
+        transaction = self._to_domain_transaction(row)
+        await self.ledger.post([wallet_journal(transaction)])
+        if status == TransactionStatusEnum.COMPLETED:
+            platform_stats.transactions_completed(self.session, [(transaction_type.value, amount_cents)])
+        
+        return transaction
+    
+    async def settle_deposits(self, settlements: List[DepositSettlement]) -> List[Transaction]:
+        """
+        Credit a batch of succeeded payment intents.
+        
+        Costs a fixed number of round trips whatever the batch size: one
+        SELECT locks the affected deposits, one locks the wallets (in user id
+        order, so concurrent batches cannot deadlock), one UPDATE raises every
+        balance, and a single flush writes the transaction rows.
+        """
+        if not settlements:
+            return []
+        
+        wallets = WalletModel.__table__
+        now = datetime.utcnow()
+        intent_ids = list(dict.fromkeys(s.payment_intent_id for s in settlements))
+        keys = [s.idempotency_key for s in settlements if s.idempotency_key]
+        
+        conditions = [TransactionModel.external_id.in_(intent_ids)]
+        if keys:
+            conditions.append(TransactionModel.idempotency_key.in_(keys))
+        result = await self.session.execute(
+            select(TransactionModel)
+            .where(
+                TransactionModel.transaction_type == TransactionTypeEnum.DEPOSIT,
+                or_(*conditions)
+            )
+            .with_for_update()
+        )
+        settled: Dict[str, TransactionModel] = {}
+        pending: Dict[str, TransactionModel] = {}
+        for model in result.scalars().all():
+            if model.status == TransactionStatusEnum.COMPLETED and model.external_id:
+                settled[model.external_id] = model
+            elif model.status == TransactionStatusEnum.PENDING and model.idempotency_key:
+                pending[model.idempotency_key] = model
+        
+        # Skip intents settled earlier and duplicates within the batch
+        to_apply: Dict[str, DepositSettlement] = {}
+        for settlement in settlements:
+            if settlement.payment_intent_id not in settled:
+                to_apply.setdefault(settlement.payment_intent_id, settlement)
+        
+        credits: Dict[UUID, int] = {}
+        for settlement in to_apply.values():
+            credits[settlement.user_id] = credits.get(settlement.user_id, 0) + settlement.amount_cents
+        
+        # wallet user_id -> [wallet_id, running balance]
+        running: Dict[UUID, list] = {}
+        if credits:
+            await self.session.execute(
+                select(wallets.c.id)
+                .where(wallets.c.user_id.in_(list(credits)))
+                .order_by(wallets.c.user_id)
+                .with_for_update()
+            )
+            credit_rows = values(
+                column("user_id", PG_UUID(as_uuid=True)),
+                column("amount_cents", BigInteger),
+                name="credits"
+            ).data(list(credits.items()))
+            result = await self.session.execute(
+                update(wallets)
+                .where(wallets.c.user_id == credit_rows.c.user_id)
+                .values(
+                    balance_cents=wallets.c.balance_cents + credit_rows.c.amount_cents,
+                    total_deposited_cents=wallets.c.total_deposited_cents + credit_rows.c.amount_cents,
+                    updated_at=now
+                )
+                .returning(wallets.c.id, wallets.c.user_id, wallets.c.balance_cents, wallets.c.total_deposited_cents)
+            )
+            for row in result.all():
+                running[row.user_id] = [row.id, row.balance_cents - credits[row.user_id]]
+                
+                # Keep any wallet already loaded in this session in step with the database
+                wallet_model = self.session.sync_session.identity_map.get(
+                    identity_key(WalletModel, row.id)
+                )
+                if wallet_model is not None:
+                    set_committed_value(wallet_model, "balance_cents", row.balance_cents)
+                    set_committed_value(wallet_model, "total_deposited_cents", row.total_deposited_cents)
+        
+        credited: List[TransactionModel] = []
+        for settlement in to_apply.values():
+            wallet = running.get(settlement.user_id)
+            if wallet is None:
+                continue  # No wallet: nothing was credited, the caller decides what to do
+            wallet_id, balance = wallet
+            
+            model = pending.get(settlement.idempotency_key) if settlement.idempotency_key else None
+            if model is None or model.user_id != settlement.user_id:
+                model = TransactionModel(
+                    id=uuid4(),
+                    user_id=settlement.user_id,
+                    wallet_id=wallet_id,
+                    transaction_type=TransactionTypeEnum.DEPOSIT,
+                    reference_type="payment",
+                    description=f"Deposit of ${settlement.amount_cents / 100:.2f}",
+                    created_at=now
+                )
+                self.session.add(model)
+            
+            model.status = TransactionStatusEnum.COMPLETED
+            model.amount_cents = settlement.amount_cents
+            model.balance_before_cents = balance
+            model.balance_after_cents = balance + settlement.amount_cents
+            model.external_id = settlement.payment_intent_id
+            model.processed_at = now
+            wallet[1] = balance + settlement.amount_cents
+            settled[settlement.payment_intent_id] = model
+            credited.append(model)
+        
+        await self.session.flush()
+        
+        await self.ledger.post([
+            wallet_journal(self._to_domain_transaction(model)) for model in credited
+        ])
+        platform_stats.transactions_completed(
+            self.session,
+            [(TransactionType.DEPOSIT.value, model.amount_cents) for model in credited]
+        )
+        
+        return [self._to_domain_transaction(settled[i]) for i in intent_ids if i in settled]
+    
     async def get_transaction_by_id(self, transaction_id: UUID) -> Optional[Transaction]:
         """Get transaction by ID."""
         result = await self.session.execute(
@@ -157,26 +465,57 @@ class WalletRepositoryImpl(WalletRepository):
         if transaction_type:
             query = query.where(TransactionModel.transaction_type == TransactionTypeEnum(transaction_type.value))
         
-        if cursor:
-            try:
-                cursor_time = datetime.fromisoformat(cursor)
-                query = query.where(TransactionModel.created_at < cursor_time)
-            except ValueError:
-                pass
-        
-        query = query.order_by(desc(TransactionModel.created_at)).limit(limit + 1)
+        query = keyset_page(query, TransactionModel.created_at, TransactionModel.id, cursor, limit)
         
         result = await self.session.execute(query)
-        models = result.scalars().all()
-        
-        transactions = [self._to_domain_transaction(m) for m in models[:limit]]
-        next_cursor = None
+        models, next_cursor = page_cursor(result.scalars().all(), limit, "created_at")
         
-        if len(models) > limit:
-            next_cursor = models[limit].created_at.isoformat()
+        transactions = [self._to_domain_transaction(m) for m in models]
         
         return transactions, next_cursor
     
+    async def stream_transactions(
+        self,
+        user_id: Optional[UUID] = None,
+        transaction_types: Optional[List[TransactionType]] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+        batch_size: int = 1000
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Stream transactions oldest first, in batches of plain rows.
+        
+        Rows come through a server-side cursor batch_size at a time and skip
+        the ORM entirely, so memory stays flat however long the history is.
+        Only the export columns are read; for a single user the scan follows
+        the (user_id, created_at, id) index.
+        """
+        transactions = TransactionModel.__table__
+        query = select(*(transactions.c[name] for name in EXPORT_COLUMNS))
+        
+        if user_id:
+            query = query.where(transactions.c.user_id == user_id)
+        if transaction_types:
+            query = query.where(
+                transactions.c.transaction_type.in_([TransactionTypeEnum(t.value) for t in transaction_types])
+            )
+        if created_from:
+            query = query.where(transactions.c.created_at >= created_from)
+        if created_to:
+            query = query.where(transactions.c.created_at < created_to)
+        
+        query = query.order_by(transactions.c.created_at, transactions.c.id)
+        
+        result = await self.session.stream(query.execution_options(yield_per=batch_size))
+        async for partition in result.mappings().partitions():
+            yield [
+                {
+                    **row,
+                    "transaction_type": row["transaction_type"].value,
+                    "status": row["status"].value
+                } for row in partition
+            ]
+    
     async def update_transaction_status(
         self,
         transaction_id: UUID,
@@ -189,6 +528,8 @@ class WalletRepositoryImpl(WalletRepository):
         )
         model = result.scalar_one()
         
+        if status == TransactionStatus.COMPLETED and model.status != TransactionStatusEnum.COMPLETED:
+            platform_stats.transactions_completed(self.session, [(model.transaction_type.value, model.amount_cents)])
         model.status = TransactionStatusEnum(status.value)
         if external_id:
             model.external_id = external_id
@@ -197,7 +538,6 @@ class WalletRepositoryImpl(WalletRepository):
         elif status == TransactionStatus.FAILED:
             model.failed_at = datetime.utcnow()
         
-        await self.session.commit()
-        await self.session.refresh(model)
+        await self.session.flush()
         
         return self._to_domain_transaction(model)
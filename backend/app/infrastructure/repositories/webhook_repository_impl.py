@@ -0,0 +1,115 @@
+"""
+Webhook inbox repository implementation using SQLAlchemy.
+"""
+from typing import Any, Dict, List, Optional
+from datetime import datetime
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, func, case
+from sqlalchemy.dialects.postgresql import insert
+
+from app.domain.entities.payment import WebhookEvent
+from app.domain.repositories.webhook_repository import WebhookRepository
+from app.infrastructure.database.models.webhook import (
+    WebhookEvent as WebhookEventModel,
+    WebhookEventStatus
+)
+
+
+class WebhookRepositoryImpl(WebhookRepository):
+    """SQLAlchemy implementation of WebhookRepository."""
+    
+    def __init__(self, session: AsyncSession):
+        self.session = session
+    
+    def _to_domain_event(self, model: WebhookEventModel) -> WebhookEvent:
+        """Convert SQLAlchemy model to domain entity."""
+        return WebhookEvent(
+            id=model.id,
+            provider=model.provider,
+            event_type=model.event_type,
+            payload=model.payload,
+            status=model.status,
+            attempts=model.attempts,
+            received_at=model.received_at,
+            processed_at=model.processed_at,
+            last_error=model.last_error
+        )
+    
+    async def record_event(
+        self,
+        event_id: str,
+        event_type: str,
+        payload: Dict[str, Any],
+        provider: str = "stripe"
+    ) -> bool:
+        """Insert the event, ignoring redeliveries of an id already in the inbox."""
+        stmt = (
+            insert(WebhookEventModel)
+            .values(
+                id=event_id,
+                provider=provider,
+                event_type=event_type,
+                payload=payload,
+                status=WebhookEventStatus.RECEIVED,
+                attempts=0,
+                received_at=datetime.utcnow()
+            )
+            .on_conflict_do_nothing(index_elements=[WebhookEventModel.id])
+            .returning(WebhookEventModel.id)
+        )
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none() is not None
+    
+    async def claim_events(self, limit: int, event_ids: Optional[List[str]] = None) -> List[WebhookEvent]:
+        """Lock the oldest received events with FOR UPDATE SKIP LOCKED."""
+        query = select(WebhookEventModel).where(WebhookEventModel.status == WebhookEventStatus.RECEIVED)
+        if event_ids is not None:
+            query = query.where(WebhookEventModel.id.in_(event_ids))
+        
+        result = await self.session.execute(
+            query
+            .order_by(WebhookEventModel.received_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        return [self._to_domain_event(m) for m in result.scalars().all()]
+    
+    async def mark_events(self, event_ids: List[str], status: str, error: Optional[str] = None) -> None:
+        """Set the final status of claimed events in one statement."""
+        if not event_ids:
+            return
+        await self.session.execute(
+            update(WebhookEventModel)
+            .where(WebhookEventModel.id.in_(event_ids))
+            .values(
+                status=status,
+                attempts=WebhookEventModel.attempts + 1,
+                last_error=error,
+                processed_at=datetime.utcnow()
+            )
+            .execution_options(synchronize_session=False)
+        )
+    
+    async def record_failure(self, event_id: str, error: str, max_attempts: int) -> None:
+        """Count a failed attempt and give up after max_attempts."""
+        await self.session.execute(
+            update(WebhookEventModel)
+            .where(WebhookEventModel.id == event_id)
+            .values(
+                attempts=WebhookEventModel.attempts + 1,
+                last_error=error,
+                status=case(
+                    (WebhookEventModel.attempts + 1 >= max_attempts, WebhookEventStatus.FAILED),
+                    else_=WebhookEventModel.status
+                )
+            )
+            .execution_options(synchronize_session=False)
+        )
+    
+    async def count_by_status(self) -> Dict[str, int]:
+        """Number of inbox events per status."""
+        result = await self.session.execute(
+            select(WebhookEventModel.status, func.count())
+            .group_by(WebhookEventModel.status)
+        )
+        return {status: count for status, count in result.all()}
@@ -11,6 +11,18 @@ import uvicorn
 
 from app.core.config import settings
 from app.core.exceptions import FGCMMatchException
+from app.api.rate_limit import RateLimitMiddleware
+from app.api.unit_of_work import UnitOfWorkMiddleware
+from app.infrastructure.rate_limiter import rate_limiter
+from app.infrastructure.external.payment_gateway import close_payment_gateway
+from app.infrastructure.principal_cache import principal_cache
+from app.workers.webhook_inbox import webhook_inbox_worker
+from app.workers.jobs import job_queue
+from app.workers.payouts import payout_worker
+from app.workers.ledger_snapshots import ledger_snapshot_worker
+from app.workers.platform_stats import platform_stats_worker
+from app.workers.last_logins import last_login_worker
+from app.workers.leaderboard import leaderboard_worker
 from app.api.v1 import auth, users, matches, rankings, payments, disputes, admin
 
 # Initialize FastAPI app
@@ -23,6 +35,26 @@ app = FastAPI(
     openapi_url="/openapi.json" if settings.DEBUG else None,
 )
 
+# Commit each request's unit of work before its response is sent; added
+# first so it sits innermost, directly around the routers
+app.add_middleware(UnitOfWorkMiddleware)
+
+# Rate limiting, ahead of routing so rejected requests never open a DB session;
+# added before CORS so 429 responses still carry CORS headers
+app.add_middleware(
+    RateLimitMiddleware,
+    limiter=rate_limiter,
+    auth_paths=[
+        f"{settings.API_V1_PREFIX}/auth/login",
+        f"{settings.API_V1_PREFIX}/auth/register",
+    ],
+    exempt_paths=[
+        "/health",
+        f"{settings.API_V1_PREFIX}/health",
+        f"{settings.API_V1_PREFIX}/payments/webhook",
+    ],
+)
+
 # CORS Middleware
 app.add_middleware(
     CORSMiddleware,
@@ -111,6 +143,38 @@ async def health_check():
     }
 
 
+@app.on_event("startup")
+async def startup() -> None:
+    """Start background workers."""
+    if settings.WEBHOOK_WORKERS_ENABLED:
+        webhook_inbox_worker.start()
+    if settings.JOB_WORKERS_ENABLED:
+        job_queue.start()
+    if settings.PAYOUT_WORKERS_ENABLED:
+        payout_worker.start()
+    if settings.LEDGER_SNAPSHOTS_ENABLED:
+        ledger_snapshot_worker.start()
+    if settings.STATS_ENABLED:
+        platform_stats_worker.start()
+    last_login_worker.start()
+    leaderboard_worker.start()
+    principal_cache.start()
+
+
+@app.on_event("shutdown")
+async def shutdown() -> None:
+    """Stop background workers and release pooled outbound connections."""
+    await webhook_inbox_worker.stop()
+    await job_queue.stop()
+    await payout_worker.stop()
+    await ledger_snapshot_worker.stop()
+    await platform_stats_worker.stop()
+    await last_login_worker.stop()
+    await leaderboard_worker.stop()
+    await principal_cache.stop()
+    await close_payment_gateway()
+
+
 # Include API routers
 app.include_router(auth.router, prefix=f"{settings.API_V1_PREFIX}/auth", tags=["Authentication"])
 app.include_router(users.router, prefix=f"{settings.API_V1_PREFIX}/users", tags=["Users"])
@@ -16,6 +16,11 @@ class WithdrawalRequest(BaseModel):
     """Withdrawal request."""
     amount_cents: int = Field(..., ge=100, description="Amount in cents (minimum $1.00)")
     idempotency_key: str = Field(..., description="Unique key to prevent duplicate withdrawals")
+    destination_account: str = Field(
+        ...,
+        pattern=r"^acct_[A-Za-z0-9]+$",
+        description="Stripe Connect account that receives the payout"
+    )
 
 
 class WalletResponse(BaseModel):
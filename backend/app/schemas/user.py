@@ -6,6 +6,19 @@ from pydantic import BaseModel
 from uuid import UUID
 
 
+class AdminUserResponse(BaseModel):
+    """User as listed in admin search."""
+    id: UUID
+    email: str
+    email_verified: bool
+    account_status: str
+    username: Optional[str]
+    display_name: Optional[str]
+    created_at: str
+    last_login_at: Optional[str]
+    deleted_at: Optional[str]
+
+
 class UpdateProfileRequest(BaseModel):
     """Update profile request."""
     display_name: Optional[str] = None
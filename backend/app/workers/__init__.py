@@ -0,0 +1 @@
+"""Background workers run inside the API process."""
@@ -0,0 +1,65 @@
+"""
+Shared run loop for background workers.
+"""
+import asyncio
+import logging
+from typing import List
+
+logger = logging.getLogger(__name__)
+
+
+class PollingWorker:
+    """
+    Pool of asyncio tasks that repeatedly call drain_once().
+
+    A task keeps draining while batches come back full and otherwise sleeps
+    for up to poll_seconds, or until notify() signals new work.
+    """
+
+    name = "worker"
+
+    def __init__(self, workers: int, batch_size: int, poll_seconds: float):
+        self.workers = workers
+        self.batch_size = batch_size
+        self.poll_seconds = poll_seconds
+        self._wakeup = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+
+    async def drain_once(self) -> int:
+        """Process one batch and return how many items were claimed."""
+        raise NotImplementedError
+
+    def notify(self) -> None:
+        """Wake idle tasks (called once new work is committed)."""
+        self._wakeup.set()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                claimed = await self.drain_once()
+            except Exception:
+                logger.exception("%s drain failed", self.name)
+                claimed = 0
+            if claimed < self.batch_size:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_seconds)
+                except asyncio.TimeoutError:
+                    pass
+
+    @property
+    def running(self) -> int:
+        """Number of live worker tasks."""
+        return len(self._tasks)
+
+    def start(self) -> None:
+        """Start the worker tasks on the running loop."""
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._run()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        """Cancel the worker tasks; an interrupted batch rolls back and is picked up again."""
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
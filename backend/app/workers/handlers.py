@@ -0,0 +1,60 @@
+"""
+Background job handlers.
+Each handler receives the worker's session and the job payload. Its writes
+commit together with the job being marked done, so a job's effects are
+applied exactly once even if the worker crashes mid-batch.
+"""
+from typing import Any, Awaitable, Callable, Dict, Optional
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.entities.job import JobType
+from app.domain.services.ranking_service import RankingService
+from app.infrastructure.external.notifier import get_notifier
+from app.infrastructure.repositories.audit_repository_impl import AuditRepositoryImpl
+from app.infrastructure.repositories.ranking_repository_impl import RankingRepositoryImpl
+from app.infrastructure.repositories.user_repository_impl import UserRepositoryImpl
+
+JobHandler = Callable[[AsyncSession, Dict[str, Any]], Awaitable[None]]
+
+
+def _uuid(value: Optional[str]) -> Optional[UUID]:
+    return UUID(value) if value else None
+
+
+async def update_ratings(session: AsyncSession, payload: Dict[str, Any]) -> None:
+    """
+    Apply the ELO update for a completed match.
+    complete_match now rates inline; this drains jobs queued before it did.
+    """
+    ranking_service = RankingService(RankingRepositoryImpl(session), UserRepositoryImpl(session))
+    await ranking_service.update_rankings_after_match(
+        UUID(payload["player1_id"]),
+        UUID(payload["player2_id"]),
+        UUID(payload["winner_id"])
+    )
+
+
+async def record_audit(session: AsyncSession, payload: Dict[str, Any]) -> None:
+    """Append an audit log entry."""
+    await AuditRepositoryImpl(session).record(
+        event_type=payload["event_type"],
+        action=payload["action"],
+        user_id=_uuid(payload.get("user_id")),
+        entity_type=payload.get("entity_type"),
+        entity_id=_uuid(payload.get("entity_id")),
+        details=payload.get("details")
+    )
+
+
+async def send_notification(session: AsyncSession, payload: Dict[str, Any]) -> None:
+    """Deliver a user notification."""
+    await get_notifier().notify(payload["user_id"], payload["kind"], payload.get("data", {}))
+
+
+HANDLERS: Dict[str, JobHandler] = {
+    JobType.UPDATE_RATINGS: update_ratings,
+    JobType.AUDIT: record_audit,
+    JobType.NOTIFY: send_notification,
+}
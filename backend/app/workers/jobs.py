@@ -0,0 +1,134 @@
+"""
+Durable background job queue.
+Jobs are rows in the jobs table, enqueued in the same transaction as the
+change that caused them. Worker tasks claim due jobs in batches with
+FOR UPDATE SKIP LOCKED and run each one inside a savepoint: a failing job
+is rolled back on its own and rescheduled with exponential backoff, the
+rest of the batch commits together with their SUCCEEDED status.
+"""
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.domain.entities.job import Job
+from app.infrastructure.database.session import unit_of_work
+from app.infrastructure.repositories.job_repository_impl import JobRepositoryImpl, enqueue_listeners
+from app.infrastructure.repositories.ledger_repository_impl import LEDGER_LINES
+from app.workers.base import PollingWorker
+from app.workers.handlers import HANDLERS, JobHandler
+
+logger = logging.getLogger(__name__)
+
+
+class JobQueue(PollingWorker):
+    """Pool of asyncio tasks running jobs from the jobs table."""
+
+    name = "job queue"
+
+    def __init__(
+        self,
+        handlers: Dict[str, JobHandler],
+        workers: int,
+        batch_size: int,
+        poll_seconds: float,
+        retry_base_seconds: float,
+        retry_max_seconds: float = 600.0
+    ):
+        super().__init__(workers, batch_size, poll_seconds)
+        self.handlers = handlers
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self.batches = 0
+        self.succeeded = 0
+        self.retried = 0
+        self.failed = 0
+        self.last_batch_ms = 0.0
+
+    def _retry_at(self, job: Job) -> Optional[datetime]:
+        """When to run the job again, or None once it is out of attempts."""
+        attempt = job.attempts + 1
+        if attempt >= job.max_attempts:
+            return None
+        delay = min(self.retry_base_seconds * 2 ** (attempt - 1), self.retry_max_seconds)
+        return datetime.utcnow() + timedelta(seconds=delay)
+
+    async def _run_job(self, session: AsyncSession, job: Job) -> Optional[str]:
+        """Run one job in a savepoint; returns an error message if it failed."""
+        handler = self.handlers.get(job.job_type)
+        if handler is None:
+            return f"No handler registered for {job.job_type}"
+
+        callbacks = session.info.setdefault("on_commit", [])
+        registered = len(callbacks)
+        ledger_lines = session.info.setdefault(LEDGER_LINES, [])
+        posted = len(ledger_lines)
+        try:
+            async with session.begin_nested():
+                await handler(session, job.payload)
+        except Exception as exc:
+            # The savepoint undid the job's writes; drop its after-commit side
+            # effects and unwritten ledger lines too
+            del callbacks[registered:]
+            del ledger_lines[posted:]
+            logger.warning("job %s (%s) failed: %s", job.id, job.job_type, exc)
+            return f"{type(exc).__name__}: {exc}"
+        return None
+
+    async def drain_once(self) -> int:
+        """Run one batch of due jobs and return how many were claimed."""
+        started = time.perf_counter()
+        async with unit_of_work() as session:
+            jobs_repo = JobRepositoryImpl(session)
+            jobs = await jobs_repo.claim_jobs(self.batch_size)
+
+            succeeded: List[Any] = []
+            for job in jobs:
+                error = await self._run_job(session, job)
+                if error is None:
+                    succeeded.append(job.id)
+                    continue
+                retry_at = self._retry_at(job)
+                await jobs_repo.record_failure(job.id, error, retry_at)
+                if retry_at is None:
+                    self.failed += 1
+                else:
+                    self.retried += 1
+
+            await jobs_repo.mark_succeeded(succeeded)
+
+        self.succeeded += len(succeeded)
+        if jobs:
+            self.batches += 1
+            self.last_batch_ms = (time.perf_counter() - started) * 1000
+        return len(jobs)
+
+    def start(self) -> None:
+        """Start the worker tasks and wake them whenever jobs are committed."""
+        if self.notify not in enqueue_listeners:
+            enqueue_listeners.append(self.notify)
+        super().start()
+
+    def stats(self) -> Dict[str, Any]:
+        """Throughput counters for this process."""
+        return {
+            "workers": self.running,
+            "batch_size": self.batch_size,
+            "batches": self.batches,
+            "succeeded": self.succeeded,
+            "retried": self.retried,
+            "failed": self.failed,
+            "last_batch_ms": round(self.last_batch_ms, 2)
+        }
+
+
+job_queue = JobQueue(
+    handlers=HANDLERS,
+    workers=settings.JOB_WORKERS,
+    batch_size=settings.JOB_BATCH_SIZE,
+    poll_seconds=settings.JOB_POLL_SECONDS,
+    retry_base_seconds=settings.JOB_RETRY_BASE_SECONDS
+)
@@ -0,0 +1,71 @@
+"""
+Last-login worker.
+Writes the login times buffered by this process to users.last_login_at,
+one multi-row UPDATE per LAST_LOGIN_BATCH_SIZE users, and flushes what is
+left on shutdown.
+"""
+import logging
+import time
+from typing import Any, Dict
+
+from app.core.config import settings
+from app.infrastructure.database.session import unit_of_work
+from app.infrastructure.last_logins import last_logins
+from app.infrastructure.repositories.user_repository_impl import UserRepositoryImpl
+from app.workers.base import PollingWorker
+
+logger = logging.getLogger(__name__)
+
+
+class LastLoginWorker(PollingWorker):
+    """Single asyncio task flushing coalesced last_login_at writes."""
+
+    name = "last login"
+
+    def __init__(self, flush_seconds: float, batch_size: int):
+        super().__init__(workers=1, batch_size=batch_size, poll_seconds=flush_seconds)
+        self.last_pass_ms = 0.0
+
+    async def drain_once(self) -> int:
+        """Write the buffered logins; returns how many users were flushed."""
+        pending = last_logins.take_pending()
+        if not pending:
+            return 0
+        started = time.perf_counter()
+        items = list(pending.items())
+        for start in range(0, len(items), self.batch_size):
+            batch = dict(items[start:start + self.batch_size])
+            try:
+                async with unit_of_work() as session:
+                    last_logins.written += await UserRepositoryImpl(session).record_last_logins(batch)
+            except Exception:
+                last_logins.restore_pending(dict(items[start:]))
+                raise
+        last_logins.flushes += 1
+        self.last_pass_ms = (time.perf_counter() - started) * 1000
+        # Flushed on the interval, not drained continuously like a queue
+        return 0
+
+    async def stop(self) -> None:
+        """Stop the task, then write whatever is still buffered."""
+        await super().stop()
+        try:
+            await self.drain_once()
+        except Exception:
+            logger.exception("final %s flush failed", self.name)
+
+    def stats(self) -> Dict[str, Any]:
+        """Flush counters for this process."""
+        return {
+            "workers": self.running,
+            "flush_seconds": self.poll_seconds,
+            "batch_size": self.batch_size,
+            "last_pass_ms": round(self.last_pass_ms, 2),
+            **last_logins.stats()
+        }
+
+
+last_login_worker = LastLoginWorker(
+    flush_seconds=settings.LAST_LOGIN_FLUSH_SECONDS,
+    batch_size=settings.LAST_LOGIN_BATCH_SIZE
+)
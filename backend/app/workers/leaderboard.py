@@ -0,0 +1,44 @@
+"""
+Leaderboard worker.
+Rebuilds this process's in-memory leaderboard index from the rankings
+table at startup and then every LEADERBOARD_REFRESH_SECONDS, so no request
+ever waits on the full rankings read or the index build.
+"""
+import time
+from typing import Any, Dict
+
+from app.core.config import settings
+from app.infrastructure.database.session import unit_of_work
+from app.infrastructure.leaderboard import leaderboard
+from app.workers.base import PollingWorker
+
+
+class LeaderboardWorker(PollingWorker):
+    """Single asyncio task reloading the leaderboard index."""
+
+    name = "leaderboard"
+
+    def __init__(self, refresh_seconds: float):
+        # One task, and never treat a pass as a full batch: always wait out the interval
+        super().__init__(workers=1, batch_size=1, poll_seconds=refresh_seconds)
+        self.last_pass_ms = 0.0
+
+    async def drain_once(self) -> int:
+        """Reload the index and swap it in."""
+        started = time.perf_counter()
+        async with unit_of_work() as session:
+            await leaderboard.reload(session)
+        self.last_pass_ms = (time.perf_counter() - started) * 1000
+        return 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Reload counters for this process."""
+        return {
+            "workers": self.running,
+            "refresh_seconds": self.poll_seconds,
+            "last_pass_ms": round(self.last_pass_ms, 2),
+            **leaderboard.stats()
+        }
+
+
+leaderboard_worker = LeaderboardWorker(refresh_seconds=settings.LEADERBOARD_REFRESH_SECONDS)
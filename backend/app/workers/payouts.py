@@ -0,0 +1,209 @@
+"""
+Withdrawal payout worker.
+Each pass leases a batch of withdrawals (FOR UPDATE SKIP LOCKED, so any
+number of workers on any number of nodes can run side by side), groups
+them into one payout per destination account, and commits that
+assignment before calling the gateway. Transfers go out concurrently,
+bounded by PAYOUT_CONCURRENCY, with the payout id as idempotency key: a
+payout retried after a crash or timeout can never be paid twice. Results
+are settled in bulk in a second short transaction. Only a definitive
+rejection refunds the withdrawals. Timeouts, 5xx, 409 and unexpected errors
+leave the outcome unknown (the transfer may have gone through), so they
+are retried with exponential backoff until PAYOUT_MAX_ATTEMPTS and then
+parked in REVIEW with the funds still reserved.
+"""
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from app.core.config import settings
+from app.core.exceptions import PaymentError
+from app.domain.entities.payment import Payout
+from app.infrastructure.database.session import unit_of_work
+from app.infrastructure.external.payment_gateway import PaymentGateway, get_payment_gateway
+from app.infrastructure.repositories.payout_repository_impl import PayoutRepositoryImpl
+from app.workers.base import PollingWorker
+
+logger = logging.getLogger(__name__)
+
+# Gateway failures worth retrying with the same idempotency key
+TRANSIENT_ERROR_CODES = ("GATEWAY_TIMEOUT", "GATEWAY_UNAVAILABLE")
+
+
+def is_transient(exc: PaymentError) -> bool:
+    """
+    True unless the gateway definitively rejected the transfer.
+
+    A transient outcome may succeed when retried with the same idempotency
+    key, or may already have succeeded, so it must never be refunded.
+    """
+    if exc.code in TRANSIENT_ERROR_CODES:
+        return True
+    status = (exc.details or {}).get("http_status") or 0
+    return status == 429 or status == 409 or status >= 500
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[max(math.ceil(len(ordered) * pct) - 1, 0)]
+
+
+class PayoutWorker(PollingWorker):
+    """Pool of asyncio tasks paying out PROCESSING withdrawals."""
+
+    name = "payouts"
+
+    def __init__(
+        self,
+        workers: int,
+        batch_size: int,
+        poll_seconds: float,
+        concurrency: int,
+        lease_seconds: float,
+        retry_base_seconds: float,
+        max_attempts: int,
+        retry_max_seconds: float = 900.0,
+        gateway: Optional[PaymentGateway] = None
+    ):
+        super().__init__(workers, batch_size, poll_seconds)
+        self.concurrency = concurrency
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self.gateway = gateway
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self.payouts_paid = 0
+        self.payouts_failed = 0
+        self.payouts_in_review = 0
+        self.payouts_retried = 0
+        self.withdrawals_paid = 0
+        self.withdrawals_refunded = 0
+        self.cents_paid = 0
+        self._transfer_ms: Deque[float] = deque(maxlen=1000)
+        self._batch_ms: Deque[float] = deque(maxlen=200)
+        self._settled: Deque[Tuple[float, int]] = deque()
+
+    def _retry_at(self, payout: Payout) -> Optional[datetime]:
+        """When to try the transfer again, or None once the payout is out of attempts."""
+        attempt = payout.attempts + 1
+        if attempt >= self.max_attempts:
+            return None
+        delay = min(self.retry_base_seconds * 2 ** payout.attempts, self.retry_max_seconds)
+        return datetime.utcnow() + timedelta(seconds=delay)
+
+    async def _transfer(self, payout: Payout) -> Tuple[Optional[str], Optional[str], bool]:
+        """Submit one payout; returns (transfer_id, error, transient)."""
+        gateway = self.gateway or get_payment_gateway()
+        async with self._semaphore:
+            started = time.perf_counter()
+            try:
+                transfer = await gateway.create_transfer(
+                    amount_cents=payout.amount_cents,
+                    destination_account=payout.destination,
+                    metadata={"payout_id": str(payout.id), "withdrawals": payout.withdrawal_count},
+                    idempotency_key=f"payout_{payout.id}"
+                )
+                return transfer["transfer_id"], None, False
+            except PaymentError as exc:
+                return None, exc.message, is_transient(exc)
+            except Exception as exc:
+                logger.exception("payout %s transfer failed", payout.id)
+                return None, str(exc), True
+            finally:
+                self._transfer_ms.append((time.perf_counter() - started) * 1000)
+
+    async def drain_once(self) -> int:
+        """Lease, transfer and settle one batch; returns the number of withdrawals handled."""
+        started = time.perf_counter()
+        async with unit_of_work() as session:
+            payouts = await PayoutRepositoryImpl(session).claim_payouts(self.batch_size, self.lease_seconds)
+        if not payouts:
+            return 0
+
+        outcomes = await asyncio.gather(*(self._transfer(payout) for payout in payouts))
+
+        paid: Dict[UUID, str] = {}
+        failed: Dict[UUID, str] = {}
+        review: Dict[UUID, str] = {}
+        retries: List[Tuple[Payout, str, datetime]] = []
+        for payout, (transfer_id, error, transient) in zip(payouts, outcomes):
+            retry_at = self._retry_at(payout) if transient and not transfer_id else None
+            if transfer_id:
+                paid[payout.id] = transfer_id
+            elif retry_at:
+                retries.append((payout, error, retry_at))
+            elif transient:
+                # Out of attempts, but the gateway may still have paid: never refund here
+                review[payout.id] = f"{error} (outcome unknown after {self.max_attempts} attempts)"
+            else:
+                failed[payout.id] = error
+
+        async with unit_of_work() as session:
+            payout_repo = PayoutRepositoryImpl(session)
+            withdrawals_paid = await payout_repo.mark_paid(paid)
+            withdrawals_refunded = await payout_repo.mark_failed(failed)
+            await payout_repo.mark_for_review(review)
+            for payout, error, retry_at in retries:
+                await payout_repo.record_retry(payout.id, error, retry_at)
+
+        now = time.monotonic()
+        self.payouts_paid += len(paid)
+        self.payouts_failed += len(failed)
+        self.payouts_in_review += len(review)
+        self.payouts_retried += len(retries)
+        self.withdrawals_paid += withdrawals_paid
+        self.withdrawals_refunded += withdrawals_refunded
+        self.cents_paid += sum(p.amount_cents for p in payouts if p.id in paid)
+        self._settled.append((now, withdrawals_paid))
+        self._batch_ms.append((time.perf_counter() - started) * 1000)
+        return sum(payout.withdrawal_count for payout in payouts)
+
+    def stats(self) -> Dict[str, Any]:
+        """Throughput and latency for this process."""
+        window_start = time.monotonic() - 60
+        while self._settled and self._settled[0][0] < window_start:
+            self._settled.popleft()
+        transfer_ms = list(self._transfer_ms)
+        batch_ms = list(self._batch_ms)
+        return {
+            "workers": self.running,
+            "batch_size": self.batch_size,
+            "concurrency": self.concurrency,
+            "max_attempts": self.max_attempts,
+            "payouts_paid": self.payouts_paid,
+            "payouts_failed": self.payouts_failed,
+            "payouts_in_review": self.payouts_in_review,
+            "payouts_retried": self.payouts_retried,
+            "withdrawals_paid": self.withdrawals_paid,
+            "withdrawals_refunded": self.withdrawals_refunded,
+            "cents_paid": self.cents_paid,
+            "withdrawals_per_minute": sum(count for _, count in self._settled),
+            "transfer_ms": {
+                "p50": round(percentile(transfer_ms, 0.5), 2),
+                "p99": round(percentile(transfer_ms, 0.99), 2)
+            },
+            "batch_ms": {
+                "p50": round(percentile(batch_ms, 0.5), 2),
+                "p99": round(percentile(batch_ms, 0.99), 2)
+            }
+        }
+
+
+payout_worker = PayoutWorker(
+    workers=settings.PAYOUT_WORKERS,
+    batch_size=settings.PAYOUT_BATCH_SIZE,
+    poll_seconds=settings.PAYOUT_POLL_SECONDS,
+    concurrency=settings.PAYOUT_CONCURRENCY,
+    lease_seconds=settings.PAYOUT_LEASE_SECONDS,
+    retry_base_seconds=settings.PAYOUT_RETRY_BASE_SECONDS,
+    max_attempts=settings.PAYOUT_MAX_ATTEMPTS
+)
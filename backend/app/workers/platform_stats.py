@@ -0,0 +1,75 @@
+"""
+Platform statistics worker.
+Flushes this process's buffered counter deltas into platform_counters,
+reloads the shared totals, and periodically reconciles the counters
+against the source tables. The reconcile is serialized across nodes by an
+advisory lock and spaced by a timestamp kept with the counters, so it runs
+once per interval for the whole deployment, not once per process.
+"""
+import logging
+import time
+from typing import Any, Dict
+
+from app.core.config import settings
+from app.infrastructure.database.session import unit_of_work
+from app.infrastructure.platform_stats import platform_stats
+from app.infrastructure.repositories.stats_repository_impl import StatsRepositoryImpl
+from app.workers.base import PollingWorker
+
+logger = logging.getLogger(__name__)
+
+
+class PlatformStatsWorker(PollingWorker):
+    """Single asyncio task flushing and reloading the dashboard counters."""
+
+    name = "platform stats"
+
+    def __init__(self, flush_seconds: float, reconcile_seconds: float):
+        # One task, and never treat a pass as a full batch: always wait out the interval
+        super().__init__(workers=1, batch_size=1, poll_seconds=flush_seconds)
+        self.reconcile_seconds = reconcile_seconds
+        self.last_pass_ms = 0.0
+
+    async def drain_once(self) -> int:
+        """Flush deltas, reconcile if due, and reload the totals."""
+        started = time.perf_counter()
+        deltas = platform_stats.take_pending()
+        drift = None
+        try:
+            async with unit_of_work() as session:
+                repo = StatsRepositoryImpl(session)
+                stale = await repo.add_to_counters(deltas)
+                if time.time() - (platform_stats.reconciled_at or 0) >= self.reconcile_seconds:
+                    drift = await repo.reconcile_counters(self.reconcile_seconds)
+                totals = await repo.get_counters()
+        except Exception:
+            platform_stats.restore_pending(deltas)
+            raise
+
+        platform_stats.load(totals)
+        if deltas:
+            platform_stats.flushes += 1
+            platform_stats.stale_buckets += stale
+        if drift is not None:
+            platform_stats.reconciles += 1
+            platform_stats.last_drift = drift
+            if drift:
+                logger.warning("platform counters drifted, corrected: %s", drift)
+        self.last_pass_ms = (time.perf_counter() - started) * 1000
+        return 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Flush and reconcile counters for this process."""
+        return {
+            "workers": self.running,
+            "flush_seconds": self.poll_seconds,
+            "reconcile_seconds": self.reconcile_seconds,
+            "last_pass_ms": round(self.last_pass_ms, 2),
+            **platform_stats.stats()
+        }
+
+
+platform_stats_worker = PlatformStatsWorker(
+    flush_seconds=settings.STATS_FLUSH_SECONDS,
+    reconcile_seconds=settings.STATS_RECONCILE_SECONDS
+)
@@ -0,0 +1,153 @@
+"""
+Webhook inbox drainer.
+The webhook endpoint only verifies and stores events. These workers claim
+stored events in batches with FOR UPDATE SKIP LOCKED, so any number of
+workers and processes can drain the inbox concurrently without handing
+out the same event twice. Each batch settles its succeeded deposits with
+one bulk wallet update and marks its events in the same transaction.
+"""
+import logging
+import time
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.domain.entities.payment import DepositSettlement, WebhookEvent
+from app.domain.services.wallet_service import WalletService
+from app.infrastructure.database.models.webhook import WebhookEventStatus
+from app.infrastructure.database.session import unit_of_work
+from app.infrastructure.repositories.wallet_repository_impl import WalletRepositoryImpl
+from app.infrastructure.repositories.webhook_repository_impl import WebhookRepositoryImpl
+from app.workers.base import PollingWorker
+
+logger = logging.getLogger(__name__)
+
+PAYMENT_SUCCEEDED = "payment_intent.succeeded"
+
+
+def deposit_from_event(event: WebhookEvent) -> Optional[DepositSettlement]:
+    """Read the deposit a payment_intent.succeeded event settles, or None if it is not ours."""
+    try:
+        intent = event.payload["data"]["object"]
+        metadata = intent.get("metadata") or {}
+        return DepositSettlement(
+            payment_intent_id=intent["id"],
+            user_id=UUID(metadata["user_id"]),
+            amount_cents=int(intent.get("amount_received") or intent["amount"]),
+            idempotency_key=metadata.get("idempotency_key")
+        )
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+class WebhookInboxWorker(PollingWorker):
+    """Pool of asyncio tasks draining the webhook inbox."""
+
+    name = "webhook inbox"
+
+    def __init__(self, workers: int, batch_size: int, poll_seconds: float, max_attempts: int):
+        super().__init__(workers, batch_size, poll_seconds)
+        self.max_attempts = max_attempts
+        self.batches = 0
+        self.processed = 0
+        self.ignored = 0
+        self.failed = 0
+        self.last_batch_ms = 0.0
+
+    async def drain_once(self) -> int:
+        """
+        Process one batch and return how many events were claimed.
+
+        If the batch fails as a whole it is rolled back and its events are
+        retried one at a time, so a single bad event cannot hold up the rest.
+        """
+        started = time.perf_counter()
+        claimed: List[str] = []
+        try:
+            async with unit_of_work() as session:
+                await self._process(session, claimed)
+        except Exception:
+            logger.exception("webhook batch of %d events failed, retrying individually", len(claimed))
+            for event_id in claimed:
+                await self._process_one(event_id)
+        if claimed:
+            self.batches += 1
+            self.last_batch_ms = (time.perf_counter() - started) * 1000
+        return len(claimed)
+
+    async def _process_one(self, event_id: str) -> None:
+        """Process a single event, counting an attempt against it if it fails."""
+        try:
+            async with unit_of_work() as session:
+                await self._process(session, [], event_ids=[event_id])
+        except Exception as exc:
+            logger.exception("webhook event %s failed", event_id)
+            async with unit_of_work() as session:
+                await WebhookRepositoryImpl(session).record_failure(event_id, str(exc), self.max_attempts)
+
+    async def _process(
+        self,
+        session: AsyncSession,
+        claimed: List[str],
+        event_ids: Optional[List[str]] = None
+    ) -> None:
+        """Claim events, apply their effects and mark them, all in the caller's unit of work."""
+        inbox = WebhookRepositoryImpl(session)
+        events = await inbox.claim_events(self.batch_size, event_ids)
+        claimed.extend(event.id for event in events)
+        if not events:
+            return
+
+        settlements: List[DepositSettlement] = []
+        events_by_intent: Dict[str, List[str]] = {}
+        ignored: List[str] = []
+        invalid: List[str] = []
+        for event in events:
+            if event.event_type != PAYMENT_SUCCEEDED:
+                ignored.append(event.id)
+                continue
+            settlement = deposit_from_event(event)
+            if settlement is None:
+                invalid.append(event.id)
+                continue
+            settlements.append(settlement)
+            events_by_intent.setdefault(settlement.payment_intent_id, []).append(event.id)
+
+        settled = set()
+        if settlements:
+            wallet_service = WalletService(WalletRepositoryImpl(session))
+            settled = {t.external_id for t in await wallet_service.confirm_deposits(settlements)}
+
+        processed = [i for intent, ids in events_by_intent.items() if intent in settled for i in ids]
+        no_wallet = [i for intent, ids in events_by_intent.items() if intent not in settled for i in ids]
+
+        await inbox.mark_events(processed, WebhookEventStatus.PROCESSED)
+        await inbox.mark_events(ignored, WebhookEventStatus.IGNORED)
+        await inbox.mark_events(invalid, WebhookEventStatus.FAILED, error="Not a deposit payment intent")
+        await inbox.mark_events(no_wallet, WebhookEventStatus.FAILED, error="User has no wallet")
+
+        self.processed += len(processed)
+        self.ignored += len(ignored)
+        self.failed += len(invalid) + len(no_wallet)
+
+    def stats(self) -> Dict[str, Any]:
+        """Throughput counters for this process."""
+        return {
+            "workers": self.running,
+            "batch_size": self.batch_size,
+            "batches": self.batches,
+            "processed": self.processed,
+            "ignored": self.ignored,
+            "failed": self.failed,
+            "last_batch_ms": round(self.last_batch_ms, 2)
+        }
+
+
+webhook_inbox_worker = WebhookInboxWorker(
+    workers=settings.WEBHOOK_WORKERS,
+    batch_size=settings.WEBHOOK_BATCH_SIZE,
+    poll_seconds=settings.WEBHOOK_POLL_SECONDS,
+    max_attempts=settings.WEBHOOK_MAX_ATTEMPTS
+)
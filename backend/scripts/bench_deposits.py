@@ -0,0 +1,95 @@
+"""
+Offline deposit throughput benchmark.
+Starts the fake Stripe server in-process, then creates payment intents
+concurrently through StripePaymentGateway (--mode async) or through the
+blocking stripe SDK called from async code (--mode blocking, the old
+behaviour). Reports throughput and how long the event loop stalled.
+
+Usage:
+    python scripts/bench_deposits.py --deposits 500 --latency-ms 150
+    python scripts/bench_deposits.py --deposits 50 --mode blocking
+"""
+import argparse
+import asyncio
+import sys
+import threading
+import time
+import uuid
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import stripe
+import uvicorn
+from app.infrastructure.external.payment_gateway import StripePaymentGateway
+from fake_stripe import create_app
+
+
+async def loop_lag(stop: asyncio.Event, samples: list, interval: float = 0.01) -> None:
+    """Record how late the event loop wakes up a periodic timer, in milliseconds."""
+    while not stop.is_set():
+        due = time.perf_counter() + interval
+        await asyncio.sleep(interval)
+        samples.append((time.perf_counter() - due) * 1000)
+
+
+async def run(args) -> None:
+    """Run the benchmark."""
+    # The fake server gets its own thread and loop so blocking calls cannot starve it
+    server = uvicorn.Server(uvicorn.Config(
+        create_app(args.latency_ms), host="127.0.0.1", port=args.port, log_level="warning"
+    ))
+    server_thread = threading.Thread(target=server.run, daemon=True)
+    server_thread.start()
+    while not server.started:
+        await asyncio.sleep(0.05)
+
+    api_base = f"http://127.0.0.1:{args.port}"
+    gateway = StripePaymentGateway(api_key="sk_test_fake", api_base=api_base, max_concurrency=args.concurrency)
+    stripe.api_key = "sk_test_fake"
+    stripe.api_base = api_base
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def deposit() -> None:
+        async with semaphore:
+            if args.mode == "async":
+                await gateway.create_payment_intent(
+                    amount_cents=1000,
+                    currency="usd",
+                    metadata={"bench": "1"},
+                    idempotency_key=f"bench_{uuid.uuid4().hex}"
+                )
+            else:
+                stripe.PaymentIntent.create(amount=1000, currency="usd", metadata={"bench": "1"})
+
+    stop = asyncio.Event()
+    lag: list = []
+    lag_task = asyncio.create_task(loop_lag(stop, lag))
+    started = time.perf_counter()
+    await asyncio.gather(*(deposit() for _ in range(args.deposits)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await lag_task
+
+    lag.sort()
+    print(f"mode:                 {args.mode}")
+    print(f"deposits:             {args.deposits} (concurrency {args.concurrency}, fake latency {args.latency_ms:.0f}ms)")
+    print(f"elapsed:              {elapsed:.2f}s")
+    print(f"throughput:           {args.deposits / elapsed:.1f} deposits/s")
+    print(f"loop lag p99 / max:   {lag[int(len(lag) * 0.99) - 1] if lag else 0:.1f}ms / {lag[-1] if lag else 0:.1f}ms")
+
+    await gateway.aclose()
+    server.should_exit = True
+    server_thread.join()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--deposits", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=150.0)
+    parser.add_argument("--port", type=int, default=12111)
+    parser.add_argument("--mode", choices=["async", "blocking"], default="async")
+    asyncio.run(run(parser.parse_args()))
@@ -0,0 +1,111 @@
+"""
+Benchmark for the in-memory leaderboard index.
+Builds an index of synthetic players and times global rank, "around me"
+and deep-page lookups plus rating updates, then spot-checks results
+against a fully sorted list.
+
+Usage:
+    python scripts/bench_leaderboard.py --users 1000000 --radius 5
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.infrastructure.leaderboard import LeaderboardEngine, LeaderboardIndex
+
+
+def synthetic_rows(count: int, seed: int) -> list:
+    """Generate players with a normal-ish rating distribution around 1500."""
+    rng = random.Random(seed)
+    rows = []
+    for i in range(count):
+        rating = max(0, int(rng.gauss(1500, 250)))
+        rows.append((str(uuid.UUID(int=rng.getrandbits(128))), {
+            "rating": rating,
+            "wins": 0,
+            "losses": 0,
+            "draws": 0,
+            "win_streak": 0,
+            "total_matches": 0,
+            "username": f"player{i}",
+            "display_name": None
+        }))
+    return rows
+
+
+def timed(label: str, fn, args_list: list) -> None:
+    """Run fn over args_list and print latency percentiles in microseconds."""
+    samples = []
+    for args in args_list:
+        started = time.perf_counter()
+        fn(*args)
+        samples.append((time.perf_counter() - started) * 1_000_000)
+    samples.sort()
+    p50 = statistics.median(samples)
+    p99 = samples[int(len(samples) * 0.99) - 1]
+    print(f"{label:<22}p50 {p50:8.1f}us   p99 {p99:8.1f}us   ({len(samples)} ops)")
+
+
+def verify(engine: LeaderboardEngine, rows: list, radius: int, samples: int, rng: random.Random) -> None:
+    """Compare around() against a fully sorted list for a few players."""
+    ordered = sorted(rows, key=lambda row: (-row[1]["rating"], row[0]))
+    position = {user_id: i for i, (user_id, _) in enumerate(ordered)}
+    for user_id, _ in rng.sample(rows, samples):
+        i = position[user_id]
+        expected = [uid for uid, _ in ordered[max(i - radius, 0):i + radius + 1]]
+        got = engine.around(user_id, radius)
+        assert [row["user_id"] for row in got] == expected, f"around mismatch for {user_id}"
+        higher = sum(1 for _, entry in ordered[:i] if entry["rating"] > ordered[i][1]["rating"])
+        assert engine.rank_of(user_id)["rank"] == higher + 1, f"rank mismatch for {user_id}"
+    print(f"verified:             {samples} players against sorted order")
+
+
+def run(args) -> None:
+    """Run the benchmark."""
+    rng = random.Random(args.seed)
+    rows = synthetic_rows(args.users, args.seed)
+
+    started = time.perf_counter()
+    engine = LeaderboardEngine()
+    engine._index = LeaderboardIndex.build([(user_id, dict(entry)) for user_id, entry in rows])
+    print(f"users:                {args.users}")
+    print(f"build:                {time.perf_counter() - started:.2f}s")
+
+    user_ids = [user_id for user_id, _ in rows]
+    picks = [(rng.choice(user_ids),) for _ in range(args.lookups)]
+
+    timed("rank_of", engine.rank_of, picks)
+    timed(f"around (radius {args.radius})", engine.around, [(p[0], args.radius) for p in picks])
+
+    index = engine.index
+    cursors = []
+    for (user_id,) in picks:
+        position = index.position_of(user_id)
+        row = index.slice(position, 1)[0]
+        cursors.append((100, (row["rating"], row["user_id"])))
+    timed("page (100, deep)", engine.page, cursors)
+
+    updates = [(rng.choice(user_ids), max(0, int(rng.gauss(1500, 250)))) for _ in range(args.lookups)]
+    timed("rating update", lambda user_id, rating: engine.apply(user_id, rating=rating), updates)
+
+    entries = dict(rows)
+    for user_id, rating in updates:
+        entries[user_id]["rating"] = rating
+    verify(engine, rows, args.radius, min(args.verify, args.users), rng)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument("--radius", type=int, default=5)
+    parser.add_argument("--lookups", type=int, default=10_000)
+    parser.add_argument("--verify", type=int, default=20, help="Players to check against a full sort")
+    parser.add_argument("--seed", type=int, default=42)
+    run(parser.parse_args())
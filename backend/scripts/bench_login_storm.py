@@ -0,0 +1,119 @@
+"""
+Login-storm benchmark for password hashing.
+Fires a burst of Argon2 verifications (what each login costs) while a
+probe repeatedly calls a non-auth route through the ASGI app, and reports
+the probe's latency percentiles. Run once with --mode inline (hashing on
+the event loop, the old behaviour) and once with --mode executor.
+
+No database is needed: the probe hits /health in-process.
+
+Usage:
+    python scripts/bench_login_storm.py --logins 200 --mode inline
+    python scripts/bench_login_storm.py --logins 200 --mode executor
+"""
+import argparse
+import asyncio
+import math
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import httpx
+from app.main import app
+from app.core.exceptions import RateLimitError
+from app.core.security import (
+    hash_password,
+    verify_password,
+    verify_password_async,
+    password_hash_executor
+)
+
+
+async def login_inline(password_hash: str) -> None:
+    """Verify on the event loop, as the handlers used to."""
+    verify_password("bench-password", password_hash)
+
+
+async def login_executor(password_hash: str) -> None:
+    """Verify on the bounded password hash executor."""
+    await verify_password_async("bench-password", password_hash)
+
+
+async def probe(client: httpx.AsyncClient, stop: asyncio.Event, interval: float) -> list:
+    """
+    Call /health until stopped and collect latencies in milliseconds.
+
+    Latency is measured from when the request was due, so time spent
+    waiting for a blocked event loop counts against it.
+    """
+    samples = []
+    while not stop.is_set():
+        due = time.perf_counter() + interval
+        await asyncio.sleep(interval)
+        response = await client.get("/health")
+        response.raise_for_status()
+        samples.append((time.perf_counter() - due) * 1000)
+    return samples
+
+
+def percentile(samples: list, pct: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(samples)
+    return ordered[max(math.ceil(len(ordered) * pct) - 1, 0)]
+
+
+async def run(args) -> None:
+    """Run the benchmark."""
+    password_hash = hash_password("bench-password")
+    login = login_inline if args.mode == "inline" else login_executor
+    semaphore = asyncio.Semaphore(args.concurrency)
+    rejected = 0
+
+    async def one_login() -> None:
+        nonlocal rejected
+        async with semaphore:
+            try:
+                await login(password_hash)
+            except RateLimitError:
+                rejected += 1
+            # Yield so the probe gets a chance between inline logins
+            await asyncio.sleep(0)
+
+    async with httpx.AsyncClient(app=app, base_url="http://bench") as client:
+        stop = asyncio.Event()
+        baseline_task = asyncio.create_task(probe(client, stop, args.interval))
+        await asyncio.sleep(1.0)
+        stop.set()
+        baseline = await baseline_task
+
+        stop = asyncio.Event()
+        probe_task = asyncio.create_task(probe(client, stop, args.interval))
+        started = time.perf_counter()
+        await asyncio.gather(*(one_login() for _ in range(args.logins)))
+        elapsed = time.perf_counter() - started
+        stop.set()
+        storm = await probe_task
+
+    print(f"mode:                 {args.mode}")
+    print(f"logins:               {args.logins} (concurrency {args.concurrency}) in {elapsed:.2f}s")
+    print(f"rejected:             {rejected}")
+    for label, samples in (("idle", baseline), ("storm", storm)):
+        print(
+            f"/health {label:<6}        n={len(samples):<5} p50 {statistics.median(samples):7.2f}ms   "
+            f"p99 {percentile(samples, 0.99):7.2f}ms   max {max(samples):7.2f}ms"
+        )
+    if args.mode == "executor":
+        print(f"executor:             {password_hash_executor.stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--interval", type=float, default=0.005, help="Seconds between probe requests")
+    parser.add_argument("--mode", choices=["inline", "executor"], default="executor")
+    asyncio.run(run(parser.parse_args()))
@@ -0,0 +1,190 @@
+"""
+Benchmark for admin user search.
+Optionally seeds synthetic accounts (users plus player profiles, generated
+server-side in batches), then times UserRepositoryImpl.search_users for
+rare terms, common terms, filtered searches and deep keyset pages, and
+fails if any workload's p95 exceeds the budget.
+
+Seeded accounts use the @bench.invalid email domain; --cleanup removes
+them. Run the migrations first so the trigram indexes exist.
+
+Usage:
+    python scripts/bench_user_search.py --seed-users 5000000
+    python scripts/bench_user_search.py --searches 500 --budget-ms 50
+    python scripts/bench_user_search.py --cleanup
+"""
+import argparse
+import asyncio
+import math
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, List
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import text
+from app.infrastructure.database.session import AsyncSessionLocal, engine
+from app.infrastructure.repositories.user_repository_impl import UserRepositoryImpl
+
+SEED_DOMAIN = "bench.invalid"
+
+# ~2% suspended, ~0.5% banned, ~1% soft-deleted
+SEED_USERS = text(f"""
+    INSERT INTO users (id, email, email_verified, password_hash, account_status,
+                       failed_login_attempts, created_at, updated_at, deleted_at)
+    SELECT gen_random_uuid(),
+           'u' || n || '.' || substr(md5(n::text), 1, 8) || '@{SEED_DOMAIN}',
+           true, 'bench',
+           CASE WHEN n % 200 = 0 THEN 'BANNED' WHEN n % 50 = 0 THEN 'SUSPENDED' ELSE 'ACTIVE' END,
+           0,
+           now() - (n || ' seconds')::interval,
+           now(),
+           CASE WHEN n % 100 = 7 THEN now() END
+    FROM generate_series(:start, :stop - 1) AS n
+""")
+
+SEED_PROFILES = text(f"""
+    INSERT INTO player_profiles (id, user_id, username, display_name, region, created_at, updated_at)
+    SELECT gen_random_uuid(), u.id, 'p' || split_part(u.email, '@', 1), NULL, 'US', u.created_at, now()
+    FROM users u
+    WHERE u.email LIKE '%@{SEED_DOMAIN}'
+      AND NOT EXISTS (SELECT 1 FROM player_profiles p WHERE p.user_id = u.id)
+""")
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(samples)
+    return ordered[max(math.ceil(len(ordered) * pct) - 1, 0)]
+
+
+async def seed(count: int, batch: int) -> None:
+    """Insert count synthetic users and their profiles."""
+    async with engine.begin() as conn:
+        existing = await conn.scalar(text(f"SELECT count(*) FROM users WHERE email LIKE '%@{SEED_DOMAIN}'"))
+    started = time.perf_counter()
+    for start in range(existing, count, batch):
+        async with engine.begin() as conn:
+            await conn.execute(SEED_USERS, {"start": start, "stop": min(start + batch, count)})
+        print(f"  seeded {min(start + batch, count)}/{count} users", file=sys.stderr)
+    async with engine.begin() as conn:
+        await conn.execute(SEED_PROFILES)
+        await conn.execute(text("ANALYZE users"))
+        await conn.execute(text("ANALYZE player_profiles"))
+    print(f"seed:            {count - min(existing, count)} users in {time.perf_counter() - started:.1f}s")
+
+
+async def cleanup() -> None:
+    """Remove every seeded account."""
+    async with engine.begin() as conn:
+        result = await conn.execute(text(f"DELETE FROM users WHERE email LIKE '%@{SEED_DOMAIN}'"))
+    print(f"cleanup:         removed {result.rowcount} users")
+
+
+async def sample_terms(count: int, rng: random.Random) -> List[str]:
+    """Substrings of real emails and usernames, as support staff would type them."""
+    async with engine.connect() as conn:
+        result = await conn.execute(text("""
+            SELECT u.email, p.username
+            FROM users u TABLESAMPLE SYSTEM (1)
+            LEFT JOIN player_profiles p ON p.user_id = u.id
+            LIMIT :count
+        """), {"count": count})
+        rows = result.all()
+    terms = []
+    for email, username in rows:
+        source = rng.choice([s for s in (email.split("@")[0], username) if s])
+        length = rng.randint(4, min(len(source), 10)) if len(source) > 4 else len(source)
+        start = rng.randint(0, len(source) - length)
+        terms.append(source[start:start + length])
+    return terms
+
+
+async def timed(label: str, search: Callable[..., Awaitable], args_list: list, budget_ms: float) -> bool:
+    """Run each search on a fresh session and print latency percentiles."""
+    samples = []
+    for kwargs in args_list:
+        async with AsyncSessionLocal() as session:
+            started = time.perf_counter()
+            await search(UserRepositoryImpl(session), **kwargs)
+            samples.append((time.perf_counter() - started) * 1000)
+    p95 = percentile(samples, 0.95)
+    ok = p95 <= budget_ms
+    print(
+        f"{label:<24}p50 {statistics.median(samples):7.1f}ms   p95 {p95:7.1f}ms   "
+        f"p99 {percentile(samples, 0.99):7.1f}ms   ({len(samples)} searches) {'ok' if ok else 'OVER BUDGET'}"
+    )
+    return ok
+
+
+async def run(args) -> int:
+    """Run the benchmark."""
+    rng = random.Random(args.seed)
+    try:
+        if args.cleanup:
+            await cleanup()
+            return 0
+        if args.seed_users:
+            await seed(args.seed_users, args.batch)
+
+        async with engine.connect() as conn:
+            users = await conn.scalar(text("SELECT count(*) FROM users"))
+        print(f"users:           {users}")
+
+        terms = await sample_terms(args.searches, rng)
+        if not terms:
+            print("no users to search; seed some with --seed-users")
+            return 1
+
+        async def search(repo, **kwargs):
+            return await repo.search_users(limit=args.limit, **kwargs)
+
+        async def deep_page(repo, query):
+            cursor = None
+            for _ in range(args.pages):
+                _, cursor = await repo.search_users(query=query, limit=args.limit, cursor=cursor)
+                if cursor is None:
+                    break
+
+        rare = [{"query": term} for term in terms]
+        missing = [{"query": f"zz{rng.getrandbits(40):x}"} for _ in terms]
+        common = [{"query": rng.choice(["bench", "invalid", "pu1", "u12"])} for _ in terms]
+        filtered = [
+            {"query": term, "account_status": rng.choice(["SUSPENDED", "BANNED"]), "deleted": rng.choice([False, None])}
+            for term in terms
+        ]
+        listing = [{"account_status": rng.choice([None, "ACTIVE", "SUSPENDED"])} for _ in terms]
+
+        results = [
+            await timed("substring (sampled)", search, rare, args.budget_ms),
+            await timed("no match", search, missing, args.budget_ms),
+            await timed("common term", search, common, args.budget_ms),
+            await timed("status + deleted filter", search, filtered, args.budget_ms),
+            await timed("listing, no query", search, listing, args.budget_ms),
+            await timed(
+                f"{args.pages} pages deep",
+                deep_page,
+                [{"query": "bench"} for _ in range(max(len(terms) // 10, 1))],
+                args.budget_ms * args.pages
+            ),
+        ]
+        return 0 if all(results) else 1
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seed-users", type=int, default=0, help="Top up synthetic users to this many")
+    parser.add_argument("--batch", type=int, default=250_000, help="Users inserted per statement when seeding")
+    parser.add_argument("--cleanup", action="store_true", help="Delete seeded users and exit")
+    parser.add_argument("--searches", type=int, default=300)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--pages", type=int, default=10, help="Pages walked by the deep-page workload")
+    parser.add_argument("--budget-ms", type=float, default=50.0, help="p95 budget per search")
+    parser.add_argument("--seed", type=int, default=42)
+    sys.exit(asyncio.run(run(parser.parse_args())))
@@ -0,0 +1,162 @@
+"""
+Concurrency benchmark for wallet debits.
+Fires many concurrent debits at a single wallet and checks that no update
+was lost and that the balance_before/after chain is consistent.
+
+Usage:
+    python scripts/bench_wallet_debit.py --debits 2000 --concurrency 50
+    python scripts/bench_wallet_debit.py --mode read-modify-write
+"""
+import argparse
+import asyncio
+import sys
+import time
+import uuid
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import select, delete
+from app.core.exceptions import PaymentError
+from app.core.security import hash_password
+from app.domain.entities.payment import TransactionType
+from app.domain.services.wallet_service import WalletService
+from app.infrastructure.database.session import unit_of_work, uow_metrics, engine
+from app.infrastructure.database.models.user import User as UserModel
+from app.infrastructure.database.models.wallet import (
+    Wallet as WalletModel,
+    Transaction as TransactionModel
+)
+from app.infrastructure.repositories.wallet_repository_impl import WalletRepositoryImpl
+
+
+async def create_bench_wallet(balance_cents: int) -> uuid.UUID:
+    """Create a throwaway user with a funded wallet."""
+    async with unit_of_work() as session:
+        user = UserModel(
+            email=f"bench-{uuid.uuid4().hex}@bench.local",
+            password_hash=hash_password("bench-password"),
+            account_status="ACTIVE"
+        )
+        session.add(user)
+        await session.flush()
+        session.add(WalletModel(user_id=user.id, balance_cents=balance_cents, pending_cents=0, currency="USD"))
+        return user.id
+
+
+async def debit_atomic(user_id: uuid.UUID, amount_cents: int) -> None:
+    """Debit through WalletService (single-statement path)."""
+    async with unit_of_work() as session:
+        service = WalletService(WalletRepositoryImpl(session))
+        await service.debit_wallet(
+            user_id=user_id,
+            amount_cents=amount_cents,
+            transaction_type=TransactionType.ADJUSTMENT,
+            idempotency_key=f"bench_{uuid.uuid4().hex}",
+            description="benchmark debit"
+        )
+
+
+async def debit_read_modify_write(user_id: uuid.UUID, amount_cents: int) -> None:
+    """Debit by reading the wallet and writing it back (the pre-atomic pattern)."""
+    async with unit_of_work() as session:
+        repo = WalletRepositoryImpl(session)
+        wallet = await repo.get_wallet_by_user_id(user_id)
+        if not wallet.has_sufficient_balance(amount_cents):
+            raise PaymentError("Insufficient balance", code="INSUFFICIENT_BALANCE")
+        balance_before = wallet.balance_cents
+        wallet.balance_cents -= amount_cents
+        await repo.update_wallet(wallet)
+        await repo.create_transaction(
+            user_id=user_id,
+            wallet_id=wallet.id,
+            transaction_type=TransactionType.ADJUSTMENT,
+            amount_cents=-amount_cents,
+            balance_before_cents=balance_before,
+            balance_after_cents=wallet.balance_cents,
+            idempotency_key=f"bench_{uuid.uuid4().hex}",
+            description="benchmark debit"
+        )
+
+
+async def verify(user_id: uuid.UUID, initial_cents: int) -> dict:
+    """Check conservation of money and the ledger chain for the bench wallet."""
+    async with unit_of_work() as session:
+        wallet = (await session.execute(
+            select(WalletModel).where(WalletModel.user_id == user_id)
+        )).scalar_one()
+        rows = (await session.execute(
+            select(TransactionModel)
+            .where(TransactionModel.user_id == user_id)
+            .order_by(TransactionModel.balance_before_cents.desc())
+        )).scalars().all()
+
+    ledger_total = sum(r.amount_cents for r in rows)
+    chain_breaks = 0
+    expected_before = initial_cents
+    for r in rows:
+        if r.balance_before_cents != expected_before:
+            chain_breaks += 1
+        expected_before = r.balance_after_cents
+
+    return {
+        "final_balance_cents": wallet.balance_cents,
+        "ledger_rows": len(rows),
+        "lost_updates": (initial_cents + ledger_total) - wallet.balance_cents,
+        "chain_breaks": chain_breaks,
+    }
+
+
+async def cleanup(user_id: uuid.UUID) -> None:
+    """Remove the bench user, wallet and ledger rows."""
+    async with unit_of_work() as session:
+        await session.execute(delete(TransactionModel).where(TransactionModel.user_id == user_id))
+        await session.execute(delete(WalletModel).where(WalletModel.user_id == user_id))
+        await session.execute(delete(UserModel).where(UserModel.id == user_id))
+
+
+async def run(args) -> None:
+    """Run the benchmark."""
+    initial_cents = args.debits * args.amount
+    user_id = await create_bench_wallet(initial_cents)
+    debit = debit_atomic if args.mode == "atomic" else debit_read_modify_write
+    semaphore = asyncio.Semaphore(args.concurrency)
+    failures = 0
+
+    async def one() -> None:
+        nonlocal failures
+        async with semaphore:
+            try:
+                await debit(user_id, args.amount)
+            except Exception:
+                failures += 1
+
+    uow_metrics.reset()
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(args.debits)))
+    elapsed = time.perf_counter() - started
+
+    report = await verify(user_id, initial_cents)
+    print(f"mode:                {args.mode}")
+    print(f"debits:              {args.debits} (concurrency {args.concurrency})")
+    print(f"failed:              {failures}")
+    print(f"elapsed:             {elapsed:.2f}s")
+    print(f"throughput:          {args.debits / elapsed:.0f} debits/s")
+    print(f"statements/debit:    {uow_metrics.snapshot()['statements_per_unit']}")
+    for key, value in report.items():
+        print(f"{key + ':':<21}{value}")
+
+    if not args.keep:
+        await cleanup(user_id)
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--debits", type=int, default=1000)
+    parser.add_argument("--amount", type=int, default=100, help="Cents per debit")
+    parser.add_argument("--concurrency", type=int, default=25)
+    parser.add_argument("--mode", choices=["atomic", "read-modify-write"], default="atomic")
+    parser.add_argument("--keep", action="store_true", help="Keep the bench rows afterwards")
+    asyncio.run(run(parser.parse_args()))
@@ -0,0 +1,106 @@
+"""
+Local stand-in for the Stripe REST API.
+Implements the endpoints StripePaymentGateway uses (payment intents and
+transfers) with configurable latency, so deposit and payout paths can be
+exercised and benchmarked offline. Honours Idempotency-Key headers.
+
+Usage:
+    python scripts/fake_stripe.py --port 12111 --latency-ms 150
+    STRIPE_API_BASE=http://127.0.0.1:12111 uvicorn app.main:app
+"""
+import argparse
+import asyncio
+import secrets
+import time
+from typing import Any, Dict
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+
+def create_app(latency_ms: float = 0.0, succeed: bool = True) -> FastAPI:
+    """Build the fake Stripe app."""
+    app = FastAPI(title="Fake Stripe")
+    objects: Dict[str, Dict[str, Any]] = {}
+    idempotent: Dict[str, Dict[str, Any]] = {}
+    app.state.requests = 0
+
+    async def delay() -> None:
+        app.state.requests += 1
+        if latency_ms:
+            await asyncio.sleep(latency_ms / 1000)
+
+    def metadata(form) -> Dict[str, str]:
+        return {key[len("metadata["):-1]: value for key, value in form.items() if key.startswith("metadata[")}
+
+    def not_found(object_id: str) -> JSONResponse:
+        return JSONResponse(
+            status_code=404,
+            content={"error": {
+                "type": "invalid_request_error",
+                "code": "resource_missing",
+                "message": f"No such object: '{object_id}'"
+            }}
+        )
+
+    @app.post("/v1/payment_intents")
+    async def create_payment_intent(request: Request):
+        await delay()
+        key = request.headers.get("Idempotency-Key")
+        if key and key in idempotent:
+            return idempotent[key]
+        form = await request.form()
+        intent_id = f"pi_{secrets.token_hex(12)}"
+        intent = {
+            "id": intent_id,
+            "object": "payment_intent",
+            "amount": int(form["amount"]),
+            "currency": form.get("currency", "usd"),
+            "status": "succeeded" if succeed else "requires_payment_method",
+            "client_secret": f"{intent_id}_secret_{secrets.token_hex(8)}",
+            "metadata": metadata(form),
+            "created": int(time.time()),
+        }
+        objects[intent_id] = intent
+        if key:
+            idempotent[key] = intent
+        return intent
+
+    @app.get("/v1/payment_intents/{intent_id}")
+    async def retrieve_payment_intent(intent_id: str):
+        await delay()
+        return objects.get(intent_id) or not_found(intent_id)
+
+    @app.post("/v1/transfers")
+    async def create_transfer(request: Request):
+        await delay()
+        key = request.headers.get("Idempotency-Key")
+        if key and key in idempotent:
+            return idempotent[key]
+        form = await request.form()
+        transfer = {
+            "id": f"tr_{secrets.token_hex(12)}",
+            "object": "transfer",
+            "amount": int(form["amount"]),
+            "currency": form.get("currency", "usd"),
+            "destination": form["destination"],
+            "metadata": metadata(form),
+            "created": int(time.time()),
+        }
+        objects[transfer["id"]] = transfer
+        if key:
+            idempotent[key] = transfer
+        return transfer
+
+    return app
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=12111)
+    parser.add_argument("--latency-ms", type=float, default=150.0, help="Simulated Stripe round trip")
+    parser.add_argument("--fail", action="store_true", help="Create intents that have not succeeded")
+    args = parser.parse_args()
+    uvicorn.run(create_app(args.latency_ms, succeed=not args.fail), host=args.host, port=args.port, log_level="warning")
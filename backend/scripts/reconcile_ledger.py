@@ -0,0 +1,364 @@
+"""
+Streaming ledger reconciliation.
+Verifies, without loading any table into memory:
+
+- chains: each wallet's transactions form an unbroken balance_before /
+  balance_after chain that ends at wallets.balance_cents
+- escrow: each escrow account's stakes, payout and fee agree with its
+  ESCROW_LOCK, ESCROW_RELEASE and MATCH_REFUND transactions
+- ledger: every journal balances, and each wallet's ledger accounts match
+  its balance_cents and pending_cents
+
+The UUID space is cut into ranges that worker processes check in
+parallel. Each range is streamed through server-side cursors, so memory
+stays bounded by --fetch-size whatever the size of the tables. Exits
+non-zero if anything does not reconcile.
+
+Usage:
+    python scripts/reconcile_ledger.py
+    python scripts/reconcile_ledger.py --processes 8 --report discrepancies.json
+    python scripts/reconcile_ledger.py --checks chains escrow
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import sys
+import time
+import uuid
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+from app.core.config import settings
+from app.domain.entities.ledger import LedgerAccount
+
+CHECKS = ("chains", "escrow", "ledger")
+
+# Balance-moving events per wallet, in the order they hit the balance.
+# Deposits move the balance when settled (processed_at); withdrawals when
+# reserved (created_at), and a failed withdrawal is returned at failed_at
+# without a row of its own. The wallet row itself comes last.
+CHAIN_EVENTS = """
+SELECT wallet_id, at, id, amount, before, after, phase FROM (
+    SELECT t.wallet_id,
+           CASE WHEN t.transaction_type = 'DEPOSIT' THEN t.processed_at ELSE t.created_at END AS at,
+           t.id, t.amount_cents AS amount,
+           t.balance_before_cents AS before, t.balance_after_cents AS after, 0 AS phase
+    FROM transactions t
+    WHERE {range}
+      AND (t.status = 'COMPLETED'
+           OR (t.transaction_type = 'WITHDRAWAL' AND t.status IN ('PROCESSING', 'FAILED')))
+    UNION ALL
+    SELECT t.wallet_id, t.failed_at, t.id, -t.amount_cents, NULL, NULL, 0
+    FROM transactions t
+    WHERE {range}
+      AND t.transaction_type = 'WITHDRAWAL' AND t.status = 'FAILED' AND t.failed_at IS NOT NULL
+    UNION ALL
+    SELECT w.id, NULL, NULL, w.balance_cents, NULL, NULL, 1
+    FROM wallets w
+    WHERE {wallet_range}
+) events
+ORDER BY wallet_id, phase, at, id
+"""
+
+ESCROW_TOTALS = """
+SELECT COALESCE(e.match_id, t.reference_id) AS match_id, e.status,
+       e.player1_amount_cents + e.player2_amount_cents AS staked,
+       e.total_amount_cents AS pot, e.platform_fee_cents AS fee,
+       COALESCE(t.locked, 0) AS locked, COALESCE(t.released, 0) AS released,
+       COALESCE(t.refunded, 0) AS refunded
+FROM (SELECT * FROM escrow_accounts WHERE {escrow_range}) e
+FULL OUTER JOIN (
+    SELECT reference_id,
+           -SUM(amount_cents) FILTER (WHERE transaction_type = 'ESCROW_LOCK') AS locked,
+           SUM(amount_cents) FILTER (WHERE transaction_type = 'ESCROW_RELEASE') AS released,
+           SUM(amount_cents) FILTER (WHERE transaction_type = 'MATCH_REFUND') AS refunded
+    FROM transactions
+    WHERE reference_type = 'match' AND status = 'COMPLETED'
+      AND transaction_type IN ('ESCROW_LOCK', 'ESCROW_RELEASE', 'MATCH_REFUND')
+      AND {reference_range}
+    GROUP BY reference_id
+) t ON t.reference_id = e.match_id
+"""
+
+LEDGER_WALLETS = """
+WITH balances AS (
+    SELECT account, SUM(amount_cents) AS balance
+    FROM ledger_entries
+    WHERE (account >= :wallet_lo AND account < :wallet_hi)
+       OR (account >= :pending_lo AND account < :pending_hi)
+    GROUP BY account
+)
+SELECT w.user_id, w.balance_cents, w.pending_cents,
+       COALESCE(lw.balance, 0) AS ledger_balance, COALESCE(lp.balance, 0) AS ledger_pending
+FROM wallets w
+LEFT JOIN balances lw ON lw.account = 'wallet:' || w.user_id
+LEFT JOIN balances lp ON lp.account = 'pending:' || w.user_id
+WHERE {user_range}
+"""
+
+UNBALANCED_JOURNALS = """
+SELECT journal_id, SUM(amount_cents) AS total
+FROM ledger_entries
+WHERE {journal_range}
+GROUP BY journal_id
+HAVING SUM(amount_cents) <> 0
+"""
+
+# Remaining escrow per status once every movement has been applied
+EXPECTED_REMAINING = {
+    "LOCKED": lambda row: row.staked,
+    "HELD": lambda row: row.staked,
+    "RELEASED": lambda row: row.fee,
+    "REFUNDED": lambda row: 0,
+}
+
+
+class Findings:
+    """Discrepancy counts plus a bounded list of examples."""
+
+    def __init__(self, max_examples: int):
+        self.max_examples = max_examples
+        self.checked: Counter = Counter()
+        self.counts: Counter = Counter()
+        self.examples: List[Dict[str, Any]] = []
+
+    def add(self, kind: str, **details: Any) -> None:
+        self.counts[kind] += 1
+        if len(self.examples) < self.max_examples:
+            self.examples.append({"kind": kind, **{k: str(v) for k, v in details.items()}})
+
+    def merge(self, other: Dict[str, Any]) -> None:
+        self.checked.update(other["checked"])
+        self.counts.update(other["counts"])
+        self.examples.extend(other["examples"][:self.max_examples - len(self.examples)])
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"checked": dict(self.checked), "counts": dict(self.counts), "examples": self.examples}
+
+
+class ChainChecker:
+    """Walks one wallet's events in order, holding only its running balance."""
+
+    def __init__(self, findings: Findings):
+        self.findings = findings
+        self.wallet_id = None
+        self.running = 0
+        self.tied: List[Any] = []
+
+    def start(self, wallet_id) -> None:
+        self.wallet_id = wallet_id
+        self.running = 0
+        self.tied = []
+
+    def event(self, row) -> None:
+        if self.tied and row.at != self.tied[0].at:
+            self._apply_tied()
+        self.tied.append(row)
+
+    def finish(self, balance_cents: int) -> None:
+        self._apply_tied()
+        if balance_cents != self.running:
+            self.findings.add(
+                "balance_mismatch",
+                wallet_id=self.wallet_id,
+                expected=self.running,
+                found=balance_cents
+            )
+
+    def _apply_tied(self) -> None:
+        """
+        Apply events that share a timestamp in chain order: rows written in
+        one batch (e.g. a deposit settlement) have equal times and random ids.
+        """
+        tied, self.tied = self.tied, []
+        while tied:
+            pick = next((e for e in tied if e.before == self.running), None)
+            if pick is None:
+                pick = next((e for e in tied if e.before is None), tied[0])
+            tied.remove(pick)
+            self._apply(pick)
+
+    def _apply(self, row) -> None:
+        self.findings.checked["transactions"] += row.before is not None
+        if row.before is None:
+            self.running += row.amount  # Returned withdrawal
+            return
+        if row.after - row.before != row.amount:
+            self.findings.add(
+                "amount_mismatch",
+                wallet_id=self.wallet_id,
+                transaction_id=row.id,
+                amount=row.amount,
+                delta=row.after - row.before
+            )
+        if row.before != self.running:
+            self.findings.add(
+                "chain_break",
+                wallet_id=self.wallet_id,
+                transaction_id=row.id,
+                expected=self.running,
+                found=row.before
+            )
+        self.running = row.after
+
+
+def uuid_ranges(chunks: int) -> List[Tuple[Optional[str], Optional[str]]]:
+    """Split the UUID space into contiguous [lo, hi) ranges; None means unbounded."""
+    step = (1 << 128) // chunks
+    bounds = [None] + [str(uuid.UUID(int=i * step)) for i in range(1, chunks)] + [None]
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def range_sql(column: str, lo: Optional[str], hi: Optional[str]) -> str:
+    parts = []
+    if lo:
+        parts.append(f"{column} >= CAST(:lo AS uuid)")
+    if hi:
+        parts.append(f"{column} < CAST(:hi AS uuid)")
+    return " AND ".join(parts) or "TRUE"
+
+
+def account_range(prefix: str, lo: Optional[str], hi: Optional[str]) -> Tuple[str, str]:
+    """String bounds of prefix-owned ledger accounts whose owner id is in [lo, hi)."""
+    # UUID text sorts like the UUID itself; ';' is the character after ':'
+    return prefix + (lo or ""), prefix + hi if hi else prefix[:-1] + ";"
+
+
+async def stream(conn: AsyncConnection, sql: str, params: Dict[str, Any], fetch_size: int):
+    result = await conn.stream(text(sql), {k: v for k, v in params.items() if v is not None})
+    async for partition in result.partitions(fetch_size):
+        for row in partition:
+            yield row
+
+
+async def check_chains(conn, lo, hi, findings: Findings, fetch_size: int) -> None:
+    checker = ChainChecker(findings)
+    sql = CHAIN_EVENTS.format(range=range_sql("t.wallet_id", lo, hi), wallet_range=range_sql("w.id", lo, hi))
+    async for row in stream(conn, sql, {"lo": lo, "hi": hi}, fetch_size):
+        if row.wallet_id != checker.wallet_id:
+            checker.start(row.wallet_id)
+        if row.phase == 1:
+            checker.finish(row.amount)
+            findings.checked["wallets"] += 1
+        else:
+            checker.event(row)
+
+
+async def check_escrow(conn, lo, hi, findings: Findings, fetch_size: int) -> None:
+    sql = ESCROW_TOTALS.format(
+        escrow_range=range_sql("match_id", lo, hi),
+        reference_range=range_sql("reference_id", lo, hi)
+    )
+    async for row in stream(conn, sql, {"lo": lo, "hi": hi}, fetch_size):
+        findings.checked["escrow_accounts"] += 1
+        if row.status is None:
+            findings.add("escrow_missing", match_id=row.match_id, locked=row.locked)
+            continue
+        if row.locked != row.staked:
+            findings.add("escrow_lock_mismatch", match_id=row.match_id, expected=row.staked, found=row.locked)
+        expected = EXPECTED_REMAINING.get(row.status)
+        remaining = row.locked - row.released - row.refunded
+        if expected is not None and remaining != expected(row):
+            findings.add(
+                "escrow_not_conserved",
+                match_id=row.match_id,
+                status=row.status,
+                expected_remaining=expected(row),
+                remaining=remaining
+            )
+
+
+async def check_ledger(conn, lo, hi, findings: Findings, fetch_size: int) -> None:
+    wallet_lo, wallet_hi = account_range(LedgerAccount.wallet(""), lo, hi)
+    pending_lo, pending_hi = account_range(LedgerAccount.pending(""), lo, hi)
+    sql = LEDGER_WALLETS.format(user_range=range_sql("w.user_id", lo, hi))
+    params = {
+        "lo": lo, "hi": hi,
+        "wallet_lo": wallet_lo, "wallet_hi": wallet_hi,
+        "pending_lo": pending_lo, "pending_hi": pending_hi
+    }
+    async for row in stream(conn, sql, params, fetch_size):
+        findings.checked["ledger_wallets"] += 1
+        if row.ledger_balance != row.balance_cents:
+            findings.add("ledger_balance_mismatch", user_id=row.user_id, wallet=row.balance_cents, ledger=row.ledger_balance)
+        if row.ledger_pending != row.pending_cents:
+            findings.add("ledger_pending_mismatch", user_id=row.user_id, wallet=row.pending_cents, ledger=row.ledger_pending)
+
+    sql = UNBALANCED_JOURNALS.format(journal_range=range_sql("journal_id", lo, hi))
+    async for row in stream(conn, sql, {"lo": lo, "hi": hi}, fetch_size):
+        findings.add("unbalanced_journal", journal_id=row.journal_id, total=row.total)
+
+
+CHECKERS = {"chains": check_chains, "escrow": check_escrow, "ledger": check_ledger}
+
+
+async def check_range(lo: Optional[str], hi: Optional[str], args) -> Dict[str, Any]:
+    """Run the selected checks over one UUID range on a connection of its own."""
+    findings = Findings(args.max_examples)
+    engine = create_async_engine(settings.DATABASE_URL, pool_size=1, max_overflow=0)
+    try:
+        async with engine.connect() as conn:
+            for check in args.checks:
+                await CHECKERS[check](conn, lo, hi, findings, args.fetch_size)
+    finally:
+        await engine.dispose()
+    return findings.to_dict()
+
+
+def run_range(task) -> Dict[str, Any]:
+    """Process pool entry point."""
+    lo, hi, args = task
+    return asyncio.run(check_range(lo, hi, args))
+
+
+def main(args) -> int:
+    ranges = uuid_ranges(args.processes * args.ranges_per_process)
+    findings = Findings(args.max_examples)
+    started = time.perf_counter()
+
+    # Spawn, not fork: children must not share the parent's connections
+    with multiprocessing.get_context("spawn").Pool(args.processes) as pool:
+        tasks = [(lo, hi, args) for lo, hi in ranges]
+        for done, partial in enumerate(pool.imap_unordered(run_range, tasks), start=1):
+            findings.merge(partial)
+            if args.verbose:
+                print(f"  {done}/{len(tasks)} ranges, {sum(findings.counts.values())} discrepancies", file=sys.stderr)
+
+    elapsed = time.perf_counter() - started
+    report = {
+        "checks": list(args.checks),
+        "elapsed_seconds": round(elapsed, 2),
+        **findings.to_dict()
+    }
+    if args.report:
+        Path(args.report).write_text(json.dumps(report, indent=2))
+
+    print(f"checked:       {', '.join(f'{k}={v}' for k, v in sorted(findings.checked.items())) or 'nothing'}")
+    print(f"elapsed:       {elapsed:.1f}s over {args.processes} processes")
+    if not findings.counts:
+        print("discrepancies: none")
+        return 0
+    print(f"discrepancies: {', '.join(f'{k}={v}' for k, v in sorted(findings.counts.items()))}")
+    for example in findings.examples[:10]:
+        print(f"  {json.dumps(example)}")
+    return 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--checks", nargs="+", choices=CHECKS, default=list(CHECKS))
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--ranges-per-process", type=int, default=4, help="More ranges even out skew")
+    parser.add_argument("--fetch-size", type=int, default=10000, help="Rows per server-side cursor fetch")
+    parser.add_argument("--max-examples", type=int, default=1000, help="Discrepancies kept in the report")
+    parser.add_argument("--report", help="Write the full JSON report here")
+    parser.add_argument("--verbose", action="store_true")
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,135 @@
+"""
+Tests for the ADMIN role check guarding the admin router.
+"""
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+from httpx import AsyncClient
+
+from app.api.deps import get_current_admin_user, get_current_user, get_user_repository
+from app.api.v1 import admin
+from app.core.exceptions import ForbiddenError
+from app.domain.entities.user import User as DomainUser
+from app.main import app
+
+
+class User:
+    def __init__(self):
+        self.id = uuid4()
+
+
+class UserRepository:
+    """Answers role lookups from a fixed set of (user_id, role) grants."""
+
+    def __init__(self, grants=()):
+        self.grants = set(grants)
+        self.lookups = []
+
+    async def has_role(self, user_id, role_name):
+        self.lookups.append((user_id, role_name))
+        return (user_id, role_name) in self.grants
+
+
+def dependencies(route):
+    return [dependency.call for dependency in route.dependant.dependencies]
+
+
+async def test_admin_passes_role_check():
+    user = User()
+    repo = UserRepository({(user.id, "ADMIN")})
+
+    assert await get_current_admin_user(current_user=user, user_repo=repo) is user
+    assert repo.lookups == [(user.id, "ADMIN")]
+
+
+@pytest.mark.parametrize("grants", [set(), {"PLAYER"}, {"MODERATOR"}])
+async def test_non_admin_is_forbidden(grants):
+    user = User()
+    repo = UserRepository({(user.id, role) for role in grants})
+
+    with pytest.raises(ForbiddenError):
+        await get_current_admin_user(current_user=user, user_repo=repo)
+
+
+async def test_another_users_grant_does_not_count():
+    user = User()
+    repo = UserRepository({(uuid4(), "ADMIN")})
+
+    with pytest.raises(ForbiddenError):
+        await get_current_admin_user(current_user=user, user_repo=repo)
+
+
+def test_transaction_export_requires_admin():
+    assert admin.require_admin is get_current_admin_user
+    route = next(r for r in admin.router.routes if r.path == "/transactions/export")
+    assert get_current_admin_user in dependencies(route)
+
+
+class SearchableUserRepository(UserRepository):
+    """Also serves the admin user search, so a leak would show up in the body."""
+
+    def __init__(self, grants, users):
+        super().__init__(grants)
+        self.users = users
+        self.searches = 0
+
+    async def search_users(self, **filters):
+        self.searches += 1
+        return self.users, None
+
+
+@pytest.fixture
+def user_search():
+    def account(email):
+        return DomainUser(
+            id=uuid4(),
+            email=email,
+            email_verified=True,
+            account_status="ACTIVE",
+            failed_login_attempts=0,
+            locked_until=None,
+            last_login_at=None,
+            created_at=datetime.utcnow(),
+            updated_at=datetime.utcnow(),
+            deleted_at=None
+        )
+
+    caller = User()
+    listed = [(account("someone@example.com"), None)]
+
+    async def search(grants):
+        repo = SearchableUserRepository({(caller.id, role) for role in grants}, listed)
+        app.dependency_overrides[get_current_user] = lambda: caller
+        app.dependency_overrides[get_user_repository] = lambda: repo
+        app.dependency_overrides[admin.get_user_repository_admin] = lambda: repo
+        try:
+            async with AsyncClient(app=app, base_url="http://test") as client:
+                response = await client.get("/api/v1/admin/users")
+        finally:
+            app.dependency_overrides.clear()
+        return response, repo
+
+    return search
+
+
+def test_every_admin_route_requires_admin():
+    for route in admin.router.routes:
+        assert get_current_admin_user in dependencies(route), route.path
+
+
+async def test_user_search_is_forbidden_to_players(user_search):
+    response, repo = await user_search({"PLAYER"})
+
+    assert response.status_code == 403
+    assert response.json()["error"]["code"] == "FORBIDDEN"
+    assert "someone@example.com" not in response.text
+    assert repo.searches == 0
+
+
+async def test_user_search_returns_emails_to_admins(user_search):
+    response, repo = await user_search({"ADMIN"})
+
+    assert response.status_code == 200
+    assert [user["email"] for user in response.json()["data"]] == ["someone@example.com"]
+    assert repo.searches == 1
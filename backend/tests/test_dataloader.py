@@ -0,0 +1,43 @@
+"""
+Tests for the request-scoped DataLoader.
+"""
+import asyncio
+import gc
+
+from app.api.dataloader import DataLoader
+
+
+async def test_keys_requested_together_share_one_batch():
+    calls = []
+
+    async def batch(keys):
+        calls.append(list(keys))
+        return {key: key * 10 for key in keys if key != 3}
+
+    loader = DataLoader(batch, default_factory=list)
+
+    assert await loader.load_many([1, 2, 3, 1]) == [10, 20, [], 10]
+    assert calls == [[1, 2, 3]]
+    assert await loader.load(2) == 20
+    assert loader.batches == 1
+
+
+async def test_dispatch_task_is_held_until_it_finishes():
+    released = asyncio.Event()
+
+    async def batch(keys):
+        await released.wait()
+        return {key: key for key in keys}
+
+    loader = DataLoader(batch)
+    pending = asyncio.ensure_future(loader.load(1))
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+
+    # Only the loader references the dispatch task; it must survive a collection
+    assert len(loader._tasks) == 1
+    gc.collect()
+    released.set()
+    assert await asyncio.wait_for(pending, 1) == 1
+    await asyncio.sleep(0)
+    assert not loader._tasks
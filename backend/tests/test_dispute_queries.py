@@ -0,0 +1,103 @@
+"""
+Query-count test for the dispute listings.
+Needs a migrated Postgres database at DATABASE_URL and is skipped when
+none is reachable. Everything it writes is rolled back.
+"""
+import uuid
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.api.dataloader import DataLoader
+from app.api.v1.admin import list_disputes_admin
+from app.infrastructure.database.models.dispute import Dispute as DisputeModel
+from app.infrastructure.database.models.dispute import DisputeEvidence as DisputeEvidenceModel
+from app.infrastructure.database.models.match import Match as MatchModel
+from app.infrastructure.database.models.user import User as UserModel
+from app.infrastructure.database.session import AsyncSessionLocal, engine
+from app.infrastructure.repositories.dispute_repository_impl import DisputeRepositoryImpl
+
+DISPUTES = 30
+EVIDENCE_PER_DISPUTE = 3
+
+
+@pytest.fixture
+async def session():
+    async with AsyncSessionLocal() as session:
+        try:
+            await session.execute(text("SELECT 1"))
+        except (OSError, SQLAlchemyError) as exc:
+            pytest.skip(f"no database at DATABASE_URL: {exc}")
+        try:
+            yield session
+        finally:
+            await session.rollback()
+    await engine.dispose()
+
+
+async def seed_disputes(session) -> None:
+    """Create DISPUTES disputes with EVIDENCE_PER_DISPUTE evidence rows each."""
+    players = [
+        UserModel(email=f"dispute-{uuid.uuid4().hex}@check.local", password_hash="x", account_status="ACTIVE")
+        for _ in range(2)
+    ]
+    session.add_all(players)
+    await session.flush()
+    creator, opponent = (player.id for player in players)
+
+    for _ in range(DISPUTES):
+        match = MatchModel(
+            match_type="QUICK_DUEL",
+            status="DISPUTED",
+            stake_cents=500,
+            total_pot_cents=1000,
+            platform_fee_cents=100,
+            created_by=creator,
+            accepted_by=opponent
+        )
+        session.add(match)
+        await session.flush()
+        dispute = DisputeModel(
+            match_id=match.id,
+            created_by=creator,
+            against_user_id=opponent,
+            reason="CHEATING",
+            description="check"
+        )
+        session.add(dispute)
+        await session.flush()
+        session.add_all(
+            DisputeEvidenceModel(dispute_id=dispute.id, submitted_by=creator, content=f"evidence {i}")
+            for i in range(EVIDENCE_PER_DISPUTE)
+        )
+    await session.flush()
+    # Start from a cold identity map, as a fresh request would
+    session.expunge_all()
+
+
+async def count_listing(session, limit: int) -> int:
+    """Statements sent to list one admin dispute page with its evidence."""
+    repo = DisputeRepositoryImpl(session)
+    loader = DataLoader(repo.get_evidence_for_disputes, default_factory=list)
+    before = session.info.get("uow_statements", 0)
+    response = await list_disputes_admin(
+        status=None,
+        limit=limit,
+        cursor=None,
+        admin_user=None,
+        dispute_repo=repo,
+        evidence_loader=loader
+    )
+    assert len(response["data"]) == limit
+    assert all(len(dispute.evidence) == EVIDENCE_PER_DISPUTE for dispute in response["data"][:DISPUTES])
+    return session.info.get("uow_statements", 0) - before
+
+
+async def test_dispute_listing_query_count_does_not_grow_with_page_size(session):
+    await seed_disputes(session)
+
+    counts = {limit: await count_listing(session, limit) for limit in (1, 10, DISPUTES)}
+
+    # One page query plus one batched evidence query, whatever the page size
+    assert set(counts.values()) == {2}, counts
@@ -0,0 +1,103 @@
+"""
+Tests for reloading the in-memory leaderboard.
+"""
+from collections import namedtuple
+
+import pytest
+
+from app.infrastructure.leaderboard import (
+    ENTRY_FIELDS,
+    MAX_RATING,
+    FenwickTree,
+    LeaderboardEngine,
+    LeaderboardIndex
+)
+
+RankingRow = namedtuple("RankingRow", ("user_id",) + ENTRY_FIELDS)
+
+
+def ranking_row(user_id, rating):
+    return RankingRow(user_id, rating, 0, 0, 0, 0, 0, f"player-{user_id}", None)
+
+
+class StreamedRankings:
+    """Stands in for session.stream(...): yields partitions and runs a hook between them."""
+
+    def __init__(self, partitions, between=None):
+        self._partitions = partitions
+        self._between = between
+
+    async def partitions(self):
+        for i, partition in enumerate(self._partitions):
+            if i and self._between:
+                self._between()
+            yield partition
+
+
+class RankingsSession:
+    def __init__(self, result):
+        self.result = result
+
+    async def stream(self, statement):
+        return self.result
+
+
+async def test_reload_swaps_in_a_new_index():
+    engine = LeaderboardEngine()
+    assert not engine.loaded
+    assert engine.page(10) == ([], False)
+
+    rows = [[ranking_row("a", 1500), ranking_row("b", 1700)], [ranking_row("c", 1600)]]
+    await engine.reload(RankingsSession(StreamedRankings(rows)))
+
+    page, has_more = engine.page(10)
+    assert [row["user_id"] for row in page] == ["b", "c", "a"]
+    assert not has_more
+    assert engine.loaded and engine.stats()["players"] == 3
+
+
+async def test_changes_committed_during_reload_survive_the_swap():
+    engine = LeaderboardEngine()
+    engine.apply("a", rating=1500)
+
+    # "a" wins a match after the reload has already read its old rating
+    rows = [[ranking_row("a", 1500)], [ranking_row("b", 1600)]]
+    result = StreamedRankings(rows, between=lambda: engine.apply("a", rating=1800))
+    await engine.reload(RankingsSession(result))
+
+    assert engine.rank_of("a")["rank"] == 1
+    assert engine.rank_of("b")["rank"] == 2
+
+
+def test_ratings_outside_the_index_range_are_clamped():
+    engine = LeaderboardEngine()
+    engine.apply("low", rating=-3)
+    engine.apply("mid", rating=1500)
+    engine.apply("high", rating=MAX_RATING + 1)
+
+    page, _ = engine.page(10)
+    assert [(row["user_id"], row["rating"]) for row in page] == [
+        ("high", MAX_RATING), ("mid", 1500), ("low", 0)
+    ]
+    assert engine.rank_of("low")["rank"] == 3
+
+    # Moving back into range keeps the counts consistent
+    engine.apply("low", rating=1600)
+    assert engine.rank_of("low")["rank"] == 2
+
+
+def test_build_clamps_out_of_range_ratings():
+    index = LeaderboardIndex.build([
+        ("low", {**dict.fromkeys(ENTRY_FIELDS, 0), "rating": -40}),
+        ("high", {**dict.fromkeys(ENTRY_FIELDS, 0), "rating": MAX_RATING * 2}),
+    ])
+
+    assert [row["user_id"] for row in index.slice(0, 10)] == ["high", "low"]
+    assert index.rank_of("low")["rank"] == 2
+
+
+def test_fenwick_rejects_keys_outside_the_tree():
+    tree = FenwickTree(8)
+    for key in (-1, 8):
+        with pytest.raises(IndexError):
+            tree.add(key, 1)
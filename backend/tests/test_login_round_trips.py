@@ -0,0 +1,95 @@
+"""
+Round-trip test for login.
+Needs a migrated Postgres database at DATABASE_URL and is skipped when
+none is reachable. Failed logins are tracked in memory, so no Redis is
+needed. Everything it writes is rolled back.
+"""
+import uuid
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.config import settings
+from app.core.exceptions import AuthenticationError
+from app.core.security import hash_password_async
+from app.domain.services.auth_service import AuthService
+from app.infrastructure.database.models.player_profile import PlayerProfile as PlayerProfileModel
+from app.infrastructure.database.models.user import User as UserModel
+from app.infrastructure.database.session import AsyncSessionLocal, engine
+from app.infrastructure.last_logins import LastLoginBuffer
+from app.infrastructure.login_attempts import LoginAttemptTracker, MemoryLoginAttemptBackend
+from app.infrastructure.repositories.user_repository_impl import UserRepositoryImpl
+
+PASSWORD = "check-password"
+
+
+@pytest.fixture
+async def session():
+    async with AsyncSessionLocal() as session:
+        try:
+            await session.execute(text("SELECT 1"))
+        except (OSError, SQLAlchemyError) as exc:
+            pytest.skip(f"no database at DATABASE_URL: {exc}")
+        try:
+            yield session
+        finally:
+            await session.rollback()
+    await engine.dispose()
+
+
+@pytest.fixture
+async def login(session):
+    """A fresh account, the AuthService wired as the API wires it, and its last-login buffer."""
+    email = f"login-{uuid.uuid4().hex}@check.local"
+    user = UserModel(email=email, password_hash=await hash_password_async(PASSWORD), account_status="ACTIVE")
+    session.add(user)
+    await session.flush()
+    session.add(PlayerProfileModel(user_id=user.id, username=f"login{uuid.uuid4().hex[:12]}"))
+    await session.flush()
+    # Start from a cold identity map, as a fresh request would
+    session.expunge_all()
+
+    last_logins = LastLoginBuffer()
+    login_attempts = LoginAttemptTracker(
+        MemoryLoginAttemptBackend(),
+        max_failures=settings.LOGIN_MAX_FAILED_ATTEMPTS,
+        window_seconds=settings.LOGIN_FAILURE_WINDOW_SECONDS,
+        lockout_seconds=settings.LOGIN_LOCKOUT_SECONDS
+    )
+    repo = UserRepositoryImpl(session)
+    return email, AuthService(repo, login_attempts, last_logins), repo, last_logins
+
+
+async def counted(session, operation) -> int:
+    """Run operation and return how many statements it sent."""
+    before = session.info.get("uow_statements", 0)
+    try:
+        await operation()
+    except AuthenticationError:
+        pass
+    return session.info.get("uow_statements", 0) - before
+
+
+async def test_login_costs_one_read_and_one_batched_write(session, login):
+    email, service, repo, last_logins = login
+
+    reads = await counted(session, lambda: service.login(email, PASSWORD))
+    pending = last_logins.take_pending()
+    writes = await counted(session, lambda: repo.record_last_logins(pending))
+
+    assert reads <= 1
+    assert len(pending) == 1
+    assert writes <= 1
+
+
+@pytest.mark.parametrize("attempt", ["wrong password", "unknown email"])
+async def test_failed_login_costs_one_read(session, login, attempt):
+    email, service, repo, last_logins = login
+    if attempt == "wrong password":
+        credentials = (email, "wrong-password")
+    else:
+        credentials = (f"x{email}", PASSWORD)
+
+    assert await counted(session, lambda: service.login(*credentials)) <= 1
+    assert not last_logins.take_pending()
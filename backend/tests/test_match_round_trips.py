@@ -0,0 +1,89 @@
+"""
+Round-trip test for match completion.
+Needs a migrated Postgres database at DATABASE_URL and is skipped when
+none is reachable. Everything it writes is rolled back.
+"""
+import uuid
+
+import pytest
+from sqlalchemy import text, update
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.domain.services.escrow_service import EscrowService
+from app.domain.services.match_service import MatchService
+from app.domain.services.wallet_service import WalletService
+from app.infrastructure.database.models.match import Match as MatchModel
+from app.infrastructure.database.models.ranking import Ranking as RankingModel
+from app.infrastructure.database.models.user import User as UserModel
+from app.infrastructure.database.models.wallet import Wallet as WalletModel
+from app.infrastructure.database.session import AsyncSessionLocal, engine
+from app.infrastructure.repositories.escrow_repository_impl import EscrowRepositoryImpl
+from app.infrastructure.repositories.job_repository_impl import JobRepositoryImpl
+from app.infrastructure.repositories.match_repository_impl import MatchRepositoryImpl
+from app.infrastructure.repositories.ranking_repository_impl import RankingRepositoryImpl
+from app.infrastructure.repositories.user_repository_impl import UserRepositoryImpl
+from app.infrastructure.repositories.wallet_repository_impl import WalletRepositoryImpl
+
+# lock match, UPDATE match + INSERT results, lock rankings, UPDATE rankings,
+# release escrow, credit winner, enqueue follow-up jobs
+BUDGET = 8
+
+
+@pytest.fixture
+async def session():
+    async with AsyncSessionLocal() as session:
+        try:
+            await session.execute(text("SELECT 1"))
+        except (OSError, SQLAlchemyError) as exc:
+            pytest.skip(f"no database at DATABASE_URL: {exc}")
+        try:
+            yield session
+        finally:
+            await session.rollback()
+    await engine.dispose()
+
+
+async def count_completion(session, best_of: int) -> int:
+    """Complete one freshly created match and return the statements it cost."""
+    players = []
+    for _ in range(2):
+        user = UserModel(
+            email=f"match-{uuid.uuid4().hex}@check.local",
+            password_hash="x",
+            account_status="ACTIVE"
+        )
+        session.add(user)
+        await session.flush()
+        session.add(RankingModel(user_id=user.id))
+        session.add(WalletModel(user_id=user.id, balance_cents=100000, pending_cents=0, currency="USD"))
+        players.append(user.id)
+    await session.flush()
+
+    service = MatchService(
+        MatchRepositoryImpl(session),
+        UserRepositoryImpl(session),
+        RankingRepositoryImpl(session),
+        EscrowService(EscrowRepositoryImpl(session), WalletService(WalletRepositoryImpl(session))),
+        JobRepositoryImpl(session)
+    )
+
+    match = await service.create_match("QUICK_DUEL", 500, players[0], best_of=best_of)
+    await service.accept_match(match.id, players[1])
+    await session.execute(
+        update(MatchModel).where(MatchModel.id == match.id).values(status="IN_PROGRESS")
+    )
+    # Start from a cold identity map, as a fresh request would
+    session.expunge_all()
+
+    winner = players[0]
+    game_results = [{"winner_id": str(winner)}] * best_of
+    before = session.info.get("uow_statements", 0)
+    await service.complete_match(match.id, winner, game_results, reported_by=winner)
+    return session.info.get("uow_statements", 0) - before
+
+
+async def test_match_completion_round_trips_do_not_grow_with_best_of(session):
+    counts = {best_of: await count_completion(session, best_of) for best_of in (1, 3, 5, 7)}
+
+    assert max(counts.values()) <= BUDGET, counts
+    assert len(set(counts.values())) == 1, counts
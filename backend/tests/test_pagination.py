@@ -0,0 +1,57 @@
+"""
+Tests for keyset pagination cursors.
+"""
+import base64
+import json
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import select
+
+from app.core.exceptions import ValidationError
+from app.infrastructure.database.models.match import Match as MatchModel
+from app.infrastructure.repositories.pagination import decode_cursor, encode_cursor, keyset_page
+
+
+def crafted(payload) -> str:
+    raw = json.dumps(payload).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def test_cursor_round_trips():
+    row_id = uuid4()
+    created_at = datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+
+    assert decode_cursor(encode_cursor(created_at, row_id), datetime) == (created_at, row_id)
+    assert decode_cursor(encode_cursor(1500, row_id), int) == (1500, row_id)
+    assert decode_cursor(None, int) is None
+    assert decode_cursor("", datetime) is None
+
+
+@pytest.mark.parametrize("cursor, sort_type", [
+    ("not a cursor!", int),
+    (crafted("just a string"), int),
+    (crafted(["v", 1500]), int),
+    (crafted(["x", 1500, str(uuid4())]), int),
+    (crafted(["v", "1500", str(uuid4())]), int),
+    (crafted(["v", True, str(uuid4())]), int),
+    (crafted(["v", 1500, "not-a-uuid"]), int),
+    (crafted(["v", 1500, 42]), int),
+    (crafted(["v", 1500, str(uuid4())]), datetime),
+    (crafted(["dt", "yesterday", str(uuid4())]), datetime),
+    (crafted(["dt", 1500, str(uuid4())]), datetime),
+    (crafted(["dt", "2026-01-02T03:04:05+00:00", str(uuid4())]), int),
+])
+def test_crafted_cursor_is_a_validation_error(cursor, sort_type):
+    with pytest.raises(ValidationError) as error:
+        decode_cursor(cursor, sort_type)
+    assert error.value.status_code == 400
+
+
+def test_keyset_page_checks_cursor_against_the_sort_column():
+    query = select(MatchModel)
+
+    keyset_page(query, MatchModel.created_at, MatchModel.id, encode_cursor(datetime.now(timezone.utc), uuid4()), 20)
+    with pytest.raises(ValidationError):
+        keyset_page(query, MatchModel.created_at, MatchModel.id, encode_cursor(1500, uuid4()), 20)
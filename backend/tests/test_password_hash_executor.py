@@ -0,0 +1,55 @@
+"""
+Tests for the bounded Argon2 thread pool and its counters.
+"""
+import asyncio
+import time
+
+import pytest
+
+from app.core.exceptions import RateLimitError
+from app.core.security import PasswordHashExecutor
+
+
+def work(seconds):
+    time.sleep(seconds)
+    return seconds
+
+
+def fail():
+    raise ValueError("bad hash")
+
+
+async def test_counters_add_up_across_concurrent_calls():
+    executor = PasswordHashExecutor(workers=2, max_pending=16)
+
+    results = await asyncio.gather(*(executor.run(work, 0.01) for _ in range(8)))
+
+    stats = executor.stats()
+    assert results == [0.01] * 8
+    assert stats["completed"] == 8
+    assert stats["pending"] == 0
+    # 8 calls of 10ms on 2 threads: at least 10ms each to run, and most had to queue
+    assert stats["avg_run_ms"] >= 10
+    assert stats["avg_wait_ms"] > 0
+
+
+async def test_failed_call_is_still_counted():
+    executor = PasswordHashExecutor(workers=1, max_pending=4)
+
+    with pytest.raises(ValueError):
+        await executor.run(fail)
+
+    assert executor.stats()["completed"] == 1
+    assert executor.stats()["pending"] == 0
+
+
+async def test_saturated_pool_rejects():
+    executor = PasswordHashExecutor(workers=1, max_pending=1)
+    running = asyncio.ensure_future(executor.run(work, 0.05))
+    await asyncio.sleep(0)
+
+    with pytest.raises(RateLimitError):
+        await executor.run(work, 0)
+    await running
+
+    assert executor.stats()["rejected"] == 1
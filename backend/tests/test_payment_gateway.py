@@ -0,0 +1,60 @@
+"""
+Tests for how the Stripe gateway turns HTTP responses into results and PaymentErrors.
+"""
+import asyncio
+
+import httpx
+import pytest
+
+from app.core.exceptions import PaymentError
+from app.infrastructure.external.payment_gateway import StripePaymentGateway
+
+
+def make_gateway(handler):
+    gateway = StripePaymentGateway(api_key="sk_test", api_base="https://stripe.test")
+    gateway._client = httpx.AsyncClient(base_url=gateway.api_base, transport=httpx.MockTransport(handler))
+    gateway._semaphore = asyncio.Semaphore(gateway.max_concurrency)
+    return gateway
+
+
+async def test_transfer_returns_decoded_object():
+    gateway = make_gateway(lambda request: httpx.Response(200, json={"id": "tr_1", "status": "paid"}))
+
+    transfer = await gateway.create_transfer(500, "acct_1", idempotency_key="payout-1")
+
+    assert transfer == {"transfer_id": "tr_1", "status": "paid", "amount_cents": 500}
+
+
+@pytest.mark.parametrize("status_code", [200, 502, 503])
+async def test_non_json_body_is_gateway_unavailable(status_code):
+    gateway = make_gateway(lambda request: httpx.Response(status_code, text="<html>Bad Gateway</html>"))
+
+    with pytest.raises(PaymentError) as exc_info:
+        await gateway.create_transfer(500, "acct_1", idempotency_key="payout-1")
+
+    assert exc_info.value.code == "GATEWAY_UNAVAILABLE"
+    assert exc_info.value.details == {"http_status": status_code}
+
+
+async def test_stripe_error_body_is_stripe_error():
+    error = {"error": {"type": "invalid_request_error", "code": "balance_insufficient", "message": "Nope"}}
+    gateway = make_gateway(lambda request: httpx.Response(400, json=error))
+
+    with pytest.raises(PaymentError) as exc_info:
+        await gateway.create_transfer(500, "acct_1", idempotency_key="payout-1")
+
+    assert exc_info.value.code == "STRIPE_ERROR"
+    assert exc_info.value.details["http_status"] == 400
+    assert exc_info.value.details["stripe_code"] == "balance_insufficient"
+
+
+async def test_timeout_is_gateway_timeout():
+    def handler(request):
+        raise httpx.ReadTimeout("timed out", request=request)
+
+    gateway = make_gateway(handler)
+
+    with pytest.raises(PaymentError) as exc_info:
+        await gateway.create_transfer(500, "acct_1", idempotency_key="payout-1")
+
+    assert exc_info.value.code == "GATEWAY_TIMEOUT"
@@ -0,0 +1,139 @@
+"""
+Tests for payout retry and give-up decisions.
+"""
+from contextlib import asynccontextmanager
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+
+from app.core.exceptions import PaymentError
+from app.domain.entities.payment import Payout
+from app.workers import payouts as payouts_module
+from app.workers.payouts import PayoutWorker
+
+
+def make_payout(attempts: int) -> Payout:
+    now = datetime.utcnow()
+    return Payout(
+        id=uuid4(),
+        destination="acct_test",
+        amount_cents=1000,
+        currency="usd",
+        withdrawal_count=1,
+        status="PENDING",
+        attempts=attempts,
+        transfer_id=None,
+        last_error=None,
+        lease_until=now,
+        created_at=now
+    )
+
+
+class FailingGateway:
+    def __init__(self, exc: Exception):
+        self.exc = exc
+
+    async def create_transfer(self, **kwargs):
+        raise self.exc
+
+
+class RecordingPayoutRepository:
+    """Records the settlement calls drain_once makes."""
+
+    claimed = []
+    failed = {}
+    review = {}
+    retried = []
+
+    def __init__(self, session):
+        pass
+
+    async def claim_payouts(self, limit, lease_seconds):
+        return list(self.claimed)
+
+    async def mark_paid(self, transfers):
+        return 0
+
+    async def mark_failed(self, errors):
+        RecordingPayoutRepository.failed.update(errors)
+        return len(errors)
+
+    async def mark_for_review(self, errors):
+        RecordingPayoutRepository.review.update(errors)
+        return len(errors)
+
+    async def record_retry(self, payout_id, error, retry_at):
+        RecordingPayoutRepository.retried.append(payout_id)
+
+
+@asynccontextmanager
+async def no_database():
+    yield None
+
+
+@pytest.fixture
+def settle(monkeypatch):
+    monkeypatch.setattr(payouts_module, "unit_of_work", no_database)
+    monkeypatch.setattr(payouts_module, "PayoutRepositoryImpl", RecordingPayoutRepository)
+    RecordingPayoutRepository.failed = {}
+    RecordingPayoutRepository.review = {}
+    RecordingPayoutRepository.retried = []
+
+    async def run(payouts, exc):
+        RecordingPayoutRepository.claimed = payouts
+        worker = PayoutWorker(
+            workers=1,
+            batch_size=10,
+            poll_seconds=1,
+            concurrency=2,
+            lease_seconds=60,
+            retry_base_seconds=30,
+            max_attempts=3,
+            gateway=FailingGateway(exc)
+        )
+        await worker.drain_once()
+        return (
+            RecordingPayoutRepository.failed,
+            RecordingPayoutRepository.review,
+            RecordingPayoutRepository.retried
+        )
+
+    return run
+
+
+async def test_unexpected_errors_are_retried_then_parked_for_review(settle):
+    fresh, last_try = make_payout(attempts=0), make_payout(attempts=2)
+
+    failed, review, retried = await settle([fresh, last_try], RuntimeError("connection reset"))
+
+    assert retried == [fresh.id]
+    assert list(review) == [last_try.id]
+    assert "outcome unknown after 3 attempts" in review[last_try.id]
+    # The transfer may have gone through, so nothing is refunded
+    assert failed == {}
+
+
+@pytest.mark.parametrize("exc", [
+    PaymentError("timeout", code="GATEWAY_TIMEOUT"),
+    PaymentError("bad gateway", code="GATEWAY_ERROR", details={"http_status": 502}),
+    PaymentError("idempotency conflict", code="GATEWAY_ERROR", details={"http_status": 409}),
+])
+async def test_ambiguous_gateway_errors_are_never_refunded(settle, exc):
+    payout = make_payout(attempts=2)
+
+    failed, review, retried = await settle([payout], exc)
+
+    assert retried == []
+    assert failed == {}
+    assert list(review) == [payout.id]
+
+
+async def test_rejected_transfers_are_refunded_immediately(settle):
+    payout = make_payout(attempts=0)
+
+    failed, review, retried = await settle([payout], PaymentError("account closed", code="ACCOUNT_CLOSED"))
+
+    assert retried == []
+    assert review == {}
+    assert failed == {payout.id: "account closed"}
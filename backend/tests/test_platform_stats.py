@@ -0,0 +1,65 @@
+"""
+Tests for the per-process platform counters and how they meet a reconcile.
+"""
+import pytest
+
+from app.infrastructure import platform_stats as platform_stats_module
+from app.infrastructure.platform_stats import PlatformStats
+from app.infrastructure.repositories.stats_repository_impl import RECONCILED_AT
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Pin the second deltas are buffered in."""
+    now = [1_000.0]
+    monkeypatch.setattr(platform_stats_module.time, "time", lambda: now[0])
+    return now
+
+
+def test_deltas_are_bucketed_by_the_second_they_were_buffered(clock):
+    stats = PlatformStats()
+    stats._add({"users.total": 1})
+    stats._add({"users.total": 1})
+    clock[0] = 1_001.5
+    stats._add({"users.total": 1, "users.status.ACTIVE": 1})
+
+    assert stats.take_pending() == {
+        1_000: {"users.total": 2},
+        1_001: {"users.total": 1, "users.status.ACTIVE": 1}
+    }
+    assert stats.take_pending() == {}
+
+
+def test_restored_deltas_merge_into_their_buckets(clock):
+    stats = PlatformStats()
+    stats._add({"users.total": 1})
+    failed = stats.take_pending()
+    stats._add({"users.total": 1})
+
+    stats.restore_pending(failed)
+
+    assert stats.take_pending() == {1_000: {"users.total": 2}}
+
+
+def test_snapshot_adds_unflushed_deltas_to_totals(clock):
+    stats = PlatformStats()
+    stats.load({"users.total": 10, "users.status.ACTIVE": 9})
+    stats._add({"users.total": 1, "users.status.ACTIVE": 1})
+
+    users = stats.snapshot()["users"]
+
+    assert users["total"] == 11
+    assert users["by_status"] == {"ACTIVE": 10}
+
+
+def test_load_drops_deltas_a_reconcile_already_counted(clock):
+    stats = PlatformStats()
+    stats._add({"users.total": 1})
+    clock[0] = 1_010.0
+    stats._add({"users.total": 1})
+
+    # A recount taken at second 1005 already includes the first event
+    stats.load({"users.total": 51, RECONCILED_AT: 1_005})
+
+    assert stats.snapshot()["users"]["total"] == 52
+    assert stats.take_pending() == {1_010: {"users.total": 1}}
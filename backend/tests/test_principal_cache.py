@@ -0,0 +1,155 @@
+"""
+Tests for the principal cache and how invalidations reach other workers.
+"""
+import asyncio
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.domain.entities.user import User
+from app.infrastructure.cache import FakeRedis
+from app.infrastructure.principal_cache import PrincipalCache
+
+
+class Session:
+    """Just enough of an AsyncSession for on_commit."""
+
+    def __init__(self):
+        self.info = {}
+
+    def commit(self):
+        for callback in self.info.pop("on_commit", []):
+            callback()
+
+
+def make_user():
+    now = datetime.utcnow()
+    return User(
+        id=uuid4(),
+        email="player@example.com",
+        email_verified=True,
+        account_status="ACTIVE",
+        failed_login_attempts=0,
+        locked_until=None,
+        last_login_at=None,
+        created_at=now,
+        updated_at=now
+    )
+
+
+async def eventually(condition):
+    for _ in range(100):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("condition never became true")
+
+
+@pytest.fixture
+async def workers():
+    """Two workers' caches sharing one Redis."""
+    redis = FakeRedis()
+    caches = [PrincipalCache(ttl_seconds=30, client=redis) for _ in range(2)]
+    for cache in caches:
+        cache.start()
+    await eventually(lambda: all(cache.subscribed for cache in caches))
+    yield caches
+    for cache in caches:
+        await cache.stop()
+
+
+def test_local_cache_returns_copies():
+    cache = PrincipalCache(ttl_seconds=30)
+    user = make_user()
+    cache.put(user)
+
+    cached = cache.get(user.id)
+    cached.account_status = "BANNED"
+
+    assert cache.get(user.id).account_status == "ACTIVE"
+
+
+def test_local_invalidation_waits_for_commit():
+    cache = PrincipalCache(ttl_seconds=30)
+    user = make_user()
+    cache.put(user)
+    session = Session()
+
+    cache.invalidate_on_commit(session, user.id)
+    assert cache.get(user.id) is not None
+
+    session.commit()
+    assert cache.get(user.id) is None
+
+
+async def test_invalidation_reaches_other_workers(workers):
+    publisher, other = workers
+    user = make_user()
+    publisher.put(user)
+    other.put(user)
+    session = Session()
+
+    publisher.invalidate_on_commit(session, user.id)
+    session.commit()
+
+    assert publisher.get(user.id) is None
+    await eventually(lambda: other.received == 1)
+    assert other.get(user.id) is None
+    assert publisher.published == 1
+
+
+async def test_unsubscribed_worker_bypasses_its_cache():
+    cache = PrincipalCache(ttl_seconds=30, client=FakeRedis())
+    user = make_user()
+
+    cache.put(user)
+
+    assert not cache.subscribed
+    assert cache.get(user.id) is None
+
+
+class DownPubSub:
+    def __init__(self, redis):
+        self.redis = redis
+
+    async def subscribe(self, *channels):
+        self.redis.attempts += 1
+        raise RedisConnectionError("connection refused")
+
+    async def aclose(self):
+        pass
+
+
+class DownRedis(FakeRedis):
+    def __init__(self):
+        super().__init__()
+        self.attempts = 0
+
+    async def publish(self, channel, message):
+        raise RedisConnectionError("connection refused")
+
+    def pubsub(self):
+        return DownPubSub(self)
+
+
+async def test_redis_outage_keeps_the_cache_bypassed(monkeypatch):
+    monkeypatch.setattr("app.infrastructure.principal_cache.RESUBSCRIBE_SECONDS", 0.01)
+    redis = DownRedis()
+    cache = PrincipalCache(ttl_seconds=30, client=redis)
+    cache.start()
+    try:
+        # The listener keeps retrying rather than dying on the first failure
+        await eventually(lambda: redis.attempts >= 2)
+        user = make_user()
+        cache.put(user)
+        assert cache.get(user.id) is None
+        assert cache.stats()["subscribed"] is False
+
+        session = Session()
+        cache.invalidate_on_commit(session, user.id)
+        session.commit()
+        await eventually(lambda: cache.publish_failures == 1)
+    finally:
+        await cache.stop()
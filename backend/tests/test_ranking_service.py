@@ -0,0 +1,19 @@
+"""
+Tests for Elo rating updates.
+"""
+from app.domain.services.ranking_service import MIN_RATING, RankingService
+
+
+def test_elo_is_zero_sum_for_equal_ratings():
+    service = RankingService(ranking_repository=None, user_repository=None)
+
+    assert service.calculate_elo_rating(1500, 1500, player1_won=True) == (1516, 1484)
+
+
+def test_elo_never_drops_below_the_floor():
+    service = RankingService(ranking_repository=None, user_repository=None)
+
+    loser, winner = service.calculate_elo_rating(10, 10, player1_won=False)
+    assert (loser, winner) == (MIN_RATING, 26)
+    _, loser = service.calculate_elo_rating(2000, MIN_RATING, player1_won=True)
+    assert loser == MIN_RATING
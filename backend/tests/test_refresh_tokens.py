@@ -0,0 +1,157 @@
+"""
+Tests for refresh-token rotation, reuse detection and logout.
+"""
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+from jose import jwt
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.core.exceptions import AuthenticationError, ServiceUnavailableError
+from app.core.security import create_refresh_token
+from app.domain.entities.user import User
+from app.domain.services.auth_service import AuthService
+from app.infrastructure.cache import FakeRedis
+from app.infrastructure.last_logins import LastLoginBuffer
+from app.infrastructure.login_attempts import LoginAttemptTracker, MemoryLoginAttemptBackend
+from app.infrastructure.refresh_tokens import (
+    CONSUMED,
+    REUSED,
+    REVOKED,
+    MemoryRefreshTokenBackend,
+    RedisRefreshTokenBackend,
+    RefreshTokenStore,
+    RefreshTokenStoreUnavailable
+)
+
+
+def make_store(backend):
+    return RefreshTokenStore(backend, token_lifetime_seconds=3600, bloom_capacity=1000, bloom_error_rate=0.01)
+
+
+@pytest.fixture(params=["memory", "fake-redis"])
+def store(request):
+    if request.param == "memory":
+        return make_store(MemoryRefreshTokenBackend())
+    return make_store(RedisRefreshTokenBackend(FakeRedis()))
+
+
+class UserRepository:
+    """The one lookup refresh makes."""
+
+    def __init__(self, user):
+        self.user = user
+
+    async def get_user_by_id(self, user_id):
+        return self.user if user_id == self.user.id else None
+
+
+@pytest.fixture
+def auth_service(store):
+    now = datetime.utcnow()
+    user = User(
+        id=uuid4(),
+        email="player@example.com",
+        email_verified=True,
+        account_status="ACTIVE",
+        failed_login_attempts=0,
+        locked_until=None,
+        last_login_at=None,
+        created_at=now,
+        updated_at=now
+    )
+    tracker = LoginAttemptTracker(MemoryLoginAttemptBackend(), max_failures=5, window_seconds=900, lockout_seconds=1800)
+    return AuthService(UserRepository(user), tracker, LastLoginBuffer(), store)
+
+
+def claims(token):
+    return jwt.get_unverified_claims(token)
+
+
+def login_token(auth_service):
+    return create_refresh_token({"sub": str(auth_service.user_repository.user.id)})
+
+
+async def test_rotation_consumes_token_and_keeps_family(store):
+    assert await store.rotate("jti-1", "fam-1", 9999999999) == CONSUMED
+    assert await store.rotate("jti-2", "fam-1", 9999999999) == CONSUMED
+    assert store.stats()["rotations"] == 2
+
+
+async def test_reused_token_revokes_its_family(store):
+    await store.rotate("jti-1", "fam-1", 9999999999)
+    await store.rotate("jti-2", "fam-1", 9999999999)
+
+    assert await store.rotate("jti-1", "fam-1", 9999999999) == REUSED
+    # The legitimate holder's newer token dies with the family
+    assert await store.rotate("jti-3", "fam-1", 9999999999) == REVOKED
+    # Other logins are untouched
+    assert await store.rotate("jti-4", "fam-2", 9999999999) == CONSUMED
+
+
+async def test_logout_revokes_family(store):
+    await store.rotate("jti-1", "fam-1", 9999999999)
+    await store.revoke_family("fam-1")
+
+    assert await store.rotate("jti-2", "fam-1", 9999999999) == REVOKED
+
+
+async def test_refresh_rotates_within_the_login_family(auth_service):
+    first = login_token(auth_service)
+    _, second = await auth_service.refresh_access_token(first)
+
+    assert claims(second)["fam"] == claims(first)["jti"]
+    assert claims(second)["jti"] != claims(first)["jti"]
+    _, third = await auth_service.refresh_access_token(second)
+    assert claims(third)["fam"] == claims(first)["jti"]
+
+
+async def test_replayed_refresh_token_ends_the_session(auth_service):
+    first = login_token(auth_service)
+    _, second = await auth_service.refresh_access_token(first)
+
+    with pytest.raises(AuthenticationError):
+        await auth_service.refresh_access_token(first)
+    with pytest.raises(AuthenticationError):
+        await auth_service.refresh_access_token(second)
+
+
+async def test_logout_rejects_every_token_of_the_login(auth_service):
+    first = login_token(auth_service)
+    _, second = await auth_service.refresh_access_token(first)
+
+    await auth_service.logout(first)
+
+    with pytest.raises(AuthenticationError):
+        await auth_service.refresh_access_token(second)
+
+
+class DownRedis(FakeRedis):
+    """A client whose every command fails as if Redis were unreachable."""
+
+    def pipeline(self, transaction=True):
+        raise RedisConnectionError("connection refused")
+
+    async def exists(self, *keys):
+        raise RedisConnectionError("connection refused")
+
+
+async def test_redis_outage_rejects_refresh_and_fails_logout():
+    store = make_store(RedisRefreshTokenBackend(DownRedis()))
+
+    with pytest.raises(RefreshTokenStoreUnavailable):
+        await store.rotate("jti-1", "fam-1", 9999999999)
+    with pytest.raises(RefreshTokenStoreUnavailable):
+        await store.revoke_family("fam-1")
+
+
+async def test_redis_outage_fails_refresh_closed(auth_service):
+    auth_service.refresh_tokens = make_store(RedisRefreshTokenBackend(DownRedis()))
+
+    with pytest.raises(AuthenticationError):
+        await auth_service.refresh_access_token(login_token(auth_service))
+    with pytest.raises(ServiceUnavailableError) as exc_info:
+        await auth_service.logout(login_token(auth_service))
+    assert exc_info.value.status_code == 503
+    assert exc_info.value.code == "LOGOUT_UNAVAILABLE"
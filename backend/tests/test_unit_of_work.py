@@ -0,0 +1,127 @@
+"""
+Tests for the request unit of work: commit before the response, and
+writes that must outlive a failed request.
+"""
+from datetime import datetime
+from uuid import uuid4
+
+import httpx
+import pytest
+from fastapi import Depends, FastAPI, Request
+
+from app.api.unit_of_work import UnitOfWorkMiddleware
+from app.core.exceptions import AuthenticationError, BusinessLogicError
+from app.core.security import hash_password
+from app.domain.entities.user import User
+from app.domain.services.auth_service import AuthService
+from app.infrastructure.database.session import REQUEST_SESSIONS_KEY
+from app.infrastructure.last_logins import LastLoginBuffer
+from app.infrastructure.login_attempts import LoginAttemptTracker, MemoryLoginAttemptBackend
+
+
+class RecordingSession:
+    """Stands in for an AsyncSession, recording what the middleware does to it."""
+
+    def __init__(self, events, fail_commit=False):
+        self.events = events
+        self.fail_commit = fail_commit
+        self.info = {}
+        self.new = self.dirty = self.deleted = ()
+
+    def in_transaction(self):
+        return True
+
+    async def commit(self):
+        self.events.append("commit")
+        if self.fail_commit:
+            raise RuntimeError("commit failed")
+
+    async def rollback(self):
+        self.events.append("rollback")
+
+
+def build_app(events, fail_commit=False):
+    async def session_dependency(request: Request):
+        sessions = request.scope.setdefault(REQUEST_SESSIONS_KEY, [])
+        session = RecordingSession(events, fail_commit)
+        sessions.append(session)
+        try:
+            yield session
+        finally:
+            sessions.remove(session)
+            events.append("teardown")
+
+    app = FastAPI()
+    app.add_middleware(UnitOfWorkMiddleware)
+
+    @app.post("/write")
+    async def write(db=Depends(session_dependency)):
+        events.append("endpoint")
+        return {"ok": True}
+
+    return app
+
+
+async def post(app, path):
+    async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+        return await client.post(path)
+
+
+async def test_commit_happens_before_response_is_sent():
+    events = []
+    response = await post(build_app(events), "/write")
+
+    assert response.status_code == 200
+    assert events == ["endpoint", "commit", "teardown"]
+
+
+async def test_failed_commit_turns_response_into_500():
+    events = []
+    response = await post(build_app(events, fail_commit=True), "/write")
+
+    assert response.status_code == 500
+    assert response.json()["error"]["code"] == "INTERNAL_ERROR"
+    assert events == ["endpoint", "commit", "rollback", "teardown"]
+
+
+class LoginRepository:
+    """The single repository read login makes, for one account."""
+
+    def __init__(self, user, password_hash):
+        self.user = user
+        self.password_hash = password_hash
+
+    async def get_login_account(self, email):
+        if email != self.user.email:
+            return None
+        return self.user, None, self.password_hash
+
+
+async def test_failed_logins_lock_account_although_each_request_rolls_back():
+    now = datetime.utcnow()
+    user = User(
+        id=uuid4(),
+        email="player@example.com",
+        email_verified=True,
+        account_status="ACTIVE",
+        failed_login_attempts=0,
+        locked_until=None,
+        last_login_at=None,
+        created_at=now,
+        updated_at=now
+    )
+    tracker = LoginAttemptTracker(
+        MemoryLoginAttemptBackend(),
+        max_failures=3,
+        window_seconds=900,
+        lockout_seconds=1800
+    )
+    service = AuthService(LoginRepository(user, hash_password("right-password")), tracker, LastLoginBuffer())
+
+    for _ in range(3):
+        with pytest.raises(AuthenticationError):
+            await service.login(user.email, "wrong-password")
+
+    with pytest.raises(BusinessLogicError) as locked:
+        await service.login(user.email, "right-password")
+    assert locked.value.code == "ACCOUNT_LOCKED"